@@ -2,10 +2,11 @@
 
 import useSWR from "swr";
 import { api } from "@/lib/api";
-import React, { useEffect } from "react";
+import React, { useEffect, useState } from "react";
 import { useReviewStore } from "@/store/useReviewStore";
 import LoadingSpinner from "@/components/LoadingSpinner";
 import ReviewPage from "@/components/ReviewPage";
+import type { ReviewStatusResponse } from "@/lib/types";
 
 export default function ReviewDetailPage({ params }: { params: Promise<{ id: string }> }) {
   const { id } = React.use(params);
@@ -15,9 +16,16 @@ export default function ReviewDetailPage({ params }: { params: Promise<{ id: str
   const setExpandedIssueId = useReviewStore((s) => s.setExpandedIssueId);
   const setPrdText = useReviewStore((s) => s.setPrdText);
 
-  // Improved SWR configuration to prevent infinite polling
-  const { data, error, isLoading } = useSWR(["review", id], () => api.getReview(id), {
+  // 進捗はSSEでプッシュ受信し、ストリームが使えない場合のみポーリングに切り替える
+  const [live, setLive] = useState<Partial<ReviewStatusResponse> | null>(null);
+  const [streamFailed, setStreamFailed] = useState(false);
+
+  // Initial fetch hydrates PRD text; polling is only a fallback when the event stream fails
+  const { data: fetched, error, isLoading } = useSWR(["review", id], () => api.getReview(id), {
     refreshInterval: (latestData) => {
+      if (!streamFailed) {
+        return 0;
+      }
       // Stop polling if review is completed or failed
       if (latestData?.status === "completed" || latestData?.status === "failed") {
         return 0;
@@ -33,6 +41,29 @@ export default function ReviewDetailPage({ params }: { params: Promise<{ id: str
     errorRetryInterval: 5000, // 5 second intervals for retries
   });
 
+  useEffect(() => {
+    setLive(null);
+    setStreamFailed(false);
+    return api.subscribeReviewEvents(
+      id,
+      (event) =>
+        setLive((prev) => {
+          const { issues_added, ...rest } = event.data;
+          const next = { ...(prev ?? {}), ...rest };
+          if (issues_added && issues_added.length > 0) {
+            const known = new Set((prev?.provisional_issues ?? []).map((issue) => issue.issue_id));
+            const merged = [...(prev?.provisional_issues ?? []), ...issues_added.filter((i) => !known.has(i.issue_id))];
+            next.provisional_issues = merged.sort((a, b) => a.priority - b.priority);
+          }
+          return next;
+        }),
+      () => setStreamFailed(true)
+    );
+  }, [id]);
+
+  const data: Partial<ReviewStatusResponse> | undefined =
+    fetched || live ? { ...(fetched ?? {}), ...(streamFailed ? {} : live ?? {}) } : undefined;
+
   useEffect(() => {
     setReviewId(id);
   }, [id, setReviewId]);
@@ -48,16 +79,17 @@ export default function ReviewDetailPage({ params }: { params: Promise<{ id: str
         setExpandedIssueId(data.issues[0].issue_id);
       }
     }
-  }, [data, setIssues, expandedIssueId, setExpandedIssueId, setPrdText]);
+  }, [data?.prd_text, data?.status, data?.issues, setIssues, expandedIssueId, setExpandedIssueId, setPrdText]);
 
-  if (error) return <p className="text-red-600 p-6">読み込みに失敗しました: {String(error)}</p>;
-  if (isLoading || data?.status === "processing")
+  if (error && !live) return <p className="text-red-600 p-6">読み込みに失敗しました: {String(error)}</p>;
+  if ((isLoading && !live) || data?.status === "processing")
     return (
       <LoadingSpinner
         progress={data?.progress}
         phaseMessage={data?.phase_message}
         expectedAgents={data?.expected_agents}
         completedAgents={data?.completed_agents}
+        provisionalIssues={data?.provisional_issues}
       />
     );
   if (data?.status === "failed") return <p className="text-red-600 p-6">レビューの実行に失敗しました。</p>;
@@ -1,8 +1,11 @@
+import type { Issue } from "@/lib/types";
+
 interface LoadingSpinnerProps {
   progress?: number | null;
   phaseMessage?: string | null;
   expectedAgents?: string[] | null;
   completedAgents?: string[] | null;
+  provisionalIssues?: Issue[] | null;
 }
 
 const SPINNER_ICON = (
@@ -39,6 +42,7 @@ export default function LoadingSpinner({
   phaseMessage,
   expectedAgents,
   completedAgents,
+  provisionalIssues,
 }: LoadingSpinnerProps) {
   const pct = Math.max(0, Math.min(100, Math.round((progress ?? 0) * 100)));
   const agents = expectedAgents ?? [];
@@ -80,6 +84,19 @@ export default function LoadingSpinner({
             </ul>
           </div>
         )}
+        {provisionalIssues && provisionalIssues.length > 0 && (
+          <div className="rounded-lg border border-slate-200/70 bg-white/80 p-3">
+            <p className="typ-caption mb-2 text-slate-500">届いた指摘（{provisionalIssues.length}件・集約前）</p>
+            <ul className="space-y-1">
+              {provisionalIssues.map((issue) => (
+                <li key={issue.issue_id} className="rounded-md px-2 py-1 text-sm text-slate-600">
+                  <span className="mr-2 text-slate-400">{issue.agent_name}</span>
+                  <span>{issue.summary || issue.comment}</span>
+                </li>
+              ))}
+            </ul>
+          </div>
+        )}
       </div>
     </div>
   );
@@ -149,11 +149,18 @@ function ChatPane({
     setInput("");
     setError(null);
     setLoading(true);
-    setHistory((h) => [...h, { role: "user", text: q }]);
+    setHistory((h) => [...h, { role: "user", text: q }, { role: "ai", text: "" }]);
+    // 末尾の AI メッセージを差分で伸ばしていく
+    const setAnswer = (update: (text: string) => string) =>
+      setHistory((h) => {
+        const last = h[h.length - 1];
+        return [...h.slice(0, -1), { ...last, text: update(last.text) }];
+      });
     try {
-      const res = await api.dialog(reviewId, issueId, q);
-      setHistory((h) => [...h, { role: "ai", text: res.response_text }]);
+      const answer = await api.dialogStream(reviewId, issueId, q, (delta) => setAnswer((t) => t + delta));
+      setAnswer(() => answer);
     } catch (e: unknown) {
+      setHistory((h) => (h[h.length - 1]?.text ? h : h.slice(0, -1)));
       setError(toErrorMessage(e, "対話の送信に失敗しました"));
     } finally {
       setLoading(false);
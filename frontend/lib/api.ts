@@ -1,4 +1,12 @@
-import { ReviewStatusResponse, ReviewStartResponse, ReviewSummaryResponse, AgentRole } from "./types";
+import {
+  ReviewStatusResponse,
+  ReviewStartResponse,
+  ReviewSummaryResponse,
+  AgentRole,
+  ReviewStreamEvent,
+  DialogStreamChunk,
+  IssueListResponse,
+} from "./types";
 
 const API_BASE = process.env.NEXT_PUBLIC_API_BASE_URL || "http://localhost:8000";
 
@@ -22,17 +30,78 @@ export const api = {
   getAgentRoles: () =>
     http<AgentRole[]>("/agents/roles"),
 
-  startReview: (prd_text: string, panel_type?: string | null, selected_agent_roles?: string[]) =>
+  startReview: (
+    prd_text: string,
+    panel_type?: string | null,
+    selected_agent_roles?: string[],
+    base_review_id?: string | null
+  ) =>
     http<ReviewStartResponse>("/reviews", {
       method: "POST",
       body: JSON.stringify({
         prd_text,
         panel_type: panel_type ?? null,
         selected_agent_roles: selected_agent_roles ?? null,
+        base_review_id: base_review_id ?? null,
       }),
     }),
 
-  getReview: (review_id: string) => http<ReviewStatusResponse>(`/reviews/${review_id}`),
+  getReview: (review_id: string, view: "full" | "compact" = "full") =>
+    http<ReviewStatusResponse>(`/reviews/${review_id}${view === "compact" ? "?view=compact" : ""}`),
+
+  listIssues: (
+    review_id: string,
+    params: {
+      status?: string;
+      agent?: string;
+      priority?: number;
+      cursor?: string | null;
+      limit?: number;
+      fields?: string[];
+    } = {}
+  ) => {
+    const query = new URLSearchParams();
+    if (params.status) query.set("status", params.status);
+    if (params.agent) query.set("agent", params.agent);
+    if (params.priority) query.set("priority", String(params.priority));
+    if (params.cursor) query.set("cursor", params.cursor);
+    if (params.limit) query.set("limit", String(params.limit));
+    if (params.fields?.length) query.set("fields", params.fields.join(","));
+    const suffix = query.toString() ? `?${query.toString()}` : "";
+    return http<IssueListResponse>(`/reviews/${review_id}/issues${suffix}`);
+  },
+
+  // 進捗は SSE で受け取る（EventSource が Last-Event-ID による再接続を自動で行う）
+  subscribeReviewEvents: (
+    review_id: string,
+    onEvent: (event: ReviewStreamEvent) => void,
+    onError?: () => void
+  ): (() => void) => {
+    const source = new EventSource(`${API_BASE}/reviews/${review_id}/events`);
+    const eventTypes: ReviewStreamEvent["type"][] = [
+      "snapshot",
+      "progress",
+      "agent_completed",
+      "completed",
+      "failed",
+    ];
+    for (const type of eventTypes) {
+      source.addEventListener(type, (message) => {
+        const data = JSON.parse((message as MessageEvent<string>).data) as Partial<ReviewStatusResponse>;
+        onEvent({ type, data });
+        const finished = data.status === "completed" || data.status === "failed";
+        if (type === "completed" || type === "failed" || finished) {
+          source.close();
+        }
+      });
+    }
+    source.onerror = () => {
+      if (source.readyState === EventSource.CLOSED) {
+        onError?.();
+      }
+    };
+    return () => source.close();
+  },
 
   dialog: (review_id: string, issue_id: string, question_text: string) =>
     http<{ response_text: string }>(`/reviews/${review_id}/issues/${issue_id}/dialog`, {
@@ -40,6 +109,53 @@ export const api = {
       body: JSON.stringify({ question_text }),
     }),
 
+  // 回答を NDJSON で逐次受け取り、差分ごとに onDelta を呼ぶ。完了時は全文を返す
+  dialogStream: async (
+    review_id: string,
+    issue_id: string,
+    question_text: string,
+    onDelta: (text: string) => void,
+    signal?: AbortSignal
+  ): Promise<string> => {
+    const res = await fetch(`${API_BASE}/reviews/${review_id}/issues/${issue_id}/dialog/stream`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ question_text }),
+      cache: "no-store",
+      signal,
+    });
+    if (!res.ok || !res.body) {
+      const text = await res.text().catch(() => "");
+      throw new Error(`API error ${res.status}: ${text}`);
+    }
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    let answer = "";
+    const handleLine = (line: string) => {
+      if (!line.trim()) return;
+      const chunk = JSON.parse(line) as DialogStreamChunk;
+      if (chunk.type === "delta") {
+        answer += chunk.text;
+        onDelta(chunk.text);
+      } else if (chunk.type === "done") {
+        answer = chunk.response_text;
+      } else {
+        throw new Error(chunk.detail);
+      }
+    };
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      const lines = buffer.split("\n");
+      buffer = lines.pop() ?? "";
+      lines.forEach(handleLine);
+    }
+    handleLine(buffer + decoder.decode());
+    return answer;
+  },
+
   suggest: (review_id: string, issue_id: string) =>
     http<{ suggested_text: string; target_text: string }>(
       `/reviews/${review_id}/issues/${issue_id}/suggest`,
@@ -15,6 +15,8 @@ export interface Issue {
   status?: string;
   // ハイライト位置情報（バックエンド対応前は未設定の可能性あり）
   span?: IssueSpan;
+  // 同じ指摘を挙げた専門家（重複をまとめた場合は複数）
+  contributing_agents?: string[];
 }
 
 export type ReviewStatus = "processing" | "completed" | "failed" | "not_found";
@@ -22,6 +24,8 @@ export type ReviewStatus = "processing" | "completed" | "failed" | "not_found";
 export interface ReviewStatusResponse {
   status: ReviewStatus;
   issues: Issue[] | null;
+  // 集約前に完了した専門家の指摘（完了時は issues に置き換わる）
+  provisional_issues?: Issue[] | null;
   prd_text?: string | null;
   progress?: number | null;
   phase?: string | null;
@@ -29,8 +33,36 @@ export interface ReviewStatusResponse {
   eta_seconds?: number | null;
   expected_agents?: string[] | null;
   completed_agents?: string[] | null;
+  cache_status?: "hit" | "miss" | null;
+  // Specialists (agent key) that failed and contributed no issues, with the reason
+  agent_errors?: Record<string, string> | null;
+  // 上位K件・専門家ごとの上限から外れた指摘の件数（GET /reviews/{id}/issues/truncated で取得）
+  truncated_issue_count?: number | null;
+  // セッションのバージョン（ETag にも含まれる）。?wait_for_version= に渡すと次の変更までロングポーリングする
+  version?: number | null;
+  // view=compact のときだけ設定される（prd_text と指摘一覧は省略）
+  issue_count?: number | null;
+  provisional_issue_count?: number | null;
 }
 
+export interface IssueListResponse {
+  status: ReviewStatus;
+  // fields を指定した場合は issue_id と指定フィールドのみ
+  issues: Partial<Issue>[];
+  total: number;
+  next_cursor?: string | null;
+}
+
+export interface ReviewStreamEvent {
+  type: "snapshot" | "progress" | "agent_completed" | "completed" | "failed";
+  data: Partial<ReviewStatusResponse> & { issues_added?: Issue[] };
+}
+
+export type DialogStreamChunk =
+  | { type: "delta"; text: string }
+  | { type: "done"; response_text: string }
+  | { type: "error"; detail: string; response_text: string };
+
 export interface ReviewStartResponse {
   review_id: string;
 }
@@ -52,10 +84,25 @@ export interface SummaryStatistics {
   agent_counts: AgentCount[];
 }
 
+export interface TokenUsage {
+  prompt_tokens: number;
+  completion_tokens: number;
+  total_tokens: number;
+  estimated_cost_usd?: number | null;
+}
+
+export interface ReviewTokenUsage {
+  model?: string | null;
+  total: TokenUsage;
+  agents: Record<string, TokenUsage>;
+}
+
 export interface ReviewSummaryResponse {
   status: ReviewStatus;
   statistics: SummaryStatistics;
   issues: Issue[];
+  agent_errors?: Record<string, string>;
+  token_usage?: ReviewTokenUsage | null;
 }
 
 export interface AgentRole {
@@ -0,0 +1,63 @@
+"""Token usage of specialist responses that took more than one model call."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types as genai_types
+
+UsageMetadata = genai_types.GenerateContentResponseUsageMetadata
+
+_COUNT_FIELDS = (
+    "prompt_token_count",
+    "candidates_token_count",
+    "thoughts_token_count",
+    "cached_content_token_count",
+    "tool_use_prompt_token_count",
+    "total_token_count",
+)
+
+
+def sum_usage(*usages: UsageMetadata | None) -> UsageMetadata | None:
+    """Add up the token counts of several calls (``None`` when none reported usage)."""
+
+    present = [usage for usage in usages if usage is not None]
+    if not present:
+        return None
+    if len(present) == 1:
+        return present[0]
+    totals: dict[str, int] = {}
+    for name in _COUNT_FIELDS:
+        values = [value for usage in present if (value := getattr(usage, name, None)) is not None]
+        if values:
+            totals[name] = sum(values)
+    return UsageMetadata.model_validate(totals)
+
+
+def call_usage(responses: Sequence[LlmResponse]) -> UsageMetadata | None:
+    """Usage of one model call: the last response that reports it."""
+
+    for response in reversed(responses):
+        if response.usage_metadata is not None:
+            return response.usage_metadata
+    return None
+
+
+def with_extra_usage(responses: list[LlmResponse], extra: UsageMetadata | None) -> list[LlmResponse]:
+    """Add ``extra`` (e.g. a losing hedge) to the usage reported by ``responses``.
+
+    ADK turns each response into an event and the review accounts the
+    usage it finds there, so the calls behind one answer must be reported
+    on that answer.
+    """
+
+    if extra is None or not responses:
+        return responses
+    index = next(
+        (i for i in range(len(responses) - 1, -1, -1) if responses[i].usage_metadata is not None),
+        len(responses) - 1,
+    )
+    target = responses[index]
+    updated = target.model_copy(update={"usage_metadata": sum_usage(target.usage_metadata, extra)})
+    return [*responses[:index], updated, *responses[index + 1 :]]
@@ -1,5 +1,21 @@
 """Parallel Orchestrator package exports."""
 
-from .agent import create_coordinator_agent, create_parallel_review_agent, root_agent
+from .agent import (
+    create_chunked_review_agent,
+    create_coordinator_agent,
+    create_dialog_agent,
+    create_parallel_review_agent,
+    resolve_definitions,
+    root_agent,
+)
+from .registry import ReviewPipelineRegistry
 
-__all__ = ["create_coordinator_agent", "create_parallel_review_agent", "root_agent"]
+__all__ = [
+    "ReviewPipelineRegistry",
+    "create_chunked_review_agent",
+    "create_coordinator_agent",
+    "create_dialog_agent",
+    "create_parallel_review_agent",
+    "resolve_definitions",
+    "root_agent",
+]
@@ -6,6 +6,7 @@ from typing import cast
 from google.adk.agents import BaseAgent, LlmAgent, ParallelAgent, SequentialAgent
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.events import Event, EventActions
+from google.adk.models import BaseLlm
 from google.adk.tools.tool_context import ToolContext
 from google.genai import types as genai_types
 
@@ -13,10 +14,12 @@ from hibikasu_agent.agents.parallel_orchestrator.tools import (
     AGGREGATE_FINAL_ISSUES_TOOL,
 )
 from hibikasu_agent.agents.specialist import (
+    create_chunk_specialist_from_definition,
     create_role_agents,
     create_specialists_from_config,
 )
-from hibikasu_agent.constants.agents import SPECIALIST_DEFINITIONS
+from hibikasu_agent.agents.specialist_timing import SpecialistTimingPolicy
+from hibikasu_agent.constants.agents import ROLE_TO_DEFINITION, SPECIALIST_DEFINITIONS, SpecialistDefinition
 
 
 class FinalIssuesAggregatorAgent(BaseAgent):
@@ -43,8 +46,24 @@ class FinalIssuesAggregatorAgent(BaseAgent):
         yield Event(author=self.name, content=content, actions=event_actions)
 
 
+def resolve_definitions(selected_agents: list[str] | None) -> list[SpecialistDefinition]:
+    """Filter specialist definitions by role, falling back to all of them."""
+
+    if selected_agents is not None:
+        filtered_definitions = [
+            definition for definition in SPECIALIST_DEFINITIONS if definition.role in selected_agents
+        ]
+        # Fall back to all agents if no valid agents found
+        if filtered_definitions:
+            return filtered_definitions
+    return list(SPECIALIST_DEFINITIONS)
+
+
 def create_parallel_review_agent(
-    model: str = "gemini-2.5-flash-lite", *, selected_agents: list[str] | None = None
+    model: str | BaseLlm = "gemini-2.5-flash-lite",
+    *,
+    selected_agents: list[str] | None = None,
+    timing: SpecialistTimingPolicy | None = None,
 ) -> SequentialAgent:
     """Build the review workflow agent using a sequential pipeline based on ADK best practices.
 
@@ -53,6 +72,7 @@ def create_parallel_review_agent(
         selected_agents: Optional list of agent roles to include. If None, all agents are used.
                         Valid roles: "engineer", "ux_designer", "qa_tester", "pm"
                         Falls back to all agents if no valid roles are provided.
+        timing: Optional per-specialist deadlines / hedging of model calls
 
     Flow:
     1) Four specialist review agents run concurrently via ParallelAgent and
@@ -61,21 +81,13 @@ def create_parallel_review_agent(
        and emits the final structured review result without additional LLM calls.
     """
 
-    # Filter definitions based on selected agents
-    if selected_agents is not None:
-        filtered_definitions = [
-            definition for definition in SPECIALIST_DEFINITIONS if definition.role in selected_agents
-        ]
-        # Fall back to all agents if no valid agents found
-        if not filtered_definitions:
-            filtered_definitions = list(SPECIALIST_DEFINITIONS)
-    else:
-        filtered_definitions = list(SPECIALIST_DEFINITIONS)
+    filtered_definitions = resolve_definitions(selected_agents)
 
     # 1) Specialists with explicit output keys defined via shared config
     review_agents = create_specialists_from_config(
         filtered_definitions,
         model=model,
+        timing=timing,
     )
 
     # 2) Run all specialists concurrently; their structured outputs persist via output_key.
@@ -100,6 +112,62 @@ def create_parallel_review_agent(
     return pipeline
 
 
+def create_chunked_review_agent(
+    model: str | BaseLlm = "gemini-2.5-flash-lite",
+    *,
+    selected_agents: list[str] | None = None,
+    chunk_count: int,
+    timing: SpecialistTimingPolicy | None = None,
+) -> SequentialAgent:
+    """Build a map-reduce review workflow for PRDs split into ``chunk_count`` chunks.
+
+    Flow:
+    1) One ParallelAgent per chunk runs every selected specialist against that
+       chunk only; outputs land under per-chunk state keys.
+    2) All chunk groups run concurrently inside an outer ParallelAgent.
+    3) The deterministic aggregator merges the per-chunk results, translating
+       chunk-relative quotes back to global PRD offsets.
+
+    The chunk plan and PRD text are read from session state, so the returned
+    graph only depends on ``model``, the selected roles and ``chunk_count``.
+    """
+
+    definitions = resolve_definitions(selected_agents)
+    chunk_groups = [
+        ParallelAgent(
+            name=f"Chunk{index + 1}Specialists",
+            sub_agents=cast(
+                list[BaseAgent],
+                [
+                    create_chunk_specialist_from_definition(
+                        definition, chunk_index=index, chunk_count=chunk_count, model=model, timing=timing
+                    )
+                    for definition in definitions
+                ],
+            ),
+            description=f"Executes specialist reviews for PRD chunk {index + 1}/{chunk_count}.",
+        )
+        for index in range(chunk_count)
+    ]
+
+    chunks_parallel = ParallelAgent(
+        name="ChunkedSpecialists",
+        sub_agents=cast(list[BaseAgent], chunk_groups),
+        description="Executes per-chunk specialist reviews concurrently.",
+    )
+
+    merger = FinalIssuesAggregatorAgent(
+        name="IssueAggregatorMerger",
+        description="Aggregates per-chunk specialist outputs deterministically.",
+    )
+
+    return SequentialAgent(
+        name="ChunkedReviewPipeline",
+        sub_agents=[chunks_parallel, merger],
+        description="Coordinates chunked specialist reviews and deterministic aggregation.",
+    )
+
+
 # Export a default root agent for optional discovery/use
 
 
@@ -142,4 +210,23 @@ def create_coordinator_agent(model: str = "gemini-2.5-flash-lite") -> LlmAgent:
     return coordinator
 
 
+def create_dialog_agent(role: str, model: str = "gemini-2.5-flash-lite") -> LlmAgent:
+    """Standalone chat agent for ``role`` used when dialog skips the coordinator.
+
+    Built separately from the coordinator's sub-agents because an ADK agent can
+    only belong to one parent.
+    """
+
+    definition = ROLE_TO_DEFINITION.get(role)
+    if definition is None:
+        raise ValueError(f"Unknown specialist role: {role}")
+    _, chat_agent = create_role_agents(
+        definition.role,
+        model=model,
+        review_output_key=definition.state_key,
+        name_prefix=definition.role,
+    )
+    return chat_agent
+
+
 root_agent = create_parallel_review_agent(model="gemini-2.5-flash-lite")
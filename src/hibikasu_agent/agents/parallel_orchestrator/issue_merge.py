@@ -0,0 +1,181 @@
+"""Deterministic merging of near-duplicate issues raised by different specialists."""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from hibikasu_agent.schemas.models import FinalIssue
+from hibikasu_agent.utils.logging_config import get_logger
+from hibikasu_agent.utils.span_calculator import get_span_index, normalize_text
+
+logger = get_logger(__name__)
+
+# Character n-gram length for text similarity (normalized text has no whitespace)
+SHINGLE_SIZE = 3
+# MinHash signature = BANDS x ROWS values; LSH candidates need one identical band (~0.6 Jaccard)
+MINHASH_BANDS = 8
+MINHASH_ROWS = 4
+# Exact shingle Jaccard needed to merge: anywhere in the PRD / when the quoted spans overlap
+TEXT_SIMILARITY_THRESHOLD = 0.6
+SPAN_TEXT_SIMILARITY_THRESHOLD = 0.3
+# Quoted spans overlap when the shared part covers this much of the shorter span
+SPAN_OVERLAP_RATIO = 0.5
+# Each issue is compared with at most this many neighbours per span sweep / LSH bucket
+MAX_COMPARISONS = 8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MINHASH_SEEDS = [
+    (
+        int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), "big") % _MERSENNE_PRIME or 1,
+        int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), "big") % _MERSENNE_PRIME,
+    )
+    for i in range(MINHASH_BANDS * MINHASH_ROWS)
+]
+
+
+@dataclass
+class _Entry:
+    index: int
+    issue: FinalIssue
+    shingles: frozenset[int]
+    span: tuple[int, int] | None
+
+
+def _shingles(text: str) -> frozenset[int]:
+    normalized = normalize_text(text)
+    if len(normalized) <= SHINGLE_SIZE:
+        grams = [normalized] if normalized else []
+    else:
+        grams = [normalized[i : i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)]
+    # Stable across processes (unlike hash()), so merges are reproducible
+    return frozenset(int.from_bytes(hashlib.blake2b(g.encode(), digest_size=8).digest(), "big") for g in grams)
+
+
+def _minhash(shingles: frozenset[int]) -> list[int]:
+    return [min((a * s + b) % _MERSENNE_PRIME for s in shingles) for a, b in _MINHASH_SEEDS]
+
+
+def _jaccard(a: frozenset[int], b: frozenset[int]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _span_of(issue: FinalIssue, prd_text: str) -> tuple[int, int] | None:
+    if issue.span_start is not None and issue.span_end is not None:
+        return issue.span_start, issue.span_end
+    if not prd_text or not issue.original_text:
+        return None
+    span = get_span_index(prd_text).find(issue.original_text)
+    return (span.start_index, span.end_index) if span is not None else None
+
+
+def _spans_overlap(a: tuple[int, int], b: tuple[int, int]) -> bool:
+    shared = min(a[1], b[1]) - max(a[0], b[0])
+    shortest = min(a[1] - a[0], b[1] - b[0])
+    return shortest > 0 and shared / shortest >= SPAN_OVERLAP_RATIO
+
+
+class _UnionFind:
+    def __init__(self, size: int) -> None:
+        self._parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        while self._parent[item] != item:
+            self._parent[item] = self._parent[self._parent[item]]
+            item = self._parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            # The earlier issue stays the root so merges do not depend on visiting order
+            self._parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def _pair_by_span(entries: list[_Entry], groups: _UnionFind) -> None:
+    """Sweep the quoted spans in start order, comparing only with recent overlapping ones."""
+
+    spanned = sorted((entry for entry in entries if entry.span is not None), key=lambda e: (e.span, e.index))
+    active: list[_Entry] = []
+    for entry in spanned:
+        start = entry.span[0]  # type: ignore[index]
+        active = [other for other in active if other.span[1] > start][-MAX_COMPARISONS:]  # type: ignore[index]
+        for other in active:
+            if (
+                _spans_overlap(other.span, entry.span)  # type: ignore[arg-type]
+                and _jaccard(other.shingles, entry.shingles) >= SPAN_TEXT_SIMILARITY_THRESHOLD
+            ):
+                groups.union(other.index, entry.index)
+        active.append(entry)
+
+
+def _pair_by_text(entries: list[_Entry], groups: _UnionFind) -> None:
+    """MinHash LSH: issues sharing a band are verified with the exact shingle Jaccard."""
+
+    buckets: dict[tuple[int, tuple[int, ...]], list[_Entry]] = {}
+    for entry in entries:
+        if not entry.shingles:
+            continue
+        signature = _minhash(entry.shingles)
+        for band in range(MINHASH_BANDS):
+            key = (band, tuple(signature[band * MINHASH_ROWS : (band + 1) * MINHASH_ROWS]))
+            bucket = buckets.setdefault(key, [])
+            for other in bucket[-MAX_COMPARISONS:]:
+                if _jaccard(other.shingles, entry.shingles) >= TEXT_SIMILARITY_THRESHOLD:
+                    groups.union(other.index, entry.index)
+            bucket.append(entry)
+
+
+def _merge_cluster(cluster: list[_Entry]) -> FinalIssue:
+    """Keep the most urgent issue (earliest on ties) and credit every contributing agent.
+
+    The lead's span resolved here is kept so later ranking and mapping need
+    not locate the quote again.
+    """
+
+    lead = min(cluster, key=lambda entry: entry.issue.priority)
+    agents: list[str] = []
+    for entry in cluster:
+        for agent in entry.issue.contributing_agents or [entry.issue.agent_name]:
+            if agent not in agents:
+                agents.append(agent)
+    update: dict[str, object] = {"contributing_agents": agents}
+    if lead.span is not None:
+        update["span_start"], update["span_end"] = lead.span
+    return lead.issue.model_copy(update=update)
+
+
+def merge_similar_issues(issues: Sequence[FinalIssue], prd_text: str = "") -> list[FinalIssue]:
+    """Cluster issues that point at the same problem and merge each cluster into one issue.
+
+    Two issues are merged when their quoted spans overlap and their summary +
+    comment are somewhat similar, or when the texts alone are very similar
+    (character n-gram Jaccard, with MinHash LSH to find candidates). No LLM
+    is involved and the result only depends on the input order. Sorting the
+    spans dominates; every issue is compared with a bounded number of
+    neighbours, so the stage stays O(n log n) as more specialists join.
+    """
+
+    entries = [
+        _Entry(
+            index=index,
+            issue=issue,
+            shingles=_shingles(f"{issue.summary}{issue.comment}"),
+            span=_span_of(issue, prd_text),
+        )
+        for index, issue in enumerate(issues)
+    ]
+    groups = _UnionFind(len(entries))
+    _pair_by_span(entries, groups)
+    _pair_by_text(entries, groups)
+
+    clusters: dict[int, list[_Entry]] = {}
+    for entry in entries:
+        clusters.setdefault(groups.find(entry.index), []).append(entry)
+    merged = [_merge_cluster(cluster) for cluster in clusters.values()]
+    if len(merged) < len(entries):
+        logger.info("Merged duplicate issues", before=len(entries), after=len(merged))
+    return merged
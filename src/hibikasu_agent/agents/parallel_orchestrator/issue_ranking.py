@@ -0,0 +1,130 @@
+"""Global ranking of aggregated issues with a top-K cap and per-agent quotas."""
+
+from __future__ import annotations
+
+import heapq
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from hibikasu_agent.constants.agents import ROLE_TO_DEFINITION
+from hibikasu_agent.schemas.models import FinalIssue
+from hibikasu_agent.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Default number of issues kept per specialist (the lead agent of a merged issue)
+DEFAULT_PER_AGENT_QUOTA = 5
+# Score of each priority (1 = most urgent); agent weights scale this part
+PRIORITY_SCORES: Mapping[int, float] = {1: 3.0, 2: 2.0, 3: 1.0}
+# Bonus per additional specialist that raised the same (merged) issue
+SUPPORT_BONUS = 0.5
+# Earlier quotes get up to this bonus; it only breaks ties within a priority
+POSITION_BONUS = 0.25
+
+
+@dataclass(frozen=True)
+class RankingOptions:
+    """Per-review ranking settings, passed to the aggregator through session state.
+
+    ``top_k`` caps the total number of issues (``None`` = no global cap),
+    ``per_agent_quota`` caps each specialist, and ``agent_weights`` maps a
+    role (e.g. ``"legal_advisor"``) to a multiplier of its priority score.
+    """
+
+    top_k: int | None = None
+    per_agent_quota: int | None = DEFAULT_PER_AGENT_QUOTA
+    agent_weights: Mapping[str, float] = field(default_factory=dict)
+
+    def to_state(self) -> dict[str, Any]:
+        return {
+            "top_k": self.top_k,
+            "per_agent_quota": self.per_agent_quota,
+            "agent_weights": dict(self.agent_weights),
+        }
+
+    @classmethod
+    def from_state(cls, raw: object) -> RankingOptions:
+        if not isinstance(raw, Mapping):
+            return cls()
+        weights = raw.get("agent_weights")
+        return cls(
+            top_k=_positive_int(raw.get("top_k")),
+            per_agent_quota=_positive_int(raw.get("per_agent_quota", DEFAULT_PER_AGENT_QUOTA)),
+            agent_weights=dict(weights) if isinstance(weights, Mapping) else {},
+        )
+
+
+def _positive_int(value: object) -> int | None:
+    if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+        return value
+    return None
+
+
+def parse_agent_weights(raw: str | None) -> dict[str, float]:
+    """Parse ``"legal_advisor=0.8,security_specialist=1.2"`` (invalid entries are skipped)."""
+
+    weights: dict[str, float] = {}
+    for item in (raw or "").split(","):
+        role, sep, value = item.partition("=")
+        if not sep:
+            continue
+        try:
+            weights[role.strip()] = float(value)
+        except ValueError:
+            logger.warning("ignoring invalid agent weight", extra={"entry": item})
+    return weights
+
+
+def _weights_by_agent_name(agent_weights: Mapping[str, float]) -> dict[str, float]:
+    """Issues carry display names; accept weights keyed by role or by display name."""
+
+    by_name: dict[str, float] = {}
+    for key, weight in agent_weights.items():
+        definition = ROLE_TO_DEFINITION.get(key)
+        by_name[definition.display_name if definition else key] = weight
+    return by_name
+
+
+def score_issue(issue: FinalIssue, *, prd_length: int = 0, weight: float = 1.0) -> float:
+    """Higher is more important: weighted priority, duplicate support and quote position."""
+
+    score = PRIORITY_SCORES.get(issue.priority, 1.0) * weight
+    score += SUPPORT_BONUS * max(0, len(issue.contributing_agents) - 1)
+    if prd_length > 0 and issue.span_start is not None:
+        score += POSITION_BONUS * (1.0 - min(issue.span_start, prd_length) / prd_length)
+    return score
+
+
+def rank_issues(
+    issues: Sequence[FinalIssue], options: RankingOptions, *, prd_length: int = 0
+) -> tuple[list[FinalIssue], list[FinalIssue]]:
+    """Select the top-K issues under the per-agent quotas.
+
+    Returns ``(selected, truncated)``, both in rank order. Issues with equal
+    scores keep their input order. Building the heap is O(n); each selected
+    or skipped issue costs one O(log n) pop.
+    """
+
+    weights = _weights_by_agent_name(options.agent_weights)
+    heap = [
+        (-score_issue(issue, prd_length=prd_length, weight=weights.get(issue.agent_name, 1.0)), index, issue)
+        for index, issue in enumerate(issues)
+    ]
+    heapq.heapify(heap)
+
+    selected: list[FinalIssue] = []
+    skipped: list[tuple[float, int, FinalIssue]] = []
+    per_agent: dict[str, int] = {}
+    while heap and (options.top_k is None or len(selected) < options.top_k):
+        entry = heapq.heappop(heap)
+        issue = entry[2]
+        taken = per_agent.get(issue.agent_name, 0)
+        if options.per_agent_quota is not None and taken >= options.per_agent_quota:
+            skipped.append(entry)
+            continue
+        per_agent[issue.agent_name] = taken + 1
+        selected.append(issue)
+    # Only the (usually short) leftover is fully sorted, and only to keep it in rank order
+    truncated = [issue for _score, _index, issue in heapq.merge(skipped, sorted(heap))]
+    return selected, truncated
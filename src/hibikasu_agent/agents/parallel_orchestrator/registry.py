@@ -0,0 +1,106 @@
+"""Cache of review pipeline graphs shared across concurrent reviews."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import partial
+
+from google.adk.agents import SequentialAgent
+from google.adk.models import BaseLlm
+from google.adk.models.google_llm import Gemini
+from google.genai import types as genai_types
+
+from hibikasu_agent.agents.parallel_orchestrator.agent import (
+    create_chunked_review_agent,
+    create_parallel_review_agent,
+    resolve_definitions,
+)
+from hibikasu_agent.agents.specialist import prompts_mtime
+from hibikasu_agent.agents.specialist_timing import SpecialistTimingPolicy
+from hibikasu_agent.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+PipelineKey = tuple[str, frozenset[str], int]
+PipelineBuilder = Callable[[str, list[str], int], SequentialAgent]
+
+
+def _build_pipeline(
+    model: str,
+    roles: list[str],
+    chunk_count: int,
+    *,
+    retry_options: genai_types.HttpRetryOptions | None = None,
+    timing: SpecialistTimingPolicy | None = None,
+) -> SequentialAgent:
+    # Retries live on each specialist's model, so a transient error re-sends only that specialist's request
+    llm: str | BaseLlm = Gemini(model=model, retry_options=retry_options) if retry_options else model
+    if chunk_count > 1:
+        return create_chunked_review_agent(model=llm, selected_agents=roles, chunk_count=chunk_count, timing=timing)
+    return create_parallel_review_agent(model=llm, selected_agents=roles, timing=timing)
+
+
+class ReviewPipelineRegistry:
+    """Builds each review pipeline once per (model, role set, chunk count).
+
+    ADK agents hold no per-run state (sessions live in the session service),
+    so one graph can back any number of concurrent runners. Entries are
+    dropped when ``prompts/agents.toml`` changes so edited instructions take
+    effect without a restart. With ``retry_options`` the default builder
+    gives every specialist a model that retries transient API errors
+    (429/5xx, timeouts) with exponential backoff, and ``timing`` applies
+    per-specialist deadlines and hedging.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 32,
+        builder: PipelineBuilder | None = None,
+        retry_options: genai_types.HttpRetryOptions | None = None,
+        timing: SpecialistTimingPolicy | None = None,
+    ) -> None:
+        self._max_entries = max(1, max_entries)
+        self._builder = builder or partial(_build_pipeline, retry_options=retry_options, timing=timing)
+        self._pipelines: OrderedDict[PipelineKey, SequentialAgent] = OrderedDict()
+        self._prompts_mtime = prompts_mtime()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pipelines)
+
+    def get(
+        self,
+        model: str,
+        *,
+        selected_agents: list[str] | None = None,
+        chunk_count: int = 1,
+    ) -> SequentialAgent:
+        """Return the shared pipeline, building it on first use."""
+
+        # Normalize through the same fallback as the factories so equivalent selections share a graph
+        roles = frozenset(definition.role for definition in resolve_definitions(selected_agents))
+        key: PipelineKey = (model, roles, max(1, chunk_count))
+        with self._lock:
+            current_mtime = prompts_mtime()
+            if current_mtime != self._prompts_mtime:
+                logger.info("Agent prompts changed; rebuilding review pipelines")
+                self._pipelines.clear()
+                self._prompts_mtime = current_mtime
+
+            pipeline = self._pipelines.get(key)
+            if pipeline is not None:
+                self._pipelines.move_to_end(key)
+                return pipeline
+
+            pipeline = self._builder(model, sorted(roles), key[2])
+            self._pipelines[key] = pipeline
+            while len(self._pipelines) > self._max_entries:
+                self._pipelines.popitem(last=False)
+            return pipeline
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pipelines.clear()
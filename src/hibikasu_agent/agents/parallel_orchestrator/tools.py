@@ -1,15 +1,24 @@
 """Tools for the Parallel Orchestrator workflow."""
 
+from dataclasses import replace
 from typing import Any
-from uuid import uuid4
+from uuid import NAMESPACE_URL, uuid5
 
 from google.adk.tools.tool_context import ToolContext
 from pydantic import ValidationError
 
+from hibikasu_agent.agents.parallel_orchestrator.issue_merge import merge_similar_issues
+from hibikasu_agent.agents.parallel_orchestrator.issue_ranking import RankingOptions, rank_issues
 from hibikasu_agent.constants.agents import (
     AGENT_DISPLAY_NAMES,
     AGENT_STATE_KEYS,
+    PRD_TEXT_STATE_KEY,
+    REVIEW_CHUNKS_STATE_KEY,
+    REVIEW_RANKING_STATE_KEY,
     SPECIALIST_DEFINITIONS,
+    SpecialistDefinition,
+    chunk_state_key,
+    specialist_error_state_key,
 )
 from hibikasu_agent.schemas.models import (
     FinalIssue,
@@ -18,23 +27,35 @@ from hibikasu_agent.schemas.models import (
     IssuesResponse,
 )
 from hibikasu_agent.utils.logging_config import get_logger
+from hibikasu_agent.utils.prd_sections import PrdChunk
+from hibikasu_agent.utils.span_calculator import calculate_span, normalize_text
 
 logger = get_logger(__name__)
 
 
-MAX_ISSUES_PER_AGENT = 5
+# Default global cap in chunked mode, when the review does not set its own top-K
+CHUNKED_TOP_K = 20
 
+_ISSUE_ID_NAMESPACE = uuid5(NAMESPACE_URL, "hibikasu/issues")
 
-def _to_final_issues(agent_key: str, issues_resp: IssuesResponse) -> list[FinalIssue]:
+
+def stable_issue_id(agent_key: str, item: IssueItem) -> str:
+    """Deterministic ID so provisional and aggregated copies of an issue match."""
+
+    fingerprint = "\x1f".join([agent_key, str(item.priority), item.summary, item.comment, item.original_text])
+    return str(uuid5(_ISSUE_ID_NAMESPACE, fingerprint))
+
+
+def to_final_issues(agent_key: str, issues_resp: IssuesResponse) -> list[FinalIssue]:
     """Convert a typed IssuesResponse to FinalIssue items for a given agent."""
     final_items: list[FinalIssue] = []
-    items = issues_resp.issues[:MAX_ISSUES_PER_AGENT]
-    for item in items:
+    # No cap here: the per-agent quota is applied when ranking all specialists together
+    for item in issues_resp.issues:
         parsed: IssueItem = item
 
         final_items.append(
             FinalIssue(
-                issue_id=str(uuid4()),
+                issue_id=stable_issue_id(agent_key, parsed),
                 priority=parsed.priority,
                 agent_name=AGENT_DISPLAY_NAMES.get(agent_key, agent_key),
                 summary=parsed.summary,
@@ -45,7 +66,7 @@ def _to_final_issues(agent_key: str, issues_resp: IssuesResponse) -> list[FinalI
     return final_items
 
 
-def _load_issues_from_state(state: dict[str, Any], key: str) -> IssuesResponse:
+def load_issues_from_state(state: dict[str, Any], key: str) -> IssuesResponse:
     raw = state.get(key)
     if isinstance(raw, IssuesResponse):
         return raw
@@ -61,25 +82,106 @@ def _load_issues_from_state(state: dict[str, Any], key: str) -> IssuesResponse:
     raise TypeError(f"Unexpected state payload type for {key}: {type(raw)!r}")
 
 
-def _calculate_issue_priorities(issues: list[FinalIssue]) -> list[FinalIssue]:
-    """Order issues by their priority (already normalized to 1/2/3)."""
+def _drop_repeated_ids(issues: list[FinalIssue]) -> list[FinalIssue]:
+    """Keep the first issue of each ID (the same output can reach state twice)."""
+
+    seen: set[str] = set()
+    unique: list[FinalIssue] = []
+    for issue in issues:
+        if issue.issue_id in seen:
+            continue
+        seen.add(issue.issue_id)
+        unique.append(issue)
+    return unique
+
+
+def _load_chunks(state: dict[str, Any]) -> list[PrdChunk]:
+    raw = state.get(REVIEW_CHUNKS_STATE_KEY) or []
+    return [PrdChunk(index=int(item["index"]), start=int(item["start"]), end=int(item["end"])) for item in raw]
 
-    return sorted(issues, key=lambda item: item.priority)
+
+def _load_issues_or_error(state: dict[str, Any], key: str, errors: list[str]) -> IssuesResponse:
+    """Load one output, recording (instead of raising) why it is unusable."""
+
+    recorded = state.get(specialist_error_state_key(key))
+    if recorded:
+        errors.append(str(recorded))
+    try:
+        return load_issues_from_state(state, key)
+    except (TypeError, ValidationError) as err:
+        errors.append(f"出力形式が不正です: {err.__class__.__name__}")
+        return IssuesResponse(issues=[])
+
+
+def _collect_chunked_issues(
+    state: dict[str, Any],
+    definition: SpecialistDefinition,
+    chunks: list[PrdChunk],
+    prd_text: str,
+    errors: list[str],
+) -> list[FinalIssue]:
+    """Merge one specialist's per-chunk outputs, deduplicating overlap repeats."""
+
+    seen: set[str] = set()
+    merged: list[FinalIssue] = []
+    for chunk in chunks:
+        key = chunk_state_key(definition.state_key, chunk.index, len(chunks))
+        issues = _load_issues_or_error(state, key, errors)
+        chunk_text = chunk.text_of(prd_text)
+        for final in to_final_issues(definition.agent_key, issues):
+            dedup_key = normalize_text(final.original_text) or normalize_text(final.summary)
+            if dedup_key in seen:
+                continue
+            seen.add(dedup_key)
+            span = calculate_span(chunk_text, final.original_text)
+            if span is not None:
+                # Translate chunk-relative offsets back into the full PRD
+                final.span_start = chunk.start + span.start_index
+                final.span_end = chunk.start + span.end_index
+            merged.append(final)
+    return merged
 
 
 def aggregate_final_issues(tool_context: ToolContext) -> FinalIssuesResponse:
-    """Aggregate specialist outputs stored in state and return a typed response."""
+    """Aggregate specialist outputs stored in state and return a typed response.
+
+    A specialist whose output is missing or invalid contributes no issues and
+    is listed in ``agent_errors``; the others are aggregated as usual. Issues
+    that several specialists raised about the same point are merged into one
+    (see :func:`merge_similar_issues`), then ranked globally and cut to the
+    review's top-K and per-agent quota (see :func:`rank_issues`). Issues that
+    did not make the cut are returned separately as ``truncated_issues``.
+    """
 
     state = getattr(tool_context, "state", {}) or {}
+    chunks = _load_chunks(state)
+    prd_text = str(state.get(PRD_TEXT_STATE_KEY) or "")
+    options = RankingOptions.from_state(state.get(REVIEW_RANKING_STATE_KEY))
+    if chunks and options.top_k is None:
+        options = replace(options, top_k=CHUNKED_TOP_K)
 
     final_items: list[FinalIssue] = []
+    agent_errors: dict[str, str] = {}
     for definition in SPECIALIST_DEFINITIONS:
-        issues = _load_issues_from_state(state, AGENT_STATE_KEYS[definition.agent_key])
-        final_items.extend(_to_final_issues(definition.agent_key, issues))
-
-    prioritized = _calculate_issue_priorities(final_items)
-    response = FinalIssuesResponse(final_issues=prioritized)
-    logger.info("Aggregated final issues", count=len(prioritized))
+        errors: list[str] = []
+        if chunks:
+            final_items.extend(_collect_chunked_issues(state, definition, chunks, prd_text, errors))
+        else:
+            issues = _load_issues_or_error(state, AGENT_STATE_KEYS[definition.agent_key], errors)
+            final_items.extend(to_final_issues(definition.agent_key, issues))
+        if errors:
+            agent_errors[definition.agent_key] = errors[0]
+
+    unique = _drop_repeated_ids(merge_similar_issues(final_items, prd_text))
+    selected, truncated = rank_issues(unique, options, prd_length=len(prd_text))
+    response = FinalIssuesResponse(final_issues=selected, truncated_issues=truncated, agent_errors=agent_errors)
+    logger.info(
+        "Aggregated final issues",
+        count=len(selected),
+        truncated=len(truncated),
+        chunks=len(chunks),
+        failed_agents=len(agent_errors),
+    )
     return response
 
 
@@ -2,30 +2,65 @@
 
 import tomllib
 from collections.abc import Iterable
+from functools import lru_cache
 from pathlib import Path
 from typing import cast
 
 from google.adk.agents import LlmAgent
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.models import BaseLlm
 from pydantic import BaseModel as PydanticBaseModel
 
-from hibikasu_agent.constants.agents import ROLE_TO_DEFINITION, SpecialistDefinition
+from hibikasu_agent.agents.specialist_recovery import SpecialistRecovery
+from hibikasu_agent.agents.specialist_timing import SpecialistTimingPolicy, timed_model
+from hibikasu_agent.constants.agents import (
+    PRD_TEXT_STATE_KEY,
+    REVIEW_CHUNKS_STATE_KEY,
+    ROLE_TO_DEFINITION,
+    SpecialistDefinition,
+    chunk_agent_name,
+    chunk_state_key,
+)
 from hibikasu_agent.schemas.models import IssuesResponse
 from hibikasu_agent.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+AGENT_PROMPTS_PATH = Path(__file__).parent.parent.parent.parent / "prompts" / "agents.toml"
+
+
+@lru_cache(maxsize=4)
+def _parse_agent_prompts(path: str, mtime: float) -> dict[str, dict[str, str]]:
+    with Path(path).open("rb") as f:
+        return tomllib.load(f)
+
+
+def prompts_mtime(path: Path = AGENT_PROMPTS_PATH) -> float | None:
+    """Return the prompts file's modification time (``None`` if it is missing)."""
+
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
 
 def load_agent_prompts() -> dict[str, dict[str, str]]:
     """Load agent prompts from TOML configuration file.
 
+    The parsed file is cached and only re-read when its mtime changes, so
+    callers must treat the returned mapping as read-only.
+
     Returns:
         Dictionary mapping agent names to their prompts
     """
-    prompts_path = Path(__file__).parent.parent.parent.parent / "prompts" / "agents.toml"
+    prompts_path = AGENT_PROMPTS_PATH
 
+    mtime = prompts_mtime(prompts_path)
+    if mtime is None:
+        logger.error(f"Prompts file not found: {prompts_path}")
+        return {}
     try:
-        with prompts_path.open("rb") as f:
-            return tomllib.load(f)
+        return _parse_agent_prompts(str(prompts_path), mtime)
     except FileNotFoundError:
         logger.error(f"Prompts file not found: {prompts_path}")
         return {}
@@ -38,7 +73,7 @@ def create_specialist(  # noqa: PLR0913
     *,
     name: str,
     description: str,
-    model: str = "gemini-2.5-flash-lite",
+    model: str | BaseLlm = "gemini-2.5-flash-lite",
     instruction: str | None = None,
     system_prompt: str | None = None,
     task_prompt: str | None = None,
@@ -66,11 +101,11 @@ def create_specialist(  # noqa: PLR0913
         logger.warning(f"Empty instruction for specialist agent; name={name}")
 
     # ログ出力：エージェントに送信されるインストラクション
-    logger.info(
+    logger.debug(
         f"Creating specialist agent - name: {name}, model: {model}, "
         f"instruction_length: {len(final_instruction)}, output_key: {output_key}"
     )
-    logger.info(f"Agent {name} instruction preview: {final_instruction[:200]}...")
+    logger.debug(f"Agent {name} instruction preview: {final_instruction[:200]}...")
 
     # Call with explicit arguments to satisfy static typing (no **kwargs dict)
     if output_schema is not None and output_key is not None:
@@ -106,35 +141,94 @@ def create_specialist(  # noqa: PLR0913
             instruction=final_instruction,
         )
 
-    logger.info("Specialist Agent created", name=name, model=model)
+    logger.debug("Specialist Agent created", name=name, model=model)
     return agent
 
 
 def create_specialist_from_definition(
     definition: SpecialistDefinition,
     *,
-    model: str = "gemini-2.5-flash-lite",
+    model: str | BaseLlm = "gemini-2.5-flash-lite",
+    timing: SpecialistTimingPolicy | None = None,
 ) -> LlmAgent:
-    """Create a specialist agent using a shared configuration entry."""
+    """Create a specialist agent using a shared configuration entry.
+
+    ``timing`` adds the role's deadline (and optional hedging) to its model calls.
+    """
 
     prompts = load_agent_prompts()
     role_cfg = prompts.get(definition.role, {})
     instruction = (role_cfg.get("instruction_review") or "").strip()
+    # Repairs and re-runs go through the same deadline (and hedging) as the first call
+    specialist_model = timed_model(model, definition.role, timing)
 
-    return create_specialist(
+    agent = create_specialist(
         name=definition.agent_key,
         description=definition.review_description,
-        model=model,
+        model=specialist_model,
         instruction=instruction,
         output_schema=cast(type[PydanticBaseModel], IssuesResponse),
         output_key=definition.state_key,
     )
+    # A failing specialist degrades to "no issues" instead of failing the whole review
+    recovery = SpecialistRecovery(model=specialist_model, output_key=definition.state_key)
+    agent.after_model_callback = recovery.after_model
+    agent.on_model_error_callback = recovery.on_model_error
+    return agent
+
+
+def create_chunk_specialist_from_definition(
+    definition: SpecialistDefinition,
+    *,
+    chunk_index: int,
+    chunk_count: int,
+    model: str | BaseLlm = "gemini-2.5-flash-lite",
+    timing: SpecialistTimingPolicy | None = None,
+) -> LlmAgent:
+    """Create a specialist that reviews a single PRD chunk in chunked mode.
+
+    The chunk text is read from session state at request time (the chunk plan
+    under ``REVIEW_CHUNKS_STATE_KEY`` and the full PRD under
+    ``PRD_TEXT_STATE_KEY``), so the agent itself does not depend on the PRD.
+    Conversation contents are not included: the chunk is the only input.
+    """
+
+    prompts = load_agent_prompts()
+    role_cfg = prompts.get(definition.role, {})
+    base_instruction = (role_cfg.get("instruction_review") or "").strip()
+
+    def _instruction(ctx: ReadonlyContext) -> str:
+        prd_text = str(ctx.state.get(PRD_TEXT_STATE_KEY) or "")
+        chunks = ctx.state.get(REVIEW_CHUNKS_STATE_KEY) or []
+        chunk = chunks[chunk_index] if chunk_index < len(chunks) else {"start": 0, "end": len(prd_text)}
+        chunk_text = prd_text[int(chunk["start"]) : int(chunk["end"])]
+        return (
+            f"{base_instruction}\n\n"
+            f"【レビュー対象】以下は長いPRDを分割したチャンク {chunk_index + 1}/{chunk_count} です。"
+            "このチャンク内の記述のみを対象に指摘し、original_text はチャンク本文から引用してください。\n"
+            f"---\n{chunk_text}\n---"
+        )
+
+    output_key = chunk_state_key(definition.state_key, chunk_index, chunk_count)
+    specialist_model = timed_model(model, definition.role, timing)
+    recovery = SpecialistRecovery(model=specialist_model, output_key=output_key)
+    return LlmAgent(
+        name=chunk_agent_name(definition.agent_key, chunk_index),
+        model=specialist_model,
+        description=definition.review_description,
+        instruction=_instruction,
+        include_contents="none",
+        output_schema=cast(type[PydanticBaseModel], IssuesResponse),
+        output_key=output_key,
+        after_model_callback=recovery.after_model,
+        on_model_error_callback=recovery.on_model_error,
+    )
 
 
 def create_specialist_for_role(
     role: str,
     *,
-    model: str = "gemini-2.5-flash-lite",
+    model: str | BaseLlm = "gemini-2.5-flash-lite",
 ) -> LlmAgent:
     """Convenience wrapper that builds a specialist from a role identifier."""
 
@@ -148,17 +242,18 @@ def create_specialist_for_role(
 def create_specialists_from_config(
     definitions: Iterable[SpecialistDefinition],
     *,
-    model: str = "gemini-2.5-flash-lite",
+    model: str | BaseLlm = "gemini-2.5-flash-lite",
+    timing: SpecialistTimingPolicy | None = None,
 ) -> list[LlmAgent]:
     """Build review specialists from shared configuration entries."""
 
-    return [create_specialist_from_definition(definition, model=model) for definition in definitions]
+    return [create_specialist_from_definition(definition, model=model, timing=timing) for definition in definitions]
 
 
 def create_role_agents(
     role_key: str,
     *,
-    model: str = "gemini-2.5-flash-lite",
+    model: str | BaseLlm = "gemini-2.5-flash-lite",
     review_output_key: str,
     name_prefix: str | None = None,
 ) -> tuple[LlmAgent, LlmAgent]:
@@ -0,0 +1,195 @@
+"""Per-specialist recovery from invalid structured output and model errors."""
+
+from __future__ import annotations
+
+import re
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.models.registry import LLMRegistry
+from google.genai import types as genai_types
+from pydantic import ValidationError
+
+from hibikasu_agent.agents.model_usage import UsageMetadata, sum_usage
+from hibikasu_agent.agents.specialist_timing import SpecialistDeadlineExceeded
+from hibikasu_agent.constants.agents import specialist_error_state_key
+from hibikasu_agent.schemas.models import IssuesResponse
+from hibikasu_agent.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Extra model calls one specialist may spend on repairs or re-runs before giving up
+SPECIALIST_MAX_RECOVERY_ATTEMPTS = 2
+
+_REPAIR_INPUT_MAX_CHARS = 20_000
+_EMPTY_ISSUES_JSON = '{"issues": []}'
+_JSON_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*(?P<body>.*?)\s*```\s*$", re.DOTALL)
+
+
+def _response_text(response: LlmResponse) -> str:
+    if not response.content or not response.content.parts:
+        return ""
+    return "".join(part.text for part in response.content.parts if part.text and not part.thought)
+
+
+def _validation_error(text: str) -> str | None:
+    """Return why ``text`` is not a valid ``IssuesResponse`` (``None`` when it is)."""
+
+    match = _JSON_FENCE_RE.match(text)
+    try:
+        IssuesResponse.model_validate_json(match.group("body") if match else text)
+    except ValidationError as err:
+        return "; ".join(f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in err.errors()[:5])
+    return None
+
+
+def _text_response(text: str, usage: UsageMetadata | None = None) -> LlmResponse:
+    """Replacement response; ``usage`` carries the tokens of every call made to produce it."""
+
+    return LlmResponse(
+        content=genai_types.Content(role="model", parts=[genai_types.Part(text=text)]), usage_metadata=usage
+    )
+
+
+class SpecialistRecovery:
+    """``after_model`` / ``on_model_error`` callbacks isolating one specialist's failures.
+
+    Output that does not match ``IssuesResponse`` is sent back to the model
+    with a short repair prompt (the invalid JSON and the validation errors
+    only, without the PRD or instruction). A model error that survived the
+    HTTP-level retries re-runs the original request. Both are bounded by
+    ``max_attempts`` and use the specialist's (timed) model, so a missed
+    deadline, on the first call or during recovery, gives up right away.
+    Once they run out the specialist reports no issues and the reason is stored
+    under :func:`specialist_error_state_key`, so the other specialists'
+    results still make it into the review.
+    """
+
+    def __init__(
+        self,
+        *,
+        model: str | BaseLlm,
+        output_key: str,
+        max_attempts: int = SPECIALIST_MAX_RECOVERY_ATTEMPTS,
+    ) -> None:
+        self._model = model
+        self._llm: BaseLlm | None = model if isinstance(model, BaseLlm) else None
+        self._output_key = output_key
+        self._max_attempts = max(0, max_attempts)
+
+    async def after_model(self, callback_context: CallbackContext, llm_response: LlmResponse) -> LlmResponse | None:
+        if llm_response.partial or llm_response.error_code:
+            return None
+        text = _response_text(llm_response)
+        if not text.strip():
+            return None
+        error = _validation_error(text)
+        if error is None:
+            return None
+        logger.warning("specialist output failed validation", extra={"output_key": self._output_key, "error": error})
+        # The replacement response also reports the tokens of the invalid first answer
+        return await self._repair(callback_context, text, error, usage=llm_response.usage_metadata)
+
+    async def on_model_error(
+        self, callback_context: CallbackContext, llm_request: LlmRequest, error: Exception
+    ) -> LlmResponse | None:
+        if isinstance(error, SpecialistDeadlineExceeded):
+            # Re-running would only extend the review further past the deadline
+            return self._give_up_after_deadline(callback_context, error)
+        logger.warning("specialist model call failed", extra={"output_key": self._output_key, "error": str(error)})
+        reason = f"{error.__class__.__name__}: {error}"
+        usage: UsageMetadata | None = None
+        for attempt in range(self._max_attempts):
+            try:
+                response = await self._generate(llm_request)
+            except SpecialistDeadlineExceeded as err:
+                return self._give_up_after_deadline(callback_context, err, usage=usage)
+            except Exception as err:  # nosec B110
+                reason = f"{err.__class__.__name__}: {err}"
+                logger.warning(
+                    "specialist re-run failed",
+                    extra={"output_key": self._output_key, "attempt": attempt + 1, "error": reason},
+                )
+                continue
+            usage = sum_usage(usage, response.usage_metadata)
+            text = _response_text(response)
+            validation_error = _validation_error(text)
+            if validation_error is None:
+                return _text_response(text, usage)
+            return await self._repair(callback_context, text, validation_error, spent=attempt + 1, usage=usage)
+        return self._give_up(callback_context, reason, usage=usage)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+
+    async def _repair(
+        self,
+        callback_context: CallbackContext,
+        text: str,
+        error: str,
+        *,
+        spent: int = 0,
+        usage: UsageMetadata | None = None,
+    ) -> LlmResponse:
+        for attempt in range(spent, self._max_attempts):
+            try:
+                response = await self._generate(self._repair_request(text, error))
+            except SpecialistDeadlineExceeded as err:
+                return self._give_up_after_deadline(callback_context, err, usage=usage)
+            except Exception as err:  # nosec B110
+                error = f"{err.__class__.__name__}: {err}"
+                continue
+            usage = sum_usage(usage, response.usage_metadata)
+            repaired = _response_text(response)
+            repaired_error = _validation_error(repaired)
+            if repaired_error is None:
+                logger.info("specialist output repaired", extra={"output_key": self._output_key, "attempt": attempt})
+                return _text_response(repaired, usage)
+            text, error = repaired or text, repaired_error
+        return self._give_up(callback_context, f"出力形式が不正です: {error}", usage=usage)
+
+    def _repair_request(self, text: str, error: str) -> LlmRequest:
+        prompt = (
+            "次のJSONはスキーマに適合しませんでした。指摘の内容は変えずに、スキーマに適合するJSONのみを出力してください。\n"
+            f"検証エラー: {error}\n"
+            f"---\n{text[:_REPAIR_INPUT_MAX_CHARS]}\n---"
+        )
+        return LlmRequest(
+            model=self._resolve_llm().model,
+            contents=[genai_types.Content(role="user", parts=[genai_types.Part(text=prompt)])],
+            config=genai_types.GenerateContentConfig(
+                response_mime_type="application/json", response_schema=IssuesResponse
+            ),
+        )
+
+    async def _generate(self, llm_request: LlmRequest) -> LlmResponse:
+        final: LlmResponse | None = None
+        async for response in self._resolve_llm().generate_content_async(llm_request, stream=False):
+            final = response
+        if final is None or final.error_code:
+            raise RuntimeError(final.error_message if final else "empty model response")
+        return final
+
+    def _give_up(
+        self, callback_context: CallbackContext, reason: str, *, usage: UsageMetadata | None = None
+    ) -> LlmResponse:
+        logger.error("specialist gave up", extra={"output_key": self._output_key, "reason": reason})
+        callback_context.state[specialist_error_state_key(self._output_key)] = reason[:500]
+        return _text_response(_EMPTY_ISSUES_JSON, usage)
+
+    def _give_up_after_deadline(
+        self,
+        callback_context: CallbackContext,
+        error: SpecialistDeadlineExceeded,
+        *,
+        usage: UsageMetadata | None = None,
+    ) -> LlmResponse:
+        reason = f"制限時間（{error.timeout_seconds:g}秒）を超えたため打ち切りました"
+        return self._give_up(callback_context, reason, usage=usage)
+
+    def _resolve_llm(self) -> BaseLlm:
+        if self._llm is None:
+            self._llm = LLMRegistry.new_llm(str(self._model))
+        return self._llm
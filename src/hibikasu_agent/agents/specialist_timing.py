@@ -0,0 +1,241 @@
+"""Per-specialist deadlines and hedged model requests to cut review tail latency."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import math
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import AsyncGenerator, Mapping
+from dataclasses import dataclass, field
+
+from google.adk.models import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.models.registry import LLMRegistry
+from opentelemetry import trace
+from pydantic import ConfigDict
+
+from hibikasu_agent.agents.model_usage import UsageMetadata, call_usage, with_extra_usage
+from hibikasu_agent.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class SpecialistDeadlineExceeded(TimeoutError):
+    """A specialist's model call ran past its deadline and was abandoned."""
+
+    def __init__(self, role: str, timeout_seconds: float) -> None:
+        super().__init__(f"{role} exceeded its {timeout_seconds:g}s deadline")
+        self.role = role
+        self.timeout_seconds = timeout_seconds
+
+
+class LatencyTracker:
+    """Rolling window of model-call latencies per specialist role, plus hedge/deadline counters."""
+
+    def __init__(self, *, window: int = 200, min_samples: int = 20) -> None:
+        self._window = max(1, window)
+        self._min_samples = max(1, min_samples)
+        self._samples: dict[str, deque[float]] = {}
+        self._counters: Counter[tuple[str, str]] = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, role: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(role, deque(maxlen=self._window)).append(seconds)
+
+    def quantile(self, role: str, q: float) -> float | None:
+        """Nearest-rank quantile of recent latencies (``None`` until enough samples exist)."""
+
+        with self._lock:
+            samples = sorted(self._samples.get(role, ()))
+        if len(samples) < self._min_samples:
+            return None
+        rank = min(len(samples), max(1, math.ceil(q * len(samples))))
+        return samples[rank - 1]
+
+    def count(self, role: str, counter: str) -> None:
+        with self._lock:
+            self._counters[(role, counter)] += 1
+
+    def counters(self) -> dict[tuple[str, str], int]:
+        """``{(role, counter): value}`` for hedges_fired / hedges_won / deadlines_exceeded."""
+
+        with self._lock:
+            return dict(self._counters)
+
+
+@dataclass(frozen=True)
+class SpecialistTimingPolicy:
+    """Deadlines (default and per role) and optional hedging for specialist model calls.
+
+    With ``hedge`` enabled a duplicate request is sent once the primary has
+    been running longer than the role's ``hedge_quantile`` latency, and
+    whichever response arrives first is used. Deadlines apply to unary and
+    streaming calls alike; hedging only applies to unary calls, since two
+    partially delivered streams cannot be swapped midway.
+    """
+
+    timeout_seconds: float | None = None
+    role_timeout_seconds: Mapping[str, float] = field(default_factory=dict)
+    hedge: bool = False
+    hedge_quantile: float = 0.9
+    hedge_min_delay_seconds: float = 1.0
+    tracker: LatencyTracker = field(default_factory=LatencyTracker)
+
+    @property
+    def enabled(self) -> bool:
+        return self.hedge or bool(self.timeout_seconds) or bool(self.role_timeout_seconds)
+
+    def timeout_for(self, role: str) -> float | None:
+        timeout = self.role_timeout_seconds.get(role, self.timeout_seconds)
+        return timeout if timeout and timeout > 0 else None
+
+    def hedge_delay_for(self, role: str) -> float | None:
+        if not self.hedge:
+            return None
+        threshold = self.tracker.quantile(role, self.hedge_quantile)
+        return None if threshold is None else max(self.hedge_min_delay_seconds, threshold)
+
+
+def parse_role_timeouts(raw: str | None) -> dict[str, float]:
+    """Parse ``"engineer=90,pm=60"`` into ``{"engineer": 90.0, "pm": 60.0}`` (invalid entries are skipped)."""
+
+    timeouts: dict[str, float] = {}
+    for item in (raw or "").split(","):
+        role, sep, value = item.partition("=")
+        if not sep:
+            continue
+        try:
+            timeouts[role.strip()] = float(value)
+        except ValueError:
+            logger.warning("ignoring invalid specialist timeout", extra={"entry": item})
+    return timeouts
+
+
+class TimedLlm(BaseLlm):
+    """Wraps a specialist's model with its deadline and hedging policy.
+
+    A deadline miss raises :class:`SpecialistDeadlineExceeded`, which the
+    specialist's ``on_model_error`` callback turns into "no issues" so the
+    rest of the pipeline is aggregated without waiting any longer.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    inner: BaseLlm
+    role: str
+    policy: SpecialistTimingPolicy
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        timeout = self.policy.timeout_for(self.role)
+        if stream:
+            async for response in self._stream(llm_request, timeout):
+                yield response
+            return
+        try:
+            responses = await asyncio.wait_for(self._first_completed(llm_request), timeout=timeout)
+        except TimeoutError as err:
+            raise self._deadline_exceeded(timeout) from err
+        for response in responses:
+            yield response
+
+    async def _stream(self, llm_request: LlmRequest, timeout: float | None) -> AsyncGenerator[LlmResponse, None]:
+        """Pass a streamed response through, abandoning it once the deadline has passed between chunks."""
+
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        started = time.perf_counter()
+        chunks = self.inner.generate_content_async(llm_request, stream=True)
+        try:
+            while True:
+                remaining = None if deadline is None else max(0.0, deadline - loop.time())
+                try:
+                    response = await asyncio.wait_for(anext(chunks), timeout=remaining)
+                except StopAsyncIteration:
+                    break
+                except TimeoutError as err:
+                    raise self._deadline_exceeded(timeout) from err
+                yield response
+        finally:
+            await chunks.aclose()
+        self.policy.tracker.record(self.role, time.perf_counter() - started)
+
+    def _deadline_exceeded(self, timeout: float | None) -> SpecialistDeadlineExceeded:
+        self.policy.tracker.count(self.role, "deadlines_exceeded")
+        logger.warning("specialist deadline exceeded", extra={"role": self.role, "timeout_seconds": timeout})
+        return SpecialistDeadlineExceeded(self.role, timeout or 0.0)
+
+    async def _collect(self, llm_request: LlmRequest) -> list[LlmResponse]:
+        started = time.perf_counter()
+        responses = [response async for response in self.inner.generate_content_async(llm_request, stream=False)]
+        self.policy.tracker.record(self.role, time.perf_counter() - started)
+        return responses
+
+    async def _first_completed(self, llm_request: LlmRequest) -> list[LlmResponse]:
+        primary = asyncio.ensure_future(self._collect(llm_request))
+        delay = self.policy.hedge_delay_for(self.role)
+        if delay is None:
+            return await primary
+        tasks: set[asyncio.Future[list[LlmResponse]]] = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return primary.result()
+            # The primary is slower than usual: race a duplicate request against it
+            self.policy.tracker.count(self.role, "hedges_fired")
+            trace.get_current_span().add_event("hedge_fired", {"role": self.role, "delay_seconds": delay})
+            hedge = asyncio.ensure_future(self._collect(llm_request.model_copy(deep=True)))
+            tasks.add(hedge)
+            error: BaseException | None = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    if task is hedge:
+                        self.policy.tracker.count(self.role, "hedges_won")
+                        trace.get_current_span().add_event("hedge_won", {"role": self.role})
+                    responses = task.result()
+                    loser = primary if task is hedge else hedge
+                    return with_extra_usage(responses, _losing_hedge_usage(loser, responses))
+            raise error or RuntimeError("hedged model call returned no response")
+        finally:
+            for task in tasks:
+                task.cancel()
+            for task in tasks:
+                with contextlib.suppress(BaseException):
+                    await task
+
+
+def _losing_hedge_usage(loser: asyncio.Future[list[LlmResponse]], winner: list[LlmResponse]) -> UsageMetadata | None:
+    """Tokens spent on the request that lost the race, to be reported with the winner.
+
+    A loser that finished reports its own usage. One that is still running
+    is about to be cancelled; the provider already processed the same
+    prompt, so the winner's prompt tokens are counted (its partial output
+    is unknown and left out). A loser that failed is not counted.
+    """
+
+    if loser.done():
+        if loser.cancelled() or loser.exception() is not None:
+            return None
+        return call_usage(loser.result())
+    usage = call_usage(winner)
+    prompt = usage.prompt_token_count if usage is not None else None
+    return UsageMetadata(prompt_token_count=prompt, total_token_count=prompt) if prompt else None
+
+
+def timed_model(model: str | BaseLlm, role: str, policy: SpecialistTimingPolicy | None) -> str | BaseLlm:
+    """Apply ``policy`` to a specialist's model (unchanged when the policy is off)."""
+
+    if policy is None or not policy.enabled:
+        return model
+    inner = model if isinstance(model, BaseLlm) else LLMRegistry.new_llm(model)
+    return TimedLlm(model=inner.model, inner=inner, role=role, policy=policy)
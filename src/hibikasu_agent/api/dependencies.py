@@ -4,9 +4,14 @@ import os
 
 from fastapi import Request
 
+from hibikasu_agent.core.config import settings
 from hibikasu_agent.services.ai_service import AiService
 from hibikasu_agent.services.base import AbstractReviewService
 from hibikasu_agent.services.mock_service import MockService
+from hibikasu_agent.services.review_events import ReviewEventBroker
+from hibikasu_agent.services.review_executor import ReviewExecutor
+from hibikasu_agent.services.review_jobs import ReviewJobWorker
+from hibikasu_agent.services.review_scheduler import ReviewScheduler
 
 
 def _use_ai_mode() -> bool:
@@ -32,6 +37,46 @@ def get_review_service(request: Request) -> AbstractReviewService:
     # Default: Mock mode
     svc = getattr(app.state, "mock_service", None)
     if not isinstance(svc, MockService):
-        svc = MockService()
+        svc = MockService(event_broker=get_review_event_broker(request))
         app.state.mock_service = svc
     return svc
+
+
+def get_review_executor(request: Request) -> ReviewExecutor:
+    """Provide the executor that runs reviews on the server event loop."""
+    app = request.app
+    executor = getattr(app.state, "review_executor", None)
+    if not isinstance(executor, ReviewExecutor):
+        executor = ReviewExecutor(max_concurrency=settings.max_concurrent_reviews)
+        app.state.review_executor = executor
+    return executor
+
+
+def get_review_scheduler(request: Request) -> ReviewScheduler:
+    """Provide the scheduler that admits and queues review jobs."""
+    app = request.app
+    scheduler = getattr(app.state, "review_scheduler", None)
+    if not isinstance(scheduler, ReviewScheduler):
+        scheduler = ReviewScheduler(
+            get_review_executor(request),
+            max_queued=settings.max_queued_reviews,
+            max_queued_per_tenant=settings.max_queued_reviews_per_tenant,
+        )
+        app.state.review_scheduler = scheduler
+    return scheduler
+
+
+def get_review_event_broker(request: Request) -> ReviewEventBroker:
+    """Provide the pub/sub broker feeding review progress SSE streams."""
+    app = request.app
+    broker = getattr(app.state, "review_event_broker", None)
+    if not isinstance(broker, ReviewEventBroker):
+        broker = ReviewEventBroker()
+        app.state.review_event_broker = broker
+    return broker
+
+
+def get_review_job_worker(request: Request) -> ReviewJobWorker | None:
+    """Provide the shared-queue worker (``None`` when reviews run only in this process)."""
+    worker = getattr(request.app.state, "review_job_worker", None)
+    return worker if isinstance(worker, ReviewJobWorker) else None
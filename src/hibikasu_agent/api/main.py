@@ -5,29 +5,147 @@ from typing import Any
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from google.genai import types as genai_types
 
+from hibikasu_agent.agents.parallel_orchestrator.issue_ranking import RankingOptions, parse_agent_weights
+from hibikasu_agent.agents.specialist_timing import SpecialistTimingPolicy, parse_role_timeouts
 from hibikasu_agent.api.dependencies import _use_ai_mode
+from hibikasu_agent.api.routers.metrics import router as metrics_router
 from hibikasu_agent.api.routers.reviews import router as reviews_router
 from hibikasu_agent.core.config import settings
 from hibikasu_agent.services.ai_service import AiService
 from hibikasu_agent.services.providers.adk import ADKService
+from hibikasu_agent.services.providers.shared_session_service import SharedStateSessionService
+from hibikasu_agent.services.review_cache import ReviewResultCache
+from hibikasu_agent.services.review_events import ReviewEventBroker
+from hibikasu_agent.services.review_executor import ReviewExecutor
+from hibikasu_agent.services.review_jobs import ReviewJobQueue, ReviewJobWorker
+from hibikasu_agent.services.review_scheduler import ReviewScheduler
+from hibikasu_agent.services.review_store import create_review_session_store
+from hibikasu_agent.services.shared_state import create_redis_client, create_shared_state_backend
+from hibikasu_agent.services.token_accounting import TokenPricing, parse_model_prices
 from hibikasu_agent.utils.logging_config import get_logger, setup_application_logging
+from hibikasu_agent.utils.tracing import setup_tracing, shutdown_tracing
 
 logger = get_logger(__name__)
 
 
+def _specialist_retry_options() -> genai_types.HttpRetryOptions | None:
+    if settings.specialist_max_attempts <= 1:
+        return None
+    return genai_types.HttpRetryOptions(
+        attempts=settings.specialist_max_attempts,
+        initial_delay=settings.specialist_retry_initial_delay_seconds,
+        max_delay=settings.specialist_retry_max_delay_seconds,
+    )
+
+
 # App assembly only; routers hold handlers
 @asynccontextmanager
 async def lifespan(app: FastAPI):  # type: ignore[no-untyped-def]
     # Configure application/package logging
     setup_application_logging(settings.hibikasu_log_level)
+    # One trace per review (request → queue wait → pipeline → specialist LLM calls → mapping)
+    setup_tracing(settings.tracing_exporter, file_path=settings.tracing_file_path)
+
+    # Reviews run as tasks on this loop; the executor caps their concurrency and
+    # the scheduler queues the overflow fairly across tenants
+    review_executor = ReviewExecutor(max_concurrency=settings.max_concurrent_reviews)
+    app.state.review_executor = review_executor
+    app.state.review_scheduler = ReviewScheduler(
+        review_executor,
+        max_queued=settings.max_queued_reviews,
+        max_queued_per_tenant=settings.max_queued_reviews_per_tenant,
+    )
+    # Progress deltas are pushed to SSE subscribers instead of being polled
+    review_event_broker = ReviewEventBroker()
+    app.state.review_event_broker = review_event_broker
 
     # Initialize ADK provider once if running in AI mode
+    review_job_worker: ReviewJobWorker | None = None
     if _use_ai_mode():
         try:
-            adk_service = ADKService()
+            # sqlite/redis share sessions, jobs and dialog history across workers; memory is single-process
+            redis_client = create_redis_client(settings.redis_url) if settings.review_store_backend == "redis" else None
+            shared_state = create_shared_state_backend(
+                settings.review_store_backend, db_path=settings.review_store_db_path, redis_client=redis_client
+            )
+            dialog_session_service = (
+                SharedStateSessionService(shared_state, ttl_seconds=settings.dialog_session_ttl_seconds)
+                if shared_state is not None
+                else None
+            )
+            agent_weights = parse_agent_weights(settings.issue_agent_weights)
+            adk_service = ADKService(
+                chunk_threshold_chars=settings.review_chunk_threshold_chars,
+                chunk_max_chars=settings.review_chunk_max_chars,
+                chunk_overlap_chars=settings.review_chunk_overlap_chars,
+                dialog_idle_ttl_seconds=settings.dialog_session_ttl_seconds,
+                dialog_max_history_tokens=settings.dialog_max_history_tokens,
+                dialog_direct_routing=settings.dialog_direct_routing,
+                dialog_session_service=dialog_session_service,
+                specialist_retry_options=_specialist_retry_options(),
+                specialist_timing=SpecialistTimingPolicy(
+                    timeout_seconds=settings.specialist_timeout_seconds or None,
+                    role_timeout_seconds=parse_role_timeouts(settings.specialist_role_timeouts),
+                    hedge=settings.specialist_hedging,
+                    hedge_quantile=settings.specialist_hedge_percentile / 100,
+                ),
+                issue_ranking=RankingOptions(
+                    top_k=settings.issue_top_k or None,
+                    per_agent_quota=settings.issues_per_agent or None,
+                    agent_weights=agent_weights,
+                ),
+            )
             app.state.adk_service = adk_service
-            app.state.ai_service = AiService(adk_service=adk_service)
+            review_cache = None
+            if settings.review_cache_enabled:
+                review_cache = ReviewResultCache(
+                    max_entries=settings.review_cache_max_entries,
+                    ttl_seconds=settings.review_cache_ttl_seconds,
+                    db_path=settings.review_cache_db_path,
+                )
+            review_store = create_review_session_store(
+                settings.review_store_backend,
+                db_path=settings.review_store_db_path,
+                redis_client=redis_client,
+                ttl_seconds=settings.review_session_ttl_seconds,
+                max_sessions=settings.review_store_max_sessions,
+                max_total_chars=settings.review_store_max_chars,
+            )
+            job_queue: ReviewJobQueue | None = None
+            if shared_state is not None:
+                # Jobs are claimed under leases so any worker can run them and crashed runs are retried
+                job_queue = ReviewJobQueue(
+                    shared_state,
+                    lease_seconds=settings.review_job_lease_seconds,
+                    max_queued=settings.max_queued_reviews,
+                    max_queued_per_tenant=settings.max_queued_reviews_per_tenant,
+                    max_attempts=settings.review_job_max_attempts,
+                    retention_seconds=settings.review_session_ttl_seconds,
+                )
+            ai_service = AiService(
+                adk_service=adk_service,
+                review_store=review_store,
+                review_cache=review_cache,
+                event_broker=review_event_broker,
+                on_phase_change=job_queue.record_phase if job_queue is not None else None,
+                token_pricing=TokenPricing(parse_model_prices(settings.model_prices)),
+                agent_weights=agent_weights,
+            )
+            app.state.ai_service = ai_service
+            if job_queue is not None:
+                # Reviews orphaned by a crashed/restarted worker are queued again before claiming starts;
+                # sessions younger than a lease may still be enqueued by the worker that accepted them
+                job_queue.recover(ai_service.unfinished_review_ids(min_age_seconds=job_queue.lease_seconds))
+                review_job_worker = ReviewJobWorker(
+                    job_queue,
+                    review_executor,
+                    ai_service.kickoff_review_async,
+                    on_give_up=ai_service.abandon_review,
+                )
+                review_job_worker.start()
+                app.state.review_job_worker = review_job_worker
             logger.info("ADKService and AiService initialized in app.state")
         except Exception as err:  # nosec B110
             # Do not crash app; requests will see failure when trying to use AI mode
@@ -35,6 +153,11 @@ async def lifespan(app: FastAPI):  # type: ignore[no-untyped-def]
 
     yield
 
+    if review_job_worker is not None:
+        await review_job_worker.stop()
+    await review_executor.shutdown()
+    shutdown_tracing()
+
 
 app: Any = FastAPI(title="Hibikasu PRD Reviewer API", version="0.1.0", lifespan=lifespan)
 
@@ -49,3 +172,4 @@ app.add_middleware(
 
 # Routers
 app.include_router(reviews_router)
+app.include_router(metrics_router)
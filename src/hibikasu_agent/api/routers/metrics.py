@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from hibikasu_agent.services.ai_service import AiService
+from hibikasu_agent.services.review_executor import ReviewExecutor
+from hibikasu_agent.services.review_jobs import ReviewJobWorker
+from hibikasu_agent.services.review_scheduler import ReviewScheduler
+from hibikasu_agent.utils.logging_config import get_logger
+from hibikasu_agent.utils.metrics import REGISTRY, Counter, Gauge
+
+router = APIRouter()
+logger = get_logger(__name__)
+
+_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _runtime_metrics(state: Any) -> list[Gauge | Counter]:
+    """Gauges read from the live scheduler/executor/store at scrape time."""
+
+    queue_depth = Gauge("hibikasu_review_queue_depth", "Reviews waiting for a free slot.", ("queue",))
+    in_flight = Gauge("hibikasu_reviews_in_flight", "Reviews currently executing in this worker.")
+    store_sessions = Gauge("hibikasu_review_store_sessions", "Review sessions held by the session store.")
+    store_chars = Gauge(
+        "hibikasu_review_store_chars", "Approximate characters held by the session store (memory estimate)."
+    )
+    hedges = Counter(
+        "hibikasu_specialist_timing_events_total",
+        "Specialist hedged requests fired/won and deadlines exceeded.",
+        ("role", "event"),
+    )
+
+    scheduler = getattr(state, "review_scheduler", None)
+    if isinstance(scheduler, ReviewScheduler):
+        queue_depth.set(scheduler.queue_depth, queue="local")
+    worker = getattr(state, "review_job_worker", None)
+    if isinstance(worker, ReviewJobWorker):
+        queue_depth.set(sum(1 for job in worker.queue.jobs() if job.state == "queued"), queue="shared")
+    executor = getattr(state, "review_executor", None)
+    if isinstance(executor, ReviewExecutor):
+        in_flight.set(executor.in_flight)
+    ai_service = getattr(state, "ai_service", None)
+    if isinstance(ai_service, AiService):
+        sessions, chars = ai_service.store_stats()
+        store_sessions.set(sessions)
+        if chars is not None:
+            store_chars.set(chars)
+        timing = getattr(ai_service.adk_service, "specialist_timing", None)
+        if timing is not None:
+            for (role, event), value in timing.tracker.counters().items():
+                hedges.inc(value, role=role, event=event)
+    return [queue_depth, in_flight, store_sessions, store_chars, hedges]
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(request: Request) -> PlainTextResponse:
+    """Prometheus text exposition of review latency, throughput and failure metrics."""
+
+    try:
+        extra = _runtime_metrics(request.app.state)
+    except Exception as err:  # nosec B110
+        # Counters/histograms are still worth serving when a runtime component is unavailable
+        logger.warning("failed to collect runtime metrics", extra={"error": str(err)})
+        extra = []
+    return PlainTextResponse(REGISTRY.render(extra), media_type=_CONTENT_TYPE)
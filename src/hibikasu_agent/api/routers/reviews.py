@@ -1,50 +1,191 @@
 from __future__ import annotations
 
-from typing import Any
+import json
+import time
+from collections.abc import AsyncIterator
+from typing import Any, Literal
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 
-from hibikasu_agent.api.dependencies import get_review_service
+from hibikasu_agent.api.dependencies import (
+    get_review_event_broker,
+    get_review_job_worker,
+    get_review_scheduler,
+    get_review_service,
+)
 from hibikasu_agent.api.schemas.reviews import (
     AgentRole,
     ApplySuggestionResponse,
     DialogRequest,
     DialogResponse,
+    IssueListResponse,
     ReviewRequest,
     ReviewResponse,
     ReviewSummaryResponse,
     StatusResponse,
     SuggestResponse,
+    TruncatedIssuesResponse,
     UpdateStatusRequest,
     UpdateStatusResponse,
 )
 from hibikasu_agent.constants.agents import SPECIALIST_DEFINITIONS
+from hibikasu_agent.core.config import settings
 from hibikasu_agent.services.base import AbstractReviewService
+from hibikasu_agent.services.issue_listing import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    paginate,
+    parse_fields,
+    project_issue,
+)
+from hibikasu_agent.services.review_events import (
+    TERMINAL_EVENTS,
+    ReviewEvent,
+    ReviewEventBroker,
+)
+from hibikasu_agent.services.review_jobs import ReviewJobWorker
+from hibikasu_agent.services.review_scheduler import DEFAULT_TENANT, QueueFullError, ReviewScheduler
 from hibikasu_agent.utils.logging_config import get_logger
+from hibikasu_agent.utils.tracing import record_span
 
 router = APIRouter()
 logger = get_logger(__name__)
 
+# Reconnect delay suggested to EventSource clients
+_SSE_RETRY_MS = 3000
+# Clients may keep the status but must revalidate it (If-None-Match) before reuse
+_CACHE_CONTROL = "no-cache"
+# Long polls re-read the version this often to notice changes made without a local event
+_LONG_POLL_RECHECK_SECONDS = 1.0
+
+
+def _parse_event_id(raw: str | None) -> int | None:
+    try:
+        return int((raw or "").strip())
+    except ValueError:
+        return None
+
 
 @router.post("/reviews", response_model=ReviewResponse)
 async def start_review(
     req: ReviewRequest,
-    background_tasks: BackgroundTasks,
     service: AbstractReviewService = Depends(get_review_service),
+    scheduler: ReviewScheduler = Depends(get_review_scheduler),
+    job_worker: ReviewJobWorker | None = Depends(get_review_job_worker),
+    x_tenant_id: str | None = Header(default=None),
 ) -> ReviewResponse:
+    received_at = time.time()
+    tenant = (x_tenant_id or "").strip() or DEFAULT_TENANT
+    # 0) キューが溢れている場合はセッションを作らずに拒否（Retry-After で再試行時刻を通知）
+    try:
+        if job_worker is not None:
+            job_worker.queue.check_admission(tenant)
+        else:
+            scheduler.check_admission(tenant)
+    except QueueFullError as err:
+        logger.warning("start_review rejected", extra={"tenant": tenant, "status_code": err.status_code})
+        raise HTTPException(
+            status_code=err.status_code, detail=str(err), headers={"Retry-After": str(err.retry_after)}
+        ) from err
     # 1) セッションだけ先に作成（同期）
-    review_id = service.new_review_session(req.prd_text, req.panel_type, selected_agents=req.selected_agent_roles)
-    # 2) 重い計算はバックグラウンドへ（同期ラッパーを登録）
-    background_tasks.add_task(service.kickoff_review, review_id=review_id)
+    review_id = service.new_review_session(
+        req.prd_text,
+        req.panel_type,
+        selected_agents=req.selected_agent_roles,
+        base_review_id=req.base_review_id,
+        max_issues=req.max_issues,
+        max_issues_per_agent=req.max_issues_per_agent,
+    )
+    # 2) 重い計算はスケジューラ経由でサーバーのイベントループ上のタスクとして実行
+    #    共有ストア構成では共有ジョブキューに積み、空きのあるワーカーがリースを取って実行する
+    if job_worker is not None:
+        job_worker.enqueue(review_id, tenant=tenant, on_queue_update=service.update_queue_position)
+    else:
+        scheduler.submit(
+            review_id, service.kickoff_review_async, tenant=tenant, on_queue_update=service.update_queue_position
+        )
     logger.info(
         "start_review accepted",
         extra={"review_id": review_id, "panel_type": req.panel_type or "", "prd_len": len(req.prd_text or "")},
     )
+    # Root of the review's trace; queue wait and the run are recorded under the same trace id
+    record_span(
+        "review.request",
+        review_id,
+        start_time=received_at,
+        attributes={"hibikasu.tenant": tenant, "hibikasu.prd_chars": len(req.prd_text or "")},
+    )
     return ReviewResponse(review_id=review_id)
 
 
+def _etag(version: int | None, variant: str) -> str | None:
+    return f'"v{version}-{variant}"' if version is not None else None
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": _CACHE_CONTROL})
+
+
+async def _wait_for_change(
+    service: AbstractReviewService, broker: ReviewEventBroker, review_id: str, known_version: int
+) -> None:
+    """Hold until the session's version passes ``known_version`` or the long-poll timeout expires.
+
+    Progress events of this worker wake the wait at once; the version is
+    also re-read periodically, which catches status updates and reviews
+    running on other workers.
+    """
+
+    deadline = time.monotonic() + settings.review_long_poll_seconds
+    subscription = broker.subscribe(review_id)
+    try:
+        while True:
+            version = service.get_review_version(review_id)
+            remaining = deadline - time.monotonic()
+            if version is None or version > known_version or remaining <= 0:
+                return
+            await subscription.next_event(timeout=min(remaining, _LONG_POLL_RECHECK_SECONDS))
+    finally:
+        subscription.close()
+
+
 @router.get("/reviews/{review_id}", response_model=StatusResponse)
-async def get_review(review_id: str, service: AbstractReviewService = Depends(get_review_service)) -> StatusResponse:
+async def get_review(  # noqa: PLR0913
+    review_id: str,
+    response: Response,
+    *,
+    view: Literal["full", "compact"] = Query(default="full"),
+    wait_for_version: int | None = Query(default=None, ge=0, description="Long-poll until the version exceeds N"),
+    if_none_match: str | None = Header(default=None),
+    service: AbstractReviewService = Depends(get_review_service),
+    broker: ReviewEventBroker = Depends(get_review_event_broker),
+) -> StatusResponse | Response:
+    """Review status. ``view=compact`` leaves out ``prd_text`` and the issue lists (only their counts).
+
+    The ``ETag`` carries the session version: a matching ``If-None-Match``
+    is answered with 304 without building the payload. ``wait_for_version``
+    holds the request until the version exceeds it or the long poll expires.
+    """
+
+    if wait_for_version is not None:
+        await _wait_for_change(service, broker, review_id, wait_for_version)
+    # Read before the data: a concurrent change then only makes the ETag older, never newer
+    etag = _etag(service.get_review_version(review_id), view)
+    if etag is not None:
+        if _etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = _CACHE_CONTROL
+
     data: dict[str, Any] = service.get_review_session(review_id)
     try:
         issues_count = len(data.get("issues") or []) if isinstance(data.get("issues"), list) else 0
@@ -54,9 +195,146 @@ async def get_review(review_id: str, service: AbstractReviewService = Depends(ge
         )
     except Exception:  # nosec B110
         pass
+    if view == "compact":
+        data = {
+            **data,
+            "prd_text": None,
+            "issues": None,
+            "provisional_issues": None,
+            "issue_count": len(data["issues"]) if isinstance(data.get("issues"), list) else None,
+            "provisional_issue_count": len(data.get("provisional_issues") or []),
+        }
     return StatusResponse.model_validate(data)
 
 
+@router.get("/reviews/{review_id}/issues", response_model=IssueListResponse)
+async def list_review_issues(  # noqa: PLR0913
+    review_id: str,
+    *,
+    status: str | None = Query(default=None, description="Issue status (pending, done, later, ...)"),
+    agent: str | None = Query(default=None, description="Role, agent key or display name"),
+    priority: int | None = Query(default=None, ge=1, le=3),
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: str | None = Query(default=None, description="Comma separated Issue fields, e.g. issue_id,summary"),
+    service: AbstractReviewService = Depends(get_review_service),
+) -> IssueListResponse:
+    """Cursor-paginated final issues with filters and field projection."""
+
+    try:
+        projection = parse_fields(fields)
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail=str(err)) from err
+    review_status = service.get_review_status(review_id)
+    if review_status is None:
+        raise HTTPException(status_code=404, detail="Review not found")
+    matches = service.list_issues(review_id, status=status, agent=agent, priority=priority)
+    page, next_cursor = paginate(matches, after=after, limit=limit)
+    return IssueListResponse(
+        status=review_status,
+        issues=[project_issue(issue, projection) for _position, issue in page],
+        total=len(matches),
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/reviews/{review_id}/events")
+async def stream_review_events(
+    review_id: str,
+    request: Request,
+    service: AbstractReviewService = Depends(get_review_service),
+    broker: ReviewEventBroker = Depends(get_review_event_broker),
+    last_event_id: str | None = Header(default=None),
+) -> StreamingResponse:
+    """Server-Sent Events stream of review progress.
+
+    A new connection first receives a ``snapshot`` event (status without the
+    PRD text), then ``progress`` / ``agent_completed`` deltas and finally a
+    ``completed`` (with issues) or ``failed`` event. Reconnecting with
+    ``Last-Event-ID`` replays only the missed events when still buffered.
+    """
+
+    if service.get_review_session(review_id).get("status") == "not_found":
+        raise HTTPException(status_code=404, detail="Review not found")
+    resume_id = _parse_event_id(last_event_id)
+    # Subscribe before taking the snapshot so no delta falls in between
+    subscription = broker.subscribe(review_id, last_event_id=resume_id)
+
+    async def _stream() -> AsyncIterator[str]:
+        try:
+            yield f"retry: {_SSE_RETRY_MS}\n\n"
+            if not subscription.resumed:
+                snapshot_id = broker.last_event_id(review_id)
+                subscription.mark_seen(snapshot_id)
+                status = StatusResponse.model_validate(service.get_review_session(review_id))
+                payload = status.model_dump(mode="json", exclude={"prd_text"})
+                yield ReviewEvent(id=snapshot_id, event="snapshot", data=payload).to_sse()
+                if status.status in TERMINAL_EVENTS:
+                    return
+            elif broker.last_event_id(review_id) <= (resume_id or 0):
+                # Fully caught up: finish right away if the review already ended
+                if service.get_review_session(review_id).get("status") in TERMINAL_EVENTS:
+                    return
+            last_seen: dict[str, Any] | None = None
+            async for item in subscription.events(heartbeat_seconds=settings.review_events_heartbeat_seconds):
+                if item is None:
+                    if await request.is_disconnected():
+                        return
+                    # The review may run on another worker whose events never reach this broker
+                    fallback, last_seen = _store_fallback_event(service, review_id, last_seen)
+                    if fallback is not None:
+                        yield fallback.to_sse(include_id=False)
+                        if fallback.event in TERMINAL_EVENTS:
+                            return
+                        continue
+                    yield ": heartbeat\n\n"
+                    continue
+                # Delivered through the broker: restart change detection from the next idle tick
+                last_seen = None
+                yield item.to_sse()
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        _stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _store_fallback_event(
+    service: AbstractReviewService, review_id: str, last_seen: dict[str, Any] | None
+) -> tuple[ReviewEvent | None, dict[str, Any] | None]:
+    """Derive a progress/terminal event from the shared store when the session changed unseen."""
+
+    data = service.get_review_session(review_id)
+    status = data.get("status")
+    if status == "not_found":
+        return None, last_seen
+    status_model = StatusResponse.model_validate(data)
+    current = {key: getattr(status_model, key) for key in ("status", "progress", "phase", "completed_agents")}
+    if last_seen is None and status not in TERMINAL_EVENTS:
+        # First tick only records the baseline; the snapshot already covered it
+        return None, current
+    if current == last_seen:
+        return None, last_seen
+    payload = status_model.model_dump(mode="json", exclude={"prd_text"})
+    event = str(status) if status in TERMINAL_EVENTS else "progress"
+    return ReviewEvent(id=0, event=event, data=payload), current
+
+
+@router.get("/reviews/{review_id}/issues/truncated", response_model=TruncatedIssuesResponse)
+async def get_truncated_issues(
+    review_id: str, service: AbstractReviewService = Depends(get_review_service)
+) -> TruncatedIssuesResponse:
+    """Issues ranked below the review's top-K / per-agent quota (``truncated_issue_count`` in the status)."""
+
+    if service.get_review_session(review_id).get("status") == "not_found":
+        raise HTTPException(status_code=404, detail="Review not found")
+    return TruncatedIssuesResponse(issues=service.get_truncated_issues(review_id))
+
+
 @router.post("/reviews/{review_id}/issues/{issue_id}/dialog", response_model=DialogResponse)
 async def issue_dialog(
     review_id: str,
@@ -71,6 +349,47 @@ async def issue_dialog(
     return DialogResponse(response_text=text)
 
 
+def _ndjson(payload: dict[str, Any]) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+@router.post("/reviews/{review_id}/issues/{issue_id}/dialog/stream")
+async def issue_dialog_stream(
+    review_id: str,
+    issue_id: str,
+    req: DialogRequest,
+    service: AbstractReviewService = Depends(get_review_service),
+) -> StreamingResponse:
+    """Stream the dialog answer as NDJSON.
+
+    Each line is ``{"type": "delta", "text": ...}`` while the model is
+    generating, followed by ``{"type": "done", "response_text": ...}`` with the
+    full answer (or ``{"type": "error", ...}`` if generation broke off).
+    """
+
+    issue = service.find_issue(review_id, issue_id)
+    if issue is None:
+        raise HTTPException(status_code=404, detail="Issue not found")
+
+    async def _stream() -> AsyncIterator[str]:
+        parts: list[str] = []
+        try:
+            async for delta in service.stream_dialog(review_id, issue_id, req.question_text):
+                parts.append(delta)
+                yield _ndjson({"type": "delta", "text": delta})
+        except Exception:  # nosec B110
+            logger.error("Dialog stream aborted", extra={"review_id": review_id, "issue_id": issue_id}, exc_info=True)
+            yield _ndjson({"type": "error", "detail": "回答の生成が中断されました。", "response_text": "".join(parts)})
+            return
+        yield _ndjson({"type": "done", "response_text": "".join(parts)})
+
+    return StreamingResponse(
+        _stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/reviews/{review_id}/issues/{issue_id}/suggest", response_model=SuggestResponse)
 async def issue_suggest(
     review_id: str,
@@ -117,8 +436,17 @@ async def update_issue_status_endpoint(
 
 @router.get("/reviews/{review_id}/summary", response_model=ReviewSummaryResponse)
 async def get_review_summary(
-    review_id: str, service: AbstractReviewService = Depends(get_review_service)
-) -> ReviewSummaryResponse:
+    review_id: str,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    service: AbstractReviewService = Depends(get_review_service),
+) -> ReviewSummaryResponse | Response:
+    etag = _etag(service.get_review_version(review_id), "summary")
+    if etag is not None:
+        if _etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = _CACHE_CONTROL
     data = service.get_review_summary(review_id)
     return ReviewSummaryResponse.model_validate(data)
 
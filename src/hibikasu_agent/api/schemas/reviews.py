@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Literal
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -28,6 +28,19 @@ class ReviewRequest(BaseModel):
         default=None,
         description="Optional list of agent roles to include in the review",
     )
+    base_review_id: str | None = Field(
+        default=None,
+        description="Previous review of an earlier PRD version; only changed sections are re-reviewed",
+    )
+    max_issues: int | None = Field(
+        default=None, ge=1, le=200, description="Return at most this many top-ranked issues (default: server setting)"
+    )
+    max_issues_per_agent: int | None = Field(
+        default=None,
+        ge=1,
+        le=50,
+        description="Return at most this many issues per specialist (default: server setting)",
+    )
 
 
 class ReviewResponse(BaseModel):
@@ -49,6 +62,8 @@ class Issue(BaseModel):
     span: IssueSpan | None = None
     # Optional per-issue status managed by the client workflow
     status: str | None = None
+    # Every specialist that raised this issue (near-duplicates are merged into one issue)
+    contributing_agents: list[str] = Field(default_factory=list)
 
 
 class ReviewSession(BaseModel):
@@ -73,6 +88,8 @@ class StatusResponse(BaseModel):
 
     status: Literal["processing", "completed", "failed", "not_found"]
     issues: list[Issue] | None = None
+    # Issues from specialists that already finished, shown before aggregation completes
+    provisional_issues: list[Issue] | None = None
     # Include original PRD text so the frontend can hydrate state on reload
     prd_text: str | None = None
     progress: float | None = None
@@ -81,6 +98,33 @@ class StatusResponse(BaseModel):
     eta_seconds: int | None = None
     expected_agents: list[str] | None = None
     completed_agents: list[str] | None = None
+    # "hit" when the result was reused from an identical earlier review
+    cache_status: Literal["hit", "miss"] | None = None
+    # Specialists (agent key) that failed and contributed no issues, with the reason
+    agent_errors: dict[str, str] | None = None
+    # Lower-ranked issues cut by the top-K / per-agent quota; fetch them from /issues/truncated
+    truncated_issue_count: int | None = None
+    # Session version (also in the ETag); pass as ?wait_for_version= to long-poll for the next change
+    version: int | None = None
+    # Set by ?view=compact, which leaves out prd_text and the issue lists (page them via /issues)
+    issue_count: int | None = None
+    provisional_issue_count: int | None = None
+
+
+class IssueListResponse(BaseModel):
+    """One page of GET /reviews/{review_id}/issues."""
+
+    status: Literal["processing", "completed", "failed", "not_found"]
+    # Issues projected to the requested fields (all fields by default)
+    issues: list[dict[str, Any]] = Field(default_factory=list)
+    total: int = Field(default=0, description="Issues matching the filters across all pages")
+    next_cursor: str | None = Field(default=None, description="Pass as ?cursor= to fetch the next page")
+
+
+class TruncatedIssuesResponse(BaseModel):
+    """Issues that were ranked below the review's top-K or per-agent quota, in rank order."""
+
+    issues: list[Issue] = Field(default_factory=list)
 
 
 class DialogRequest(BaseModel):
@@ -135,12 +179,31 @@ class SummaryStatistics(BaseModel):
     agent_counts: list[AgentCount] = Field(default_factory=list)
 
 
+class TokenUsage(BaseModel):
+    """LLM token usage and its estimated cost."""
+
+    prompt_tokens: int = 0
+    completion_tokens: int = Field(default=0, description="Output tokens including thinking tokens")
+    total_tokens: int = 0
+    estimated_cost_usd: float | None = Field(default=None, description="None when the model has no known price")
+
+
+class ReviewTokenUsage(BaseModel):
+    """Token usage of a review, in total and per agent."""
+
+    model: str | None = None
+    total: TokenUsage = Field(default_factory=TokenUsage)
+    agents: dict[str, TokenUsage] = Field(default_factory=dict, description="Usage per agent key")
+
+
 class ReviewSummaryResponse(BaseModel):
     """Response payload for the summary endpoint."""
 
     status: Literal["processing", "completed", "failed", "not_found"]
     statistics: SummaryStatistics
     issues: list[Issue]
+    agent_errors: dict[str, str] = Field(default_factory=dict)
+    token_usage: ReviewTokenUsage | None = None
 
 
 class AgentRole(BaseModel):
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import re
 from collections.abc import Mapping
 from dataclasses import dataclass
 from typing import Final
@@ -177,3 +178,74 @@ ROLE_TO_DEFINITION: Mapping[str, SpecialistDefinition] = {
 }
 
 SPECIALIST_AGENT_KEYS: tuple[str, ...] = tuple(definition.agent_key for definition in SPECIALIST_DEFINITIONS)
+
+# Issues carry ``AGENT_DISPLAY_NAMES[agent_key]`` (or the raw agent key when unmapped) as ``agent_name``
+_AGENT_NAME_TO_DEFINITION: Mapping[str, SpecialistDefinition] = {
+    **{definition.agent_key: definition for definition in SPECIALIST_DEFINITIONS},
+    **{definition.display_name: definition for definition in SPECIALIST_DEFINITIONS},
+}
+
+
+def definition_for_agent_name(agent_name: str | None) -> SpecialistDefinition | None:
+    """Resolve the specialist that produced an issue from its ``agent_name``."""
+
+    if not agent_name:
+        return None
+    return _AGENT_NAME_TO_DEFINITION.get(agent_name.strip())
+
+
+# Session state keys shared between the ADK pipeline and the service layer
+PRD_TEXT_STATE_KEY: Final[str] = "review_prd_text"
+REVIEW_CHUNKS_STATE_KEY: Final[str] = "review_chunks"
+# Top-K / per-agent quota / agent weights of the aggregator's ranking (RankingOptions.to_state())
+REVIEW_RANKING_STATE_KEY: Final[str] = "review_ranking"
+
+_CHUNK_STATE_KEY_RE = re.compile(r"^(?P<base>.+)__chunk(?P<index>\d+)of(?P<total>\d+)$")
+
+
+def chunk_state_key(state_key: str, index: int, total: int) -> str:
+    """State key holding a specialist's output for chunk ``index`` (0-based) of ``total``."""
+
+    return f"{state_key}__chunk{index + 1}of{total}"
+
+
+def parse_chunk_state_key(key: str) -> tuple[str, int, int] | None:
+    """Inverse of :func:`chunk_state_key`; returns ``(state_key, index, total)``."""
+
+    match = _CHUNK_STATE_KEY_RE.match(key)
+    if match is None:
+        return None
+    return match.group("base"), int(match.group("index")) - 1, int(match.group("total"))
+
+
+_CHUNK_AGENT_NAME_RE = re.compile(r"^(?P<agent_key>.+)_chunk\d+$")
+
+
+def chunk_agent_name(agent_key: str, index: int) -> str:
+    """Name of the agent reviewing chunk ``index`` (0-based) for specialist ``agent_key``."""
+
+    return f"{agent_key}_chunk{index + 1}"
+
+
+def agent_key_for_author(author: str) -> str:
+    """Fold a chunk agent's name (see :func:`chunk_agent_name`) back into its specialist's agent key."""
+
+    match = _CHUNK_AGENT_NAME_RE.match(author)
+    return match.group("agent_key") if match else author
+
+
+_ERROR_STATE_KEY_SUFFIX = "__error"
+
+
+def specialist_error_state_key(state_key: str) -> str:
+    """State key recording why the specialist writing ``state_key`` produced no usable output."""
+
+    return f"{state_key}{_ERROR_STATE_KEY_SUFFIX}"
+
+
+def parse_specialist_error_state_key(key: str) -> str | None:
+    """Inverse of :func:`specialist_error_state_key`; returns the output state key."""
+
+    if not key.endswith(_ERROR_STATE_KEY_SUFFIX):
+        return None
+    return key[: -len(_ERROR_STATE_KEY_SUFFIX)] or None
@@ -11,6 +11,23 @@ except Exception:
     pass
 
 
+def _env_int(name: str, default: int) -> int:
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = (os.getenv(name) or "").strip().lower()
+    if not raw:
+        return default
+    return raw in {"1", "true", "yes", "on"}
+
+
 class Settings:
     """Application settings centralized in one place.
 
@@ -18,12 +35,48 @@ class Settings:
     while providing a simple, explicit configuration surface.
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         *,
         cors_allow_origins: str | None | list[str] = None,
         cors_allow_origin_regex: str | None = None,
         hibikasu_log_level: str = "INFO",
+        max_concurrent_reviews: int = 8,
+        max_queued_reviews: int = 100,
+        max_queued_reviews_per_tenant: int = 20,
+        review_cache_enabled: bool = True,
+        review_cache_max_entries: int = 256,
+        review_cache_ttl_seconds: int = 24 * 60 * 60,
+        review_cache_db_path: str | None = None,
+        review_chunk_threshold_chars: int = 60_000,
+        review_chunk_max_chars: int = 30_000,
+        review_chunk_overlap_chars: int = 1_000,
+        review_store_backend: str = "memory",
+        review_store_db_path: str | None = None,
+        review_session_ttl_seconds: int = 24 * 60 * 60,
+        review_store_max_sessions: int = 1_000,
+        review_store_max_chars: int = 200_000_000,
+        redis_url: str | None = None,
+        review_job_lease_seconds: int = 30,
+        review_job_max_attempts: int = 3,
+        specialist_max_attempts: int = 4,
+        specialist_retry_initial_delay_seconds: int = 1,
+        specialist_retry_max_delay_seconds: int = 30,
+        specialist_timeout_seconds: int = 180,
+        specialist_role_timeouts: str | None = None,
+        specialist_hedging: bool = False,
+        specialist_hedge_percentile: int = 90,
+        review_events_heartbeat_seconds: int = 15,
+        review_long_poll_seconds: int = 30,
+        dialog_session_ttl_seconds: int = 30 * 60,
+        dialog_max_history_tokens: int = 200_000,
+        dialog_direct_routing: bool = True,
+        tracing_exporter: str | None = None,
+        tracing_file_path: str | None = None,
+        model_prices: str | None = None,
+        issue_top_k: int = 0,
+        issues_per_agent: int = 5,
+        issue_agent_weights: str | None = None,
     ) -> None:
         # Predeclare internal attributes with optional types for mypy
         self._cors_allow_origins_raw: str | None = None
@@ -38,6 +91,60 @@ class Settings:
 
         self.cors_allow_origin_regex = cors_allow_origin_regex
         self.hibikasu_log_level = hibikasu_log_level
+        # Upper bound of reviews executed concurrently on the server event loop
+        self.max_concurrent_reviews = max(1, max_concurrent_reviews)
+        # Backpressure limits for reviews waiting for a free execution slot
+        self.max_queued_reviews = max(0, max_queued_reviews)
+        self.max_queued_reviews_per_tenant = max(0, max_queued_reviews_per_tenant)
+        # Result cache for resubmitted PRDs (SQLite tier only when a path is given)
+        self.review_cache_enabled = review_cache_enabled
+        self.review_cache_max_entries = review_cache_max_entries
+        self.review_cache_ttl_seconds = review_cache_ttl_seconds
+        self.review_cache_db_path = review_cache_db_path or None
+        # Long PRDs are reviewed in overlapping chunks (threshold 0 disables chunking)
+        self.review_chunk_threshold_chars = review_chunk_threshold_chars
+        self.review_chunk_max_chars = review_chunk_max_chars
+        self.review_chunk_overlap_chars = review_chunk_overlap_chars
+        # Review session persistence: "memory" (LRU/TTL bounded, single worker), or "sqlite" / "redis"
+        # (shared across workers; review jobs are then claimed by any worker under a lease)
+        self.review_store_backend = (review_store_backend or "memory").strip().lower()
+        self.review_store_db_path = review_store_db_path or None
+        self.review_session_ttl_seconds = review_session_ttl_seconds
+        self.review_store_max_sessions = review_store_max_sessions
+        self.review_store_max_chars = review_store_max_chars
+        self.redis_url = redis_url or "redis://localhost:6379/0"
+        self.review_job_lease_seconds = max(1, review_job_lease_seconds)
+        # Runs of one review job (crash recovery included) before it is marked failed
+        self.review_job_max_attempts = max(1, review_job_max_attempts)
+        # Per-specialist retries of transient model API errors with exponential backoff (1 disables)
+        self.specialist_max_attempts = max(1, specialist_max_attempts)
+        self.specialist_retry_initial_delay_seconds = max(0, specialist_retry_initial_delay_seconds)
+        self.specialist_retry_max_delay_seconds = max(1, specialist_retry_max_delay_seconds)
+        # Deadline per specialist (0 disables; "role=seconds,..." overrides per role); a specialist past its
+        # deadline is dropped and the rest aggregated. Hedging re-sends a request slower than the percentile.
+        self.specialist_timeout_seconds = max(0, specialist_timeout_seconds)
+        self.specialist_role_timeouts = specialist_role_timeouts or None
+        self.specialist_hedging = specialist_hedging
+        self.specialist_hedge_percentile = min(99, max(50, specialist_hedge_percentile))
+        # Idle interval after which SSE progress streams send a heartbeat comment
+        self.review_events_heartbeat_seconds = max(1, review_events_heartbeat_seconds)
+        # Longest time GET /reviews/{id}?wait_for_version=N holds the request waiting for a change
+        self.review_long_poll_seconds = max(1, review_long_poll_seconds)
+        # Per-issue dialog sessions: idle eviction and total retained history budget
+        self.dialog_session_ttl_seconds = dialog_session_ttl_seconds
+        self.dialog_max_history_tokens = dialog_max_history_tokens
+        # Send dialog turns straight to the issue's specialist instead of via the coordinator
+        self.dialog_direct_routing = dialog_direct_routing
+        # Review traces: "console", "file" (JSON lines at tracing_file_path) or unset (off unless OTEL_* is set)
+        self.tracing_exporter = (tracing_exporter or "").strip().lower() or None
+        self.tracing_file_path = tracing_file_path
+        # Extra/overridden LLM prices for cost estimates: "model=input/output" in USD per 1M tokens
+        self.model_prices = model_prices
+        # Issue ranking defaults (reviews may override the first two): global top-K (0 = none; chunked
+        # reviews then keep 20), per-specialist quota (0 = none) and "role=weight,..." score multipliers
+        self.issue_top_k = max(0, issue_top_k)
+        self.issues_per_agent = max(0, issues_per_agent)
+        self.issue_agent_weights = issue_agent_weights or None
 
     @property
     def cors_allow_origins(self) -> list[str]:
@@ -64,6 +171,42 @@ class Settings:
             cors_allow_origins=os.getenv("CORS_ALLOW_ORIGINS"),
             cors_allow_origin_regex=os.getenv("CORS_ALLOW_ORIGIN_REGEX"),
             hibikasu_log_level=os.getenv("HIBIKASU_LOG_LEVEL", "INFO"),
+            max_concurrent_reviews=_env_int("HIBIKASU_MAX_CONCURRENT_REVIEWS", 8),
+            max_queued_reviews=_env_int("HIBIKASU_MAX_QUEUED_REVIEWS", 100),
+            max_queued_reviews_per_tenant=_env_int("HIBIKASU_MAX_QUEUED_REVIEWS_PER_TENANT", 20),
+            review_cache_enabled=_env_bool("HIBIKASU_REVIEW_CACHE_ENABLED", True),
+            review_cache_max_entries=_env_int("HIBIKASU_REVIEW_CACHE_MAX_ENTRIES", 256),
+            review_cache_ttl_seconds=_env_int("HIBIKASU_REVIEW_CACHE_TTL_SECONDS", 24 * 60 * 60),
+            review_cache_db_path=os.getenv("HIBIKASU_REVIEW_CACHE_DB_PATH"),
+            review_chunk_threshold_chars=_env_int("HIBIKASU_REVIEW_CHUNK_THRESHOLD_CHARS", 60_000),
+            review_chunk_max_chars=_env_int("HIBIKASU_REVIEW_CHUNK_MAX_CHARS", 30_000),
+            review_chunk_overlap_chars=_env_int("HIBIKASU_REVIEW_CHUNK_OVERLAP_CHARS", 1_000),
+            review_store_backend=os.getenv("HIBIKASU_REVIEW_STORE_BACKEND", "memory"),
+            review_store_db_path=os.getenv("HIBIKASU_REVIEW_STORE_DB_PATH"),
+            review_session_ttl_seconds=_env_int("HIBIKASU_REVIEW_SESSION_TTL_SECONDS", 24 * 60 * 60),
+            review_store_max_sessions=_env_int("HIBIKASU_REVIEW_STORE_MAX_SESSIONS", 1_000),
+            review_store_max_chars=_env_int("HIBIKASU_REVIEW_STORE_MAX_CHARS", 200_000_000),
+            redis_url=os.getenv("HIBIKASU_REDIS_URL"),
+            review_job_lease_seconds=_env_int("HIBIKASU_REVIEW_JOB_LEASE_SECONDS", 30),
+            review_job_max_attempts=_env_int("HIBIKASU_REVIEW_JOB_MAX_ATTEMPTS", 3),
+            specialist_max_attempts=_env_int("HIBIKASU_SPECIALIST_MAX_ATTEMPTS", 4),
+            specialist_retry_initial_delay_seconds=_env_int("HIBIKASU_SPECIALIST_RETRY_INITIAL_DELAY_SECONDS", 1),
+            specialist_retry_max_delay_seconds=_env_int("HIBIKASU_SPECIALIST_RETRY_MAX_DELAY_SECONDS", 30),
+            specialist_timeout_seconds=_env_int("HIBIKASU_SPECIALIST_TIMEOUT_SECONDS", 180),
+            specialist_role_timeouts=os.getenv("HIBIKASU_SPECIALIST_ROLE_TIMEOUTS"),
+            specialist_hedging=_env_bool("HIBIKASU_SPECIALIST_HEDGING", False),
+            specialist_hedge_percentile=_env_int("HIBIKASU_SPECIALIST_HEDGE_PERCENTILE", 90),
+            review_events_heartbeat_seconds=_env_int("HIBIKASU_REVIEW_EVENTS_HEARTBEAT_SECONDS", 15),
+            review_long_poll_seconds=_env_int("HIBIKASU_REVIEW_LONG_POLL_SECONDS", 30),
+            dialog_session_ttl_seconds=_env_int("HIBIKASU_DIALOG_SESSION_TTL_SECONDS", 30 * 60),
+            dialog_max_history_tokens=_env_int("HIBIKASU_DIALOG_MAX_HISTORY_TOKENS", 200_000),
+            dialog_direct_routing=_env_bool("HIBIKASU_DIALOG_DIRECT_ROUTING", True),
+            tracing_exporter=os.getenv("HIBIKASU_TRACING_EXPORTER"),
+            tracing_file_path=os.getenv("HIBIKASU_TRACING_FILE"),
+            model_prices=os.getenv("HIBIKASU_MODEL_PRICES"),
+            issue_top_k=_env_int("HIBIKASU_ISSUE_TOP_K", 0),
+            issues_per_agent=_env_int("HIBIKASU_ISSUES_PER_AGENT", 5),
+            issue_agent_weights=os.getenv("HIBIKASU_ISSUE_AGENT_WEIGHTS"),
         )
 
 
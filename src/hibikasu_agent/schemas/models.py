@@ -33,12 +33,23 @@ class FinalIssue(BaseModel):
     comment: str = Field(description="詳細や論理的根拠を含む、レビューコメントの全文")
     original_text: str = Field(description="元のPRDから引用されたテキスト")
     status: str = Field(default="pending", description="指摘のステータス（例: pending, done, later）")
+    span_start: int | None = Field(default=None, description="PRD全体における引用箇所の開始位置（算出済みの場合）")
+    span_end: int | None = Field(default=None, description="PRD全体における引用箇所の終了位置（半開区間）")
+    contributing_agents: list[str] = Field(
+        default_factory=list, description="同じ指摘を挙げた専門家の名前（重複をまとめた場合は複数）"
+    )
 
 
 class FinalIssuesResponse(BaseModel):
     """Wrapper for returning a list of final issues."""
 
     final_issues: list[FinalIssue] = Field(description="Aggregated and prioritized issues")
+    truncated_issues: list[FinalIssue] = Field(
+        default_factory=list, description="Ranked issues cut by the top-K or per-agent quota, in rank order"
+    )
+    agent_errors: dict[str, str] = Field(
+        default_factory=dict, description="Specialists (agent key) whose output could not be used, with the reason"
+    )
 
 
 # Shared output schema across specialist agents
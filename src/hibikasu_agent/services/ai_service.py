@@ -1,24 +1,57 @@
 from __future__ import annotations
 
+import asyncio
 import time
 import uuid
 from collections import Counter
+from collections.abc import AsyncIterator, Callable, Mapping
 from typing import Any
 
 from google.adk.events.event import Event as ADKEvent
-
-from hibikasu_agent.api.schemas.reviews import AgentCount, Issue, ReviewSummaryResponse, StatusCount, SummaryStatistics
+from pydantic import ValidationError
+
+from hibikasu_agent.agents.parallel_orchestrator.tools import load_issues_from_state, to_final_issues
+from hibikasu_agent.api.schemas.reviews import (
+    AgentCount,
+    Issue,
+    ReviewSummaryResponse,
+    ReviewTokenUsage,
+    StatusCount,
+    SummaryStatistics,
+    TokenUsage,
+)
 from hibikasu_agent.constants.agents import (
     AGENT_DISPLAY_NAMES,
     SPECIALIST_AGENT_KEYS,
     STATE_KEY_TO_AGENT_KEY,
+    agent_key_for_author,
+    parse_chunk_state_key,
+    parse_specialist_error_state_key,
 )
+from hibikasu_agent.schemas.models import FinalIssue
 from hibikasu_agent.services.base import AbstractReviewService
-from hibikasu_agent.services.models import ReviewRuntimeSession
-from hibikasu_agent.services.providers.adk import ADKService
+from hibikasu_agent.services.incremental_review import IncrementalReviewPlan, plan_incremental_review
+from hibikasu_agent.services.issue_listing import agent_filter_names
+from hibikasu_agent.services.mappers.api_issue_mapper import map_api_issue
+from hibikasu_agent.services.models import ReviewRuntimeSession, ReviewStatus
+from hibikasu_agent.services.providers.adk import ADKService, resolve_adk_model
+from hibikasu_agent.services.review_cache import ReviewResultCache, build_review_cache_key
+from hibikasu_agent.services.review_events import ReviewEventBroker, session_event_payload
 from hibikasu_agent.services.review_runner import AdkReviewRunner
-from hibikasu_agent.services.review_store import ReviewSessionStore
+from hibikasu_agent.services.review_store import AbstractReviewSessionStore, ReviewSessionStore
+from hibikasu_agent.services.token_accounting import TokenPricing, add_usage, sum_usage, usage_counts
 from hibikasu_agent.utils.logging_config import get_logger
+from hibikasu_agent.utils.metrics import (
+    DIALOG_SECONDS,
+    FAILURES_TOTAL,
+    LLM_COST_USD_TOTAL,
+    LLM_TOKENS_TOTAL,
+    REVIEW_PHASE_SECONDS,
+    REVIEWS_TOTAL,
+    SPECIALIST_SECONDS,
+)
+from hibikasu_agent.utils.span_calculator import calculate_span
+from hibikasu_agent.utils.tracing import record_span, review_trace_context, tracer
 
 logger = get_logger(__name__)
 
@@ -60,30 +93,77 @@ def _extract_error_message(err: Exception) -> str:
     return err.__class__.__name__
 
 
+def _log_state_delta_sizes(state_delta: dict[str, Any]) -> None:
+    # レスポンスサイズをログ出力
+    for key, value in state_delta.items():
+        if value:
+            value_str = str(value)
+            logger.info(f"ADK state delta - key: {key}, size: {len(value_str)} chars")
+
+            # 巨大なレスポンスを警告
+            if len(value_str) > 50000:
+                logger.warning(f"⚠️ HUGE RESPONSE DETECTED! key: {key}, size: {len(value_str)} chars")
+                logger.info(f"Response preview (first 1000 chars): {value_str[:1000]}")
+
+
+def _start_phase_message(expected_agents: list[str]) -> str | None:
+    if not expected_agents:
+        return None
+    return f"{len(expected_agents)}名の専門家がレビューを開始しました"
+
+
 class AiService(AbstractReviewService):
     """AI-backed review service.
 
-    Manages in-memory review sessions and uses an ADKService provider
-    to compute review issues asynchronously.
+    Keeps review sessions in a pluggable session store and uses an
+    ADKService provider to compute review issues asynchronously. Sessions are
+    written back to the store after every change so non-memory backends
+    observe progress. ``on_phase_change`` receives ``(review_id, phase)``
+    whenever a review reaches aggregating/completed/failed, e.g. to keep a
+    durable job record in step. Phase and per-specialist latencies, outcomes
+    and failure reasons are recorded in :mod:`hibikasu_agent.utils.metrics`,
+    as are the token counts and estimated costs (``token_pricing``) taken
+    from each ADK event's usage metadata, which are also kept per agent on
+    the session. ``agent_weights`` are the ranking weights the ADK service
+    applies; they are part of the review cache key.
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         adk_service: ADKService,
         *,
-        review_store: ReviewSessionStore | None = None,
+        review_store: AbstractReviewSessionStore | None = None,
         review_runner: AdkReviewRunner | None = None,
+        review_cache: ReviewResultCache | None = None,
+        event_broker: ReviewEventBroker | None = None,
+        on_phase_change: Callable[[str, str], None] | None = None,
+        token_pricing: TokenPricing | None = None,
+        agent_weights: Mapping[str, float] | None = None,
     ) -> None:
         self.adk_service = adk_service
         self._store = review_store or ReviewSessionStore()
         self._review_runner = review_runner or AdkReviewRunner(adk_service)
+        self._review_cache = review_cache
+        self._event_broker = event_broker
+        self._on_phase_change = on_phase_change
+        self._token_pricing = token_pricing or TokenPricing()
+        self._agent_weights = dict(agent_weights or {})
+        # review_id -> monotonic times of the run start and (once reached) the aggregating phase
+        self._review_clocks: dict[str, dict[str, float]] = {}
 
     @property
     def reviews_in_memory(self) -> dict[str, ReviewRuntimeSession]:
         return dict(self._store.as_dict())
 
-    def new_review_session(
-        self, prd_text: str, panel_type: str | None = None, *, selected_agents: list[str] | None = None
+    def new_review_session(  # noqa: PLR0913
+        self,
+        prd_text: str,
+        panel_type: str | None = None,
+        *,
+        selected_agents: list[str] | None = None,
+        base_review_id: str | None = None,
+        max_issues: int | None = None,
+        max_issues_per_agent: int | None = None,
     ) -> str:
         """Create a new review session with optional agent selection.
 
@@ -91,6 +171,9 @@ class AiService(AbstractReviewService):
             prd_text: The PRD text to review
             panel_type: Optional panel type for categorization
             selected_agents: Optional list of agent roles to use (e.g., ["engineer", "pm"])
+            base_review_id: Optional previous review to re-review incrementally against
+            max_issues: Optional top-K of the issue ranking for this review
+            max_issues_per_agent: Optional per-specialist issue quota for this review
         """
         review_id = str(uuid.uuid4())
 
@@ -103,10 +186,6 @@ class AiService(AbstractReviewService):
                 raw_expected = raw_expected()
             expected_agents = list(raw_expected or SPECIALIST_AGENT_KEYS)
 
-        phase_message = None
-        if expected_agents:
-            phase_message = f"{len(expected_agents)}名の専門家がレビューを開始しました"
-
         session = ReviewRuntimeSession(
             created_at=time.time(),
             status="processing",
@@ -117,12 +196,44 @@ class AiService(AbstractReviewService):
             completed_agents=[],
             progress=0.0,
             phase="processing",
-            phase_message=phase_message,
+            phase_message=_start_phase_message(expected_agents),
             selected_agent_roles=selected_agents,  # Store original selection
+            base_review_id=base_review_id,
+            max_issues=max_issues,
+            max_issues_per_agent=max_issues_per_agent,
         )
         self._store.create(review_id, session)
         return review_id
 
+    def unfinished_review_ids(self, *, min_age_seconds: float = 0.0) -> list[str]:
+        """Reviews still ``processing`` in the store (used by the startup recovery sweep).
+
+        ``min_age_seconds`` skips sessions created more recently, which a live
+        worker may still be about to enqueue.
+        """
+
+        cutoff = time.time() - min_age_seconds
+        return [
+            review_id
+            for review_id, sess in self._store.as_dict().items()
+            if sess.status == "processing" and sess.created_at <= cutoff
+        ]
+
+    def store_stats(self) -> tuple[int, int | None]:
+        """``(sessions, approximate characters)`` held by the session store."""
+
+        return self._store.stats()
+
+    def abandon_review(self, review_id: str, reason: str) -> None:
+        """Mark a review failed without running it (e.g. its job exhausted its retries)."""
+
+        sess = self._store.get(review_id)
+        if not sess or sess.status != "processing":
+            return
+        self._fail_session(
+            review_id, sess, "レビューを完了できませんでした。再度お試しください。", reason, reason_label="abandoned"
+        )
+
     def get_review_session(self, review_id: str) -> dict[str, Any]:
         sess = self._store.get(review_id)
         if not sess:
@@ -130,6 +241,7 @@ class AiService(AbstractReviewService):
         return {
             "status": sess.status,
             "issues": sess.issues,
+            "provisional_issues": sess.provisional_issues,
             "prd_text": sess.prd_text,
             "progress": sess.progress,
             "phase": sess.phase,
@@ -137,73 +249,194 @@ class AiService(AbstractReviewService):
             "eta_seconds": sess.eta_seconds,
             "expected_agents": sess.expected_agents,
             "completed_agents": sess.completed_agents,
+            "cache_status": sess.cache_status,
+            "agent_errors": sess.agent_errors,
+            "truncated_issue_count": len(sess.truncated_issues) if sess.status == "completed" else None,
+            "version": sess.version,
         }
 
+    def get_review_version(self, review_id: str) -> int | None:
+        return self._store.get_version(review_id)
+
+    def get_review_status(self, review_id: str) -> ReviewStatus | None:
+        return self._store.get_status(review_id)
+
     def find_issue(self, review_id: str, issue_id: str) -> Issue | None:
         sess = self._store.get(review_id)
         if not sess or not sess.issues:
             return None
-        issues = sess.issues
-        for iss in issues:
-            if iss.issue_id == issue_id:
-                return iss
-        return None
+        return sess.issue_index().get(issue_id)
+
+    def list_issues(
+        self,
+        review_id: str,
+        *,
+        status: str | None = None,
+        agent: str | None = None,
+        priority: int | None = None,
+    ) -> list[tuple[int, Issue]]:
+        sess = self._store.get(review_id)
+        if not sess or not sess.issues:
+            return []
+        agent_names = agent_filter_names(agent) if agent else None
+        return sess.issue_index().filter(status=status, agent_names=agent_names, priority=priority)
+
+    def get_truncated_issues(self, review_id: str) -> list[Issue]:
+        """Map the issues cut by the ranking on demand (they are not part of the status payload)."""
+
+        sess = self._store.get(review_id)
+        if not sess:
+            return []
+        # Spans are located in the full PRD (the pipeline may have seen only changed sections)
+        return [
+            map_api_issue(issue.model_dump(exclude={"span_start", "span_end"}), sess.prd_text)
+            for issue in sess.truncated_issues
+        ]
 
     async def answer_dialog(self, review_id: str, issue_id: str, question_text: str) -> str:
         issue = self.find_issue(review_id, issue_id)
         if not issue:
             return "該当する論点が見つかりませんでした。"
-        return await self.adk_service.answer_dialog_async(issue, question_text)
+        with DIALOG_SECONDS.time(mode="answer"):
+            return await self.adk_service.answer_dialog_async(issue, question_text, review_id=review_id)
+
+    async def stream_dialog(self, review_id: str, issue_id: str, question_text: str) -> AsyncIterator[str]:
+        issue = self.find_issue(review_id, issue_id)
+        if not issue:
+            yield "該当する論点が見つかりませんでした。"
+            return
+        with DIALOG_SECONDS.time(mode="stream"):
+            async for delta in self.adk_service.stream_dialog_async(issue, question_text, review_id=review_id):
+                yield delta
 
     def kickoff_review(self, review_id: str) -> None:
-        """同期メソッド。BackgroundTasks から呼ばれて非同期レビューを実行する。"""
+        """同期メソッド。イベントループを持たない呼び出し元向けに非同期レビューを実行する。"""
+        asyncio.run(self.kickoff_review_async(review_id))
+
+    async def kickoff_review_async(self, review_id: str) -> None:
+        """サーバーのイベントループ上でレビューを実行する。"""
         sess = self._store.get(review_id)
-        if not sess or sess.issues is not None:
+        if not sess or sess.issues is not None or sess.status != "processing":
             return
-
-        def _on_event(event: Any) -> None:
-            try:
-                self._handle_adk_event(sess, event)
-            except Exception:  # nosec B110
-                logger.debug("failed to handle ADK event", exc_info=True)
+        REVIEW_PHASE_SECONDS.observe(max(0.0, time.time() - sess.created_at), phase="queued")
+        record_span("review.queue_wait", review_id, start_time=sess.created_at)
+        self._review_clocks[review_id] = {"started": time.monotonic()}
+        with tracer.start_as_current_span(
+            "review.run",
+            context=review_trace_context(review_id),
+            attributes={"hibikasu.review_id": review_id, "hibikasu.prd_chars": len(sess.prd_text)},
+        ) as span:
+            await self._run_review(review_id, sess)
+            span.set_attribute("hibikasu.review_status", sess.status)
+
+    async def _run_review(self, review_id: str, sess: ReviewRuntimeSession) -> None:
+        if sess.completed_agents or sess.chunk_progress:
+            # Re-run of a job whose worker died: progress restarts with the specialists
+            sess.completed_agents = []
+            sess.chunk_progress = {}
+            sess.agent_errors = {}
+            sess.truncated_issues = []
+            sess.progress = 0.0
+            sess.phase = "processing"
+            sess.phase_message = _start_phase_message(sess.expected_agents)
+        if sess.phase == "queued":
+            sess.phase = "processing"
+            sess.phase_message = _start_phase_message(sess.expected_agents)
+            sess.eta_seconds = None
+
+        cache_key: str | None = None
+        if self._review_cache is not None:
+            cache_key = build_review_cache_key(
+                sess.prd_text,
+                sess.expected_agents,
+                model=resolve_adk_model(),
+                issue_limits=(sess.max_issues, sess.max_issues_per_agent),
+                agent_weights=self._agent_weights,
+            )
+            cached = self._review_cache.get_review(cache_key)
+            if cached is not None:
+                sess.cache_status = "hit"
+                sess.truncated_issues = cached.truncated_issues
+                # The key ignores newline style and trailing spaces, so the cached offsets may not fit this PRD
+                for issue in cached.issues:
+                    issue.span = calculate_span(sess.prd_text, issue.original_text)
+                self._complete_session(
+                    review_id, sess, cached.issues, phase_message="同じ内容のレビュー結果を再利用しました"
+                )
+                logger.info("ai review served from cache", extra={"review_id": review_id})
+                return
+            sess.cache_status = "miss"
+
+        plan = self._plan_incremental_review(sess)
+        review_text = sess.prd_text
+        if plan is not None:
+            if not plan.needs_review:
+                self._complete_session(
+                    review_id, sess, plan.carried_issues, phase_message="変更箇所がないため前回の指摘を引き継ぎました"
+                )
+                return
+            review_text = plan.review_text
+            sess.provisional_issues = list(plan.carried_issues)
+            sess.phase_message = f"変更された{len(plan.changed_sections)}セクションを再レビューしています"
+        sess.bump_version()
+        self._store.update(review_id, sess)
+        self._publish(review_id, sess, "progress")
 
         try:
-            issues = self._review_runner.run_blocking(
-                sess.prd_text, on_event=_on_event, selected_agents=sess.selected_agent_roles
+            issues = await self._review_runner.run_async(
+                review_text,
+                on_event=self._event_handler(review_id, sess),
+                selected_agents=sess.selected_agent_roles,
+                max_issues=sess.max_issues,
+                max_issues_per_agent=sess.max_issues_per_agent,
             )
         except Exception as err:  # nosec B110
             message = _extract_error_message(err)
-            sess.status = "failed"
-            sess.error = str(err)
-            sess.phase = "failed"
-            sess.phase_message = f"レビューの実行中にエラーが発生しました: {message}"
+            self._fail_session(
+                review_id,
+                sess,
+                f"レビューの実行中にエラーが発生しました: {message}",
+                str(err),
+                reason_label="review_error",
+            )
             logger.error(
                 "ai review failed",
                 extra={"review_id": review_id, "error": str(err)},
                 exc_info=True,
             )
             return
-        sess.issues = issues
-        sess.status = "completed"
-        sess.phase = "completed"
-        sess.progress = 1.0
-        if sess.expected_agents:
-            remaining = [agent for agent in sess.expected_agents if agent not in sess.completed_agents]
-            if remaining:
-                sess.completed_agents.extend(remaining)
-        sess.phase_message = "レビューが完了しました"
+        if plan is not None:
+            # Specialists only saw the changed sections; anchor their quotes in the full PRD
+            with tracer.start_as_current_span("review.span_calculation", attributes={"hibikasu.issues": len(issues)}):
+                for issue in issues:
+                    issue.span = calculate_span(sess.prd_text, issue.original_text)
+            issues = sorted([*plan.carried_issues, *issues], key=lambda item: item.priority)
+        # Partial results (some specialists failed) are not worth replaying for the same PRD
+        if self._review_cache is not None and cache_key is not None and issues and not sess.agent_errors:
+            self._review_cache.set(cache_key, issues, truncated_issues=sess.truncated_issues)
+        self._complete_session(review_id, sess, issues)
+
+    def update_queue_position(self, review_id: str, position: int, eta_seconds: int | None) -> None:
+        sess = self._store.get(review_id)
+        if not sess or sess.status != "processing":
+            return
+        sess.phase = "queued"
+        sess.phase_message = f"順番待ち中です（{position}番目）"
+        sess.eta_seconds = eta_seconds
+        sess.bump_version()
+        self._store.update(review_id, sess)
+        self._publish(review_id, sess, "progress")
 
     def update_issue_status(self, review_id: str, issue_id: str, status: str) -> bool:
         sess = self._store.get(review_id)
         if not sess or not sess.issues:
             return False
-        issues = sess.issues
-        for iss in issues:
-            if iss.issue_id == issue_id:
-                # The API Issue model has an optional status field
-                iss.status = status
-                return True
-        return False
+        # The API Issue model has an optional status field; the index keeps its status bucket in sync
+        issue = sess.issue_index().set_status(issue_id, status)
+        if issue is None:
+            return False
+        # Only the changed issue row (and the version) is rewritten by persistent stores
+        return self._store.update_issue(review_id, issue, version=sess.bump_version())
 
     def get_review_summary(self, review_id: str) -> dict[str, Any]:
         sess = self._store.get(review_id)
@@ -246,40 +479,187 @@ class AiService(AbstractReviewService):
         agent_counts.sort(key=lambda x: (-x.count, x.agent_name.lower()))
 
         statistics = SummaryStatistics(total_issues=total, status_counts=status_counts, agent_counts=agent_counts)
-        response = ReviewSummaryResponse(status=sess.status, statistics=statistics, issues=issues)
+        token_usage = None
+        if sess.token_usage:
+            token_usage = ReviewTokenUsage(model=sess.model, total=sum_usage(sess.token_usage), agents=sess.token_usage)
+        response = ReviewSummaryResponse(
+            status=sess.status,
+            statistics=statistics,
+            issues=issues,
+            agent_errors=sess.agent_errors,
+            token_usage=token_usage,
+        )
         return response.model_dump()
 
     # ------------------------------------------------------------------
     # Internal helpers
 
+    def _plan_incremental_review(self, sess: ReviewRuntimeSession) -> IncrementalReviewPlan | None:
+        if not sess.base_review_id:
+            return None
+        base = self._store.get(sess.base_review_id)
+        if base is None or base.status != "completed" or base.issues is None:
+            logger.info("incremental review baseline unavailable", extra={"base_review_id": sess.base_review_id})
+            return None
+        if sorted(base.expected_agents) != sorted(sess.expected_agents):
+            # Carried issues would come from a different panel; review from scratch
+            return None
+        plan = plan_incremental_review(base.prd_text, sess.prd_text, base.issues)
+        logger.info(
+            "incremental review planned",
+            extra={
+                "base_review_id": sess.base_review_id,
+                "changed_sections": len(plan.changed_sections),
+                "carried_issues": len(plan.carried_issues),
+            },
+        )
+        return plan
+
+    def _complete_session(
+        self,
+        review_id: str,
+        sess: ReviewRuntimeSession,
+        issues: list[Issue],
+        *,
+        phase_message: str = "レビューが完了しました",
+    ) -> None:
+        sess.issues = issues
+        sess.issue_index()
+        # Final issues supersede the provisional list (IDs are shared, so selections carry over)
+        sess.provisional_issues = []
+        sess.status = "completed"
+        sess.phase = "completed"
+        sess.progress = 1.0
+        if sess.expected_agents:
+            remaining = [agent for agent in sess.expected_agents if agent not in sess.completed_agents]
+            if remaining:
+                sess.completed_agents.extend(remaining)
+        sess.phase_message = phase_message
+        if sess.agent_errors:
+            sess.phase_message += f"（{len(sess.agent_errors)}名の専門家の指摘は取得できませんでした）"
+        sess.bump_version()
+        self._store.update(review_id, sess)
+        self._report_phase(review_id, sess)
+        self._record_finished(review_id, sess, "cached" if sess.cache_status == "hit" else "completed")
+        self._publish(review_id, sess, "completed", issues=[issue.model_dump() for issue in issues])
+
+    def _fail_session(
+        self,
+        review_id: str,
+        sess: ReviewRuntimeSession,
+        phase_message: str,
+        error: str,
+        *,
+        reason_label: str,
+    ) -> None:
+        sess.status = "failed"
+        sess.error = error
+        sess.phase = "failed"
+        sess.phase_message = phase_message
+        if sess.agent_errors:
+            sess.phase_message += f"（{len(sess.agent_errors)}名の専門家の指摘は取得できませんでした）"
+        sess.bump_version()
+        self._store.update(review_id, sess)
+        self._report_phase(review_id, sess)
+        FAILURES_TOTAL.inc(reason=reason_label)
+        self._record_finished(review_id, sess, "failed")
+        self._publish(review_id, sess, "failed", error=sess.phase_message)
+
+    def _record_finished(self, review_id: str, sess: ReviewRuntimeSession, outcome: str) -> None:
+        clock = self._review_clocks.pop(review_id, {})
+        if "aggregating" in clock:
+            REVIEW_PHASE_SECONDS.observe(time.monotonic() - clock["aggregating"], phase="aggregating")
+        REVIEW_PHASE_SECONDS.observe(max(0.0, time.time() - sess.created_at), phase="total")
+        REVIEWS_TOTAL.inc(outcome=outcome)
+        for _agent in sess.agent_errors:
+            FAILURES_TOTAL.inc(reason="specialist_error")
+
+    def _report_phase(self, review_id: str, sess: ReviewRuntimeSession) -> None:
+        if self._on_phase_change is None:
+            return
+        try:
+            self._on_phase_change(review_id, sess.phase)
+        except Exception:  # nosec B110
+            logger.debug("phase change callback failed", exc_info=True)
+
+    def _publish(self, review_id: str, sess: ReviewRuntimeSession, event: str, **extra: Any) -> None:
+        """Push a progress delta to SSE subscribers (no-op without a broker)."""
+
+        if self._event_broker is None:
+            return
+        try:
+            self._event_broker.publish(review_id, event, {**session_event_payload(sess), **extra})
+        except Exception:  # nosec B110
+            logger.debug("failed to publish review event", exc_info=True)
+
+    def _event_handler(self, review_id: str, sess: ReviewRuntimeSession) -> Callable[[Any], None]:
+        """Build the ADK event callback that updates, persists and publishes progress."""
+
+        def _on_event(event: Any) -> None:
+            try:
+                completed_before = len(sess.completed_agents)
+                provisional_before = {issue.issue_id for issue in sess.provisional_issues}
+                phase_before = sess.phase
+                version_before = sess.version
+                self._handle_adk_event(sess, event)
+                newly_completed = sess.completed_agents[completed_before:]
+                added = [issue for issue in sess.provisional_issues if issue.issue_id not in provisional_before]
+                self._record_timings(review_id, sess, newly_completed, phase_before)
+                if sess.version != version_before:
+                    # Every bumped version is persisted, so ETags and long polls on other workers see it
+                    # (token usage and specialist errors included, not only progress)
+                    self._store.update(review_id, sess)
+                if newly_completed or added or sess.phase != phase_before:
+                    if sess.phase != phase_before:
+                        self._report_phase(review_id, sess)
+                    event_type = "agent_completed" if newly_completed or added else "progress"
+                    self._publish(review_id, sess, event_type, issues_added=[issue.model_dump() for issue in added])
+            except Exception:  # nosec B110
+                logger.debug("failed to handle ADK event", exc_info=True)
+
+        return _on_event
+
+    def _record_timings(
+        self, review_id: str, sess: ReviewRuntimeSession, newly_completed: list[str], phase_before: str
+    ) -> None:
+        clock = self._review_clocks.get(review_id)
+        if clock is None:
+            return
+        now = time.monotonic()
+        for agent in newly_completed:
+            SPECIALIST_SECONDS.observe(now - clock["started"], agent=agent)
+        if sess.phase == "aggregating" and phase_before != "aggregating":
+            REVIEW_PHASE_SECONDS.observe(now - clock["started"], phase="specialists")
+            clock["aggregating"] = now
+
     def _handle_adk_event(self, sess: ReviewRuntimeSession, event: Any) -> None:
         """Update runtime session based on ADK event callbacks."""
 
         if not isinstance(event, ADKEvent):
             return
+        state_delta = getattr(getattr(event, "actions", None), "state_delta", None)
+        if self._record_token_usage(sess, event) or state_delta:
+            # Token usage (summary) or specialist/aggregator output (status) may have changed
+            sess.bump_version()
 
         expected = sess.expected_agents
         if not expected:
             return
 
         matched_agents: list[str] = []
-        state_delta = getattr(getattr(event, "actions", None), "state_delta", None)
         if isinstance(state_delta, dict):
-            # レスポンスサイズをログ出力
-            for key, value in state_delta.items():
-                if value:
-                    value_str = str(value)
-                    logger.info(f"ADK state delta - key: {key}, size: {len(value_str)} chars")
-
-                    # 巨大なレスポンスを警告
-                    if len(value_str) > 50000:
-                        logger.warning(f"⚠️ HUGE RESPONSE DETECTED! key: {key}, size: {len(value_str)} chars")
-                        logger.info(f"Response preview (first 1000 chars): {value_str[:1000]}")
-
-            for state_key in state_delta:
+            _log_state_delta_sizes(state_delta)
+            for state_key, value in state_delta.items():
+                if self._record_agent_error(sess, state_key, value):
+                    continue
+                self._add_provisional_issues(sess, state_key, value)
                 agent_key = STATE_KEY_TO_AGENT_KEY.get(state_key)
                 if agent_key and agent_key in expected:
                     matched_agents.append(agent_key)
+                    continue
+                chunk_agent = self._record_chunk_completion(sess, state_key)
+                if chunk_agent:
+                    matched_agents.append(chunk_agent)
 
         if not matched_agents:
             logger.debug(
@@ -296,7 +676,93 @@ class AiService(AbstractReviewService):
             sess.completed_agents.extend(newly_completed)
             self._recalculate_progress(sess, last_completed=newly_completed[-1])
 
+    def _record_token_usage(self, sess: ReviewRuntimeSession, event: Any) -> bool:
+        """Add one model response's usage metadata to the session and the token metrics."""
+
+        if getattr(event, "partial", False):
+            return False
+        counts = usage_counts(getattr(event, "usage_metadata", None))
+        if counts is None:
+            return False
+        prompt, completion, total = counts
+        agent = agent_key_for_author(getattr(event, "author", None) or "unknown")
+        model = getattr(event, "model_version", None) or sess.model or resolve_adk_model()
+        sess.model = sess.model or model
+        cost = self._token_pricing.cost(model, prompt, completion)
+        add_usage(sess.token_usage.setdefault(agent, TokenUsage()), prompt, completion, total, cost)
+        LLM_TOKENS_TOTAL.inc(prompt, model=model, agent=agent, kind="prompt")
+        LLM_TOKENS_TOTAL.inc(completion, model=model, agent=agent, kind="completion")
+        if cost is not None:
+            LLM_COST_USD_TOTAL.inc(cost, model=model, agent=agent)
+        return True
+
+    def _record_agent_error(self, sess: ReviewRuntimeSession, state_key: str, value: Any) -> bool:
+        """Keep per-specialist failures (from the specialist itself or the aggregator).
+
+        The aggregator's output also carries the issues cut by the ranking,
+        which are kept unmapped until a client asks for them.
+        """
+
+        if state_key == "final_review_issues" and isinstance(value, dict):
+            for agent_key, message in (value.get("agent_errors") or {}).items():
+                if agent_key in sess.expected_agents:
+                    sess.agent_errors.setdefault(agent_key, str(message))
+            truncated = value.get("truncated_issues") or []
+            try:
+                sess.truncated_issues = [FinalIssue.model_validate(item) for item in truncated]
+            except ValidationError:
+                logger.warning("unparseable truncated issues", extra={"count": len(truncated)})
+            return True
+        output_key = parse_specialist_error_state_key(state_key)
+        if output_key is None:
+            return False
+        parsed = parse_chunk_state_key(output_key)
+        agent_key = STATE_KEY_TO_AGENT_KEY.get(parsed[0] if parsed else output_key)
+        if agent_key and agent_key in sess.expected_agents and value:
+            sess.agent_errors.setdefault(agent_key, str(value))
+        return True
+
+    def _add_provisional_issues(self, sess: ReviewRuntimeSession, state_key: str, value: Any) -> None:
+        """Map a finished specialist's (or chunk's) output to API issues right away."""
+
+        if not value:
+            return
+        parsed = parse_chunk_state_key(state_key)
+        agent_key = STATE_KEY_TO_AGENT_KEY.get(parsed[0] if parsed else state_key)
+        if not agent_key or agent_key not in sess.expected_agents:
+            return
+        try:
+            issues_resp = load_issues_from_state({state_key: value}, state_key)
+        except (TypeError, ValueError):
+            logger.debug("unparseable specialist output", extra={"state_key": state_key})
+            return
+        known = {issue.issue_id for issue in sess.provisional_issues}
+        added: list[Issue] = []
+        for final in to_final_issues(agent_key, issues_resp):
+            if final.issue_id in known:
+                continue
+            known.add(final.issue_id)
+            added.append(map_api_issue(final.model_dump(exclude={"span_start", "span_end"}), sess.prd_text))
+        if added:
+            sess.provisional_issues = sorted([*sess.provisional_issues, *added], key=lambda item: item.priority)
+
+    def _record_chunk_completion(self, sess: ReviewRuntimeSession, state_key: str) -> str | None:
+        """Track per-chunk outputs; return the agent key once all its chunks are done."""
+
+        parsed = parse_chunk_state_key(state_key)
+        if parsed is None:
+            return None
+        base_key, index, total = parsed
+        agent_key = STATE_KEY_TO_AGENT_KEY.get(base_key)
+        if not agent_key or agent_key not in sess.expected_agents:
+            return None
+        done = sess.chunk_progress.setdefault(agent_key, [])
+        if index not in done:
+            done.append(index)
+        return agent_key if len(done) >= total else None
+
     def _recalculate_progress(self, sess: ReviewRuntimeSession, *, last_completed: str | None = None) -> None:
+        sess.bump_version()
         total = len(sess.expected_agents)
         completed = len(sess.completed_agents)
         if total <= 0:
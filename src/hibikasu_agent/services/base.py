@@ -3,7 +3,11 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any
+from collections.abc import AsyncIterator
+from typing import Any, cast, get_args
+
+from hibikasu_agent.services.issue_listing import agent_filter_names, issue_matches
+from hibikasu_agent.services.models import ReviewStatus
 
 
 class AbstractReviewService(ABC):
@@ -13,13 +17,26 @@ class AbstractReviewService(ABC):
     This ensures consistency across different implementations (AI, Mock, etc.).
     """
 
-    # start_review_process は撤廃。ルーターからは new_review_session + kickoff_review を使用する。
+    # start_review_process は撤廃。ルーターからは new_review_session + kickoff_review_async を使用する。
 
     @abstractmethod
-    def new_review_session(
-        self, prd_text: str, panel_type: str | None = None, *, selected_agents: list[str] | None = None
+    def new_review_session(  # noqa: PLR0913
+        self,
+        prd_text: str,
+        panel_type: str | None = None,
+        *,
+        selected_agents: list[str] | None = None,
+        base_review_id: str | None = None,
+        max_issues: int | None = None,
+        max_issues_per_agent: int | None = None,
     ) -> str:
-        """Create a new review session and return its ID."""
+        """Create a new review session and return its ID.
+
+        When ``base_review_id`` refers to a completed review of an earlier PRD
+        version, implementations may re-review only the changed sections.
+        ``max_issues`` / ``max_issues_per_agent`` override the server's
+        top-K and per-specialist quota for this review.
+        """
         ...
 
     @abstractmethod
@@ -61,15 +78,83 @@ class AbstractReviewService(ABC):
         """
         ...
 
+    async def stream_dialog(self, review_id: str, issue_id: str, question_text: str) -> AsyncIterator[str]:
+        """Stream the answer to a follow-up question as text deltas.
+
+        The default implementation yields the complete ``answer_dialog`` result
+        as a single chunk; providers that support token streaming override it.
+        """
+        yield await self.answer_dialog(review_id, issue_id, question_text)
+
+    def get_review_version(self, review_id: str) -> int | None:
+        """Version of the review session, bumped on every visible change (``None`` if unknown).
+
+        Used for ETags and long polls; implementations without versioning
+        return ``None`` and responses are then always sent in full.
+        """
+        _ = review_id
+        return None
+
+    def get_review_status(self, review_id: str) -> ReviewStatus | None:
+        """Status of the review (``None`` if unknown), without building the full status payload.
+
+        The default derives it from :meth:`get_review_session`; store-backed
+        implementations read the status alone.
+        """
+        status = self.get_review_session(review_id).get("status")
+        return cast(ReviewStatus, status) if status in get_args(ReviewStatus) else None
+
+    def list_issues(
+        self,
+        review_id: str,
+        *,
+        status: str | None = None,
+        agent: str | None = None,
+        priority: int | None = None,
+    ) -> list[tuple[int, Any]]:
+        """Return ``(position, issue)`` of the review's final issues matching the filters.
+
+        ``agent`` accepts a role, an agent key or a display name. Positions
+        refer to the full issue list so pagination cursors stay valid while
+        issue statuses change. The default implementation scans the issues
+        returned by :meth:`get_review_session`.
+        """
+
+        issues = self.get_review_session(review_id).get("issues") or []
+        agent_names = agent_filter_names(agent) if agent else None
+        return [
+            (position, issue)
+            for position, issue in enumerate(issues)
+            if issue_matches(issue, status=status, agent_names=agent_names, priority=priority)
+        ]
+
+    def get_truncated_issues(self, review_id: str) -> list[Any]:
+        """Return the issues cut by the review's top-K / per-agent quota, in rank order.
+
+        Implementations without a ranking stage have nothing to return.
+        """
+        _ = review_id
+        return []
+
     @abstractmethod
     def kickoff_review(self, review_id: str) -> None:
-        """Kick off heavy review computation in background.
+        """Run the review computation synchronously.
 
-        This synchronous wrapper is suitable for FastAPI BackgroundTasks.
-        It should call the provider's async review method via asyncio.run().
+        Kept for scripts and tests that have no running event loop. The API
+        schedules ``kickoff_review_async`` on the server loop instead.
         """
         ...
 
+    @abstractmethod
+    async def kickoff_review_async(self, review_id: str) -> None:
+        """Run the review computation on the caller's event loop."""
+        ...
+
+    @abstractmethod
+    def update_queue_position(self, review_id: str, position: int, eta_seconds: int | None) -> None:
+        """Reflect the review's wait position and estimated start time in its session."""
+        ...
+
     @abstractmethod
     def update_issue_status(self, review_id: str, issue_id: str, status: str) -> bool:
         """Updates the status of a specific issue and returns success."""
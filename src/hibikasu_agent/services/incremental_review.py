@@ -0,0 +1,60 @@
+"""Plan re-reviews of an edited PRD against a previous review's results."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from hibikasu_agent.api.schemas.reviews import Issue
+from hibikasu_agent.utils.prd_sections import PrdSection, section_at, split_sections
+from hibikasu_agent.utils.span_calculator import calculate_span
+
+
+@dataclass
+class IncrementalReviewPlan:
+    """Sections that need fresh specialist review and issues that can be kept."""
+
+    changed_sections: list[PrdSection] = field(default_factory=list)
+    carried_issues: list[Issue] = field(default_factory=list)
+
+    @property
+    def needs_review(self) -> bool:
+        return bool(self.changed_sections)
+
+    @property
+    def review_text(self) -> str:
+        """Concatenated text of the changed sections, sent to the specialists."""
+
+        return "\n\n".join(section.text.strip("\n") for section in self.changed_sections)
+
+
+def plan_incremental_review(previous_prd: str, current_prd: str, previous_issues: list[Issue]) -> IncrementalReviewPlan:
+    """Diff two PRD versions section by section.
+
+    A section of the current PRD is unchanged when a section with identical
+    content existed in the previous version (so moved sections are not
+    re-reviewed). Previous issues anchored in unchanged sections are carried
+    over with their spans recalculated against the current text; issues in
+    edited or removed sections are dropped and left to the fresh review.
+    """
+
+    previous_sections = split_sections(previous_prd)
+    current_sections = split_sections(current_prd)
+    previous_digests = {section.digest for section in previous_sections}
+    current_digests = {section.digest for section in current_sections}
+
+    plan = IncrementalReviewPlan(
+        changed_sections=[section for section in current_sections if section.digest not in previous_digests]
+    )
+
+    for issue in previous_issues:
+        span = issue.span or calculate_span(previous_prd, issue.original_text)
+        if span is None:
+            continue
+        section = section_at(previous_sections, span.start_index)
+        if section is None or section.digest not in current_digests:
+            continue
+        new_span = calculate_span(current_prd, issue.original_text)
+        if new_span is None:
+            continue
+        plan.carried_issues.append(issue.model_copy(update={"span": new_span}))
+    return plan
@@ -0,0 +1,83 @@
+"""Per-session index of a review's final issues by ID, status and agent."""
+
+from __future__ import annotations
+
+from hibikasu_agent.api.schemas.reviews import Issue
+from hibikasu_agent.services.issue_listing import issue_status_key
+
+
+class IssueIndex:
+    """Positions of the issues by ``issue_id`` plus secondary indexes by status and agent.
+
+    Built once per issue list (on completion or when a store loads the
+    session) and kept up to date by :meth:`set_status`, so lookups and
+    status updates are O(1) and filtered listings touch only the matching
+    issues instead of scanning the whole list.
+    """
+
+    def __init__(self, issues: list[Issue]) -> None:
+        self._issues = issues
+        self._size = len(issues)
+        self._positions: dict[str, int] = {}
+        self._by_status: dict[str, set[int]] = {}
+        self._by_agent: dict[str, set[int]] = {}
+        for position, issue in enumerate(issues):
+            # The first issue wins for repeated IDs, as with the former linear scans
+            self._positions.setdefault(issue.issue_id, position)
+            self._by_status.setdefault(issue_status_key(issue), set()).add(position)
+            self._by_agent.setdefault(issue.agent_name, set()).add(position)
+
+    def covers(self, issues: list[Issue] | None) -> bool:
+        """Whether this index was built for ``issues`` (same list object, not resized since)."""
+
+        return issues is self._issues and len(issues) == self._size
+
+    def position(self, issue_id: str) -> int | None:
+        return self._positions.get(issue_id)
+
+    def get(self, issue_id: str) -> Issue | None:
+        position = self._positions.get(issue_id)
+        return self._issues[position] if position is not None else None
+
+    def set_status(self, issue_id: str, status: str) -> Issue | None:
+        """Update the issue's status and the status index; ``None`` if the issue does not exist."""
+
+        position = self._positions.get(issue_id)
+        if position is None:
+            return None
+        issue = self._issues[position]
+        old_key = issue_status_key(issue)
+        issue.status = status
+        new_key = issue_status_key(issue)
+        if new_key != old_key:
+            bucket = self._by_status.get(old_key)
+            if bucket is not None:
+                bucket.discard(position)
+                if not bucket:
+                    del self._by_status[old_key]
+            self._by_status.setdefault(new_key, set()).add(position)
+        return issue
+
+    def filter(
+        self,
+        *,
+        status: str | None = None,
+        agent_names: set[str] | None = None,
+        priority: int | None = None,
+    ) -> list[tuple[int, Issue]]:
+        """``(position, issue)`` matching all filters, in list order."""
+
+        candidates: set[int] | None = None
+        if status is not None:
+            candidates = set(self._by_status.get(status.strip().lower(), ()))
+        if agent_names is not None:
+            by_agent: set[int] = set()
+            for name in agent_names:
+                by_agent.update(self._by_agent.get(name, ()))
+            candidates = by_agent if candidates is None else candidates & by_agent
+        positions = range(self._size) if candidates is None else sorted(candidates)
+        return [
+            (position, self._issues[position])
+            for position in positions
+            if priority is None or self._issues[position].priority == priority
+        ]
@@ -0,0 +1,100 @@
+"""Filtering, cursor pagination and field projection of a review's issues."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+from collections.abc import Iterable
+from typing import Any
+
+from hibikasu_agent.api.schemas.reviews import Issue
+from hibikasu_agent.constants.agents import ROLE_TO_DEFINITION, definition_for_agent_name
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+ISSUE_FIELDS: frozenset[str] = frozenset(Issue.model_fields)
+
+_CURSOR_PREFIX = "p:"
+
+
+def issue_status_key(issue: Issue) -> str:
+    """Issues without an explicit status are ``pending`` (same as the summary view)."""
+
+    return (issue.status or "pending").strip().lower() or "pending"
+
+
+def agent_filter_names(agent: str) -> set[str]:
+    """Names an ``agent`` filter matches: a role, an agent key or a display name."""
+
+    value = agent.strip()
+    definition = ROLE_TO_DEFINITION.get(value) or definition_for_agent_name(value)
+    if definition is None:
+        return {value}
+    return {value, definition.agent_key, definition.display_name}
+
+
+def issue_matches(
+    issue: Issue,
+    *,
+    status: str | None = None,
+    agent_names: set[str] | None = None,
+    priority: int | None = None,
+) -> bool:
+    if status is not None and issue_status_key(issue) != status.strip().lower():
+        return False
+    if agent_names is not None and issue.agent_name not in agent_names:
+        return False
+    return priority is None or issue.priority == priority
+
+
+def encode_cursor(position: int) -> str:
+    """Opaque cursor pointing after the issue at ``position`` in the review's issue list."""
+
+    return base64.urlsafe_b64encode(f"{_CURSOR_PREFIX}{position}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Position encoded by :func:`encode_cursor`; raises ``ValueError`` for anything else."""
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError) as err:
+        raise ValueError("invalid cursor") from err
+    if not raw.startswith(_CURSOR_PREFIX):
+        raise ValueError("invalid cursor")
+    return int(raw.removeprefix(_CURSOR_PREFIX))
+
+
+def parse_fields(raw: str | None) -> tuple[str, ...] | None:
+    """``"issue_id,summary,priority"`` -> field names (``None`` = all); raises ``ValueError`` on unknown names."""
+
+    if not raw or not raw.strip():
+        return None
+    fields = tuple(dict.fromkeys(name.strip() for name in raw.split(",") if name.strip()))
+    unknown = [name for name in fields if name not in ISSUE_FIELDS]
+    if unknown:
+        raise ValueError(f"unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def project_issue(issue: Issue, fields: tuple[str, ...] | None) -> dict[str, Any]:
+    """Serialize only the requested fields; ``issue_id`` is always kept so clients can follow up."""
+
+    if fields is None:
+        return issue.model_dump(mode="json")
+    return issue.model_dump(mode="json", include={"issue_id", *fields})
+
+
+def paginate(
+    entries: Iterable[tuple[int, Issue]], *, after: int | None, limit: int
+) -> tuple[list[tuple[int, Issue]], str | None]:
+    """Take ``limit`` entries positioned after ``after``; also return the next page's cursor."""
+
+    page: list[tuple[int, Issue]] = []
+    for position, issue in entries:
+        if after is not None and position <= after:
+            continue
+        if len(page) == limit:
+            return page, encode_cursor(page[-1][0])
+        page.append((position, issue))
+    return page, None
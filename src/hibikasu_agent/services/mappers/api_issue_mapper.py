@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import time
 from contextlib import suppress
 
 from hibikasu_agent.api.schemas.reviews import Issue as ApiIssue
-from hibikasu_agent.utils.span_calculator import calculate_span
+from hibikasu_agent.api.schemas.reviews import IssueSpan
+from hibikasu_agent.utils.metrics import SPAN_RESOLUTIONS_TOTAL, SPAN_SECONDS
+from hibikasu_agent.utils.span_calculator import get_span_index
+from hibikasu_agent.utils.tracing import tracer
 
 
 def _coerce_priority(value: object | None) -> int:
@@ -21,6 +25,18 @@ def _coerce_priority(value: object | None) -> int:
     return priority
 
 
+def _precomputed_span(item: dict[str, object], text_length: int) -> IssueSpan | None:
+    """Use offsets already resolved by the pipeline (e.g. chunked reviews)."""
+
+    start = item.get("span_start")
+    end = item.get("span_end")
+    if not isinstance(start, int) or not isinstance(end, int):
+        return None
+    if not 0 <= start < end <= text_length:
+        return None
+    return IssueSpan(start_index=start, end_index=end)
+
+
 def map_api_issue(item: dict[str, object], prd_text: str) -> ApiIssue:
     """Transform a raw ADK issue dictionary into an API response model."""
 
@@ -32,7 +48,15 @@ def map_api_issue(item: dict[str, object], prd_text: str) -> ApiIssue:
         cleaned_text = " ".join(original_text.split())
         original_text = cleaned_text[:200] + "..." if len(cleaned_text) > 200 else cleaned_text
 
-    span = calculate_span(prd_text, original_text)
+    started = time.perf_counter()
+    span = _precomputed_span(item, len(prd_text))
+    method = "precomputed"
+    if span is None:
+        with tracer.start_as_current_span("review.span_calculation") as trace_span:
+            span, method = get_span_index(prd_text).locate(original_text)
+            trace_span.set_attribute("hibikasu.span_method", method)
+    SPAN_SECONDS.observe(time.perf_counter() - started)
+    SPAN_RESOLUTIONS_TOTAL.inc(method=method)
 
     _comment = str(item.get("comment") or "")
     _summary = str(item.get("summary") or "").strip()
@@ -48,6 +72,7 @@ def map_api_issue(item: dict[str, object], prd_text: str) -> ApiIssue:
             _summary = original_text
 
     priority = _coerce_priority(item.get("priority"))
+    contributing_agents = item.get("contributing_agents")
 
     return ApiIssue(
         issue_id=str(item.get("issue_id") or ""),
@@ -57,4 +82,7 @@ def map_api_issue(item: dict[str, object], prd_text: str) -> ApiIssue:
         comment=_comment,
         original_text=original_text,
         span=span,
+        contributing_agents=[str(agent) for agent in contributing_agents]
+        if isinstance(contributing_agents, list)
+        else [],
     )
@@ -3,6 +3,7 @@ from __future__ import annotations
 import time
 import uuid
 from collections import Counter
+from collections.abc import AsyncIterator
 
 from hibikasu_agent.api.schemas.reviews import (
     AgentCount,
@@ -13,30 +14,52 @@ from hibikasu_agent.api.schemas.reviews import (
     SummaryStatistics,
 )
 from hibikasu_agent.services.base import AbstractReviewService
-from hibikasu_agent.services.models import ReviewRuntimeSession
+from hibikasu_agent.services.issue_listing import agent_filter_names
+from hibikasu_agent.services.models import ReviewRuntimeSession, ReviewStatus
+from hibikasu_agent.services.review_events import ReviewEventBroker, session_event_payload
+from hibikasu_agent.services.review_store import AbstractReviewSessionStore, ReviewSessionStore
 
 
 class MockService(AbstractReviewService):
-    """Simple in-memory mock review service for local/dev use."""
+    """Simple mock review service for local/dev use (in-memory store by default)."""
 
-    def __init__(self) -> None:
-        self._store: dict[str, ReviewRuntimeSession] = {}
+    def __init__(
+        self,
+        *,
+        event_broker: ReviewEventBroker | None = None,
+        review_store: AbstractReviewSessionStore | None = None,
+    ) -> None:
+        self._store = review_store or ReviewSessionStore()
+        self._event_broker = event_broker
 
     @property
     def reviews_in_memory(self) -> dict[str, ReviewRuntimeSession]:
-        return self._store
-
-    def new_review_session(
-        self, prd_text: str, panel_type: str | None = None, *, selected_agents: list[str] | None = None
+        return dict(self._store.as_dict())
+
+    def new_review_session(  # noqa: PLR0913
+        self,
+        prd_text: str,
+        panel_type: str | None = None,
+        *,
+        selected_agents: list[str] | None = None,
+        base_review_id: str | None = None,
+        max_issues: int | None = None,
+        max_issues_per_agent: int | None = None,
     ) -> str:
         review_id = str(uuid.uuid4())
-        self._store[review_id] = ReviewRuntimeSession(
-            created_at=time.time(),
-            status="processing",
-            issues=None,
-            prd_text=prd_text,
-            panel_type=panel_type,
-            selected_agent_roles=selected_agents,  # Store selected agents in session
+        self._store.create(
+            review_id,
+            ReviewRuntimeSession(
+                created_at=time.time(),
+                status="processing",
+                issues=None,
+                prd_text=prd_text,
+                panel_type=panel_type,
+                selected_agent_roles=selected_agents,  # Store selected agents in session
+                base_review_id=base_review_id,
+                max_issues=max_issues,
+                max_issues_per_agent=max_issues_per_agent,
+            ),
         )
         return review_id
 
@@ -68,17 +91,41 @@ class MockService(AbstractReviewService):
         sess = self._store.get(review_id)
         if not sess:
             return {"status": "not_found", "issues": None}
-        return {"status": sess.status, "issues": sess.issues, "prd_text": sess.prd_text}
+        return {
+            "status": sess.status,
+            "issues": sess.issues,
+            "prd_text": sess.prd_text,
+            "phase": sess.phase,
+            "phase_message": sess.phase_message,
+            "eta_seconds": sess.eta_seconds,
+            "version": sess.version,
+        }
+
+    def get_review_version(self, review_id: str) -> int | None:
+        return self._store.get_version(review_id)
+
+    def get_review_status(self, review_id: str) -> ReviewStatus | None:
+        return self._store.get_status(review_id)
 
     def find_issue(self, review_id: str, issue_id: str) -> Issue | None:
         session = self._store.get(review_id)
         if not session or not session.issues:
             return None
-        issues = session.issues
-        for issue in issues:
-            if issue.issue_id == issue_id:
-                return issue
-        return None
+        return session.issue_index().get(issue_id)
+
+    def list_issues(
+        self,
+        review_id: str,
+        *,
+        status: str | None = None,
+        agent: str | None = None,
+        priority: int | None = None,
+    ) -> list[tuple[int, Issue]]:
+        session = self._store.get(review_id)
+        if not session or not session.issues:
+            return []
+        agent_names = agent_filter_names(agent) if agent else None
+        return session.issue_index().filter(status=status, agent_names=agent_names, priority=priority)
 
     def kickoff_review(self, review_id: str) -> None:
         """同期実行。モックでは即時に完了させる。"""
@@ -97,7 +144,20 @@ class MockService(AbstractReviewService):
             if pos >= 0:
                 iss.span = IssueSpan(start_index=pos, end_index=pos + len(snippet))
         sess.issues = issues
+        sess.issue_index()
         sess.status = "completed"
+        sess.phase = "completed"
+        sess.phase_message = None
+        sess.eta_seconds = None
+        sess.bump_version()
+        self._store.update(review_id, sess)
+        if self._event_broker is not None:
+            payload = {**session_event_payload(sess), "issues": [issue.model_dump() for issue in issues]}
+            self._event_broker.publish(review_id, "completed", payload)
+
+    async def kickoff_review_async(self, review_id: str) -> None:
+        """モックは計算を伴わないため同期版をそのまま実行する。"""
+        self.kickoff_review(review_id)
 
     async def answer_dialog(self, review_id: str, issue_id: str, question_text: str) -> str:
         issue = self.find_issue(review_id, issue_id)
@@ -109,17 +169,33 @@ class MockService(AbstractReviewService):
             "まずは要件の明確化と簡易な対策から検討してください。"
         )
 
+    async def stream_dialog(self, review_id: str, issue_id: str, question_text: str) -> AsyncIterator[str]:
+        # 行単位で返してストリーミング表示を再現する
+        text = await self.answer_dialog(review_id, issue_id, question_text)
+        for line in text.splitlines(keepends=True):
+            yield line
+
+    def update_queue_position(self, review_id: str, position: int, eta_seconds: int | None) -> None:
+        sess = self._store.get(review_id)
+        if not sess or sess.status != "processing":
+            return
+        sess.phase = "queued"
+        sess.phase_message = f"順番待ち中です（{position}番目）"
+        sess.eta_seconds = eta_seconds
+        sess.bump_version()
+        self._store.update(review_id, sess)
+        if self._event_broker is not None:
+            self._event_broker.publish(review_id, "progress", session_event_payload(sess))
+
     def update_issue_status(self, review_id: str, issue_id: str, status: str) -> bool:
         session = self._store.get(review_id)
         if not session or not session.issues:
             return False
-        issues = session.issues
-        for issue in issues:
-            if issue.issue_id == issue_id:
-                # api.schemas.Issue には optional な status フィールドがあるため、直接更新可能
-                issue.status = status
-                return True
-        return False
+        # api.schemas.Issue には optional な status フィールドがあるため、インデックス経由で直接更新する
+        issue = session.issue_index().set_status(issue_id, status)
+        if issue is None:
+            return False
+        return self._store.update_issue(review_id, issue, version=session.bump_version())
 
     def get_review_summary(self, review_id: str) -> dict[str, object]:
         session = self._store.get(review_id)
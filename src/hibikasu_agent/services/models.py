@@ -2,9 +2,13 @@ from __future__ import annotations
 
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
-from hibikasu_agent.api.schemas.reviews import Issue
+from hibikasu_agent.api.schemas.reviews import Issue, TokenUsage
+from hibikasu_agent.schemas.models import FinalIssue
+from hibikasu_agent.services.issue_index import IssueIndex
+
+ReviewStatus = Literal["processing", "completed", "failed"]
 
 
 class ReviewRuntimeSession(BaseModel):
@@ -14,8 +18,11 @@ class ReviewRuntimeSession(BaseModel):
     """
 
     created_at: float = Field(description="Epoch seconds when the session was created")
-    status: Literal["processing", "completed", "failed"] = Field(default="processing")
+    status: ReviewStatus = Field(default="processing")
     issues: list[Issue] | None = Field(default=None, description="Computed issues when completed")
+    provisional_issues: list[Issue] = Field(
+        default_factory=list, description="Issues of specialists that already finished, before aggregation"
+    )
     prd_text: str = Field(default="")
     panel_type: str | None = Field(default=None)
     error: str | None = Field(default=None, description="Error details when status is failed")
@@ -28,3 +35,42 @@ class ReviewRuntimeSession(BaseModel):
     selected_agent_roles: list[str] | None = Field(
         default=None, description="Original agent roles selected for this review session"
     )
+    chunk_progress: dict[str, list[int]] = Field(
+        default_factory=dict, description="Completed chunk indices per agent in chunked reviews"
+    )
+    base_review_id: str | None = Field(
+        default=None, description="Previous review used as the baseline for an incremental re-review"
+    )
+    max_issues: int | None = Field(default=None, description="Requested top-K of the issue ranking")
+    max_issues_per_agent: int | None = Field(default=None, description="Requested per-specialist issue quota")
+    truncated_issues: list[FinalIssue] = Field(
+        default_factory=list,
+        description="Issues cut by the ranking, kept unmapped until a client asks for them",
+    )
+    agent_errors: dict[str, str] = Field(
+        default_factory=dict, description="Specialists (agent key) that failed and contributed no issues"
+    )
+    token_usage: dict[str, TokenUsage] = Field(
+        default_factory=dict, description="LLM token usage per agent (chunk agents are folded into their specialist)"
+    )
+    model: str | None = Field(default=None, description="Model that served the review's LLM calls")
+    cache_status: Literal["hit", "miss"] | None = Field(
+        default=None, description="Whether the result was served from the review result cache"
+    )
+    version: int = Field(default=0, description="Bumped on every visible change; used for ETags and long polls")
+
+    _issue_index: IssueIndex | None = PrivateAttr(default=None)
+
+    def bump_version(self) -> int:
+        self.version += 1
+        return self.version
+
+    def issue_index(self) -> IssueIndex:
+        """Index of ``issues``, rebuilt only when the list was replaced (e.g. on completion)."""
+
+        issues = self.issues if self.issues is not None else []
+        index = self._issue_index
+        if index is None or not index.covers(issues):
+            index = IssueIndex(issues)
+            self._issue_index = index
+        return index
@@ -2,44 +2,107 @@ from __future__ import annotations
 
 import os
 import time
-from collections.abc import Callable
-from contextlib import suppress
-from uuid import uuid4
+from collections.abc import AsyncIterator, Callable
+from dataclasses import replace
 
+from google.adk.agents import RunConfig
 from google.adk.events.event import Event
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
+from google.adk.sessions.base_session_service import BaseSessionService
 from google.genai import types as genai_types
 
+from hibikasu_agent.agents.parallel_orchestrator.agent import create_coordinator_agent, create_dialog_agent
+
 # Internal imports
-from hibikasu_agent.agents.parallel_orchestrator.agent import (
-    create_coordinator_agent,
-    create_parallel_review_agent,
-)
+from hibikasu_agent.agents.parallel_orchestrator.issue_ranking import RankingOptions
+from hibikasu_agent.agents.parallel_orchestrator.registry import ReviewPipelineRegistry
+from hibikasu_agent.agents.specialist_timing import SpecialistTimingPolicy
 from hibikasu_agent.api.schemas.reviews import Issue as ApiIssue
-from hibikasu_agent.constants.agents import ROLE_TO_DEFINITION, SPECIALIST_DEFINITIONS
+from hibikasu_agent.constants.agents import (
+    PRD_TEXT_STATE_KEY,
+    REVIEW_CHUNKS_STATE_KEY,
+    REVIEW_RANKING_STATE_KEY,
+    ROLE_TO_DEFINITION,
+    SPECIALIST_DEFINITIONS,
+    definition_for_agent_name,
+)
 from hibikasu_agent.services.mappers.api_issue_mapper import map_api_issue
 from hibikasu_agent.services.providers.adk_session_factory import (
     AdkSessionContext,
     AdkSessionFactory,
 )
+from hibikasu_agent.services.providers.dialog_sessions import DialogSessionPool
 from hibikasu_agent.utils.logging_config import get_logger
+from hibikasu_agent.utils.metrics import FAILURES_TOTAL, REVIEW_PIPELINE_SECONDS
+from hibikasu_agent.utils.prd_sections import PrdChunk, chunk_prd
+from hibikasu_agent.utils.tracing import tracer
 
 logger = get_logger(__name__)
 
+DEFAULT_ADK_MODEL = "gemini-2.5-flash-lite"
+
+# PRDs longer than the threshold are reviewed in overlapping, section-aware chunks
+DEFAULT_CHUNK_THRESHOLD_CHARS = 60_000
+DEFAULT_CHUNK_MAX_CHARS = 30_000
+DEFAULT_CHUNK_OVERLAP_CHARS = 1_000
+
+DIALOG_APP_NAME = "hibikasu_review_api"
+DIALOG_EMPTY_ANSWER = "回答を生成できませんでした。"
+DIALOG_FALLBACK_ANSWER = "（簡易回答）現在うまく回答できません。時間を置いて再度お試しください。"
+
+
+def resolve_adk_model() -> str:
+    """Return the model configured via ``ADK_MODEL`` (falls back to the default)."""
+
+    return os.getenv("ADK_MODEL") or DEFAULT_ADK_MODEL
+
 
 class ADKService:
     """ADKの実行ロジックをカプセル化するサービス"""
 
-    def __init__(self, *, session_factory: AdkSessionFactory | None = None) -> None:
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        session_factory: AdkSessionFactory | None = None,
+        pipeline_registry: ReviewPipelineRegistry | None = None,
+        chunk_threshold_chars: int = DEFAULT_CHUNK_THRESHOLD_CHARS,
+        chunk_max_chars: int = DEFAULT_CHUNK_MAX_CHARS,
+        chunk_overlap_chars: int = DEFAULT_CHUNK_OVERLAP_CHARS,
+        dialog_idle_ttl_seconds: float = 30 * 60,
+        dialog_max_history_tokens: int = 200_000,
+        dialog_direct_routing: bool = True,
+        dialog_session_service: BaseSessionService | None = None,
+        specialist_retry_options: genai_types.HttpRetryOptions | None = None,
+        specialist_timing: SpecialistTimingPolicy | None = None,
+        issue_ranking: RankingOptions | None = None,
+    ) -> None:
         """
         アプリケーションのライフサイクル中に維持されるステートフルなコンポーネントを初期化する。
         - 対話用コーディネーターエージェント
         - 対話履歴を保持するセッションサービス
+        - 論点ごとの対話セッションを再利用するプールと、共有 Runner
+        - 直接ルーティング時に使う専門家ごとのチャット Runner（初回利用時に生成）
+        - 一時的な API エラーを専門家ごとに指数バックオフで再試行するレビューパイプライン
+        - 専門家ごとの制限時間とヘッジリクエスト（遅い専門家を待たずに残りを集約）
+        - 指摘のランキング既定値（上位K件・専門家ごとの上限・重み。レビューごとに上書き可能）
         """
-        model_name = os.getenv("ADK_MODEL") or "gemini-2.5-flash-lite"
+        model_name = resolve_adk_model()
+        self._model_name = model_name
         self._coordinator_agent = create_coordinator_agent(model=model_name)
-        self._chat_session_service = InMemorySessionService()  # type: ignore[no-untyped-call]
+        # Shared across workers when a shared state backend is configured
+        self._chat_session_service = dialog_session_service or InMemorySessionService()  # type: ignore[no-untyped-call]
+        self._dialog_runner = Runner(
+            agent=self._coordinator_agent, app_name=DIALOG_APP_NAME, session_service=self._chat_session_service
+        )
+        self._dialog_sessions = DialogSessionPool(
+            self._chat_session_service,
+            app_name=DIALOG_APP_NAME,
+            idle_ttl_seconds=dialog_idle_ttl_seconds,
+            max_history_tokens=dialog_max_history_tokens,
+        )
+        self._dialog_direct_routing = dialog_direct_routing
+        self._role_dialog_runners: dict[str, Runner] = {}
         self._default_specialist_agents: list[str] = [
             "engineer_specialist",
             "ux_designer_specialist",
@@ -47,8 +110,23 @@ class ADKService:
             "pm_specialist",
         ]
         self._session_factory = session_factory or AdkSessionFactory()
+        # Pipelines are built once per (model, roles, chunk count) and shared across reviews
+        self._specialist_timing = specialist_timing
+        self._pipeline_registry = pipeline_registry or ReviewPipelineRegistry(
+            retry_options=specialist_retry_options, timing=specialist_timing
+        )
+        self._chunk_threshold_chars = chunk_threshold_chars
+        self._chunk_max_chars = chunk_max_chars
+        self._chunk_overlap_chars = chunk_overlap_chars
+        self._issue_ranking = issue_ranking or RankingOptions()
         logger.info("ADKService initialized.")
 
+    @property
+    def specialist_timing(self) -> SpecialistTimingPolicy | None:
+        """Deadline/hedging policy of the review specialists (its tracker holds hedge counters)."""
+
+        return self._specialist_timing
+
     @property
     def default_review_agents(self) -> list[str]:
         """Returns the default specialist agent names involved in the review."""
@@ -80,6 +158,8 @@ class ADKService:
         *,
         on_event: Callable[[Event], None] | None = None,
         selected_agents: list[str] | None = None,
+        max_issues: int | None = None,
+        max_issues_per_agent: int | None = None,
     ) -> list[ApiIssue]:
         """
         PRDのレビューを非同期で実行する。呼び出し毎に独立した ADK セッションを生成・破棄する。
@@ -88,18 +168,51 @@ class ADKService:
             prd_text: レビュー対象のPRDテキスト
             on_event: イベントコールバック関数
             selected_agents: 使用するエージェントのロール一覧（例: ["engineer", "pm"]）
+            max_issues: 返す指摘の上限（未指定ならサーバー既定値）
+            max_issues_per_agent: 専門家ごとの指摘の上限（未指定ならサーバー既定値）
         """
         try:
-            model_name = os.getenv("ADK_MODEL") or "gemini-2.5-flash-lite"
-            agent = create_parallel_review_agent(model=model_name, selected_agents=selected_agents)
-
-            session_ctx: AdkSessionContext = await self._session_factory.create_session(agent)
-
-            content = genai_types.Content(role="user", parts=[genai_types.Part(text=str(prd_text))])
+            model_name = resolve_adk_model()
+            with tracer.start_as_current_span("review.pipeline_build") as build_span:
+                ranking = replace(
+                    self._issue_ranking,
+                    top_k=max_issues or self._issue_ranking.top_k,
+                    per_agent_quota=max_issues_per_agent or self._issue_ranking.per_agent_quota,
+                )
+                state: dict[str, object] = {
+                    PRD_TEXT_STATE_KEY: prd_text,
+                    REVIEW_RANKING_STATE_KEY: ranking.to_state(),
+                }
+                chunks: list[PrdChunk] = []
+                if 0 < self._chunk_threshold_chars < len(prd_text):
+                    chunks = chunk_prd(
+                        prd_text, max_chars=self._chunk_max_chars, overlap_chars=self._chunk_overlap_chars
+                    )
+                if len(chunks) > 1:
+                    # Map-reduce: specialists read their chunk from state; the message only triggers the run
+                    agent = self._pipeline_registry.get(
+                        model_name, selected_agents=selected_agents, chunk_count=len(chunks)
+                    )
+                    state[REVIEW_CHUNKS_STATE_KEY] = [
+                        {"index": chunk.index, "start": chunk.start, "end": chunk.end} for chunk in chunks
+                    ]
+                    message = f"長いPRDを{len(chunks)}個のチャンクに分割しました。担当チャンクをレビューしてください。"
+                else:
+                    agent = self._pipeline_registry.get(model_name, selected_agents=selected_agents)
+                    message = str(prd_text)
+
+                session_ctx: AdkSessionContext = await self._session_factory.create_session(agent, state=state)
+                build_span.set_attribute("hibikasu.chunks", max(1, len(chunks)))
+                build_span.set_attribute("hibikasu.agents", ",".join(selected_agents or []))
+
+            content = genai_types.Content(role="user", parts=[genai_types.Part(text=message)])
 
             # ログ出力：送信されるプロンプト
-            logger.info(f"Sending PRD to ADK - length: {len(prd_text)}, agents: {selected_agents}, model: {model_name}")
-            logger.info(f"PRD first 500 chars: {prd_text[:500]}")
+            logger.info(
+                f"Sending PRD to ADK - length: {len(prd_text)}, chunks: {max(1, len(chunks))}, "
+                f"agents: {selected_agents}, model: {model_name}"
+            )
+            logger.debug(f"PRD first 500 chars: {prd_text[:500]}")
 
             _t0 = time.perf_counter()
             async for event in session_ctx.runner.run_async(
@@ -114,6 +227,7 @@ class ADKService:
                     except Exception as cb_err:
                         logger.warning("on_event callback failed", exc_info=cb_err)
             _elapsed_ms = int((time.perf_counter() - _t0) * 1000)
+            REVIEW_PIPELINE_SECONDS.observe(_elapsed_ms / 1000, mode="chunked" if len(chunks) > 1 else "single")
 
             sess = await session_ctx.session_service.get_session(
                 app_name=session_ctx.app_name,
@@ -124,6 +238,7 @@ class ADKService:
             final_review_issues = state.get("final_review_issues")
             if not final_review_issues or not isinstance(final_review_issues, dict):
                 logger.error("No final_review_issues in state")
+                FAILURES_TOTAL.inc(reason="missing_final_issues")
                 return []
             final_issues: list[dict[str, object]] = final_review_issues.get("final_issues", [])
 
@@ -136,51 +251,130 @@ class ADKService:
             # No local aggregation fallback: rely on orchestrator outputs
 
             api_issues: list[ApiIssue] = []
-            for item in final_issues:
-                try:
-                    api_issue = map_api_issue(item, prd_text)
-                    api_issues.append(api_issue)
-                except Exception as err:  # validation error on a single item
-                    logger.warning("Skipping invalid ADK issue: %s | data=%s", err, item)
+            with tracer.start_as_current_span("review.mapping", attributes={"hibikasu.issues": len(final_issues)}):
+                for item in final_issues:
+                    try:
+                        api_issue = map_api_issue(item, prd_text)
+                        api_issues.append(api_issue)
+                    except Exception as err:  # validation error on a single item
+                        logger.warning("Skipping invalid ADK issue: %s | data=%s", err, item)
+                        FAILURES_TOTAL.inc(reason="invalid_issue")
             return api_issues
         except Exception as err:  # nosec B110
             logger.error("ADK run failed", extra={"error": str(err)}, exc_info=True)
+            FAILURES_TOTAL.inc(reason="pipeline_error")
             raise
 
-    async def answer_dialog_async(self, issue: ApiIssue, question_text: str) -> str:
-        """
-        特定のIssueに関するユーザーの質問に回答する。初期化時のエージェントと
-        セッションサービスを利用して会話の文脈を維持する。
-        """
-        try:
-            coord = self._coordinator_agent
-            cs = self._chat_session_service
-
-            # Compose runtime context (instruction is owned by coordinator agent via TOML)
+    @staticmethod
+    def _dialog_prompt(issue: ApiIssue, question_text: str, *, first_turn: bool) -> genai_types.Content:
+        if first_turn:
+            # Compose runtime context once (instruction is owned by coordinator agent via TOML)
             prompt = (
                 f"- 担当領域の目安: {issue.agent_name}\n"
                 f"- PRD抜粋: {issue.original_text}\n"
                 f"- 指摘: {issue.comment}\n\n"
                 f"ユーザーの質問: {question_text}"
             )
+        else:
+            prompt = f"ユーザーの質問: {question_text}"
+        return genai_types.Content(role="user", parts=[genai_types.Part(text=prompt)])
+
+    @staticmethod
+    def _prompt_text(content: genai_types.Content) -> str:
+        parts = content.parts or []
+        return "".join(part.text or "" for part in parts)
+
+    @staticmethod
+    def _event_text(event: Event) -> str:
+        event_content = getattr(event, "content", None)
+        if event_content and getattr(event_content, "parts", None):
+            return "".join(part.text or "" for part in event_content.parts if getattr(part, "text", None))
+        return ""
+
+    def _dialog_runner_for(self, issue: ApiIssue) -> Runner:
+        """論点を出した専門家のチャットエージェントへ直接つなぐ Runner を返す。
+
+        ``agent_name`` から専門家を特定できない場合のみ、コーディネーター経由
+        （transfer_to_agent による LLM ルーティング）にフォールバックする。
+        """
+        definition = definition_for_agent_name(issue.agent_name) if self._dialog_direct_routing else None
+        if definition is None:
+            return self._dialog_runner
+        runner = self._role_dialog_runners.get(definition.role)
+        if runner is None:
+            runner = Runner(
+                agent=create_dialog_agent(definition.role, model=self._model_name),
+                app_name=DIALOG_APP_NAME,
+                session_service=self._chat_session_service,
+            )
+            self._role_dialog_runners[definition.role] = runner
+        return runner
 
-            session_id = f"dialog_{uuid4()}"
-            app_name = "hibikasu_review_api"
-
-            # Ensure session exists (create if missing)
-            with suppress(Exception):
-                await cs.create_session(app_name=app_name, user_id="dialog_user", session_id=session_id)
-
-            runner = Runner(agent=coord, app_name=app_name, session_service=cs)
-            content = genai_types.Content(role="user", parts=[genai_types.Part(text=prompt)])
-
-            final_text = ""
-            async for event in runner.run_async(user_id="dialog_user", session_id=session_id, new_message=content):
-                if getattr(event, "is_final_response", lambda: False)() and getattr(event, "content", None):
-                    event_content = getattr(event, "content", None)
-                    if event_content and hasattr(event_content, "parts") and event_content.parts:
-                        final_text = event_content.parts[0].text or ""
-            return final_text or "回答を生成できませんでした。"
+    async def answer_dialog_async(self, issue: ApiIssue, question_text: str, *, review_id: str = "") -> str:
+        """
+        特定のIssueに関するユーザーの質問に回答する。(review_id, issue_id) ごとの対話セッションを
+        再利用するため、追質問では前回までの会話履歴を踏まえて差分のターンのみを送信する。
+        """
+        key = (review_id, issue.issue_id)
+        try:
+            session = await self._dialog_sessions.acquire(key)
+            async with session.lock:
+                content = self._dialog_prompt(issue, question_text, first_turn=session.turns == 0)
+                final_text = ""
+                async for event in self._dialog_runner_for(issue).run_async(
+                    user_id=self._dialog_sessions.user_id, session_id=session.session_id, new_message=content
+                ):
+                    if getattr(event, "is_final_response", lambda: False)() and getattr(event, "content", None):
+                        final_text = self._event_text(event)
+                await self._dialog_sessions.record_turn(key, self._prompt_text(content), final_text)
+            return final_text or DIALOG_EMPTY_ANSWER
         except Exception as err:  # nosec B110
             logger.error("Dialog execution failed", extra={"error": str(err)})
-            return "（簡易回答）現在うまく回答できません。時間を置いて再度お試しください。"
+            FAILURES_TOTAL.inc(reason="dialog_error")
+            # Do not keep a half-written conversation around
+            await self._dialog_sessions.discard(key)
+            return DIALOG_FALLBACK_ANSWER
+
+    async def stream_dialog_async(
+        self, issue: ApiIssue, question_text: str, *, review_id: str = ""
+    ) -> AsyncIterator[str]:
+        """
+        ``answer_dialog_async`` のストリーミング版。モデルの部分応答（SSE モード）を届いた順に
+        テキスト差分として返す。対話セッションの再利用と履歴の計上は非ストリーミング版と共通。
+        """
+        key = (review_id, issue.issue_id)
+        emitted: list[str] = []
+        try:
+            session = await self._dialog_sessions.acquire(key)
+            async with session.lock:
+                content = self._dialog_prompt(issue, question_text, first_turn=session.turns == 0)
+                final_text = ""
+                async for event in self._dialog_runner_for(issue).run_async(
+                    user_id=self._dialog_sessions.user_id,
+                    session_id=session.session_id,
+                    new_message=content,
+                    # Validated from the value: StreamingMode is not exported by google.adk.agents
+                    run_config=RunConfig.model_validate({"streaming_mode": "sse"}),
+                ):
+                    text = self._event_text(event)
+                    if getattr(event, "partial", False):
+                        if text:
+                            emitted.append(text)
+                            yield text
+                    elif getattr(event, "is_final_response", lambda: False)() and text:
+                        final_text = text
+                if final_text and not emitted:
+                    # Model returned the answer in one piece (streaming unsupported)
+                    emitted.append(final_text)
+                    yield final_text
+                await self._dialog_sessions.record_turn(key, self._prompt_text(content), final_text or "".join(emitted))
+            if not emitted:
+                yield DIALOG_EMPTY_ANSWER
+        except Exception as err:  # nosec B110
+            logger.error("Dialog streaming failed", extra={"error": str(err)})
+            FAILURES_TOTAL.inc(reason="dialog_error")
+            await self._dialog_sessions.discard(key)
+            if not emitted:
+                yield DIALOG_FALLBACK_ANSWER
+            else:
+                raise
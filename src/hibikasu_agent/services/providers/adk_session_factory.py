@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Any
 from uuid import uuid4
 
 from google.adk.runners import Runner
@@ -22,8 +23,11 @@ class AdkSessionFactory:
     def __init__(self, app_name: str = "hibikasu_review_api") -> None:
         self._app_name = app_name
 
-    async def create_session(self, agent) -> AdkSessionContext:  # type: ignore[no-untyped-def]
-        """Build a runner and session service bound to unique identifiers."""
+    async def create_session(self, agent, *, state: dict[str, Any] | None = None) -> AdkSessionContext:  # type: ignore[no-untyped-def]
+        """Build a runner and session service bound to unique identifiers.
+
+        ``state`` seeds the session state visible to the agents (e.g. the PRD text).
+        """
 
         session_service = InMemorySessionService()  # type: ignore[no-untyped-call]
         user_id = f"api_user_{uuid4()}"
@@ -33,6 +37,7 @@ class AdkSessionFactory:
             app_name=self._app_name,
             user_id=user_id,
             session_id=session_id,
+            state=state,
         )
         runner = Runner(agent=agent, app_name=self._app_name, session_service=session_service)
         return AdkSessionContext(
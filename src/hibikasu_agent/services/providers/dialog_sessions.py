@@ -0,0 +1,150 @@
+"""Pool of per-issue ADK chat sessions reused across dialog turns."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from uuid import NAMESPACE_URL, uuid5
+
+from google.adk.sessions.base_session_service import BaseSessionService
+
+from hibikasu_agent.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DialogKey = tuple[str, str]
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate: ~4 ASCII characters or 1 non-ASCII character per token."""
+
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+@dataclass
+class DialogSession:
+    session_id: str
+    last_used: float = field(default_factory=time.monotonic)
+    history_tokens: int = 0
+    turns: int = 0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class DialogSessionPool:
+    """Keeps one chat session per (review_id, issue_id) in a shared session service.
+
+    Follow-up questions land in the same session so the coordinator sees
+    the earlier turns. Session ids are derived from the key, so with a shared
+    session service another worker picks up the same conversation. Sessions idle longer than ``idle_ttl_seconds`` are
+    deleted, and when the estimated history of all sessions exceeds
+    ``max_history_tokens`` the least recently used ones are dropped.
+    """
+
+    def __init__(
+        self,
+        session_service: BaseSessionService,
+        *,
+        app_name: str,
+        user_id: str = "dialog_user",
+        idle_ttl_seconds: float = 30 * 60,
+        max_history_tokens: int = 200_000,
+    ) -> None:
+        self._session_service = session_service
+        self._app_name = app_name
+        self._user_id = user_id
+        self._idle_ttl = idle_ttl_seconds
+        self._max_history_tokens = max_history_tokens
+        self._sessions: OrderedDict[DialogKey, DialogSession] = OrderedDict()
+
+    @property
+    def user_id(self) -> str:
+        return self._user_id
+
+    @property
+    def total_history_tokens(self) -> int:
+        return sum(session.history_tokens for session in self._sessions.values())
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    async def acquire(self, key: DialogKey) -> DialogSession:
+        """Return the session for ``key``, creating it (and evicting stale ones) as needed."""
+
+        await self.evict_idle()
+        session = self._sessions.get(key)
+        if session is None:
+            session = await self._load_or_create(key)
+            self._sessions[key] = session
+        self._sessions.move_to_end(key)
+        session.last_used = time.monotonic()
+        return session
+
+    async def record_turn(self, key: DialogKey, *texts: str) -> None:
+        """Account a finished turn against the history budget."""
+
+        session = self._sessions.get(key)
+        if session is None:
+            return
+        session.turns += 1
+        session.history_tokens += sum(estimate_tokens(text) for text in texts)
+        session.last_used = time.monotonic()
+        await self._enforce_history_budget(keep=key)
+
+    async def discard(self, key: DialogKey) -> None:
+        session = self._sessions.pop(key, None)
+        if session is not None:
+            await self._delete(session)
+
+    async def evict_idle(self) -> None:
+        now = time.monotonic()
+        stale = [
+            key
+            for key, session in self._sessions.items()
+            if now - session.last_used > self._idle_ttl and not session.lock.locked()
+        ]
+        for key in stale:
+            await self.discard(key)
+        if stale:
+            logger.debug("evicted idle dialog sessions", extra={"count": len(stale)})
+
+    async def _enforce_history_budget(self, *, keep: DialogKey) -> None:
+        for key in list(self._sessions):
+            if self.total_history_tokens <= self._max_history_tokens:
+                return
+            if key == keep or self._sessions[key].lock.locked():
+                continue
+            await self.discard(key)
+        if self.total_history_tokens > self._max_history_tokens:
+            # A single conversation outgrew the budget; restart it on the next turn
+            await self.discard(keep)
+
+    async def _load_or_create(self, key: DialogKey) -> DialogSession:
+        session_id = "dialog_" + uuid5(NAMESPACE_URL, "\x00".join(key)).hex
+        existing = await self._session_service.get_session(
+            app_name=self._app_name, user_id=self._user_id, session_id=session_id
+        )
+        if existing is None:
+            await self._session_service.create_session(
+                app_name=self._app_name, user_id=self._user_id, session_id=session_id
+            )
+            return DialogSession(session_id=session_id)
+        # Conversation started on another worker: rebuild the local accounting from its events
+        turns = 0
+        history_tokens = 0
+        for event in existing.events:
+            if event.author == "user":
+                turns += 1
+            parts = event.content.parts if event.content and event.content.parts else []
+            history_tokens += sum(estimate_tokens(part.text or "") for part in parts)
+        return DialogSession(session_id=session_id, turns=turns, history_tokens=history_tokens)
+
+    async def _delete(self, session: DialogSession) -> None:
+        try:
+            await self._session_service.delete_session(
+                app_name=self._app_name, user_id=self._user_id, session_id=session.session_id
+            )
+        except Exception:  # nosec B110
+            logger.debug("failed to delete dialog session", exc_info=True)
@@ -0,0 +1,100 @@
+"""ADK session service persisting dialog sessions in the shared state backend."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+from uuid import uuid4
+
+from google.adk.events.event import Event
+from google.adk.sessions import Session
+from google.adk.sessions.base_session_service import BaseSessionService, GetSessionConfig, ListSessionsResponse
+
+from hibikasu_agent.services.shared_state import SharedStateBackend
+
+_SESSION_PREFIX = "adk_session:"
+
+
+class SharedStateSessionService(BaseSessionService):
+    """Stores each ADK session as one JSON document so any worker can continue a dialog.
+
+    Only session-scoped state is supported (the dialog agents do not use
+    ``app:``/``user:`` state). Concurrent turns on the same session from two
+    workers are last-writer-wins; the dialog pool serializes turns per process.
+    """
+
+    def __init__(self, backend: SharedStateBackend, *, ttl_seconds: float | None = None) -> None:
+        self._backend = backend
+        self._ttl = ttl_seconds
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: dict[str, Any] | None = None,
+        session_id: str | None = None,
+    ) -> Session:
+        session = Session(
+            id=(session_id or "").strip() or str(uuid4()),
+            app_name=app_name,
+            user_id=user_id,
+            state=dict(state or {}),
+            last_update_time=time.time(),
+        )
+        self._save(session)
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: GetSessionConfig | None = None,
+    ) -> Session | None:
+        raw = self._backend.get(self._key(app_name, user_id, session_id))
+        if raw is None:
+            return None
+        session = Session.model_validate_json(raw)
+        if config is not None:
+            events = session.events
+            if config.num_recent_events is not None:
+                events = events[-config.num_recent_events :] if config.num_recent_events else []
+            if config.after_timestamp is not None:
+                events = [event for event in events if event.timestamp >= config.after_timestamp]
+            session.events = events
+        return session
+
+    async def list_sessions(self, *, app_name: str, user_id: str | None = None) -> ListSessionsResponse:
+        prefix = f"{_SESSION_PREFIX}{app_name}:" + (f"{user_id}:" if user_id is not None else "")
+        sessions: list[Session] = []
+        for key in self._backend.scan(prefix):
+            raw = self._backend.get(key)
+            if raw is not None:
+                session = Session.model_validate_json(raw)
+                session.events = []
+                sessions.append(session)
+        sessions.sort(key=lambda item: item.last_update_time)
+        return ListSessionsResponse(sessions=sessions)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        self._backend.delete(self._key(app_name, user_id, session_id))
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await super().append_event(session, event)
+        if not event.partial:
+            session.last_update_time = event.timestamp
+            self._save(session)
+        return event
+
+    @staticmethod
+    def _key(app_name: str, user_id: str, session_id: str) -> str:
+        return f"{_SESSION_PREFIX}{app_name}:{user_id}:{session_id}"
+
+    def _save(self, session: Session) -> None:
+        self._backend.set(
+            self._key(session.app_name, session.user_id, session.id),
+            session.model_dump_json(),
+            ttl_seconds=self._ttl,
+        )
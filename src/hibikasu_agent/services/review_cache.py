@@ -0,0 +1,179 @@
+"""Content-addressed cache of completed review results."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from functools import lru_cache
+from pathlib import Path
+
+from pydantic import BaseModel, Field, TypeAdapter
+
+from hibikasu_agent.agents.specialist import AGENT_PROMPTS_PATH
+from hibikasu_agent.api.schemas.reviews import Issue
+from hibikasu_agent.schemas.models import FinalIssue
+from hibikasu_agent.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class CachedReview(BaseModel):
+    """A cached review result: the ranked issues and those cut by the issue limits."""
+
+    issues: list[Issue]
+    truncated_issues: list[FinalIssue] = Field(default_factory=list)
+
+
+# Entries written before truncated issues were cached are bare issue lists
+_PAYLOAD_ADAPTER: TypeAdapter[CachedReview | list[Issue]] = TypeAdapter(CachedReview | list[Issue])
+
+
+def _load_payload(payload: bytes) -> CachedReview:
+    loaded = _PAYLOAD_ADAPTER.validate_json(payload)
+    return loaded if isinstance(loaded, CachedReview) else CachedReview(issues=loaded)
+
+
+def normalize_prd_text(prd_text: str) -> str:
+    """Normalize insignificant differences (newline style, trailing spaces, outer blank lines)."""
+
+    lines = prd_text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip("\n")
+
+
+@lru_cache(maxsize=8)
+def _file_digest(path: str, mtime: float) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def prompts_digest(path: Path = AGENT_PROMPTS_PATH) -> str:
+    """Hash of the agent prompt definitions; recomputed only when the file changes."""
+
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return "missing"
+    return _file_digest(str(path), mtime)
+
+
+def build_review_cache_key(  # noqa: PLR0913
+    prd_text: str,
+    agent_keys: Iterable[str],
+    *,
+    model: str,
+    prompts_hash: str | None = None,
+    issue_limits: tuple[int | None, int | None] = (None, None),
+    agent_weights: Mapping[str, float] | None = None,
+) -> str:
+    """Return the cache key for a review of ``prd_text`` by ``agent_keys`` on ``model``.
+
+    ``issue_limits`` is the review's ``(max_issues, max_issues_per_agent)``
+    override and ``agent_weights`` the ranking weights; reviews using the
+    server defaults share keys as before.
+    """
+
+    payload: dict[str, object] = {
+        "prd": hashlib.sha256(normalize_prd_text(prd_text).encode("utf-8")).hexdigest(),
+        "agents": sorted(set(agent_keys)),
+        "model": model,
+        "prompts": prompts_hash if prompts_hash is not None else prompts_digest(),
+    }
+    if any(limit is not None for limit in issue_limits):
+        payload["issue_limits"] = list(issue_limits)
+    if agent_weights:
+        payload["agent_weights"] = dict(sorted(agent_weights.items()))
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ReviewResultCache:
+    """Two-tier cache: in-memory LRU with TTL, optionally backed by SQLite.
+
+    Entries are stored serialized so callers always receive fresh ``Issue``
+    instances that they may mutate (e.g. per-review status).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 256,
+        ttl_seconds: float = 24 * 60 * 60,
+        db_path: str | Path | None = None,
+    ) -> None:
+        self._max_entries = max(1, max_entries)
+        self._ttl = ttl_seconds
+        self._memory: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        if db_path:
+            self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS review_cache (key TEXT PRIMARY KEY, created_at REAL NOT NULL, payload BLOB)"
+            )
+            self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def get(self, key: str) -> list[Issue] | None:
+        """Return cached issues for ``key`` or ``None`` on miss/expiry."""
+
+        review = self.get_review(key)
+        return review.issues if review is not None else None
+
+    def get_review(self, key: str) -> CachedReview | None:
+        """Return the cached review for ``key`` or ``None`` on miss/expiry."""
+
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, payload = entry
+                if now - created_at <= self._ttl:
+                    self._memory.move_to_end(key)
+                    return _load_payload(payload)
+                del self._memory[key]
+
+            if self._db is None:
+                return None
+            row = self._db.execute("SELECT created_at, payload FROM review_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            created_at, payload = row
+            if now - created_at > self._ttl:
+                self._db.execute("DELETE FROM review_cache WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            self._remember(key, created_at, payload)
+            return _load_payload(payload)
+
+    def set(self, key: str, issues: list[Issue], *, truncated_issues: list[FinalIssue] | None = None) -> None:
+        """Store issues and truncated issues under ``key`` (status fields are dropped)."""
+
+        cleaned = [issue.model_copy(update={"status": None}) for issue in issues]
+        payload = CachedReview(issues=cleaned, truncated_issues=truncated_issues or []).model_dump_json().encode()
+        created_at = time.time()
+        with self._lock:
+            self._remember(key, created_at, payload)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO review_cache (key, created_at, payload) VALUES (?, ?, ?)",
+                    (key, created_at, payload),
+                )
+                self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM review_cache")
+                self._db.commit()
+
+    def _remember(self, key: str, created_at: float, payload: bytes) -> None:
+        self._memory[key] = (created_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_entries:
+            self._memory.popitem(last=False)
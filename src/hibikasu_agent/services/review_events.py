@@ -0,0 +1,226 @@
+"""Per-review pub/sub channels backing the Server-Sent Events stream."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from hibikasu_agent.services.models import ReviewRuntimeSession
+from hibikasu_agent.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+TERMINAL_EVENTS = frozenset({"completed", "failed"})
+
+
+def session_event_payload(session: ReviewRuntimeSession) -> dict[str, Any]:
+    """Progress fields sent with every event (never the PRD text)."""
+
+    return {
+        "status": session.status,
+        "progress": session.progress,
+        "phase": session.phase,
+        "phase_message": session.phase_message,
+        "eta_seconds": session.eta_seconds,
+        "expected_agents": list(session.expected_agents),
+        "completed_agents": list(session.completed_agents),
+    }
+
+
+@dataclass(frozen=True)
+class ReviewEvent:
+    """A single progress delta; ``id`` increases monotonically per review."""
+
+    id: int
+    event: str
+    data: dict[str, Any]
+
+    def to_sse(self, *, include_id: bool = True) -> str:
+        """Render the event; without ``include_id`` the client's ``Last-Event-ID`` is left unchanged."""
+
+        payload = json.dumps(self.data, ensure_ascii=False, separators=(",", ":"))
+        id_line = f"id: {self.id}\n" if include_id else ""
+        return f"{id_line}event: {self.event}\ndata: {payload}\n\n"
+
+
+@dataclass
+class _Subscriber:
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue[ReviewEvent]
+
+
+@dataclass
+class _Channel:
+    history: deque[ReviewEvent]
+    subscribers: list[_Subscriber] = field(default_factory=list)
+    last_id: int = 0
+    closed_at: float | None = None
+
+
+class ReviewEventBroker:
+    """Fan progress events out to SSE subscribers, keeping a short replay buffer.
+
+    Publishing is synchronous and cheap so it can be called from ADK event
+    callbacks; subscribers on another loop/thread are woken thread-safely.
+    The last ``history_size`` events of each review are retained so a client
+    reconnecting with ``Last-Event-ID`` receives what it missed. Channels of
+    finished reviews are dropped ``retention_seconds`` after their final event.
+    """
+
+    def __init__(self, *, history_size: int = 256, retention_seconds: float = 300.0) -> None:
+        self._history_size = max(1, history_size)
+        self._retention = retention_seconds
+        self._channels: dict[str, _Channel] = {}
+        self._lock = threading.Lock()
+
+    def last_event_id(self, review_id: str) -> int:
+        with self._lock:
+            channel = self._channels.get(review_id)
+            return channel.last_id if channel else 0
+
+    def publish(self, review_id: str, event: str, data: dict[str, Any]) -> ReviewEvent:
+        with self._lock:
+            self._purge_closed()
+            channel = self._channel(review_id)
+            channel.last_id += 1
+            item = ReviewEvent(id=channel.last_id, event=event, data=data)
+            channel.history.append(item)
+            if event in TERMINAL_EVENTS:
+                channel.closed_at = time.monotonic()
+            subscribers = list(channel.subscribers)
+        for subscriber in subscribers:
+            self._deliver(subscriber, item)
+        return item
+
+    def subscribe(self, review_id: str, *, last_event_id: int | None = None) -> ReviewSubscription:
+        """Register a subscriber immediately and return its event stream.
+
+        With ``last_event_id`` still covered by the replay buffer, the missed
+        events are replayed first and ``resumed`` is true. Otherwise only
+        events published from now on are delivered and the caller is expected
+        to send a snapshot (then call :meth:`ReviewSubscription.mark_seen`).
+        """
+
+        subscriber = _Subscriber(loop=asyncio.get_running_loop(), queue=asyncio.Queue())
+        with self._lock:
+            channel = self._channel(review_id)
+            backlog: list[ReviewEvent] = []
+            resumed = (
+                last_event_id is not None
+                and bool(channel.history)
+                and channel.history[0].id <= last_event_id + 1
+                and last_event_id <= channel.last_id
+            )
+            if resumed:
+                backlog = [item for item in channel.history if item.id > (last_event_id or 0)]
+            channel.subscribers.append(subscriber)
+        return ReviewSubscription(
+            self, review_id, subscriber, backlog, last_event_id if resumed else None, resumed=resumed
+        )
+
+    def _unsubscribe(self, review_id: str, subscriber: _Subscriber) -> None:
+        with self._lock:
+            channel = self._channels.get(review_id)
+            if channel is not None and subscriber in channel.subscribers:
+                channel.subscribers.remove(subscriber)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+
+    def _channel(self, review_id: str) -> _Channel:
+        channel = self._channels.get(review_id)
+        if channel is None:
+            channel = _Channel(history=deque(maxlen=self._history_size))
+            self._channels[review_id] = channel
+        return channel
+
+    def _purge_closed(self) -> None:
+        now = time.monotonic()
+        expired = [
+            rid
+            for rid, channel in self._channels.items()
+            if channel.closed_at is not None and not channel.subscribers and now - channel.closed_at > self._retention
+        ]
+        for rid in expired:
+            del self._channels[rid]
+
+    @staticmethod
+    def _deliver(subscriber: _Subscriber, item: ReviewEvent) -> None:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        try:
+            if running is subscriber.loop:
+                subscriber.queue.put_nowait(item)
+            else:
+                subscriber.loop.call_soon_threadsafe(subscriber.queue.put_nowait, item)
+        except RuntimeError:  # subscriber loop already closed
+            logger.debug("dropping event for closed subscriber loop", exc_info=True)
+
+
+class ReviewSubscription:
+    """Async stream of one subscriber's events; always :meth:`close` it when done."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        broker: ReviewEventBroker,
+        review_id: str,
+        subscriber: _Subscriber,
+        backlog: list[ReviewEvent],
+        last_event_id: int | None,
+        *,
+        resumed: bool = False,
+    ) -> None:
+        self._broker = broker
+        self._review_id = review_id
+        self._subscriber = subscriber
+        self._backlog = backlog
+        self._last_id = last_event_id or 0
+        self.resumed = resumed
+
+    def mark_seen(self, event_id: int) -> None:
+        """Skip events up to ``event_id`` (already covered by a snapshot)."""
+
+        self._last_id = max(self._last_id, event_id)
+
+    async def events(self, *, heartbeat_seconds: float = 15.0) -> AsyncIterator[ReviewEvent | None]:
+        """Yield events in order; ``None`` marks an idle heartbeat tick.
+
+        The stream ends after a terminal (completed/failed) event.
+        """
+
+        for item in self._backlog:
+            self._last_id = item.id
+            yield item
+            if item.event in TERMINAL_EVENTS:
+                return
+        while True:
+            try:
+                item = await asyncio.wait_for(self._subscriber.queue.get(), timeout=heartbeat_seconds)
+            except TimeoutError:
+                yield None
+                continue
+            if item.id <= self._last_id:
+                continue
+            self._last_id = item.id
+            yield item
+            if item.event in TERMINAL_EVENTS:
+                return
+
+    async def next_event(self, *, timeout: float) -> ReviewEvent | None:
+        """Wait up to ``timeout`` seconds for the next published event (``None`` on timeout)."""
+
+        try:
+            return await asyncio.wait_for(self._subscriber.queue.get(), timeout=timeout)
+        except TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self._broker._unsubscribe(self._review_id, self._subscriber)
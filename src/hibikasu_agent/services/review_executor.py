@@ -0,0 +1,78 @@
+"""Run review jobs as tasks on the server event loop with a concurrency cap."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from hibikasu_agent.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+ReviewJob = Callable[[str], Coroutine[Any, Any, None]]
+
+
+class ReviewExecutor:
+    """Schedules ``kickoff_review_async`` coroutines on the running loop.
+
+    All reviews share the application's event loop (and therefore the HTTP
+    connection pools owned by long-lived clients) instead of spinning up a
+    fresh loop per review on a threadpool worker. A semaphore bounds how many
+    reviews execute at once; excess submissions wait on the loop without
+    occupying threads.
+    """
+
+    def __init__(self, max_concurrency: int = 8) -> None:
+        self._max_concurrency = max(1, max_concurrency)
+        self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._running = 0
+
+    @property
+    def max_concurrency(self) -> int:
+        return self._max_concurrency
+
+    @property
+    def in_flight(self) -> int:
+        """Number of reviews currently executing (holding a slot)."""
+
+        return self._running
+
+    @property
+    def pending(self) -> int:
+        """Number of submitted reviews that have not finished yet."""
+
+        return len(self._tasks)
+
+    def submit(self, review_id: str, job: ReviewJob) -> asyncio.Task[None]:
+        """Schedule ``job(review_id)`` on the current event loop."""
+
+        task = asyncio.get_running_loop().create_task(self._run(review_id, job), name=f"review:{review_id}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run(self, review_id: str, job: ReviewJob) -> None:
+        async with self._semaphore:
+            self._running += 1
+            try:
+                await job(review_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:  # nosec B110
+                logger.error("review task failed", extra={"review_id": review_id, "error": str(err)}, exc_info=True)
+            finally:
+                self._running -= 1
+
+    async def shutdown(self, *, timeout: float = 5.0) -> None:
+        """Wait briefly for in-flight reviews, then cancel the remainder."""
+
+        if not self._tasks:
+            return
+        tasks = list(self._tasks)
+        _, still_running = await asyncio.wait(tasks, timeout=timeout)
+        for task in still_running:
+            task.cancel()
+        if still_running:
+            await asyncio.gather(*still_running, return_exceptions=True)
@@ -0,0 +1,492 @@
+"""Durable review jobs claimed by API workers under expiring leases."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import math
+import os
+import socket
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass, field, replace
+from typing import Literal, cast
+from urllib.parse import quote
+from uuid import uuid4
+
+from hibikasu_agent.services.review_executor import ReviewExecutor, ReviewJob
+from hibikasu_agent.services.review_scheduler import DEFAULT_TENANT, QueueFullError, QueueUpdateCallback
+from hibikasu_agent.services.shared_state import SharedStateBackend
+from hibikasu_agent.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_JOB_PREFIX = "review_job:"
+_LEASE_PREFIX = "review_job_lease:"
+# One marker key per waiting job: "<prefix><tenant>:<enqueued_at>:<review_id>" (the value is unused)
+_QUEUED_PREFIX = "review_job_queued:"
+# One marker key per running/aggregating job: "<prefix><enqueued_at>:<review_id>"
+_ACTIVE_PREFIX = "review_job_active:"
+
+ReviewJobState = Literal["queued", "running", "aggregating", "completed", "failed"]
+FINISHED_JOB_STATES: frozenset[str] = frozenset({"completed", "failed"})
+_ACTIVE_JOB_STATES: frozenset[str] = frozenset({"running", "aggregating"})
+
+# Called with (review_id, reason) when a job used up its attempts
+GiveUpCallback = Callable[[str, str], None]
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+
+@dataclass(frozen=True)
+class ReviewJobRecord:
+    """Durable state of one review job.
+
+    ``state`` moves queued → running → aggregating → completed/failed (and back
+    to queued when a run is abandoned). ``attempts`` counts started runs and
+    ``heartbeat_at`` is refreshed while the owning worker is alive.
+    """
+
+    review_id: str
+    tenant: str = DEFAULT_TENANT
+    enqueued_at: float = field(default_factory=time.time)
+    state: ReviewJobState = "queued"
+    attempts: int = 0
+    owner: str | None = None
+    heartbeat_at: float | None = None
+    updated_at: float = field(default_factory=time.time)
+    error: str | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.state in FINISHED_JOB_STATES
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, raw: str) -> ReviewJobRecord:
+        return cls(**json.loads(raw))
+
+
+class ReviewJobQueue:
+    """Pending reviews kept in the shared state backend until they finish.
+
+    A worker owns a job only while it keeps renewing the job's lease. If the
+    worker dies, the lease expires and any other worker claims the job again,
+    so the review is re-run rather than left at ``processing`` forever. A job
+    is given up after ``max_attempts`` runs; finished records are kept for
+    ``retention_seconds`` so their outcome can still be inspected.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        backend: SharedStateBackend,
+        *,
+        lease_seconds: float = 30.0,
+        max_queued: int = 100,
+        max_queued_per_tenant: int = 20,
+        max_attempts: int = 3,
+        retention_seconds: float = 24 * 60 * 60,
+    ) -> None:
+        self._backend = backend
+        self._lease_seconds = lease_seconds
+        self._max_queued = max(0, max_queued)
+        self._max_queued_per_tenant = max(0, max_queued_per_tenant)
+        self._max_attempts = max(1, max_attempts)
+        self._retention = retention_seconds
+
+    @property
+    def lease_seconds(self) -> float:
+        return self._lease_seconds
+
+    @property
+    def max_attempts(self) -> int:
+        return self._max_attempts
+
+    def get(self, review_id: str) -> ReviewJobRecord | None:
+        raw = self._backend.get(_JOB_PREFIX + review_id)
+        return ReviewJobRecord.from_json(raw) if raw is not None else None
+
+    def jobs(self) -> list[ReviewJobRecord]:
+        """Every unfinished job (waiting or running), oldest first."""
+
+        records: list[ReviewJobRecord] = []
+        for key in self._backend.scan(_JOB_PREFIX):
+            raw = self._backend.get(key)
+            if raw is None:
+                continue
+            record = ReviewJobRecord.from_json(raw)
+            if not record.finished:
+                records.append(record)
+        records.sort(key=lambda record: record.enqueued_at)
+        return records
+
+    def queued_count(self, tenant: str | None = None) -> int:
+        """Number of jobs waiting to be claimed (optionally of one tenant); running jobs are not counted."""
+
+        prefix = _QUEUED_PREFIX if tenant is None else f"{_QUEUED_PREFIX}{_tenant_key(tenant)}:"
+        return len(self._backend.scan(prefix))
+
+    def queue_positions(self) -> dict[str, int]:
+        """1-based position of every waiting job in claim order (oldest first).
+
+        Read from the marker keys alone, without loading any job record.
+        """
+
+        waiting: list[tuple[float, str]] = []
+        for key in self._backend.scan(_QUEUED_PREFIX):
+            _tenant, enqueued_at, review_id = key.removeprefix(_QUEUED_PREFIX).split(":", 2)
+            waiting.append((float(enqueued_at), review_id))
+        waiting.sort()
+        return {review_id: position for position, (_enqueued_at, review_id) in enumerate(waiting, start=1)}
+
+    def check_admission(self, tenant: str = DEFAULT_TENANT) -> None:
+        """Raise :class:`QueueFullError` when the cluster-wide backlog of waiting jobs is full."""
+
+        retry_after = max(1, int(self._lease_seconds))
+        if self.queued_count(tenant) >= self._max_queued_per_tenant:
+            raise QueueFullError("Too many queued reviews for this tenant", status_code=429, retry_after=retry_after)
+        if self.queued_count() >= self._max_queued:
+            raise QueueFullError("Review queue is full", status_code=503, retry_after=retry_after)
+
+    def enqueue(self, review_id: str, *, tenant: str = DEFAULT_TENANT) -> ReviewJobRecord:
+        record = ReviewJobRecord(review_id=review_id, tenant=tenant)
+        self._save(record)
+        return record
+
+    def claim(self, owner: str, *, skip: set[str] | frozenset[str] = frozenset()) -> ReviewJobRecord | None:
+        """Lease the oldest job nobody holds (including jobs of crashed workers).
+
+        Candidates come from the waiting and running markers, so finished
+        records kept for inspection are never read. The claimed record is
+        marked ``running`` with its attempt count incremented; callers give
+        up on it once ``attempts`` exceeds :attr:`max_attempts`.
+        """
+
+        for review_id in self._claim_candidates():
+            if review_id in skip:
+                continue
+            if not self._backend.acquire_lease(_LEASE_PREFIX + review_id, owner, self._lease_seconds):
+                continue
+            # Re-read under the lease: another worker may have finished it since the scan
+            current = self.get(review_id)
+            if current is None or current.finished:
+                self._backend.release_lease(_LEASE_PREFIX + review_id, owner)
+                continue
+            now = time.time()
+            claimed = replace(
+                current,
+                state="running",
+                attempts=current.attempts + 1,
+                owner=owner,
+                heartbeat_at=now,
+                updated_at=now,
+            )
+            self._save(claimed)
+            return claimed
+        return None
+
+    def renew(self, review_id: str, owner: str) -> bool:
+        """Extend the lease and record a heartbeat; ``False`` if the lease was lost."""
+
+        if not self._backend.renew_lease(_LEASE_PREFIX + review_id, owner, self._lease_seconds):
+            return False
+        record = self.get(review_id)
+        if record is not None and not record.finished:
+            self._save(replace(record, heartbeat_at=time.time()))
+        return True
+
+    def record_phase(self, review_id: str, phase: str) -> None:
+        """Mirror a review's phase (aggregating/completed/failed) onto its job record."""
+
+        if phase not in {"aggregating", *FINISHED_JOB_STATES}:
+            return
+        record = self.get(review_id)
+        if record is None or record.finished or record.state == phase:
+            return
+        self._save(replace(record, state=cast(ReviewJobState, phase), updated_at=time.time()))
+
+    def complete(self, review_id: str, owner: str, *, error: str | None = None) -> None:
+        """Finish the job (``failed`` when ``error`` is given) and drop its lease."""
+
+        record = self.get(review_id)
+        if record is not None and not record.finished:
+            state: ReviewJobState = "failed" if error else "completed"
+            self._save(replace(record, state=state, error=error, updated_at=time.time()))
+        self._backend.release_lease(_LEASE_PREFIX + review_id, owner)
+
+    def release(self, review_id: str, owner: str) -> None:
+        """Give the job back unfinished so another worker can claim it right away."""
+
+        record = self.get(review_id)
+        if record is not None and not record.finished and record.owner == owner:
+            self._save(replace(record, state="queued", owner=None, updated_at=time.time()))
+        self._backend.release_lease(_LEASE_PREFIX + review_id, owner)
+
+    def owner_of(self, review_id: str) -> str | None:
+        return self._backend.lease_owner(_LEASE_PREFIX + review_id)
+
+    def recover(self, unfinished_review_ids: Iterable[str]) -> list[str]:
+        """Re-queue jobs orphaned by dead workers; returns the affected review ids.
+
+        Meant to run once at startup, while other workers may be live. Each
+        record is handled under its lease, so jobs being claimed elsewhere
+        are left alone. Jobs still marked running/aggregating whose lease
+        expired go back to ``queued``. Reviews still ``processing`` in the
+        session store without any job record (the process died between
+        accepting and enqueueing) are enqueued again; callers pass only
+        sessions older than :attr:`lease_seconds` so reviews another worker
+        is about to enqueue are not doubled.
+        """
+
+        owner = f"recovery:{default_worker_id()}"
+        recovered: list[str] = []
+        for record in self.jobs():
+            lease_key = _LEASE_PREFIX + record.review_id
+            if not self._backend.acquire_lease(lease_key, owner, self._lease_seconds):
+                continue
+            try:
+                current = self.get(record.review_id)
+                if current is None or current.finished:
+                    continue
+                if current.state in _ACTIVE_JOB_STATES:
+                    self._save(replace(current, state="queued", owner=None, updated_at=time.time()))
+                    recovered.append(current.review_id)
+                else:
+                    # Rewrites the markers (records saved before markers existed have none)
+                    self._save(current)
+            finally:
+                self._backend.release_lease(lease_key, owner)
+        for review_id in unfinished_review_ids:
+            if self.get(review_id) is None:
+                self.enqueue(review_id)
+                recovered.append(review_id)
+        if recovered:
+            logger.warning("recovered orphaned review jobs", extra={"review_ids": recovered})
+        return recovered
+
+    def _claim_candidates(self) -> list[str]:
+        """Waiting and running jobs, oldest first, read from their marker keys."""
+
+        candidates: list[tuple[float, str]] = []
+        for key in self._backend.scan(_QUEUED_PREFIX):
+            _tenant, enqueued_at, review_id = key.removeprefix(_QUEUED_PREFIX).split(":", 2)
+            candidates.append((float(enqueued_at), review_id))
+        for key in self._backend.scan(_ACTIVE_PREFIX):
+            enqueued_at, review_id = key.removeprefix(_ACTIVE_PREFIX).split(":", 1)
+            candidates.append((float(enqueued_at), review_id))
+        candidates.sort()
+        return [review_id for _enqueued_at, review_id in candidates]
+
+    def _save(self, record: ReviewJobRecord) -> None:
+        ttl = self._retention if record.finished else None
+        self._backend.set(_JOB_PREFIX + record.review_id, record.to_json(), ttl_seconds=ttl)
+        # Admission, queue positions and claiming read these markers instead of decoding every record
+        queued = f"{_QUEUED_PREFIX}{_tenant_key(record.tenant)}:{record.enqueued_at:.6f}:{record.review_id}"
+        active = f"{_ACTIVE_PREFIX}{record.enqueued_at:.6f}:{record.review_id}"
+        if record.state == "queued":
+            self._backend.set(queued, "1")
+            self._backend.delete(active)
+        elif record.state in _ACTIVE_JOB_STATES:
+            self._backend.set(active, "1")
+            self._backend.delete(queued)
+        else:
+            self._backend.delete(queued)
+            self._backend.delete(active)
+
+
+def _tenant_key(tenant: str) -> str:
+    # Tenants may contain ":"; quoting keeps each tenant's markers under its own prefix
+    return quote(tenant, safe="")
+
+
+class ReviewJobWorker:
+    """Claims jobs from the shared queue whenever the local executor has a free slot.
+
+    Every API process runs one worker, so whichever process accepted a review,
+    any process may execute it; clients read progress from the shared store.
+    Reviews enqueued here are told their cluster-wide queue position and
+    estimated start time until some worker claims them.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        queue: ReviewJobQueue,
+        executor: ReviewExecutor,
+        job: ReviewJob,
+        *,
+        worker_id: str | None = None,
+        poll_interval_seconds: float = 1.0,
+        on_give_up: GiveUpCallback | None = None,
+        initial_duration_seconds: float = 60.0,
+    ) -> None:
+        self.queue = queue
+        self._executor = executor
+        self._job = job
+        self._on_give_up = on_give_up
+        self.worker_id = worker_id or default_worker_id()
+        self._poll_interval = poll_interval_seconds
+        self._avg_duration = initial_duration_seconds
+        self._running: set[str] = set()
+        # Reviews enqueued by this worker that still wait: callback and the last reported position
+        self._waiting: dict[str, tuple[QueueUpdateCallback, int | None]] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> frozenset[str]:
+        return frozenset(self._running)
+
+    def enqueue(
+        self, review_id: str, *, tenant: str = DEFAULT_TENANT, on_queue_update: QueueUpdateCallback | None = None
+    ) -> None:
+        self.queue.enqueue(review_id, tenant=tenant)
+        if on_queue_update is not None:
+            # Reported by the loop after it tried to claim, so reviews started right away never show a position
+            self._waiting[review_id] = (on_queue_update, None)
+        self.poke()
+
+    def estimate_start_seconds(self, position: int) -> int:
+        """Estimate seconds until the job at ``position`` starts (as if this worker ran the queue alone)."""
+
+        waves = math.ceil(position / self._executor.max_concurrency)
+        return math.ceil(waves * self._avg_duration)
+
+    def publish_positions(self) -> None:
+        """Report changed queue positions of the reviews enqueued here that are still waiting."""
+
+        if not self._waiting:
+            return
+        positions = self.queue.queue_positions()
+        for review_id, (callback, reported) in list(self._waiting.items()):
+            position = positions.get(review_id)
+            if position is None:
+                # Claimed by some worker (which resets the session's queue fields) or finished
+                del self._waiting[review_id]
+                continue
+            if position == reported:
+                continue
+            self._waiting[review_id] = (callback, position)
+            try:
+                callback(review_id, position, self.estimate_start_seconds(position))
+            except Exception:  # nosec B110
+                logger.debug("queue update callback failed", exc_info=True)
+
+    def poke(self) -> None:
+        """Look for claimable jobs now instead of at the next poll."""
+
+        self._wakeup.set()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._loop(), name="review-job-worker")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    def claim_available(self) -> int:
+        """Claim and submit as many jobs as the executor has free slots; returns the count."""
+
+        claimed = 0
+        while self._executor.pending < self._executor.max_concurrency:
+            record = self.queue.claim(self.worker_id, skip=self._running)
+            if record is None:
+                break
+            if record.attempts > self.queue.max_attempts:
+                self._give_up(record)
+                continue
+            self._running.add(record.review_id)
+            self._executor.submit(record.review_id, self._run_leased)
+            logger.info(
+                "review job claimed",
+                extra={"review_id": record.review_id, "worker_id": self.worker_id, "attempt": record.attempts},
+            )
+            claimed += 1
+        return claimed
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                self.claim_available()
+                self.publish_positions()
+            except Exception as err:  # nosec B110
+                logger.error("claiming review jobs failed", extra={"error": str(err)}, exc_info=True)
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._poll_interval)
+            self._wakeup.clear()
+
+    async def _run_leased(self, review_id: str) -> None:
+        try:
+            lease_lost = await self._run_while_leased(review_id)
+        except asyncio.CancelledError:
+            # Cancelled (e.g. shutdown) before finishing: leave the job for the next worker
+            self.queue.release(review_id, self.worker_id)
+            raise
+        except Exception as err:
+            # The job records the failure on its session; re-running would fail the same way
+            self.queue.complete(review_id, self.worker_id, error=str(err) or err.__class__.__name__)
+            raise
+        else:
+            if lease_lost:
+                # Another worker may own (and re-run) the job now; finishing it here would clobber that run
+                logger.warning(
+                    "review job abandoned after losing its lease",
+                    extra={"review_id": review_id, "worker_id": self.worker_id},
+                )
+            else:
+                self.queue.complete(review_id, self.worker_id)
+        finally:
+            self._running.discard(review_id)
+            self.poke()
+
+    async def _run_while_leased(self, review_id: str) -> bool:
+        """Run the job while renewing its lease; ``True`` if it was cancelled because the lease was lost."""
+
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        run = loop.create_task(self._job(review_id), name=f"review-job:{review_id}")
+        heartbeat = loop.create_task(self._keep_lease(review_id))
+        try:
+            await asyncio.wait({run, heartbeat}, return_when=asyncio.FIRST_COMPLETED)
+            # The heartbeat only returns on its own once the lease is gone
+            lease_lost = not run.done()
+        finally:
+            heartbeat.cancel()
+            run.cancel()
+            await asyncio.gather(run, heartbeat, return_exceptions=True)
+        if lease_lost:
+            return True
+        # Same moving average as the in-process scheduler, for the ETAs of waiting reviews
+        self._avg_duration = 0.8 * self._avg_duration + 0.2 * (time.monotonic() - started)
+        run.result()
+        return False
+
+    def _give_up(self, record: ReviewJobRecord) -> None:
+        reason = f"review job failed after {self.queue.max_attempts} attempts"
+        logger.error("review job gave up", extra={"review_id": record.review_id, "attempts": record.attempts - 1})
+        self.queue.complete(record.review_id, self.worker_id, error=reason)
+        if self._on_give_up is not None:
+            try:
+                self._on_give_up(record.review_id, reason)
+            except Exception:  # nosec B110
+                logger.debug("give-up callback failed", exc_info=True)
+
+    async def _keep_lease(self, review_id: str) -> None:
+        interval = max(0.05, self.queue.lease_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            if not self.queue.renew(review_id, self.worker_id):
+                logger.warning("review job lease lost", extra={"review_id": review_id, "worker_id": self.worker_id})
+                return
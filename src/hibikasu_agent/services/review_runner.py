@@ -22,10 +22,22 @@ class AdkReviewRunner:
         *,
         on_event: Callable[[Any], None] | None = None,
         selected_agents: list[str] | None = None,
+        max_issues: int | None = None,
+        max_issues_per_agent: int | None = None,
     ) -> list[Issue]:
-        """Execute the review asynchronously and yield issues returned by the provider."""
-
-        return await self._adk_service.run_review_async(prd_text, on_event=on_event, selected_agents=selected_agents)
+        """Execute the review asynchronously and yield issues returned by the provider.
+
+        The issue limits are only forwarded when the review overrides them.
+        """
+
+        limits = {
+            key: value
+            for key, value in (("max_issues", max_issues), ("max_issues_per_agent", max_issues_per_agent))
+            if value is not None
+        }
+        return await self._adk_service.run_review_async(
+            prd_text, on_event=on_event, selected_agents=selected_agents, **limits
+        )
 
     def run_blocking(
         self,
@@ -0,0 +1,201 @@
+"""Admission control and fair queueing in front of the review executor."""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from hibikasu_agent.services.review_executor import ReviewExecutor, ReviewJob
+from hibikasu_agent.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_TENANT = "default"
+
+QueueUpdateCallback = Callable[[str, int, int | None], None]
+
+
+class QueueFullError(Exception):
+    """Raised when a review cannot be admitted because the queue is saturated."""
+
+    def __init__(self, message: str, *, status_code: int, retry_after: int) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+@dataclass
+class QueuedReview:
+    review_id: str
+    tenant: str
+    job: ReviewJob
+    enqueued_at: float = field(default_factory=time.monotonic)
+    on_queue_update: QueueUpdateCallback | None = None
+
+
+class ReviewScheduler:
+    """Bounded FIFO queue with round-robin fairness across tenants.
+
+    Jobs are handed to the :class:`ReviewExecutor` only while it has a free
+    slot, so at most ``executor.max_concurrency`` reviews generate LLM traffic
+    at once. Waiting jobs are kept per tenant and dispatched round-robin so a
+    single tenant's burst cannot starve everyone else. Whenever the queue
+    changes, waiting jobs are told their position and estimated start time.
+    """
+
+    def __init__(
+        self,
+        executor: ReviewExecutor,
+        *,
+        max_queued: int = 100,
+        max_queued_per_tenant: int = 20,
+        initial_duration_seconds: float = 60.0,
+    ) -> None:
+        self._executor = executor
+        self._max_queued = max(0, max_queued)
+        self._max_queued_per_tenant = max(0, max_queued_per_tenant)
+        self._queues: dict[str, deque[QueuedReview]] = {}
+        self._rotation: deque[str] = deque()
+        self._positions: dict[str, int] = {}
+        self._avg_duration = initial_duration_seconds
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    @property
+    def in_flight(self) -> int:
+        return self._executor.pending
+
+    @property
+    def average_duration_seconds(self) -> float:
+        return self._avg_duration
+
+    def position(self, review_id: str) -> int | None:
+        """1-based queue position, or ``None`` if the review is not waiting."""
+
+        return self._positions.get(review_id)
+
+    def estimate_start_seconds(self, position: int) -> int:
+        """Estimate seconds until the job at ``position`` starts running."""
+
+        waves = math.ceil(position / self._executor.max_concurrency)
+        return math.ceil(waves * self._avg_duration)
+
+    def check_admission(self, tenant: str = DEFAULT_TENANT) -> None:
+        """Raise :class:`QueueFullError` if a new job for ``tenant`` would overflow."""
+
+        if self._has_free_slot():
+            return
+        tenant_depth = len(self._queues.get(tenant, ()))
+        if tenant_depth >= self._max_queued_per_tenant:
+            raise QueueFullError(
+                "Too many queued reviews for this tenant",
+                status_code=429,
+                retry_after=self.estimate_start_seconds(tenant_depth + 1),
+            )
+        depth = self.queue_depth
+        if depth >= self._max_queued:
+            raise QueueFullError(
+                "Review queue is full",
+                status_code=503,
+                retry_after=self.estimate_start_seconds(depth + 1),
+            )
+
+    def submit(
+        self,
+        review_id: str,
+        job: ReviewJob,
+        *,
+        tenant: str = DEFAULT_TENANT,
+        on_queue_update: QueueUpdateCallback | None = None,
+    ) -> int:
+        """Enqueue a job and return its queue position (0 when started immediately)."""
+
+        self.check_admission(tenant)
+        entry = QueuedReview(review_id=review_id, tenant=tenant, job=job, on_queue_update=on_queue_update)
+        queue = self._queues.get(tenant)
+        if queue is None:
+            queue = deque()
+            self._queues[tenant] = queue
+            self._rotation.append(tenant)
+        queue.append(entry)
+        self._dispatch()
+        return self._positions.get(review_id, 0)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+
+    def _has_free_slot(self) -> bool:
+        return self._executor.pending < self._executor.max_concurrency
+
+    def _pop_next(self) -> QueuedReview | None:
+        while self._rotation:
+            tenant = self._rotation.popleft()
+            queue = self._queues.get(tenant)
+            if not queue:
+                self._queues.pop(tenant, None)
+                continue
+            entry = queue.popleft()
+            if queue:
+                self._rotation.append(tenant)
+            else:
+                self._queues.pop(tenant, None)
+            return entry
+        return None
+
+    def _dispatch(self) -> None:
+        while self._has_free_slot():
+            entry = self._pop_next()
+            if entry is None:
+                break
+            self._positions.pop(entry.review_id, None)
+            wait_ms = int((time.monotonic() - entry.enqueued_at) * 1000)
+            logger.info("review dispatched", extra={"review_id": entry.review_id, "queue_wait_ms": wait_ms})
+            task = self._executor.submit(entry.review_id, self._timed(entry.job))
+            task.add_done_callback(lambda _task: self._dispatch())
+        self._publish_positions()
+
+    def _timed(self, job: ReviewJob) -> ReviewJob:
+        async def _run(review_id: str) -> None:
+            started = time.monotonic()
+            try:
+                await job(review_id)
+            finally:
+                elapsed = time.monotonic() - started
+                # Exponential moving average keeps the ETA responsive to recent load
+                self._avg_duration = 0.8 * self._avg_duration + 0.2 * elapsed
+
+        return _run
+
+    def _iter_fair_order(self) -> list[QueuedReview]:
+        """Return waiting jobs in the order round-robin dispatch would pick them."""
+
+        ordered: list[QueuedReview] = []
+        cursors = {tenant: 0 for tenant in self._rotation}
+        remaining = self.queue_depth
+        while remaining > 0:
+            for tenant in self._rotation:
+                queue = self._queues.get(tenant)
+                idx = cursors[tenant]
+                if queue is not None and idx < len(queue):
+                    ordered.append(queue[idx])
+                    cursors[tenant] = idx + 1
+                    remaining -= 1
+        return ordered
+
+    def _publish_positions(self) -> None:
+        previous = self._positions
+        self._positions = {}
+        for position, entry in enumerate(self._iter_fair_order(), start=1):
+            self._positions[entry.review_id] = position
+            # Only reviews that moved are told; the rest already show this position
+            if entry.on_queue_update is None or previous.get(entry.review_id) == position:
+                continue
+            try:
+                entry.on_queue_update(entry.review_id, position, self.estimate_start_seconds(position))
+            except Exception:  # nosec B110
+                logger.debug("queue update callback failed", exc_info=True)
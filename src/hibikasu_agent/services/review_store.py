@@ -1,46 +1,559 @@
-"""In-memory store for review runtime sessions."""
+"""Stores for review runtime sessions (in-memory, SQLite and Redis backends)."""
 
 from __future__ import annotations
 
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
 from collections.abc import Callable, MutableMapping
+from pathlib import Path
+from typing import Any, cast
 
-from hibikasu_agent.services.models import ReviewRuntimeSession
+from hibikasu_agent.api.schemas.reviews import Issue
+from hibikasu_agent.services.models import ReviewRuntimeSession, ReviewStatus
+from hibikasu_agent.services.shared_state import DEFAULT_REDIS_KEY_PREFIX
+from hibikasu_agent.utils.logging_config import get_logger
 
+logger = get_logger(__name__)
 
-class ReviewSessionStore:
-    """Encapsulates in-memory management of ``ReviewRuntimeSession`` instances."""
 
-    def __init__(self) -> None:
-        self._sessions: dict[str, ReviewRuntimeSession] = {}
+def _approx_session_size(session: ReviewRuntimeSession) -> int:
+    """Rough character footprint of a session (PRD text dominates)."""
 
+    size = len(session.prd_text)
+    for issue in session.issues or []:
+        size += len(issue.comment) + len(issue.original_text) + len(issue.summary or "")
+    return size
+
+
+class AbstractReviewSessionStore(ABC):
+    """Persistence interface for ``ReviewRuntimeSession`` instances.
+
+    Backends may return detached copies from :meth:`get`, so callers must
+    write changes back with :meth:`update` (or :meth:`update_issue` for a
+    single issue) rather than relying on in-place mutation.
+    """
+
+    @abstractmethod
     def create(self, review_id: str, session: ReviewRuntimeSession) -> None:
         """Persist a newly created review session."""
 
-        self._sessions[review_id] = session
-
+    @abstractmethod
     def get(self, review_id: str) -> ReviewRuntimeSession | None:
-        """Retrieve a session by identifier."""
-
-        return self._sessions.get(review_id)
+        """Retrieve a session by identifier (``None`` if missing or expired)."""
 
+    @abstractmethod
     def update(self, review_id: str, session: ReviewRuntimeSession) -> None:
-        """Replace an existing session instance."""
-
-        self._sessions[review_id] = session
+        """Replace an existing session."""
 
+    @abstractmethod
     def remove(self, review_id: str) -> None:
         """Remove a session if present."""
 
-        self._sessions.pop(review_id, None)
+    @abstractmethod
+    def as_dict(self) -> MutableMapping[str, ReviewRuntimeSession]:
+        """Return the live sessions keyed by review id (read-only use)."""
+
+    def get_version(self, review_id: str) -> int | None:
+        """The session's ``version`` (``None`` if missing or expired).
+
+        Persistent backends override this to read the version alone, so
+        ETag checks and long polls do not load the PRD and every issue.
+        """
+
+        session = self.get(review_id)
+        return session.version if session is not None else None
+
+    def get_status(self, review_id: str) -> ReviewStatus | None:
+        """The session's ``status`` (``None`` if missing or expired); read alone like :meth:`get_version`."""
+
+        session = self.get(review_id)
+        return session.status if session is not None else None
+
+    def update_issue(self, review_id: str, issue: Issue, *, version: int | None = None) -> bool:
+        """Persist a single changed issue (and the session's new ``version``); ``False`` if it does not exist."""
+
+        session = self.get(review_id)
+        if session is None or not session.issues:
+            return False
+        position = session.issue_index().position(issue.issue_id)
+        if position is None:
+            return False
+        session.issues[position] = issue
+        if version is not None:
+            session.version = version
+        self.update(review_id, session)
+        return True
+
+    def stats(self) -> tuple[int, int | None]:
+        """``(sessions, approximate characters held)``; the size is ``None`` when too costly to compute."""
+
+        sessions = self.as_dict()
+        return len(sessions), sum(_approx_session_size(session) for session in sessions.values())
 
     def mutate(self, review_id: str, fn: Callable[[ReviewRuntimeSession], None]) -> None:
-        """Apply an in-place mutation callback when the session exists."""
+        """Apply a mutation callback and persist the result when the session exists."""
 
         session = self.get(review_id)
         if session is not None:
             fn(session)
+            self.update(review_id, session)
+
+
+class ReviewSessionStore(AbstractReviewSessionStore):
+    """In-memory store with TTL, LRU eviction and an approximate memory cap.
+
+    Sessions still being processed are never evicted by the LRU/memory
+    limits (only by TTL), so running reviews keep their state. Expired
+    sessions are swept when a session is created or listed; updates only
+    enforce the limits, which costs nothing while the store is within them.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float | None = None,
+        max_sessions: int | None = None,
+        max_total_chars: int | None = None,
+    ) -> None:
+        self._sessions: OrderedDict[str, ReviewRuntimeSession] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._total_chars = 0
+        self._ttl = ttl_seconds
+        self._max_sessions = max_sessions
+        self._max_total_chars = max_total_chars
+        self._lock = threading.RLock()
+
+    @property
+    def total_chars(self) -> int:
+        return self._total_chars
+
+    def stats(self) -> tuple[int, int | None]:
+        with self._lock:
+            return len(self._sessions), self._total_chars
+
+    def create(self, review_id: str, session: ReviewRuntimeSession) -> None:
+        with self._lock:
+            self._put(review_id, session)
+            self._evict()
+
+    def get(self, review_id: str) -> ReviewRuntimeSession | None:
+        with self._lock:
+            session = self._sessions.get(review_id)
+            if session is None:
+                return None
+            if self._is_expired(session, time.time()):
+                self._drop(review_id)
+                return None
+            self._sessions.move_to_end(review_id)
+            return session
+
+    def update(self, review_id: str, session: ReviewRuntimeSession) -> None:
+        with self._lock:
+            self._put(review_id, session)
+            # Progress updates are frequent; the TTL sweep is left to create()
+            self._evict_over_limits()
+
+    def update_issue(self, review_id: str, issue: Issue, *, version: int | None = None) -> bool:
+        with self._lock:
+            session = self.get(review_id)
+            if session is None or not session.issues:
+                return False
+            index = session.issue_index()
+            position = index.position(issue.issue_id)
+            if position is None:
+                return False
+            if session.issues[position] is not issue:
+                # A replaced issue object: keep the list and rebuild its index on next use
+                session.issues = [*session.issues[:position], issue, *session.issues[position + 1 :]]
+            if version is not None:
+                session.version = version
+            return True
+
+    def remove(self, review_id: str) -> None:
+        with self._lock:
+            self._drop(review_id)
+
+    def as_dict(self) -> MutableMapping[str, ReviewRuntimeSession]:
+        with self._lock:
+            self._evict()
+            return self._sessions
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+
+    def _is_expired(self, session: ReviewRuntimeSession, now: float) -> bool:
+        return self._ttl is not None and now - session.created_at > self._ttl
+
+    def _put(self, review_id: str, session: ReviewRuntimeSession) -> None:
+        size = _approx_session_size(session)
+        self._total_chars += size - self._sizes.get(review_id, 0)
+        self._sizes[review_id] = size
+        self._sessions[review_id] = session
+        self._sessions.move_to_end(review_id)
+
+    def _drop(self, review_id: str) -> None:
+        if self._sessions.pop(review_id, None) is not None:
+            self._total_chars -= self._sizes.pop(review_id, 0)
+
+    def _over_limits(self) -> bool:
+        if self._max_sessions is not None and len(self._sessions) > self._max_sessions:
+            return True
+        return self._max_total_chars is not None and self._total_chars > self._max_total_chars
+
+    def _evict(self) -> None:
+        now = time.time()
+        for review_id in [rid for rid, sess in self._sessions.items() if self._is_expired(sess, now)]:
+            self._drop(review_id)
+        self._evict_over_limits()
+
+    def _evict_over_limits(self) -> None:
+        if not self._over_limits():
+            return
+        # Oldest-used first; in-flight reviews are skipped
+        for review_id in [rid for rid, sess in self._sessions.items() if sess.status != "processing"]:
+            if not self._over_limits():
+                break
+            self._drop(review_id)
+            logger.debug("review session evicted", extra={"review_id": review_id})
+
+
+class SqliteReviewSessionStore(AbstractReviewSessionStore):
+    """SQLite (WAL) store shared across workers and surviving restarts.
+
+    Session metadata is one row per review; issues live in their own table so
+    a status change rewrites one issue row instead of the whole session, and
+    session updates rewrite the issue rows only when the issues changed.
+    """
+
+    def __init__(self, db_path: str | Path, *, ttl_seconds: float | None = None) -> None:
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        # review_id -> digest of the issue rows this store last wrote (dropped when rows change otherwise)
+        self._issue_digests: dict[str, str] = {}
+        self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS review_sessions (
+                review_id TEXT PRIMARY KEY,
+                created_at REAL NOT NULL,
+                status TEXT NOT NULL,
+                has_issues INTEGER NOT NULL DEFAULT 0,
+                payload TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_review_sessions_created_at ON review_sessions (created_at);
+            CREATE TABLE IF NOT EXISTS review_issues (
+                review_id TEXT NOT NULL,
+                issue_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                PRIMARY KEY (review_id, position)
+            );
+            CREATE INDEX IF NOT EXISTS idx_review_issues_issue_id ON review_issues (review_id, issue_id);
+            """
+        )
+        self._db.commit()
+
+    def create(self, review_id: str, session: ReviewRuntimeSession) -> None:
+        with self._lock:
+            self._purge_expired()
+            self._write(review_id, session)
+            self._db.commit()
+
+    def get(self, review_id: str) -> ReviewRuntimeSession | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT created_at, has_issues, payload FROM review_sessions WHERE review_id = ?", (review_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            created_at, has_issues, payload = row
+            if self._ttl is not None and time.time() - created_at > self._ttl:
+                self._delete(review_id)
+                self._db.commit()
+                return None
+            return self._load(review_id, payload, bool(has_issues))
+
+    def update(self, review_id: str, session: ReviewRuntimeSession) -> None:
+        with self._lock:
+            self._write(review_id, session)
+            self._db.commit()
+
+    def get_version(self, review_id: str) -> int | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT created_at, json_extract(payload, '$.version') FROM review_sessions WHERE review_id = ?",
+                (review_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        created_at, version = row
+        if self._ttl is not None and time.time() - created_at > self._ttl:
+            return None
+        return int(version or 0)
+
+    def get_status(self, review_id: str) -> ReviewStatus | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT created_at, status FROM review_sessions WHERE review_id = ?", (review_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        created_at, status = row
+        if self._ttl is not None and time.time() - created_at > self._ttl:
+            return None
+        return cast(ReviewStatus, status)
+
+    def update_issue(self, review_id: str, issue: Issue, *, version: int | None = None) -> bool:
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE review_issues SET payload = ? WHERE review_id = ? AND issue_id = ?",
+                (issue.model_dump_json(), review_id, issue.issue_id),
+            )
+            updated = cursor.rowcount > 0
+            self._issue_digests.pop(review_id, None)
+            if updated and version is not None:
+                # Only the version inside the session payload changes; no need to rewrite it
+                self._db.execute(
+                    "UPDATE review_sessions SET payload = json_set(payload, '$.version', ?) WHERE review_id = ?",
+                    (version, review_id),
+                )
+            self._db.commit()
+            return updated
+
+    def remove(self, review_id: str) -> None:
+        with self._lock:
+            self._delete(review_id)
+            self._db.commit()
+
+    def as_dict(self) -> MutableMapping[str, ReviewRuntimeSession]:
+        with self._lock:
+            self._purge_expired()
+            rows = self._db.execute(
+                "SELECT review_id, has_issues, payload FROM review_sessions ORDER BY created_at"
+            ).fetchall()
+            return {rid: self._load(rid, payload, bool(has_issues)) for rid, has_issues, payload in rows}
+
+    def stats(self) -> tuple[int, int | None]:
+        with self._lock:
+            sessions, session_chars = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM review_sessions"
+            ).fetchone()
+            (issue_chars,) = self._db.execute("SELECT COALESCE(SUM(LENGTH(payload)), 0) FROM review_issues").fetchone()
+        return int(sessions), int(session_chars) + int(issue_chars)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+
+    def _write(self, review_id: str, session: ReviewRuntimeSession) -> None:
+        payload = session.model_dump_json(exclude={"issues"})
+        self._db.execute(
+            "INSERT OR REPLACE INTO review_sessions (review_id, created_at, status, has_issues, payload) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (review_id, session.created_at, session.status, int(session.issues is not None), payload),
+        )
+        rows = [
+            (review_id, issue.issue_id, position, issue.model_dump_json())
+            for position, issue in enumerate(session.issues or [])
+        ]
+        digest = hashlib.sha256("\n".join(row[3] for row in rows).encode("utf-8")).hexdigest()
+        if self._issue_digests.get(review_id) == digest:
+            return
+        self._db.execute("DELETE FROM review_issues WHERE review_id = ?", (review_id,))
+        if rows:
+            self._db.executemany(
+                "INSERT INTO review_issues (review_id, issue_id, position, payload) VALUES (?, ?, ?, ?)", rows
+            )
+        self._issue_digests[review_id] = digest
+
+    def _load(self, review_id: str, payload: str, has_issues: bool) -> ReviewRuntimeSession:
+        session = ReviewRuntimeSession.model_validate_json(payload)
+        if has_issues:
+            rows = self._db.execute(
+                "SELECT payload FROM review_issues WHERE review_id = ? ORDER BY position", (review_id,)
+            ).fetchall()
+            session.issues = [Issue.model_validate_json(row[0]) for row in rows]
+        return session
+
+    def _delete(self, review_id: str) -> None:
+        self._issue_digests.pop(review_id, None)
+        self._db.execute("DELETE FROM review_issues WHERE review_id = ?", (review_id,))
+        self._db.execute("DELETE FROM review_sessions WHERE review_id = ?", (review_id,))
+
+    def _purge_expired(self) -> None:
+        if self._ttl is None:
+            return
+        cutoff = time.time() - self._ttl
+        self._db.execute(
+            "DELETE FROM review_issues WHERE review_id IN (SELECT review_id FROM review_sessions WHERE created_at < ?)",
+            (cutoff,),
+        )
+        if self._db.execute("DELETE FROM review_sessions WHERE created_at < ?", (cutoff,)).rowcount > 0:
+            self._issue_digests.clear()
+
+
+class RedisReviewSessionStore(AbstractReviewSessionStore):
+    """Redis store shared by every worker and replica.
+
+    Mirrors the SQLite layout: session metadata lives in one hash and issues in
+    a second hash keyed by issue id (so a status change rewrites one field),
+    with a sorted set of review ids by creation time for listing. ``client``
+    must decode responses to ``str``.
+    """
+
+    def __init__(
+        self, client: Any, *, ttl_seconds: float | None = None, key_prefix: str = DEFAULT_REDIS_KEY_PREFIX
+    ) -> None:
+        self._client = client
+        self._ttl = ttl_seconds
+        self._prefix = key_prefix
+
+    def create(self, review_id: str, session: ReviewRuntimeSession) -> None:
+        self._purge_expired()
+        self._write(review_id, session)
+
+    def get(self, review_id: str) -> ReviewRuntimeSession | None:
+        fields = self._client.hgetall(self._session_key(review_id))
+        if not fields:
+            return None
+        if self._ttl is not None and time.time() - float(fields["created_at"]) > self._ttl:
+            self.remove(review_id)
+            return None
+        return self._load(review_id, fields)
+
+    def update(self, review_id: str, session: ReviewRuntimeSession) -> None:
+        self._write(review_id, session)
+
+    def get_version(self, review_id: str) -> int | None:
+        created_at, version = self._client.hmget(self._session_key(review_id), ["created_at", "version"])
+        if created_at is None:
+            return None
+        if self._ttl is not None and time.time() - float(created_at) > self._ttl:
+            return None
+        return int(version or 0)
+
+    def get_status(self, review_id: str) -> ReviewStatus | None:
+        created_at, status = self._client.hmget(self._session_key(review_id), ["created_at", "status"])
+        if created_at is None:
+            return None
+        if self._ttl is not None and time.time() - float(created_at) > self._ttl:
+            return None
+        return cast(ReviewStatus, status)
+
+    def update_issue(self, review_id: str, issue: Issue, *, version: int | None = None) -> bool:
+        issues_key = self._issues_key(review_id)
+        if not self._client.hexists(issues_key, issue.issue_id):
+            return False
+        self._client.hset(issues_key, issue.issue_id, issue.model_dump_json())
+        if version is not None:
+            # Overrides the version inside the payload (see _load)
+            self._client.hset(self._session_key(review_id), "version", str(version))
+        return True
+
+    def remove(self, review_id: str) -> None:
+        pipe = self._client.pipeline()
+        pipe.delete(self._session_key(review_id), self._issues_key(review_id))
+        pipe.zrem(self._index_key, review_id)
+        pipe.execute()
 
     def as_dict(self) -> MutableMapping[str, ReviewRuntimeSession]:
-        """Expose the backing mapping for read-only scenarios."""
+        self._purge_expired()
+        sessions: dict[str, ReviewRuntimeSession] = {}
+        for review_id in self._client.zrange(self._index_key, 0, -1):
+            session = self.get(review_id)
+            if session is not None:
+                sessions[review_id] = session
+        return sessions
+
+    def stats(self) -> tuple[int, int | None]:
+        # Sizing every hash would cost a round trip per review; report the count only
+        return int(self._client.zcard(self._index_key)), None
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+
+    @property
+    def _index_key(self) -> str:
+        return f"{self._prefix}reviews"
+
+    def _session_key(self, review_id: str) -> str:
+        return f"{self._prefix}review:{review_id}"
+
+    def _issues_key(self, review_id: str) -> str:
+        return f"{self._prefix}review:{review_id}:issues"
+
+    def _write(self, review_id: str, session: ReviewRuntimeSession) -> None:
+        session_key = self._session_key(review_id)
+        issues_key = self._issues_key(review_id)
+        issue_order = [issue.issue_id for issue in session.issues or []]
+        pipe = self._client.pipeline()
+        pipe.hset(
+            session_key,
+            mapping={
+                "created_at": repr(session.created_at),
+                "status": session.status,
+                "has_issues": int(session.issues is not None),
+                "issue_order": json.dumps(issue_order),
+                "payload": session.model_dump_json(exclude={"issues"}),
+                "version": str(session.version),
+            },
+        )
+        pipe.delete(issues_key)
+        if session.issues:
+            pipe.hset(issues_key, mapping={issue.issue_id: issue.model_dump_json() for issue in session.issues})
+        pipe.zadd(self._index_key, {review_id: session.created_at})
+        if self._ttl is not None:
+            remaining_ms = max(1, int((session.created_at + self._ttl - time.time()) * 1000))
+            pipe.pexpire(session_key, remaining_ms)
+            pipe.pexpire(issues_key, remaining_ms)
+        pipe.execute()
+
+    def _load(self, review_id: str, fields: dict[str, str]) -> ReviewRuntimeSession:
+        session = ReviewRuntimeSession.model_validate_json(fields["payload"])
+        if fields.get("version"):
+            session.version = int(fields["version"])
+        if int(fields.get("has_issues", 0)):
+            raw_issues = self._client.hgetall(self._issues_key(review_id))
+            order = json.loads(fields.get("issue_order") or "[]")
+            session.issues = [Issue.model_validate_json(raw_issues[iid]) for iid in order if iid in raw_issues]
+        return session
+
+    def _purge_expired(self) -> None:
+        if self._ttl is None:
+            return
+        # Session hashes expire on their own; only the index needs trimming
+        self._client.zremrangebyscore(self._index_key, "-inf", time.time() - self._ttl)
+
+
+def create_review_session_store(  # noqa: PLR0913
+    backend: str = "memory",
+    *,
+    db_path: str | None = None,
+    redis_client: Any | None = None,
+    ttl_seconds: float | None = None,
+    max_sessions: int | None = None,
+    max_total_chars: int | None = None,
+) -> AbstractReviewSessionStore:
+    """Build the configured store (``memory``, ``sqlite`` or ``redis``)."""
 
-        return self._sessions
+    if backend == "sqlite":
+        if not db_path:
+            raise ValueError("db_path is required for the sqlite review session store")
+        return SqliteReviewSessionStore(db_path, ttl_seconds=ttl_seconds)
+    if backend == "redis":
+        if redis_client is None:
+            raise ValueError("redis_client is required for the redis review session store")
+        return RedisReviewSessionStore(redis_client, ttl_seconds=ttl_seconds)
+    if backend != "memory":
+        raise ValueError(f"Unknown review session store backend: {backend}")
+    return ReviewSessionStore(ttl_seconds=ttl_seconds, max_sessions=max_sessions, max_total_chars=max_total_chars)
@@ -0,0 +1,209 @@
+"""Key-value state with expiring leases shared across worker processes (SQLite or Redis)."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any
+
+from hibikasu_agent.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_REDIS_KEY_PREFIX = "hibikasu:"
+
+# Compare-and-expire / compare-and-delete so a worker never touches a lease it no longer owns
+_RENEW_LEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_LEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def create_redis_client(url: str) -> Any:
+    """Create a Redis client (``redis`` is an optional dependency)."""
+
+    try:
+        import redis  # noqa: PLC0415
+    except ImportError as err:  # pragma: no cover - depends on the environment
+        raise RuntimeError("The redis backend requires the 'redis' package (pip install redis)") from err
+    return redis.Redis.from_url(url, decode_responses=True)
+
+
+class SharedStateBackend(ABC):
+    """Minimal key-value interface used to coordinate several API workers.
+
+    Values are strings (callers serialize JSON). Leases are keys holding the
+    owner's id that expire on their own, so work claimed by a crashed worker
+    becomes claimable again once its lease runs out.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> str | None:
+        """Return the value of ``key`` (``None`` if missing or expired)."""
+
+    @abstractmethod
+    def set(self, key: str, value: str, *, ttl_seconds: float | None = None) -> None:
+        """Store ``value`` under ``key``, optionally expiring after ``ttl_seconds``."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove ``key`` if present."""
+
+    @abstractmethod
+    def scan(self, prefix: str) -> list[str]:
+        """Return the live keys starting with ``prefix``."""
+
+    @abstractmethod
+    def acquire_lease(self, key: str, owner: str, ttl_seconds: float) -> bool:
+        """Take the lease when it is free or expired; ``False`` if someone holds it."""
+
+    @abstractmethod
+    def renew_lease(self, key: str, owner: str, ttl_seconds: float) -> bool:
+        """Extend a lease still held by ``owner``; ``False`` if it was lost."""
+
+    @abstractmethod
+    def release_lease(self, key: str, owner: str) -> None:
+        """Release the lease if ``owner`` still holds it."""
+
+    def lease_owner(self, key: str) -> str | None:
+        return self.get(key)
+
+
+class SqliteSharedState(SharedStateBackend):
+    """Shared state in a SQLite (WAL) file; for several workers on one host."""
+
+    def __init__(self, db_path: str | Path) -> None:
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA busy_timeout=5000")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS shared_state (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM shared_state WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str, *, ttl_seconds: float | None = None) -> None:
+        expires_at = time.time() + ttl_seconds if ttl_seconds is not None else None
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO shared_state (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM shared_state WHERE key = ?", (key,))
+
+    def scan(self, prefix: str) -> list[str]:
+        now = time.time()
+        with self._lock:
+            self._db.execute("DELETE FROM shared_state WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+            rows = self._db.execute(
+                "SELECT key FROM shared_state WHERE substr(key, 1, ?) = ? ORDER BY key", (len(prefix), prefix)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def acquire_lease(self, key: str, owner: str, ttl_seconds: float) -> bool:
+        now = time.time()
+        with self._lock:
+            # A single upsert is atomic across connections: it only wins over an expired lease
+            cursor = self._db.execute(
+                "INSERT INTO shared_state (key, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+                "WHERE shared_state.expires_at IS NOT NULL AND shared_state.expires_at <= ?",
+                (key, owner, now + ttl_seconds, now),
+            )
+        return cursor.rowcount > 0
+
+    def renew_lease(self, key: str, owner: str, ttl_seconds: float) -> bool:
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE shared_state SET expires_at = ? WHERE key = ? AND value = ? AND expires_at > ?",
+                (now + ttl_seconds, key, owner, now),
+            )
+        return cursor.rowcount > 0
+
+    def release_lease(self, key: str, owner: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM shared_state WHERE key = ? AND value = ?", (key, owner))
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class RedisSharedState(SharedStateBackend):
+    """Shared state on Redis; works across hosts. ``client`` must decode responses to ``str``."""
+
+    def __init__(self, client: Any, *, key_prefix: str = DEFAULT_REDIS_KEY_PREFIX) -> None:
+        self._client = client
+        self._prefix = key_prefix
+
+    def get(self, key: str) -> str | None:
+        value = self._client.get(self._prefix + key)
+        return None if value is None else str(value)
+
+    def set(self, key: str, value: str, *, ttl_seconds: float | None = None) -> None:
+        px = max(1, int(ttl_seconds * 1000)) if ttl_seconds is not None else None
+        self._client.set(self._prefix + key, value, px=px)
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self._prefix + key)
+
+    def scan(self, prefix: str) -> list[str]:
+        offset = len(self._prefix)
+        return sorted(str(key)[offset:] for key in self._client.scan_iter(match=f"{self._prefix}{prefix}*"))
+
+    def acquire_lease(self, key: str, owner: str, ttl_seconds: float) -> bool:
+        return bool(self._client.set(self._prefix + key, owner, nx=True, px=max(1, int(ttl_seconds * 1000))))
+
+    def renew_lease(self, key: str, owner: str, ttl_seconds: float) -> bool:
+        ttl_ms = max(1, int(ttl_seconds * 1000))
+        return bool(self._client.eval(_RENEW_LEASE_SCRIPT, 1, self._prefix + key, owner, ttl_ms))
+
+    def release_lease(self, key: str, owner: str) -> None:
+        self._client.eval(_RELEASE_LEASE_SCRIPT, 1, self._prefix + key, owner)
+
+
+def create_shared_state_backend(
+    backend: str = "memory",
+    *,
+    db_path: str | None = None,
+    redis_client: Any | None = None,
+) -> SharedStateBackend | None:
+    """Build the cross-worker backend matching the review store backend.
+
+    ``memory`` means a single worker process and returns ``None``.
+    """
+
+    if backend == "memory":
+        return None
+    if backend == "sqlite":
+        if not db_path:
+            raise ValueError("db_path is required for the sqlite shared state backend")
+        return SqliteSharedState(db_path)
+    if backend == "redis":
+        if redis_client is None:
+            raise ValueError("redis_client is required for the redis shared state backend")
+        return RedisSharedState(redis_client)
+    raise ValueError(f"Unknown shared state backend: {backend}")
@@ -0,0 +1,106 @@
+"""Per-model token prices and cost estimates for LLM usage reported by ADK events."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from hibikasu_agent.api.schemas.reviews import TokenUsage
+from hibikasu_agent.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class ModelPrice:
+    """USD per one million prompt (input) and completion (output, incl. thinking) tokens."""
+
+    input_per_million: float
+    output_per_million: float
+
+
+# Paid-tier list prices for text; override or extend with HIBIKASU_MODEL_PRICES
+DEFAULT_MODEL_PRICES: Mapping[str, ModelPrice] = {
+    "gemini-2.5-pro": ModelPrice(1.25, 10.00),
+    "gemini-2.5-flash": ModelPrice(0.30, 2.50),
+    "gemini-2.5-flash-lite": ModelPrice(0.10, 0.40),
+    "gemini-2.0-flash": ModelPrice(0.10, 0.40),
+    "gemini-2.0-flash-lite": ModelPrice(0.075, 0.30),
+}
+
+
+def parse_model_prices(raw: str | None) -> dict[str, ModelPrice]:
+    """Parse ``"gemini-2.5-flash=0.30/2.50,my-model=1/4"`` (USD per 1M input/output tokens)."""
+
+    prices: dict[str, ModelPrice] = {}
+    for item in (raw or "").split(","):
+        model, sep, value = item.partition("=")
+        input_price, slash, output_price = value.partition("/")
+        if not sep or not slash:
+            continue
+        try:
+            prices[model.strip()] = ModelPrice(float(input_price), float(output_price))
+        except ValueError:
+            logger.warning("ignoring invalid model price", extra={"entry": item})
+    return prices
+
+
+class TokenPricing:
+    """Resolve a model's price by the longest matching name prefix (``models/`` is ignored).
+
+    Versioned names such as ``gemini-2.5-flash-lite-preview-06-17`` fall back
+    to their family's price; unknown models have no cost estimate.
+    """
+
+    def __init__(self, overrides: Mapping[str, ModelPrice] | None = None) -> None:
+        prices = {**DEFAULT_MODEL_PRICES, **(overrides or {})}
+        self._prices = sorted(prices.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def price_for(self, model: str | None) -> ModelPrice | None:
+        name = (model or "").strip().removeprefix("models/")
+        for prefix, price in self._prices:
+            if name.startswith(prefix):
+                return price
+        return None
+
+    def cost(self, model: str | None, prompt_tokens: int, completion_tokens: int) -> float | None:
+        price = self.price_for(model)
+        if price is None:
+            return None
+        return (prompt_tokens * price.input_per_million + completion_tokens * price.output_per_million) / 1_000_000
+
+
+def usage_counts(usage_metadata: Any) -> tuple[int, int, int] | None:
+    """``(prompt, completion, total)`` tokens from ``GenerateContentResponseUsageMetadata``.
+
+    Thinking tokens are billed as output, so they count towards completion.
+    """
+
+    if usage_metadata is None:
+        return None
+    prompt = getattr(usage_metadata, "prompt_token_count", None) or 0
+    completion = (getattr(usage_metadata, "candidates_token_count", None) or 0) + (
+        getattr(usage_metadata, "thoughts_token_count", None) or 0
+    )
+    total = getattr(usage_metadata, "total_token_count", None) or prompt + completion
+    if not (prompt or completion or total):
+        return None
+    return prompt, completion, total
+
+
+def add_usage(target: TokenUsage, prompt: int, completion: int, total: int, cost: float | None) -> None:
+    """Accumulate one model call into ``target`` (the cost stays ``None`` until a priced call is seen)."""
+
+    target.prompt_tokens += prompt
+    target.completion_tokens += completion
+    target.total_tokens += total
+    if cost is not None:
+        target.estimated_cost_usd = (target.estimated_cost_usd or 0.0) + cost
+
+
+def sum_usage(usages: Mapping[str, TokenUsage]) -> TokenUsage:
+    total = TokenUsage()
+    for usage in usages.values():
+        add_usage(total, usage.prompt_tokens, usage.completion_tokens, usage.total_tokens, usage.estimated_cost_usd)
+    return total
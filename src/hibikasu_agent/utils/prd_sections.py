@@ -0,0 +1,128 @@
+"""Split PRD markdown into heading-delimited sections."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+
+_HEADING_RE = re.compile(r"^(#{1,6})[ \t]+(.+?)[ \t#]*$", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class PrdSection:
+    """A contiguous slice ``[start, end)`` of the PRD starting at a markdown heading.
+
+    Text before the first heading forms a preamble section with an empty heading.
+    """
+
+    heading: str
+    start: int
+    end: int
+    text: str
+
+    @property
+    def digest(self) -> str:
+        """Content hash insensitive to trailing whitespace on lines."""
+
+        normalized = "\n".join(line.rstrip() for line in self.text.strip().splitlines())
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def split_sections(prd_text: str) -> list[PrdSection]:
+    """Return the PRD's sections in document order (covering the whole text)."""
+
+    starts = [match.start() for match in _HEADING_RE.finditer(prd_text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    sections: list[PrdSection] = []
+    for idx, start in enumerate(starts):
+        end = starts[idx + 1] if idx + 1 < len(starts) else len(prd_text)
+        text = prd_text[start:end]
+        if not text.strip():
+            continue
+        heading_match = _HEADING_RE.match(text)
+        heading = heading_match.group(2).strip() if heading_match else ""
+        sections.append(PrdSection(heading=heading, start=start, end=end, text=text))
+    return sections
+
+
+def section_at(sections: list[PrdSection], offset: int) -> PrdSection | None:
+    """Return the section containing character ``offset`` (sections must be sorted)."""
+
+    if not sections:
+        return None
+    idx = bisect_right([section.start for section in sections], offset) - 1
+    if idx < 0:
+        return None
+    section = sections[idx]
+    if section.start <= offset < section.end:
+        return section
+    return None
+
+
+@dataclass(frozen=True)
+class PrdChunk:
+    """A slice ``[start, end)`` of the PRD reviewed independently in chunked mode."""
+
+    index: int
+    start: int
+    end: int
+
+    def text_of(self, prd_text: str) -> str:
+        return prd_text[self.start : self.end]
+
+
+def _split_oversized(prd_text: str, start: int, end: int, max_chars: int) -> list[tuple[int, int]]:
+    """Split ``[start, end)`` into pieces of at most ``max_chars``, preferring line breaks."""
+
+    pieces: list[tuple[int, int]] = []
+    cursor = start
+    while end - cursor > max_chars:
+        limit = cursor + max_chars
+        cut = prd_text.rfind("\n", cursor + max_chars // 2, limit)
+        cut = limit if cut == -1 else cut + 1
+        pieces.append((cursor, cut))
+        cursor = cut
+    pieces.append((cursor, end))
+    return pieces
+
+
+def chunk_prd(prd_text: str, *, max_chars: int, overlap_chars: int = 0) -> list[PrdChunk]:
+    """Group sections into chunks of roughly ``max_chars`` characters.
+
+    Chunk boundaries fall on section starts where possible; sections longer
+    than ``max_chars`` are split on line breaks. Every chunk after the first
+    also includes up to ``overlap_chars`` of the preceding text (snapped to a
+    line start) so quotes spanning a boundary are still reviewable.
+    """
+
+    if max_chars <= 0 or len(prd_text) <= max_chars:
+        return [PrdChunk(index=0, start=0, end=len(prd_text))]
+
+    pieces: list[tuple[int, int]] = []
+    for section in split_sections(prd_text):
+        pieces.extend(_split_oversized(prd_text, section.start, section.end, max_chars))
+    if not pieces:
+        return [PrdChunk(index=0, start=0, end=len(prd_text))]
+
+    bounds: list[tuple[int, int]] = []
+    chunk_start, chunk_end = pieces[0]
+    for start, end in pieces[1:]:
+        if end - chunk_start > max_chars:
+            bounds.append((chunk_start, chunk_end))
+            chunk_start = start
+        chunk_end = end
+    bounds.append((chunk_start, chunk_end))
+
+    chunks: list[PrdChunk] = []
+    for index, (section_start, end) in enumerate(bounds):
+        start = section_start
+        if index > 0 and overlap_chars > 0:
+            overlap_start = max(0, section_start - overlap_chars)
+            # The newline right before ``section_start`` would yield no overlap at all
+            line_start = prd_text.find("\n", max(0, overlap_start - 1), section_start - 1)
+            start = line_start + 1 if line_start != -1 else overlap_start
+        chunks.append(PrdChunk(index=index, start=start, end=end))
+    return chunks
@@ -4,22 +4,36 @@ from __future__ import annotations
 
 import logging
 import unicodedata
+from array import array
+from collections.abc import Iterable
 from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Literal
 
 from hibikasu_agent.api.schemas.reviews import IssueSpan
 
 _MIN_MATCH_RATIO = 0.5
+# q-gram length used by the fuzzy index
+_QGRAM = 3
 logger = logging.getLogger(__name__)
 
+# Which step of SpanIndex.locate resolved a quote ("none" when it could not be anchored)
+SpanMethod = Literal["exact", "normalized", "fuzzy", "none"]
 
-def _build_normalized_view(text: str) -> tuple[str, list[int]]:
+
+@lru_cache(maxsize=8192)
+def _normalize_char(raw_ch: str) -> str:
+    # PRDs reuse a small alphabet, so per-character normalization is memoized
+    return unicodedata.normalize("NFC", unicodedata.normalize("NFKC", raw_ch)).lower()
+
+
+def _build_normalized_view(text: str) -> tuple[str, array[int]]:
     """Return normalized text and mapping back to original indices."""
 
     chars: list[str] = []
-    index_map: list[int] = []
+    index_map: array[int] = array("i")
     for idx, raw_ch in enumerate(text):
-        normalized = unicodedata.normalize("NFKC", raw_ch)
-        normalized = unicodedata.normalize("NFC", normalized).lower()
+        normalized = _normalize_char(raw_ch)
         for ch in normalized:
             if ch.isspace():
                 continue
@@ -50,7 +64,7 @@ def find_simple_span(prd_text: str, original_text: str) -> IssueSpan | None:
     return IssueSpan(start_index=start_index, end_index=start_index + len(original_text))
 
 
-def _span_from_mapping(mapping: list[int], start: int, length: int) -> IssueSpan | None:
+def _span_from_mapping(mapping: array[int], start: int, length: int) -> IssueSpan | None:
     if length <= 0:
         return None
     try:
@@ -62,51 +76,126 @@ def _span_from_mapping(mapping: list[int], start: int, length: int) -> IssueSpan
 
 
 def calculate_span(prd_text: str, original_text: str) -> IssueSpan | None:
-    """Calculate span using normalization and fuzzy matching."""
-    if not original_text:
-        return None
-
-    # Try simple span first
-    simple_span = find_simple_span(prd_text, original_text)
-    if simple_span is not None:
-        return simple_span
-
-    # Try normalized matching
-    return _calculate_normalized_span(prd_text, original_text)
-
+    """Calculate span using normalization and fuzzy matching.
 
-def _calculate_normalized_span(prd_text: str, original_text: str) -> IssueSpan | None:
-    """Calculate span using normalization and fuzzy matching."""
-    prd_normalized, mapping = _build_normalized_view(prd_text)
-    original_normalized, _ = _build_normalized_view(original_text)
-
-    if not original_normalized:
-        logger.warning(
-            "Span calculation failed: original_text became empty after normalization",
-            extra={"original_text": original_text},
-        )
+    The PRD's :class:`SpanIndex` is cached, so mapping many issues against
+    the same PRD normalizes and indexes it only once.
+    """
+    if not original_text:
         return None
-
-    # Try direct substring search first
-    direct_index = prd_normalized.find(original_normalized)
-    if direct_index != -1:
-        return _span_from_mapping(mapping, direct_index, len(original_normalized))
-
-    # Fall back to fuzzy matching
-    return _fuzzy_match_span(prd_normalized, original_normalized, original_text, mapping)
+    return get_span_index(prd_text).find(original_text)
+
+
+@lru_cache(maxsize=4)
+def get_span_index(prd_text: str) -> SpanIndex:
+    """Return a (memoized) index for ``prd_text``."""
+
+    return SpanIndex(prd_text)
+
+
+class SpanIndex:
+    """Locate many quotes in one PRD without re-normalizing it per quote.
+
+    Holds the normalized PRD, an ``array('i')`` map back to original offsets
+    and, built on the first fuzzy lookup, a q-gram postings index. Fuzzy
+    matching votes along diagonals (PRD offset minus quote offset) of shared
+    q-grams; the longest run of consecutive hits is the longest common
+    substring, so results match ``SequenceMatcher.find_longest_match``
+    while only touching postings of the quote's own q-grams.
+    """
+
+    def __init__(self, prd_text: str) -> None:
+        self.prd_text = prd_text
+        self.normalized, self.offsets = _build_normalized_view(prd_text)
+        self._postings: dict[str, array[int]] | None = None
+
+    def find(self, original_text: str) -> IssueSpan | None:
+        """Resolve one quote: raw substring, then normalized, then fuzzy."""
+
+        return self.locate(original_text)[0]
+
+    def locate(self, original_text: str) -> tuple[IssueSpan | None, SpanMethod]:
+        """Like :meth:`find`, also reporting which step resolved the quote."""
+
+        if not original_text:
+            return None, "none"
+        simple_span = find_simple_span(self.prd_text, original_text)
+        if simple_span is not None:
+            return simple_span, "exact"
+
+        original_normalized, _ = _build_normalized_view(original_text)
+        if not original_normalized:
+            logger.warning(
+                "Span calculation failed: original_text became empty after normalization",
+                extra={"original_text": original_text},
+            )
+            return None, "none"
+
+        direct_index = self.normalized.find(original_normalized)
+        if direct_index != -1:
+            return _span_from_mapping(self.offsets, direct_index, len(original_normalized)), "normalized"
+        span = _fuzzy_match_span(self.normalized, original_normalized, original_text, self.offsets, self)
+        return span, "fuzzy" if span is not None else "none"
+
+    def find_many(self, original_texts: Iterable[str]) -> list[IssueSpan | None]:
+        return [self.find(text) for text in original_texts]
+
+    def longest_common_substring(self, query: str) -> tuple[int, int]:
+        """Return ``(prd_start, length)`` of the longest normalized match of ``query``.
+
+        Ties resolve to the earliest PRD position, then the earliest query
+        position. Matches shorter than the q-gram length are not reported.
+        """
+
+        postings = self._get_postings()
+        # diagonal -> (query index of the last hit, query index where the current run began)
+        runs: dict[int, tuple[int, int]] = {}
+        best = (0, 0, 0)  # (length, prd_start, query_start)
+        for j in range(len(query) - _QGRAM + 1):
+            for i in postings.get(query[j : j + _QGRAM], ()):
+                diagonal = i - j
+                last = runs.get(diagonal)
+                run_start = last[1] if last is not None and last[0] == j - 1 else j
+                runs[diagonal] = (j, run_start)
+                length = j - run_start + _QGRAM
+                prd_start = diagonal + run_start
+                if length > best[0] or (length == best[0] and (prd_start, run_start) < (best[1], best[2])):
+                    best = (length, prd_start, run_start)
+        return best[1], best[0]
+
+    def _get_postings(self) -> dict[str, array[int]]:
+        if self._postings is None:
+            postings: dict[str, array[int]] = {}
+            text = self.normalized
+            for i in range(len(text) - _QGRAM + 1):
+                gram = text[i : i + _QGRAM]
+                bucket = postings.get(gram)
+                if bucket is None:
+                    bucket = array("i")
+                    postings[gram] = bucket
+                bucket.append(i)
+            self._postings = postings
+        return self._postings
 
 
 def _fuzzy_match_span(
     prd_normalized: str,
     original_normalized: str,
     original_text: str,
-    mapping: list[int],
+    mapping: array[int],
+    index: SpanIndex | None = None,
 ) -> IssueSpan | None:
     """Perform fuzzy matching and return span if match is good enough."""
-    matcher = SequenceMatcher(None, prd_normalized, original_normalized, autojunk=False)
-    match = matcher.find_longest_match(0, len(prd_normalized), 0, len(original_normalized))
-
-    if match.size == 0:
+    match_a, match_size = 0, 0
+    if index is not None and len(original_normalized) >= 2 * _QGRAM:
+        # Any match long enough to pass the coverage threshold spans at least one q-gram
+        match_a, match_size = index.longest_common_substring(original_normalized)
+    else:
+        matcher = SequenceMatcher(None, prd_normalized, original_normalized, autojunk=False)
+        match = matcher.find_longest_match(0, len(prd_normalized), 0, len(original_normalized))
+        match_a, match_size = match.a, match.size
+
+    if match_size == 0:
         logger.warning(
             "Span calculation failed: no common subsequence found",
             extra={
@@ -117,13 +206,13 @@ def _fuzzy_match_span(
         )
         return None
 
-    coverage = match.size / len(original_normalized)
+    coverage = match_size / len(original_normalized)
     if coverage < _MIN_MATCH_RATIO:
         logger.warning(
             "Span calculation failed: match coverage below threshold",
             extra={
                 "original_text": original_text,
-                "match_size": match.size,
+                "match_size": match_size,
                 "original_normalized_len": len(original_normalized),
                 "coverage": round(coverage, 2),
                 "threshold": _MIN_MATCH_RATIO,
@@ -131,14 +220,14 @@ def _fuzzy_match_span(
         )
         return None
 
-    span = _span_from_mapping(mapping, match.a, match.size)
+    span = _span_from_mapping(mapping, match_a, match_size)
     if span is None:
         logger.error(
             "Span calculation failed: could not map normalized span back to original indices",
             extra={
                 "original_text": original_text,
-                "match_a": match.a,
-                "match_size": match.size,
+                "match_a": match_a,
+                "match_size": match_size,
                 "mapping_len": len(mapping),
             },
         )
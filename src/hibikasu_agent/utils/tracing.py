@@ -0,0 +1,140 @@
+"""OpenTelemetry tracing: one trace per review, exported to the console or a local JSON-lines file."""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections.abc import Sequence
+from pathlib import Path
+
+from google.adk.telemetry.setup import OTelHooks, maybe_set_otel_providers
+from opentelemetry import context as otel_context
+from opentelemetry import trace
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+    SpanExportResult,
+)
+
+from hibikasu_agent.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# ADK's own agent / call_llm spans (with gen_ai.usage.* token counts) nest under these
+tracer = trace.get_tracer("hibikasu_agent")
+
+DEFAULT_TRACE_FILE = "traces.jsonl"
+
+_setup_lock = threading.Lock()
+_configured = False
+
+
+def review_trace_context(review_id: str) -> otel_context.Context:
+    """Parent context whose trace id is derived from ``review_id``.
+
+    Every span of a review (request, queue wait, run, specialist calls,
+    mapping) becomes a child of this context, so they form one trace even
+    when the request and the run happen on different workers. A UUID review
+    id maps 1:1 onto the 128-bit trace id.
+    """
+
+    try:
+        trace_id = uuid.UUID(review_id).int
+    except ValueError:
+        trace_id = uuid.uuid5(uuid.NAMESPACE_URL, review_id).int
+    span_context = trace.SpanContext(
+        trace_id=trace_id,
+        span_id=(trace_id & 0xFFFFFFFFFFFFFFFF) or 1,
+        is_remote=True,
+        trace_flags=trace.TraceFlags(trace.TraceFlags.SAMPLED),
+    )
+    return trace.set_span_in_context(trace.NonRecordingSpan(span_context))
+
+
+def record_span(
+    name: str, review_id: str, *, start_time: float, attributes: dict[str, str | int] | None = None
+) -> None:
+    """Record an already elapsed interval (e.g. queue wait) from ``start_time`` (epoch seconds) until now."""
+
+    span = tracer.start_span(
+        name,
+        context=review_trace_context(review_id),
+        start_time=int(start_time * 1e9),
+        attributes={"hibikasu.review_id": review_id, **(attributes or {})},
+    )
+    span.end(end_time=max(int(start_time * 1e9), time.time_ns()))
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Append finished spans to a local file, one JSON object per line."""
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        if self._closed:
+            return SpanExportResult.FAILURE
+        lines = [span.to_json(indent=None) for span in spans]
+        try:
+            with self._lock, self._path.open("a", encoding="utf-8") as fh:
+                fh.writelines(line + "\n" for line in lines)
+        except OSError as err:
+            logger.warning("failed to write spans", extra={"path": str(self._path), "error": str(err)})
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        self._closed = True
+
+
+def setup_tracing(exporter: str | None, *, file_path: str | None = None) -> bool:
+    """Install a tracer provider exporting to ``console`` or ``file`` (JSON lines).
+
+    The standard ``OTEL_EXPORTER_OTLP_*`` variables additionally enable OTLP
+    export (requires ``opentelemetry-exporter-otlp``). Returns ``False`` when
+    tracing stays disabled; spans are then no-ops.
+    """
+
+    global _configured  # noqa: PLW0603
+    kind = (exporter or "").strip().lower()
+    with _setup_lock:
+        if _configured:
+            return True
+        span_exporter: SpanExporter | None = None
+        if kind == "console":
+            span_exporter = ConsoleSpanExporter()
+        elif kind == "file":
+            span_exporter = JsonLinesSpanExporter(file_path or DEFAULT_TRACE_FILE)
+        elif kind:
+            logger.warning("unknown tracing exporter; tracing disabled", extra={"exporter": kind})
+        try:
+            hooks = [OTelHooks(span_processors=[BatchSpanProcessor(span_exporter)])] if span_exporter else []
+            maybe_set_otel_providers(otel_hooks_to_setup=hooks)
+        except ImportError as err:
+            # OTEL_EXPORTER_OTLP_* is set but the OTLP exporter package is not installed
+            logger.warning("tracing exporter unavailable", extra={"error": str(err)})
+            return False
+        _configured = span_exporter is not None or not isinstance(
+            trace.get_tracer_provider(), trace.ProxyTracerProvider
+        )
+        if _configured:
+            logger.info("tracing enabled", extra={"exporter": kind or "otlp"})
+        return _configured
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans (the batch processor exports in the background)."""
+
+    provider = trace.get_tracer_provider()
+    flush = getattr(provider, "force_flush", None)
+    if callable(flush):
+        try:
+            flush()
+        except Exception:  # nosec B110
+            logger.debug("failed to flush spans", exc_info=True)
@@ -41,7 +41,7 @@ def shared_ai_service() -> AiService:
                 )
             ]
 
-        async def answer_dialog_async(self, issue, question_text: str):  # type: ignore[no-untyped-def]
+        async def answer_dialog_async(self, issue, question_text: str, *, review_id: str = ""):  # type: ignore[no-untyped-def]
             return f"(stub) {question_text}"
 
     return AiService(adk_service=_StubADK())
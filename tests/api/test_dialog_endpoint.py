@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import json
+
 
 def test_issue_dialog_returns_response_text(client):
     # Start review and get review_id
@@ -40,3 +42,34 @@ def test_issue_dialog_returns_404_when_issue_not_found(client):
         json={"question_text": "存在しない論点？"},
     )
     assert dj.status_code == 404
+
+
+def test_issue_dialog_stream_returns_ndjson_deltas(client):
+    res = client.post("/reviews", json={"prd_text": "テストPRD（対話ストリーム）"})
+    review_id = res.json()["review_id"]
+    issue_id = client.get(f"/reviews/{review_id}").json()["issues"][0]["issue_id"]
+
+    with client.stream(
+        "POST",
+        f"/reviews/{review_id}/issues/{issue_id}/dialog/stream",
+        json={"question_text": "背景は？"},
+    ) as resp:
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        chunks = [json.loads(line) for line in resp.iter_lines() if line]
+
+    deltas = [c["text"] for c in chunks if c["type"] == "delta"]
+    assert len(deltas) >= 2
+    assert chunks[-1] == {"type": "done", "response_text": "".join(deltas)}
+    assert "背景は？" in chunks[-1]["response_text"]
+
+
+def test_issue_dialog_stream_returns_404_when_issue_not_found(client):
+    res = client.post("/reviews", json={"prd_text": "テストPRD（対話ストリーム404）"})
+    review_id = res.json()["review_id"]
+
+    dj = client.post(
+        f"/reviews/{review_id}/issues/NO_SUCH_ISSUE/dialog/stream",
+        json={"question_text": "存在しない論点？"},
+    )
+    assert dj.status_code == 404
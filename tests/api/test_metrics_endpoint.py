@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import time
+
+from hibikasu_agent.utils.metrics import REVIEWS_TOTAL, SPAN_RESOLUTIONS_TOTAL
+
+
+def test_metrics_endpoint_exposes_review_metrics(client_ai_mode) -> None:
+    completed_before = REVIEWS_TOTAL.value(outcome="completed")
+    exact_before = SPAN_RESOLUTIONS_TOTAL.value(method="exact")
+
+    rid = client_ai_mode.post("/reviews", json={"prd_text": "メトリクス用PRD"}).json()["review_id"]
+    for _ in range(50):
+        if client_ai_mode.get(f"/reviews/{rid}").json()["status"] == "completed":
+            break
+        time.sleep(0.02)
+
+    res = client_ai_mode.get("/metrics")
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = res.text
+    assert "# TYPE hibikasu_review_phase_seconds histogram" in body
+    assert 'hibikasu_review_phase_seconds_count{phase="total"}' in body
+    assert "# TYPE hibikasu_reviews_in_flight gauge" in body
+    assert 'hibikasu_review_queue_depth{queue="local"} 0' in body
+    assert REVIEWS_TOTAL.value(outcome="completed") == completed_before + 1
+    assert SPAN_RESOLUTIONS_TOTAL.value(method="exact") >= exact_before
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+
+from hibikasu_agent.api.main import app
+
+
+def _parse_sse(body: str) -> list[dict[str, object]]:
+    events = []
+    for block in body.split("\n\n"):
+        fields: dict[str, str] = {}
+        for line in block.splitlines():
+            if line.startswith(":") or ": " not in line:
+                continue
+            key, value = line.split(": ", 1)
+            fields[key] = value
+        if "event" in fields:
+            events.append({"id": int(fields["id"]), "event": fields["event"], "data": json.loads(fields["data"])})
+    return events
+
+
+def test_events_stream_sends_snapshot_and_closes_for_finished_review(client):
+    review_id = client.post("/reviews", json={"prd_text": "テストPRD"}).json()["review_id"]
+
+    res = client.get(f"/reviews/{review_id}/events")
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(res.text)
+    assert [event["event"] for event in events] == ["snapshot"]
+    snapshot = events[0]["data"]
+    assert snapshot["status"] == "completed"
+    assert snapshot["issues"]
+    assert "prd_text" not in snapshot
+
+
+def test_events_stream_resumes_from_last_event_id(client):
+    review_id = client.post("/reviews", json={"prd_text": "テストPRD"}).json()["review_id"]
+    broker = app.state.review_event_broker
+    base = broker.last_event_id(review_id)
+    broker.publish(review_id, "progress", {"progress": 0.5})
+    broker.publish(review_id, "completed", {"status": "completed", "issues": []})
+
+    res = client.get(f"/reviews/{review_id}/events", headers={"Last-Event-ID": str(base + 1)})
+
+    events = _parse_sse(res.text)
+    assert [(event["id"], event["event"]) for event in events] == [(base + 2, "completed")]
+
+
+def test_events_stream_returns_404_for_unknown_review(client):
+    res = client.get("/reviews/does-not-exist/events")
+    assert res.status_code == 404
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import time
+
+from hibikasu_agent.api.routers import reviews as reviews_router
+
 
 def test_post_reviews_and_poll_until_completed(client):
     # Start a review
@@ -9,8 +13,6 @@ def test_post_reviews_and_poll_until_completed(client):
     assert isinstance(review_id, str) and review_id
 
     # Poll until completed, with a timeout
-    import time
-
     for _ in range(10):  # max 1 sec
         r = client.get(f"/reviews/{review_id}")
         assert r.status_code == 200
@@ -27,3 +29,119 @@ def test_post_reviews_and_poll_until_completed(client):
     # Validate issue shape without relying on specific IDs
     first = body["issues"][0]
     assert set(["issue_id", "priority", "agent_name", "comment", "original_text"]).issubset(first.keys())
+
+
+def test_truncated_issues_endpoint(client):
+    res = client.post("/reviews", json={"prd_text": "テストPRD", "max_issues": 5, "max_issues_per_agent": 2})
+    assert res.status_code == 200
+    review_id = res.json()["review_id"]
+
+    res = client.get(f"/reviews/{review_id}/issues/truncated")
+    assert res.status_code == 200
+    assert res.json() == {"issues": []}
+    assert client.get("/reviews/unknown/issues/truncated").status_code == 404
+
+
+def test_post_reviews_rejects_invalid_issue_limits(client):
+    res = client.post("/reviews", json={"prd_text": "テストPRD", "max_issues": 0})
+    assert res.status_code == 422
+
+
+def _completed_review(client) -> str:
+    review_id = client.post("/reviews", json={"prd_text": "テストPRD"}).json()["review_id"]
+    for _ in range(20):
+        if client.get(f"/reviews/{review_id}").json()["status"] == "completed":
+            return review_id
+        time.sleep(0.05)
+    raise AssertionError("Review did not complete in time")
+
+
+def test_list_issues_paginates_filters_and_projects(client):
+    review_id = _completed_review(client)
+
+    first = client.get(f"/reviews/{review_id}/issues", params={"limit": 1, "fields": "priority"}).json()
+    assert first["status"] == "completed"
+    assert first["total"] >= 2
+    assert list(first["issues"][0]) == ["issue_id", "priority"]
+    second = client.get(f"/reviews/{review_id}/issues", params={"limit": 1, "cursor": first["next_cursor"]}).json()
+    assert second["issues"][0]["issue_id"] != first["issues"][0]["issue_id"]
+
+    issue_id = first["issues"][0]["issue_id"]
+    client.patch(f"/reviews/{review_id}/issues/{issue_id}/status", json={"status": "done"})
+    done = client.get(f"/reviews/{review_id}/issues", params={"status": "done"}).json()
+    assert [issue["issue_id"] for issue in done["issues"]] == [issue_id]
+    assert client.get(f"/reviews/{review_id}/issues", params={"priority": 3}).json()["total"] == 0
+
+
+def test_list_issues_rejects_bad_requests(client):
+    review_id = _completed_review(client)
+
+    assert client.get(f"/reviews/{review_id}/issues", params={"fields": "secret"}).status_code == 400
+    assert client.get(f"/reviews/{review_id}/issues", params={"cursor": "bogus"}).status_code == 400
+    assert client.get("/reviews/unknown/issues").status_code == 404
+
+
+def test_compact_status_leaves_out_prd_text_and_issues(client):
+    review_id = _completed_review(client)
+
+    full = client.get(f"/reviews/{review_id}")
+    compact = client.get(f"/reviews/{review_id}", params={"view": "compact"})
+
+    body = compact.json()
+    assert body["prd_text"] is None and body["issues"] is None
+    assert body["issue_count"] == len(full.json()["issues"])
+    assert len(compact.content) < len(full.content)
+
+
+def test_status_and_summary_answer_if_none_match_with_304(client):
+    review_id = _completed_review(client)
+
+    first = client.get(f"/reviews/{review_id}")
+    etag = first.headers["etag"]
+    assert first.json()["version"] is not None
+    unchanged = client.get(f"/reviews/{review_id}", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    # The compact view is a different representation with its own ETag
+    assert client.get(f"/reviews/{review_id}", params={"view": "compact"}).headers["etag"] != etag
+
+    summary_etag = client.get(f"/reviews/{review_id}/summary").headers["etag"]
+    assert client.get(f"/reviews/{review_id}/summary", headers={"If-None-Match": summary_etag}).status_code == 304
+
+    issue_id = first.json()["issues"][0]["issue_id"]
+    client.patch(f"/reviews/{review_id}/issues/{issue_id}/status", json={"status": "done"})
+    changed = client.get(f"/reviews/{review_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert client.get(f"/reviews/{review_id}/summary", headers={"If-None-Match": summary_etag}).status_code == 200
+
+
+def test_matching_etag_is_answered_without_loading_the_review(client, shared_mock_service, monkeypatch):
+    review_id = _completed_review(client)
+    etag = client.get(f"/reviews/{review_id}").headers["etag"]
+
+    def _fail(*_args, **_kwargs):
+        raise AssertionError("the full session was loaded for a 304")
+
+    monkeypatch.setattr(shared_mock_service, "get_review_session", _fail)
+    monkeypatch.setattr(shared_mock_service, "get_review_summary", _fail)
+
+    assert client.get(f"/reviews/{review_id}", headers={"If-None-Match": etag}).status_code == 304
+    # The long poll only reads versions as well
+    res = client.get(f"/reviews/{review_id}", params={"wait_for_version": 0}, headers={"If-None-Match": etag})
+    assert res.status_code == 304
+
+
+def test_wait_for_version_returns_immediately_when_behind_and_times_out_otherwise(client, monkeypatch):
+    monkeypatch.setattr(reviews_router.settings, "review_long_poll_seconds", 0.2)
+    review_id = _completed_review(client)
+    current = client.get(f"/reviews/{review_id}").json()["version"]
+
+    started = time.monotonic()
+    assert client.get(f"/reviews/{review_id}", params={"wait_for_version": current - 1}).status_code == 200
+    assert time.monotonic() - started < 0.2
+
+    started = time.monotonic()
+    res = client.get(f"/reviews/{review_id}", params={"wait_for_version": current})
+    assert time.monotonic() - started >= 0.2
+    assert res.json()["version"] == current
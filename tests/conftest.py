@@ -8,7 +8,10 @@ flow and background task polling logic.
 
 from __future__ import annotations
 
+import fnmatch
+import time
 from collections.abc import Generator
+from typing import Any
 
 import pytest
 from hibikasu_agent.api.schemas.reviews import Issue
@@ -39,3 +42,133 @@ def inject_fake_ai_impl(monkeypatch) -> Generator[None, None, None]:
         yield
     finally:
         pass
+
+
+class FakeRedis:
+    """In-process stand-in for the subset of redis-py used by the shared state backends.
+
+    Behaves like a client created with ``decode_responses=True``.
+    """
+
+    def __init__(self) -> None:
+        self._data: dict[str, Any] = {}
+        self._expires: dict[str, float] = {}
+
+    def _alive(self, key: str) -> bool:
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= time.time():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    def expire_now(self, key: str) -> None:
+        """Test helper: make ``key`` expire immediately."""
+        self._expires[key] = 0.0
+
+    def get(self, key: str) -> str | None:
+        return self._data[key] if self._alive(key) else None
+
+    def set(self, key: str, value: str, px: int | None = None, nx: bool = False) -> bool | None:
+        if nx and self._alive(key):
+            return None
+        self._data[key] = str(value)
+        self._expires.pop(key, None)
+        if px is not None:
+            self._expires[key] = time.time() + px / 1000
+        return True
+
+    def delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            if self._alive(key):
+                removed += 1
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return removed
+
+    def pexpire(self, key: str, ms: int) -> int:
+        if not self._alive(key):
+            return 0
+        self._expires[key] = time.time() + ms / 1000
+        return 1
+
+    def scan_iter(self, match: str = "*") -> list[str]:
+        return [key for key in list(self._data) if self._alive(key) and fnmatch.fnmatchcase(key, match)]
+
+    def eval(self, script: str, numkeys: int, *args: Any) -> int:
+        key, owner, *rest = args
+        if self.get(key) != owner:
+            return 0
+        if "pexpire" in script:
+            return self.pexpire(key, int(rest[0]))
+        return self.delete(key)
+
+    def hset(self, key: str, field: str | None = None, value: Any = None, mapping: dict[str, Any] | None = None) -> int:
+        if not self._alive(key):
+            self._data[key] = {}
+        table = self._data[key]
+        items = dict(mapping or {})
+        if field is not None:
+            items[field] = value
+        for name, item in items.items():
+            table[name] = str(item)
+        return len(items)
+
+    def hgetall(self, key: str) -> dict[str, str]:
+        return dict(self._data[key]) if self._alive(key) else {}
+
+    def hmget(self, key: str, fields: list[str]) -> list[str | None]:
+        table = self._data[key] if self._alive(key) else {}
+        return [table.get(name) for name in fields]
+
+    def hexists(self, key: str, field: str) -> bool:
+        return self._alive(key) and field in self._data[key]
+
+    def zadd(self, key: str, mapping: dict[str, float]) -> int:
+        zset = self._data.setdefault(key, {})
+        zset.update(mapping)
+        return len(mapping)
+
+    def zrem(self, key: str, *members: str) -> int:
+        zset = self._data.get(key, {})
+        return sum(1 for member in members if zset.pop(member, None) is not None)
+
+    def zrange(self, key: str, start: int, end: int) -> list[str]:
+        members = sorted(self._data.get(key, {}).items(), key=lambda item: item[1])
+        names = [name for name, _ in members]
+        return names[start:] if end == -1 else names[start : end + 1]
+
+    def zremrangebyscore(self, key: str, low: str | float, high: str | float) -> int:
+        zset = self._data.get(key, {})
+        lo = float("-inf") if low == "-inf" else float(low)
+        hi = float(high)
+        doomed = [name for name, score in zset.items() if lo <= score <= hi]
+        for name in doomed:
+            del zset[name]
+        return len(doomed)
+
+    def pipeline(self) -> _FakePipeline:
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, client: FakeRedis) -> None:
+        self._client = client
+        self._calls: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        def _queue(*args: Any, **kwargs: Any) -> _FakePipeline:
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    def execute(self) -> list[Any]:
+        results = [getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in self._calls]
+        self._calls.clear()
+        return results
+
+
+@pytest.fixture
+def fake_redis() -> FakeRedis:
+    return FakeRedis()
@@ -0,0 +1,27 @@
+"""Shared fixtures for the service-layer unit tests."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import pytest
+from hibikasu_agent.api.schemas.reviews import Issue
+
+IssueFactory = Callable[..., Issue]
+
+
+@pytest.fixture
+def make_issue() -> IssueFactory:
+    """Build an ``Issue`` with placeholder text; only the fields the tests filter on vary."""
+
+    def build(issue_id: str, *, priority: int = 1, agent_name: str = "PM", status: str | None = None) -> Issue:
+        return Issue(
+            issue_id=issue_id,
+            priority=priority,
+            agent_name=agent_name,
+            comment="c",
+            original_text="o",
+            status=status,
+        )
+
+    return build
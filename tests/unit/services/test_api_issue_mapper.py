@@ -56,3 +56,19 @@ def test_map_api_issue_clamps_priority_out_of_range() -> None:
     }
     issue = map_api_issue(item, "text")
     assert issue.priority == 3
+
+
+def test_map_api_issue_prefers_precomputed_span() -> None:
+    prd = "abc abc"
+    item = {
+        "issue_id": "5",
+        "priority": 1,
+        "agent_name": "engineer_specialist",
+        "comment": "comment",
+        "original_text": "abc",
+        "span_start": 4,
+        "span_end": 7,
+    }
+    issue = map_api_issue(item, prd)
+    assert issue.span is not None
+    assert (issue.span.start_index, issue.span.end_index) == (4, 7)
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+from google.adk.agents.run_config import StreamingMode
+from google.adk.events.event import Event
+from google.adk.sessions import InMemorySessionService
+from google.genai import types as genai_types
+from hibikasu_agent.api.schemas.reviews import Issue
+from hibikasu_agent.constants.agents import definition_for_agent_name
+from hibikasu_agent.services.providers.adk import ADKService
+from hibikasu_agent.services.providers.dialog_sessions import DialogSessionPool, estimate_tokens
+from hibikasu_agent.services.providers.shared_session_service import SharedStateSessionService
+from hibikasu_agent.services.shared_state import SqliteSharedState
+
+
+def _pool(**kwargs) -> tuple[DialogSessionPool, InMemorySessionService]:  # type: ignore[no-untyped-def]
+    service = InMemorySessionService()  # type: ignore[no-untyped-call]
+    return DialogSessionPool(service, app_name="app", **kwargs), service
+
+
+async def _session_exists(service: InMemorySessionService, session_id: str) -> bool:
+    session = await service.get_session(app_name="app", user_id="dialog_user", session_id=session_id)
+    return session is not None
+
+
+def test_estimate_tokens_counts_non_ascii_per_character() -> None:
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens("日本語") == 3
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_session_per_review_and_issue() -> None:
+    pool, _ = _pool()
+
+    first = await pool.acquire(("r1", "i1"))
+    again = await pool.acquire(("r1", "i1"))
+    other = await pool.acquire(("r2", "i1"))
+
+    assert first is again
+    assert other.session_id != first.session_id
+    assert len(pool) == 2
+
+
+@pytest.mark.asyncio
+async def test_pool_evicts_idle_sessions() -> None:
+    pool, service = _pool(idle_ttl_seconds=60)
+    session = await pool.acquire(("r1", "i1"))
+    session.last_used -= 120
+
+    await pool.evict_idle()
+
+    assert len(pool) == 0
+    assert not await _session_exists(service, session.session_id)
+
+
+@pytest.mark.asyncio
+async def test_pool_drops_least_recent_sessions_over_history_budget() -> None:
+    pool, service = _pool(max_history_tokens=10)
+    old = await pool.acquire(("r1", "old"))
+    await pool.record_turn(("r1", "old"), "a" * 24)  # 6 tokens
+    await pool.acquire(("r1", "new"))
+    await pool.record_turn(("r1", "new"), "b" * 24)
+
+    assert len(pool) == 1
+    assert not await _session_exists(service, old.session_id)
+    assert pool.total_history_tokens == 6
+
+
+class _RecordingRunner:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str]] = []
+
+    async def run_async(self, *, user_id: str, session_id: str, new_message, run_config=None):  # type: ignore[no-untyped-def]
+        self.calls.append((session_id, new_message.parts[0].text))
+        content = genai_types.Content(role="model", parts=[genai_types.Part(text=f"answer {len(self.calls)}")])
+        yield SimpleNamespace(is_final_response=lambda: True, content=content)
+
+
+@pytest.mark.asyncio
+async def test_answer_dialog_async_continues_conversation_per_issue() -> None:
+    service = ADKService()
+    runner = _RecordingRunner()
+    service._dialog_runner = runner  # type: ignore[assignment]
+    issue = Issue(issue_id="i1", priority=1, agent_name="engineer", comment="指摘", original_text="抜粋")
+
+    first = await service.answer_dialog_async(issue, "最初の質問", review_id="r1")
+    second = await service.answer_dialog_async(issue, "追加の質問", review_id="r1")
+    await service.answer_dialog_async(issue, "別レビュー", review_id="r2")
+
+    assert (first, second) == ("answer 1", "answer 2")
+    (sid1, prompt1), (sid2, prompt2), (sid3, _) = runner.calls
+    assert sid1 == sid2 != sid3
+    assert "PRD抜粋: 抜粋" in prompt1
+    # Follow-ups only send the incremental turn
+    assert prompt2 == "ユーザーの質問: 追加の質問"
+
+
+class _StreamingRunner:
+    def __init__(self, deltas: list[str]) -> None:
+        self.deltas = deltas
+        self.run_configs: list[object] = []
+
+    async def run_async(self, *, user_id: str, session_id: str, new_message, run_config=None):  # type: ignore[no-untyped-def]
+        self.run_configs.append(run_config)
+        for delta in self.deltas:
+            content = genai_types.Content(role="model", parts=[genai_types.Part(text=delta)])
+            yield SimpleNamespace(partial=True, is_final_response=lambda: False, content=content)
+        full = genai_types.Content(role="model", parts=[genai_types.Part(text="".join(self.deltas))])
+        yield SimpleNamespace(partial=False, is_final_response=lambda: True, content=full)
+
+
+@pytest.mark.asyncio
+async def test_stream_dialog_async_yields_partial_text_and_records_turn() -> None:
+    service = ADKService()
+    runner = _StreamingRunner(["前半", "後半"])
+    service._dialog_runner = runner  # type: ignore[assignment]
+    issue = Issue(issue_id="i1", priority=1, agent_name="engineer", comment="指摘", original_text="抜粋")
+
+    deltas = [delta async for delta in service.stream_dialog_async(issue, "質問", review_id="r1")]
+
+    # The aggregated final event is not repeated after the partial deltas
+    assert deltas == ["前半", "後半"]
+    assert runner.run_configs[0].streaming_mode == StreamingMode.SSE  # type: ignore[attr-defined]
+    assert service._dialog_sessions.total_history_tokens > 0
+
+
+@pytest.mark.asyncio
+async def test_stream_dialog_async_falls_back_to_final_response() -> None:
+    service = ADKService()
+    service._dialog_runner = _RecordingRunner()  # type: ignore[assignment]
+    issue = Issue(issue_id="i1", priority=1, agent_name="engineer", comment="指摘", original_text="抜粋")
+
+    deltas = [delta async for delta in service.stream_dialog_async(issue, "質問", review_id="r1")]
+
+    assert deltas == ["answer 1"]
+
+
+def test_definition_for_agent_name_resolves_display_names_and_keys() -> None:
+    assert definition_for_agent_name("Engineer Specialist").role == "engineer"  # type: ignore[union-attr]
+    assert definition_for_agent_name("qa_tester_specialist").role == "qa_tester"  # type: ignore[union-attr]
+    assert definition_for_agent_name("AI-Orchestrator") is None
+    assert definition_for_agent_name(None) is None
+
+
+def test_dialog_routes_directly_to_issue_specialist() -> None:
+    service = ADKService()
+    engineer_issue = Issue(
+        issue_id="i1", priority=1, agent_name="Engineer Specialist", comment="指摘", original_text="抜粋"
+    )
+    unknown_issue = Issue(issue_id="i2", priority=1, agent_name="unknown", comment="指摘", original_text="抜粋")
+
+    runner = service._dialog_runner_for(engineer_issue)
+
+    assert runner.agent.name == "engineer_chat"
+    # Runners are built once per role and reused
+    assert service._dialog_runner_for(engineer_issue) is runner
+    assert service._dialog_runner_for(unknown_issue) is service._dialog_runner
+
+
+def test_dialog_direct_routing_can_be_disabled() -> None:
+    service = ADKService(dialog_direct_routing=False)
+    issue = Issue(issue_id="i1", priority=1, agent_name="Engineer Specialist", comment="指摘", original_text="抜粋")
+
+    assert service._dialog_runner_for(issue) is service._dialog_runner
+
+
+@pytest.mark.asyncio
+async def test_shared_session_service_continues_dialog_on_another_worker(tmp_path) -> None:
+    db_path = tmp_path / "shared.sqlite3"
+    first_pool = DialogSessionPool(SharedStateSessionService(SqliteSharedState(db_path)), app_name="app")
+    first_service = first_pool._session_service
+    session = await first_pool.acquire(("r1", "i1"))
+    stored = await first_service.get_session(app_name="app", user_id="dialog_user", session_id=session.session_id)
+    for author, text in (("user", "質問"), ("engineer_chat", "回答")):
+        content = genai_types.Content(role="user", parts=[genai_types.Part(text=text)])
+        await first_service.append_event(stored, Event(author=author, content=content))  # type: ignore[arg-type]
+
+    # A second worker derives the same session id and recovers the turn count
+    second_pool = DialogSessionPool(SharedStateSessionService(SqliteSharedState(db_path)), app_name="app")
+    resumed = await second_pool.acquire(("r1", "i1"))
+
+    assert resumed.session_id == session.session_id
+    assert resumed.turns == 1
+    assert resumed.history_tokens == estimate_tokens("質問") + estimate_tokens("回答")
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from hibikasu_agent.api.schemas.reviews import Issue
+from hibikasu_agent.services.incremental_review import plan_incremental_review
+
+OLD_PRD = "# 概要\nユーザーは記事を投稿できる。\n# 非機能要件\nレスポンスは1秒以内。\n"
+NEW_PRD = "# 概要\nユーザーは記事を投稿できる。\n# 非機能要件\nレスポンスは200ms以内。\n# 追加\n通知を送る。\n"
+
+
+def _issue(issue_id: str, original_text: str) -> Issue:
+    return Issue(
+        issue_id=issue_id,
+        priority=2,
+        agent_name="Engineer Specialist",
+        comment="comment",
+        original_text=original_text,
+        status="done",
+    )
+
+
+def test_plan_reviews_only_changed_sections_and_carries_unchanged_issues() -> None:
+    issues = [_issue("keep", "ユーザーは記事を投稿できる。"), _issue("drop", "レスポンスは1秒以内。")]
+
+    plan = plan_incremental_review(OLD_PRD, NEW_PRD, issues)
+
+    assert [section.heading for section in plan.changed_sections] == ["非機能要件", "追加"]
+    assert "200ms" in plan.review_text and "通知" in plan.review_text
+    assert "記事を投稿" not in plan.review_text
+    assert [issue.issue_id for issue in plan.carried_issues] == ["keep"]
+    carried = plan.carried_issues[0]
+    assert carried.status == "done"
+    assert carried.span is not None
+    assert NEW_PRD[carried.span.start_index : carried.span.end_index] == "ユーザーは記事を投稿できる。"
+
+
+def test_plan_for_identical_prd_needs_no_review() -> None:
+    plan = plan_incremental_review(OLD_PRD, OLD_PRD, [_issue("keep", "レスポンスは1秒以内。")])
+
+    assert not plan.needs_review
+    assert len(plan.carried_issues) == 1
+
+
+def test_plan_remaps_spans_when_sections_move() -> None:
+    moved = "# 非機能要件\nレスポンスは1秒以内。\n# 概要\nユーザーは記事を投稿できる。\n"
+    plan = plan_incremental_review(OLD_PRD, moved, [_issue("keep", "ユーザーは記事を投稿できる。")])
+
+    assert not plan.needs_review
+    span = plan.carried_issues[0].span
+    assert span is not None
+    assert span.start_index == moved.index("ユーザーは記事")
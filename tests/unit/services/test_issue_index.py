@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from hibikasu_agent.api.schemas.reviews import Issue
+from hibikasu_agent.services.issue_index import IssueIndex
+from hibikasu_agent.services.models import ReviewRuntimeSession
+
+
+def test_get_and_position_by_issue_id(make_issue: Callable[..., Issue]) -> None:
+    issues = [make_issue("A"), make_issue("B"), make_issue("A", priority=2)]
+    index = IssueIndex(issues)
+
+    assert index.position("B") == 1
+    # The first issue wins for repeated IDs
+    assert index.get("A") is issues[0]
+    assert index.get("missing") is None
+
+
+def test_set_status_moves_issue_between_status_buckets(make_issue: Callable[..., Issue]) -> None:
+    issues = [make_issue("A"), make_issue("B", status="done")]
+    index = IssueIndex(issues)
+
+    updated = index.set_status("A", "done")
+
+    assert updated is issues[0]
+    assert issues[0].status == "done"
+    assert [issue.issue_id for _, issue in index.filter(status="done")] == ["A", "B"]
+    assert index.filter(status="pending") == []
+    assert index.set_status("missing", "done") is None
+
+
+def test_filter_intersects_status_agent_and_priority(make_issue: Callable[..., Issue]) -> None:
+    issues = [
+        make_issue("A", agent_name="PM"),
+        make_issue("B", agent_name="Legal", status="done"),
+        make_issue("C", agent_name="Legal", priority=2),
+        make_issue("D", agent_name="Legal"),
+    ]
+    index = IssueIndex(issues)
+
+    assert [pos for pos, _ in index.filter(agent_names={"Legal"})] == [1, 2, 3]
+    assert [pos for pos, _ in index.filter(status="PENDING", agent_names={"Legal"})] == [2, 3]
+    assert [pos for pos, _ in index.filter(status="pending", agent_names={"Legal"}, priority=1)] == [3]
+    assert [pos for pos, _ in index.filter(priority=2)] == [2]
+    assert index.filter(agent_names={"Nobody"}) == []
+
+
+def test_session_rebuilds_index_when_issue_list_is_replaced(make_issue: Callable[..., Issue]) -> None:
+    session = ReviewRuntimeSession(created_at=0.0, prd_text="prd", issues=[make_issue("A")])
+    first = session.issue_index()
+    assert session.issue_index() is first
+
+    session.issues = [make_issue("B")]
+
+    assert session.issue_index() is not first
+    assert session.issue_index().get("B") is session.issues[0]
+    assert session.issue_index().get("A") is None
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import pytest
+from hibikasu_agent.api.schemas.reviews import Issue
+from hibikasu_agent.constants.agents import ROLE_TO_DEFINITION
+from hibikasu_agent.services.issue_listing import (
+    agent_filter_names,
+    decode_cursor,
+    encode_cursor,
+    issue_matches,
+    paginate,
+    parse_fields,
+    project_issue,
+)
+
+
+def test_paginate_walks_all_entries_with_cursors(make_issue: Callable[..., Issue]) -> None:
+    entries = list(enumerate(make_issue(f"I{i}") for i in range(5)))
+
+    first, cursor = paginate(entries, after=None, limit=2)
+    assert [issue.issue_id for _, issue in first] == ["I0", "I1"]
+    assert cursor is not None
+    second, cursor = paginate(entries, after=decode_cursor(cursor), limit=2)
+    assert [issue.issue_id for _, issue in second] == ["I2", "I3"]
+    assert cursor is not None
+    last, cursor = paginate(entries, after=decode_cursor(cursor), limit=2)
+    assert [issue.issue_id for _, issue in last] == ["I4"]
+    assert cursor is None
+
+
+def test_cursor_round_trip_and_rejects_garbage() -> None:
+    assert decode_cursor(encode_cursor(41)) == 41
+    for bad in ("not-a-cursor", "%%%", encode_cursor(1)[:-1] + "!"):
+        with pytest.raises(ValueError):
+            decode_cursor(bad)
+
+
+def test_issue_matches_status_agent_and_priority(make_issue: Callable[..., Issue]) -> None:
+    engineer = ROLE_TO_DEFINITION["engineer"]
+    issue = make_issue("I1", priority=2, agent_name=engineer.display_name)
+
+    assert issue_matches(issue, status="pending")
+    assert not issue_matches(issue, status="done")
+    assert issue_matches(issue, agent_names=agent_filter_names("engineer"), priority=2)
+    assert issue_matches(issue, agent_names=agent_filter_names(engineer.agent_key))
+    assert not issue_matches(issue, agent_names=agent_filter_names("pm"))
+    assert not issue_matches(issue, priority=1)
+
+
+def test_project_issue_keeps_only_requested_fields(make_issue: Callable[..., Issue]) -> None:
+    fields = parse_fields("summary, priority,summary")
+
+    assert fields == ("summary", "priority")
+    assert project_issue(make_issue("I1"), fields) == {"issue_id": "I1", "summary": "", "priority": 1}
+    assert parse_fields(None) is None
+    with pytest.raises(ValueError, match="unknown fields: nope"):
+        parse_fields("issue_id,nope")
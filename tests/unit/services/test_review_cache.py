@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from hibikasu_agent.api.schemas.reviews import Issue
+from hibikasu_agent.schemas.models import FinalIssue
+from hibikasu_agent.services.review_cache import ReviewResultCache, build_review_cache_key
+
+
+def _issue(issue_id: str = "I-1", status: str | None = None) -> Issue:
+    return Issue(
+        issue_id=issue_id,
+        priority=1,
+        agent_name="Engineer Specialist",
+        comment="comment",
+        original_text="text",
+        status=status,
+    )
+
+
+def test_cache_key_ignores_insignificant_prd_differences() -> None:
+    base = build_review_cache_key("# PRD\nline\n", ["a", "b"], model="m", prompts_hash="p")
+    edited = build_review_cache_key("\r\n# PRD  \r\nline", ["b", "a"], model="m", prompts_hash="p")
+    assert base == edited
+
+
+def test_cache_key_depends_on_agents_model_and_prompts() -> None:
+    base = build_review_cache_key("prd", ["a"], model="m", prompts_hash="p")
+    assert base != build_review_cache_key("prd", ["a", "b"], model="m", prompts_hash="p")
+    assert base != build_review_cache_key("prd", ["a"], model="other", prompts_hash="p")
+    assert base != build_review_cache_key("prd", ["a"], model="m", prompts_hash="q")
+    assert base != build_review_cache_key("prd!", ["a"], model="m", prompts_hash="p")
+
+
+def test_cache_returns_fresh_copies_without_status() -> None:
+    cache = ReviewResultCache()
+    cache.set("k", [_issue(status="done")])
+
+    first = cache.get("k")
+    second = cache.get("k")
+    assert first is not None and second is not None
+    assert first[0].status is None
+    first[0].status = "later"
+    assert second[0].status is None
+
+
+def test_cache_evicts_least_recently_used_and_expired_entries() -> None:
+    cache = ReviewResultCache(max_entries=2)
+    cache.set("a", [_issue("A")])
+    cache.set("b", [_issue("B")])
+    assert cache.get("a") is not None
+    cache.set("c", [_issue("C")])
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+    expired = ReviewResultCache(ttl_seconds=-1)
+    expired.set("a", [_issue()])
+    assert expired.get("a") is None
+
+
+def test_cache_sqlite_tier_survives_new_instance(tmp_path) -> None:
+    db_path = tmp_path / "cache.sqlite3"
+    ReviewResultCache(db_path=db_path).set("k", [_issue("PERSISTED")])
+
+    reopened = ReviewResultCache(db_path=db_path)
+    issues = reopened.get("k")
+    assert issues is not None
+    assert issues[0].issue_id == "PERSISTED"
+
+
+def test_cache_key_depends_on_agent_weights() -> None:
+    base = build_review_cache_key("prd", ["a"], model="m", prompts_hash="p")
+    assert base == build_review_cache_key("prd", ["a"], model="m", prompts_hash="p", agent_weights={})
+    weighted = build_review_cache_key("prd", ["a"], model="m", prompts_hash="p", agent_weights={"a": 1.5})
+    assert weighted != base
+    assert weighted != build_review_cache_key("prd", ["a"], model="m", prompts_hash="p", agent_weights={"a": 0.5})
+
+
+def test_cache_keeps_truncated_issues(tmp_path) -> None:
+    truncated = FinalIssue(issue_id="T-1", agent_name="PM", priority=3, comment="cut", original_text="text")
+    ReviewResultCache(db_path=tmp_path / "cache.sqlite3").set("k", [_issue()], truncated_issues=[truncated])
+
+    review = ReviewResultCache(db_path=tmp_path / "cache.sqlite3").get_review("k")
+    assert review is not None
+    assert [issue.comment for issue in review.truncated_issues] == ["cut"]
+
+
+def test_cache_reads_entries_without_truncated_issues(tmp_path) -> None:
+    db_path = tmp_path / "cache.sqlite3"
+    legacy = ReviewResultCache(db_path=db_path)
+    legacy.set("k", [_issue("OLD")])
+    legacy._db.execute(  # type: ignore[union-attr]
+        "UPDATE review_cache SET payload = ?",
+        (b'[{"issue_id": "OLD", "priority": 1, "agent_name": "PM", "comment": "c", "original_text": "o"}]',),
+    )
+    legacy._db.commit()  # type: ignore[union-attr]
+
+    review = ReviewResultCache(db_path=db_path).get_review("k")
+    assert review is not None
+    assert [issue.issue_id for issue in review.issues] == ["OLD"]
+    assert review.truncated_issues == []
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import pytest
+from google.genai import types as genai_types
+from hibikasu_agent.services.token_accounting import ModelPrice, TokenPricing, parse_model_prices, usage_counts
+
+
+def test_price_resolves_longest_model_prefix() -> None:
+    pricing = TokenPricing()
+
+    assert pricing.price_for("gemini-2.5-flash-lite-preview-06-17") == ModelPrice(0.10, 0.40)
+    assert pricing.price_for("models/gemini-2.5-flash") == ModelPrice(0.30, 2.50)
+    assert pricing.price_for("unknown-model") is None
+    assert pricing.cost("unknown-model", 100, 100) is None
+
+
+def test_cost_uses_overrides_per_million_tokens() -> None:
+    pricing = TokenPricing(parse_model_prices("my-model=1/4, broken=x/1, gemini-2.5-pro=2/20"))
+
+    assert pricing.cost("my-model", 1_000_000, 500_000) == pytest.approx(3.0)
+    assert pricing.price_for("gemini-2.5-pro") == ModelPrice(2.0, 20.0)
+    assert pricing.price_for("broken") is None
+
+
+def test_usage_counts_bill_thinking_tokens_as_completion() -> None:
+    usage = genai_types.GenerateContentResponseUsageMetadata(
+        prompt_token_count=1200, candidates_token_count=300, thoughts_token_count=50, total_token_count=1550
+    )
+
+    assert usage_counts(usage) == (1200, 350, 1550)
+    assert usage_counts(genai_types.GenerateContentResponseUsageMetadata()) is None
+    assert usage_counts(None) is None
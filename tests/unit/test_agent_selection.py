@@ -3,7 +3,10 @@
 from __future__ import annotations
 
 import pytest
-from hibikasu_agent.agents.parallel_orchestrator.agent import create_parallel_review_agent
+from hibikasu_agent.agents.parallel_orchestrator.agent import (
+    create_chunked_review_agent,
+    create_parallel_review_agent,
+)
 from hibikasu_agent.services.providers.adk import ADKService
 
 
@@ -33,6 +36,15 @@ def test_create_parallel_review_agent_with_none_agents() -> None:
     assert agent is not None
 
 
+def test_create_chunked_review_agent_builds_one_group_per_chunk() -> None:
+    """Chunked pipeline fans selected specialists out per chunk."""
+    agent = create_chunked_review_agent(selected_agents=["engineer", "pm"], chunk_count=3)
+    chunk_groups = agent.sub_agents[0].sub_agents
+    assert len(chunk_groups) == 3
+    assert [sub.name for sub in chunk_groups[1].sub_agents] == ["engineer_specialist_chunk2", "pm_specialist_chunk2"]
+    assert chunk_groups[1].sub_agents[0].output_key == "engineer_issues__chunk2of3"
+
+
 def test_adk_service_available_agent_roles() -> None:
     """Test that ADKService returns available agent roles."""
     service = ADKService()
@@ -1,15 +1,30 @@
 from __future__ import annotations
 
-import asyncio
 from collections.abc import Callable
 from types import SimpleNamespace
 from typing import Any
 
 import hibikasu_agent.services.ai_service as ai_service_module
 import pytest
+from google.adk.events.event import Event
+from google.adk.events.event_actions import EventActions
+from google.genai import types as genai_types
+from hibikasu_agent.agents.parallel_orchestrator.tools import to_final_issues
 from hibikasu_agent.api.schemas.reviews import Issue
-from hibikasu_agent.constants.agents import AGENT_STATE_KEYS, SPECIALIST_AGENT_KEYS
+from hibikasu_agent.constants.agents import (
+    AGENT_STATE_KEYS,
+    ROLE_TO_DEFINITION,
+    SPECIALIST_AGENT_KEYS,
+    chunk_agent_name,
+    chunk_state_key,
+    specialist_error_state_key,
+)
+from hibikasu_agent.schemas.models import FinalIssue, IssuesResponse
 from hibikasu_agent.services.ai_service import AiService
+from hibikasu_agent.services.review_cache import ReviewResultCache
+from hibikasu_agent.services.review_events import ReviewEventBroker
+from hibikasu_agent.services.review_store import SqliteReviewSessionStore
+from hibikasu_agent.utils.metrics import LLM_TOKENS_TOTAL
 
 
 class _StubADK:
@@ -30,7 +45,7 @@ class _StubADK:
             )
         ]
 
-    async def answer_dialog_async(self, issue: Issue, question_text: str):  # type: ignore[no-untyped-def]
+    async def answer_dialog_async(self, issue: Issue, question_text: str, *, review_id: str = ""):  # type: ignore[no-untyped-def]
         return f"ans:{issue.issue_id}:{question_text}"
 
 
@@ -45,12 +60,24 @@ def test_kickoff_review_populates_session():
     assert data["issues"][0].issue_id == "UNIT-1"
 
 
+@pytest.mark.asyncio
+async def test_kickoff_review_async_runs_on_current_loop():
+    svc = AiService(adk_service=_StubADK())
+    rid = svc.new_review_session("PRD for unit test")
+
+    await svc.kickoff_review_async(rid)
+
+    data = svc.get_review_session(rid)
+    assert data["status"] == "completed"
+    assert data["progress"] == 1.0
+    assert data["issues"][0].issue_id == "UNIT-1"
+
+
 @pytest.mark.asyncio
 async def test_answer_dialog_calls_provider():
     svc = AiService(adk_service=_StubADK())
     rid = svc.new_review_session("PRD for unit test")
-    # kickoff_review is synchronous but uses asyncio.run internally; run it off the event loop.
-    await asyncio.to_thread(svc.kickoff_review, rid)
+    await svc.kickoff_review_async(rid)
     issue_id = svc.reviews_in_memory[rid].issues[0].issue_id  # type: ignore[index]
 
     out = await svc.answer_dialog(rid, issue_id, "Q?")
@@ -61,7 +88,7 @@ class _ErrorADK:
     async def run_review_async(self, prd_text: str, *, on_event=None, selected_agents=None):  # type: ignore[no-untyped-def]
         raise RuntimeError("ADK failed during aggregation")
 
-    async def answer_dialog_async(self, issue: Issue, question_text: str):  # type: ignore[no-untyped-def]
+    async def answer_dialog_async(self, issue: Issue, question_text: str, *, review_id: str = ""):  # type: ignore[no-untyped-def]
         return ""
 
 
@@ -116,3 +143,419 @@ def test_handle_adk_event_ignores_unknown_keys(monkeypatch):
 
     assert session.completed_agents == []
     assert session.progress == 0.0
+
+
+def test_update_queue_position_reports_wait_and_resets_on_start():
+    svc = AiService(adk_service=_StubADK())
+    rid = svc.new_review_session("PRD for unit test")
+
+    svc.update_queue_position(rid, 3, 120)
+    data = svc.get_review_session(rid)
+    assert data["phase"] == "queued"
+    assert "3番目" in (data["phase_message"] or "")
+    assert data["eta_seconds"] == 120
+
+    svc.kickoff_review(rid)
+    data = svc.get_review_session(rid)
+    assert data["phase"] == "completed"
+    assert data["eta_seconds"] is None
+
+
+class _CountingADK(_StubADK):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def run_review_async(self, prd_text: str, *, on_event=None, selected_agents=None):  # type: ignore[no-untyped-def]
+        self.calls += 1
+        return await super().run_review_async(prd_text, on_event=on_event, selected_agents=selected_agents)
+
+
+def test_kickoff_review_reuses_cached_result_for_same_prd():
+    adk = _CountingADK()
+    svc = AiService(adk_service=adk, review_cache=ReviewResultCache())
+
+    first = svc.new_review_session("Same PRD")
+    svc.kickoff_review(first)
+    second = svc.new_review_session("Same PRD\n")
+    svc.kickoff_review(second)
+
+    assert adk.calls == 1
+    assert svc.get_review_session(first)["cache_status"] == "miss"
+    data = svc.get_review_session(second)
+    assert data["status"] == "completed"
+    assert data["cache_status"] == "hit"
+    assert data["issues"][0].issue_id == "UNIT-1"
+
+
+class _TargetADK(_StubADK):
+    async def run_review_async(self, prd_text: str, *, on_event=None, selected_agents=None):  # type: ignore[no-untyped-def]
+        return [
+            Issue(
+                issue_id="SPAN-1",
+                priority=1,
+                agent_name="Engineer Specialist",
+                comment="review",
+                original_text="target text",
+            )
+        ]
+
+
+def test_cache_hit_recomputes_spans_for_new_prd_text():
+    svc = AiService(adk_service=_TargetADK(), review_cache=ReviewResultCache())
+
+    first = svc.new_review_session("# T\nfoo bar\ntarget text\n")
+    svc.kickoff_review(first)
+    prd = "\n\n# T   \r\nfoo bar    \r\ntarget text\r\n"
+    second = svc.new_review_session(prd)
+    svc.kickoff_review(second)
+
+    data = svc.get_review_session(second)
+    assert data["cache_status"] == "hit"
+    span = data["issues"][0].span
+    assert span is not None
+    assert prd[span.start_index : span.end_index] == "target text"
+
+
+class _RecordingADK(_StubADK):
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    async def run_review_async(self, prd_text: str, *, on_event=None, selected_agents=None):  # type: ignore[no-untyped-def]
+        self.prompts.append(prd_text)
+        return [
+            Issue(
+                issue_id=f"RUN-{len(self.prompts)}",
+                priority=2,
+                agent_name="Engineer Specialist",
+                comment="review",
+                original_text=prd_text.splitlines()[-1],
+            )
+        ]
+
+
+def test_incremental_review_reruns_only_changed_sections():
+    adk = _RecordingADK()
+    svc = AiService(adk_service=adk)
+    base = svc.new_review_session("# A\n変更なしの要件\n# B\n古い要件")
+    svc.kickoff_review(base)
+
+    rid = svc.new_review_session("# A\n変更なしの要件\n# B\n新しい要件", base_review_id=base)
+    svc.kickoff_review(rid)
+
+    assert adk.prompts[-1] == "# B\n新しい要件"
+    issues = svc.get_review_session(rid)["issues"]
+    assert [issue.issue_id for issue in issues] == ["RUN-2"]
+    assert issues[0].span is not None
+
+
+def test_handle_adk_event_counts_chunked_agent_once_all_chunks_finish(monkeypatch):
+    svc = AiService(adk_service=_StubADK())
+    rid = svc.new_review_session("PRD for unit test")
+    session = svc.reviews_in_memory[rid]
+    agent = SPECIALIST_AGENT_KEYS[0]
+    session.expected_agents = [agent, SPECIALIST_AGENT_KEYS[1]]
+    state_key = AGENT_STATE_KEYS[agent]
+
+    class DummyEvent:
+        def __init__(self, delta: dict[str, object]):
+            self.actions = SimpleNamespace(state_delta=delta)
+
+    monkeypatch.setattr(ai_service_module, "ADKEvent", DummyEvent)
+
+    svc._handle_adk_event(session, DummyEvent({chunk_state_key(state_key, 1, 2): {"issues": []}}))
+    assert session.completed_agents == []
+
+    svc._handle_adk_event(session, DummyEvent({chunk_state_key(state_key, 0, 2): {"issues": []}}))
+    assert session.completed_agents == [agent]
+    assert session.progress == 0.5
+
+
+@pytest.mark.asyncio
+async def test_ai_service_persists_through_sqlite_store(tmp_path):
+    db_path = tmp_path / "sessions.sqlite3"
+    svc = AiService(adk_service=_StubADK(), review_store=SqliteReviewSessionStore(db_path))
+    rid = svc.new_review_session("PRD for unit test")
+
+    await svc.kickoff_review_async(rid)
+    assert svc.update_issue_status(rid, "UNIT-1", "done")
+
+    # A fresh service over the same database sees the completed review
+    restarted = AiService(adk_service=_StubADK(), review_store=SqliteReviewSessionStore(db_path))
+    data = restarted.get_review_session(rid)
+    assert data["status"] == "completed"
+    assert data["issues"][0].status == "done"
+
+
+@pytest.mark.asyncio
+async def test_kickoff_review_async_publishes_progress_and_completion_events():
+    broker = ReviewEventBroker()
+    svc = AiService(adk_service=_StubADK(), event_broker=broker)
+    rid = svc.new_review_session("PRD for unit test")
+    subscription = broker.subscribe(rid, last_event_id=0)
+
+    await svc.kickoff_review_async(rid)
+
+    events = [item async for item in subscription.events(heartbeat_seconds=1) if item is not None]
+    subscription.close()
+    assert [event.event for event in events] == ["progress", "completed"]
+    assert events[-1].data["issues"][0]["issue_id"] == "UNIT-1"
+    assert "prd_text" not in events[-1].data
+
+
+def test_handle_adk_event_exposes_provisional_issues(monkeypatch):
+    prd = "ログイン画面でパスワードを入力する。"
+    svc = AiService(adk_service=_StubADK())
+    rid = svc.new_review_session(prd)
+    session = svc.reviews_in_memory[rid]
+    first_agent, second_agent = SPECIALIST_AGENT_KEYS[:2]
+    session.expected_agents = [first_agent, second_agent]
+
+    class DummyEvent:
+        def __init__(self, delta: dict[str, object]):
+            self.actions = SimpleNamespace(state_delta=delta)
+
+    monkeypatch.setattr(ai_service_module, "ADKEvent", DummyEvent)
+    output = {"issues": [{"priority": 2, "summary": "s", "comment": "c", "original_text": "パスワードを入力"}]}
+
+    svc._handle_adk_event(session, DummyEvent({AGENT_STATE_KEYS[first_agent]: output}))
+    # Re-delivered output must not duplicate provisional issues
+    svc._handle_adk_event(session, DummyEvent({AGENT_STATE_KEYS[first_agent]: output}))
+
+    data = svc.get_review_session(rid)
+    assert data["issues"] is None
+    provisional = data["provisional_issues"]
+    assert len(provisional) == 1
+    assert provisional[0].span is not None
+    assert prd[provisional[0].span.start_index : provisional[0].span.end_index] == "パスワードを入力"
+    expected_id = to_final_issues(first_agent, IssuesResponse.model_validate(output))[0].issue_id
+    assert provisional[0].issue_id == expected_id
+
+
+@pytest.mark.asyncio
+async def test_phase_changes_are_reported_and_exhausted_jobs_fail_the_review():
+    phases: list[tuple[str, str]] = []
+    svc = AiService(adk_service=_StubADK(), on_phase_change=lambda rid, phase: phases.append((rid, phase)))
+    done = svc.new_review_session("PRD done")
+    stuck = svc.new_review_session("PRD stuck")
+
+    await svc.kickoff_review_async(done)
+    assert svc.unfinished_review_ids() == [stuck]
+    # Sessions younger than the given age may still be enqueued by the worker that accepted them
+    assert svc.unfinished_review_ids(min_age_seconds=60) == []
+
+    svc.abandon_review(stuck, "review job failed after 3 attempts")
+    data = svc.get_review_session(stuck)
+    assert data["status"] == "failed"
+    assert phases == [(done, "completed"), (stuck, "failed")]
+    assert svc.unfinished_review_ids() == []
+
+    # A failed review is not re-run when its job is claimed again
+    await svc.kickoff_review_async(stuck)
+    assert svc.get_review_session(stuck)["status"] == "failed"
+
+
+def test_failed_specialist_is_recorded_and_review_completes_with_the_rest(monkeypatch):
+    svc = AiService(adk_service=_StubADK())
+    rid = svc.new_review_session("PRD for unit test")
+    session = svc.reviews_in_memory[rid]
+    failed_agent, ok_agent = SPECIALIST_AGENT_KEYS[:2]
+    session.expected_agents = [failed_agent, ok_agent]
+
+    class DummyEvent:
+        def __init__(self, delta: dict[str, object]):
+            self.actions = SimpleNamespace(state_delta=delta)
+
+    monkeypatch.setattr(ai_service_module, "ADKEvent", DummyEvent)
+
+    failed_key = AGENT_STATE_KEYS[failed_agent]
+    svc._handle_adk_event(
+        session,
+        DummyEvent({failed_key: {"issues": []}, specialist_error_state_key(failed_key): "TimeoutError: deadline"}),
+    )
+    svc._complete_session(rid, session, [])
+
+    assert session.completed_agents == [failed_agent, ok_agent]
+    assert svc.get_review_session(rid)["agent_errors"] == {failed_agent: "TimeoutError: deadline"}
+    assert svc.get_review_summary(rid)["agent_errors"] == {failed_agent: "TimeoutError: deadline"}
+    assert "1名の専門家" in (session.phase_message or "")
+
+
+def test_token_usage_is_summed_per_specialist_and_exposed_in_summary() -> None:
+    svc = AiService(adk_service=_StubADK())
+    rid = svc.new_review_session("PRD")
+    session = svc._store.get(rid)
+    assert session is not None
+    agent = session.expected_agents[0]
+    model = "gemini-2.5-flash-lite"
+    prompt_before = LLM_TOKENS_TOTAL.value(model=model, agent=agent, kind="prompt")
+
+    def _usage_event(author: str, prompt: int, completion: int) -> Event:
+        return Event(
+            author=author,
+            model_version=model,
+            usage_metadata=genai_types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=prompt, candidates_token_count=completion, total_token_count=prompt + completion
+            ),
+        )
+
+    svc._handle_adk_event(session, _usage_event(chunk_agent_name(agent, 0), 1_000_000, 100_000))
+    svc._handle_adk_event(session, _usage_event(chunk_agent_name(agent, 1), 1_000_000, 100_000))
+    svc._handle_adk_event(session, _usage_event("IssueAggregatorMerger", 500, 0))
+    svc._complete_session(rid, session, [])
+
+    usage = svc.get_review_summary(rid)["token_usage"]
+    assert usage["model"] == model
+    assert usage["agents"][agent]["prompt_tokens"] == 2_000_000
+    assert usage["agents"][agent]["completion_tokens"] == 200_000
+    assert usage["agents"][agent]["estimated_cost_usd"] == pytest.approx(0.28)
+    assert usage["total"]["total_tokens"] == 2_200_500
+    assert LLM_TOKENS_TOTAL.value(model=model, agent=agent, kind="prompt") == prompt_before + 2_000_000
+
+
+class _RankingADK(_StubADK):
+    def __init__(self) -> None:
+        self.limits: dict[str, Any] = {}
+
+    async def run_review_async(self, prd_text: str, *, on_event=None, selected_agents=None, **limits):  # type: ignore[no-untyped-def]
+        self.limits = limits
+        truncated = FinalIssue(
+            issue_id="CUT-1",
+            priority=3,
+            agent_name="Engineer Specialist",
+            comment="cut",
+            original_text="後半の要件",
+            span_start=0,
+            span_end=1,
+        )
+        event = Event(
+            author="IssueAggregatorMerger",
+            actions=EventActions(
+                state_delta={"final_review_issues": {"final_issues": [], "truncated_issues": [truncated.model_dump()]}}
+            ),
+        )
+        if on_event:
+            on_event(event)
+        return await super().run_review_async(prd_text, on_event=on_event, selected_agents=selected_agents)
+
+
+def test_truncated_issues_are_kept_and_mapped_on_demand() -> None:
+    adk = _RankingADK()
+    svc = AiService(adk_service=adk)
+    rid = svc.new_review_session("前半の要件。後半の要件。", max_issues=3)
+
+    svc.kickoff_review(rid)
+
+    assert adk.limits == {"max_issues": 3}
+    assert svc.get_review_session(rid)["truncated_issue_count"] == 1
+    (issue,) = svc.get_truncated_issues(rid)
+    assert issue.issue_id == "CUT-1"
+    # The span is located in the full PRD instead of trusting the pipeline's offsets
+    assert issue.span is not None and (issue.span.start_index, issue.span.end_index) == (6, 11)
+    assert svc.get_truncated_issues("missing") == []
+
+
+def test_cache_hit_restores_truncated_issues() -> None:
+    svc = AiService(adk_service=_RankingADK(), review_cache=ReviewResultCache())
+    svc.kickoff_review(svc.new_review_session("前半の要件。後半の要件。"))
+
+    rid = svc.new_review_session("前半の要件。後半の要件。\n")
+    svc.kickoff_review(rid)
+
+    data = svc.get_review_session(rid)
+    assert data["cache_status"] == "hit"
+    assert data["truncated_issue_count"] == 1
+    assert [issue.issue_id for issue in svc.get_truncated_issues(rid)] == ["CUT-1"]
+
+
+def test_cache_key_includes_agent_weights() -> None:
+    adk = _CountingADK()
+    cache = ReviewResultCache()
+    default = AiService(adk_service=adk, review_cache=cache)
+    default.kickoff_review(default.new_review_session("Same PRD"))
+    weighted = AiService(adk_service=adk, review_cache=cache, agent_weights={"legal_advisor": 2.0})
+    rid = weighted.new_review_session("Same PRD")
+    weighted.kickoff_review(rid)
+
+    assert adk.calls == 2
+    assert weighted.get_review_session(rid)["cache_status"] == "miss"
+
+
+def test_session_version_is_bumped_on_every_visible_change(monkeypatch) -> None:
+    svc = AiService(adk_service=_StubADK())
+    rid = svc.new_review_session("PRD for unit test")
+    session = svc._store.get(rid)
+    assert session is not None
+    assert svc.get_review_version(rid) == 0
+
+    class DummyEvent:
+        def __init__(self, delta: dict[str, object]):
+            self.actions = SimpleNamespace(state_delta=delta)
+
+    monkeypatch.setattr(ai_service_module, "ADKEvent", DummyEvent)
+    svc._handle_adk_event(session, DummyEvent({AGENT_STATE_KEYS[session.expected_agents[0]]: {"issues": []}}))
+    after_event = svc.get_review_version(rid)
+    assert after_event is not None and after_event > 0
+
+    svc._complete_session(
+        rid, session, [Issue(issue_id="I1", priority=1, agent_name="A", comment="c", original_text="")]
+    )
+    completed = svc.get_review_version(rid)
+    assert completed is not None and completed > after_event
+
+    assert svc.update_issue_status(rid, "I1", "done")
+    assert svc.get_review_version(rid) == completed + 1
+    assert svc.get_review_session(rid)["version"] == completed + 1
+    assert svc.get_review_version("missing") is None
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+def test_issue_lookups_and_filtered_listing_follow_status_updates(tmp_path, persistent: bool) -> None:
+    store = SqliteReviewSessionStore(str(tmp_path / "reviews.db")) if persistent else None
+    svc = AiService(adk_service=_StubADK(), review_store=store)
+    rid = svc.new_review_session("PRD for unit test")
+    session = svc._store.get(rid)
+    assert session is not None
+    issues = [
+        Issue(
+            issue_id=f"I{i}",
+            priority=1 + i % 2,
+            agent_name=ROLE_TO_DEFINITION[role].display_name,
+            comment="c",
+            original_text="",
+        )
+        for i, role in enumerate(["engineer", "pm", "engineer"])
+    ]
+    svc._complete_session(rid, session, issues)
+
+    assert svc.find_issue(rid, "I2") is not None
+    assert svc.update_issue_status(rid, "I2", "done")
+    assert not svc.update_issue_status(rid, "missing", "done")
+
+    assert [pos for pos, _ in svc.list_issues(rid, status="pending")] == [0, 1]
+    assert [pos for pos, _ in svc.list_issues(rid, status="done", agent="engineer")] == [2]
+    assert [pos for pos, _ in svc.list_issues(rid, agent="engineer", priority=1)] == [0, 2]
+    assert svc.list_issues("missing") == []
+
+
+def test_token_only_events_are_persisted_with_their_version(tmp_path) -> None:
+    db_path = str(tmp_path / "reviews.db")
+    svc = AiService(adk_service=_StubADK(), review_store=SqliteReviewSessionStore(db_path))
+    other_worker = AiService(adk_service=_StubADK(), review_store=SqliteReviewSessionStore(db_path))
+    rid = svc.new_review_session("PRD")
+    session = svc._store.get(rid)
+    assert session is not None
+    before = other_worker.get_review_version(rid)
+
+    usage_event = Event(
+        author=session.expected_agents[0],
+        model_version="gemini-2.5-flash-lite",
+        usage_metadata=genai_types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=100, candidates_token_count=10, total_token_count=110
+        ),
+    )
+    svc._event_handler(rid, session)(usage_event)
+
+    # No agent completed and the phase did not change, but the version bump still reaches the shared store
+    after = other_worker.get_review_version(rid)
+    assert before is not None and after == before + 1
+    assert other_worker.get_review_summary(rid)["token_usage"]["total"]["total_tokens"] == 110
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from hibikasu_agent.agents.parallel_orchestrator.issue_merge import merge_similar_issues
+from hibikasu_agent.agents.parallel_orchestrator.tools import AGGREGATE_FINAL_ISSUES_TOOL
+from hibikasu_agent.constants.agents import AGENT_STATE_KEYS, PRD_TEXT_STATE_KEY, ROLE_TO_DEFINITION
+from hibikasu_agent.schemas.models import FinalIssue
+
+PRD = "ログイン画面ではメールアドレスとパスワードを入力する。ログイン失敗時のエラー表示は未定義。検索結果は保存できる。"
+
+
+def _issue(issue_id: str, agent: str, priority: int, *, summary: str, comment: str, quote: str = "") -> FinalIssue:
+    return FinalIssue(
+        issue_id=issue_id, priority=priority, agent_name=agent, summary=summary, comment=comment, original_text=quote
+    )
+
+
+def test_same_quote_and_similar_comment_are_merged_with_all_agents() -> None:
+    engineer = _issue(
+        "E1",
+        "Engineer",
+        2,
+        summary="エラー表示が未定義",
+        comment="ログイン失敗時のエラー表示の仕様が未定義です。",
+        quote="ログイン失敗時のエラー表示は未定義",
+    )
+    qa = _issue(
+        "Q1",
+        "QA",
+        1,
+        summary="エラー表示が未定義",
+        comment="ログイン失敗時のエラー表示の仕様が未定義のためテストできません。",
+        quote="エラー表示は未定義",
+    )
+
+    merged = merge_similar_issues([engineer, qa], PRD)
+
+    assert len(merged) == 1
+    assert merged[0].issue_id == "Q1"
+    assert merged[0].priority == 1
+    assert merged[0].contributing_agents == ["Engineer", "QA"]
+
+
+def test_different_points_about_the_same_quote_stay_separate() -> None:
+    quote = "ログイン画面ではメールアドレスとパスワードを入力する"
+    issues = [
+        _issue(
+            "E1",
+            "Engineer",
+            1,
+            summary="パスワード保存方式",
+            comment="パスワードのハッシュ化方式を明記してください。",
+            quote=quote,
+        ),
+        _issue(
+            "U1",
+            "UX",
+            2,
+            summary="入力補助",
+            comment="メールアドレス欄に自動補完と表示切替を用意しましょう。",
+            quote=quote,
+        ),
+    ]
+
+    merged = merge_similar_issues(issues, PRD)
+
+    assert [issue.issue_id for issue in merged] == ["E1", "U1"]
+    assert [issue.contributing_agents for issue in merged] == [["Engineer"], ["UX"]]
+
+
+def test_near_identical_text_is_merged_without_spans() -> None:
+    comment = "検索結果の保存件数に上限がなく、ストレージ容量の見積もりができません。上限を定めてください。"
+    issues = [
+        _issue("E1", "Engineer", 2, summary="保存件数の上限", comment=comment),
+        _issue("D1", "Data", 2, summary="保存件数の上限", comment=comment.replace("定めてください", "決めてください")),
+        _issue("P1", "PM", 3, summary="KPI未定義", comment="成功指標が定義されていません。"),
+    ]
+
+    merged = merge_similar_issues(issues)
+
+    assert [issue.issue_id for issue in merged] == ["E1", "P1"]
+    assert merged[0].contributing_agents == ["Engineer", "Data"]
+
+
+def test_aggregate_final_issues_merges_across_specialists() -> None:
+    output = {
+        "issues": [
+            {
+                "priority": 1,
+                "summary": "エラー表示が未定義",
+                "comment": "ログイン失敗時のエラー表示の仕様が未定義です。",
+                "original_text": "ログイン失敗時のエラー表示は未定義",
+            }
+        ]
+    }
+    state: dict[str, object] = {PRD_TEXT_STATE_KEY: PRD}
+    for role in ("engineer", "qa_tester"):
+        state[AGENT_STATE_KEYS[ROLE_TO_DEFINITION[role].agent_key]] = output
+
+    result = AGGREGATE_FINAL_ISSUES_TOOL(SimpleNamespace(state=state))  # type: ignore[arg-type]
+
+    assert len(result.final_issues) == 1
+    assert result.final_issues[0].contributing_agents == ["Engineer Specialist", "QA Tester Specialist"]
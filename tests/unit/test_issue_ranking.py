@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from hibikasu_agent.agents.parallel_orchestrator.issue_ranking import (
+    RankingOptions,
+    parse_agent_weights,
+    rank_issues,
+    score_issue,
+)
+from hibikasu_agent.agents.parallel_orchestrator.tools import AGGREGATE_FINAL_ISSUES_TOOL
+from hibikasu_agent.constants.agents import AGENT_STATE_KEYS, REVIEW_RANKING_STATE_KEY, ROLE_TO_DEFINITION
+from hibikasu_agent.schemas.models import FinalIssue
+
+
+def _issue(issue_id: str, agent: str, priority: int, **extra: object) -> FinalIssue:
+    return FinalIssue(
+        issue_id=issue_id,
+        priority=priority,
+        agent_name=agent,
+        summary=issue_id,
+        comment=issue_id,
+        original_text="",
+        **extra,  # type: ignore[arg-type]
+    )
+
+
+def test_rank_issues_applies_top_k_and_per_agent_quota() -> None:
+    issues = [
+        _issue("E1", "Engineer", 1),
+        _issue("E2", "Engineer", 1),
+        _issue("E3", "Engineer", 1),
+        _issue("P1", "PM", 2),
+        _issue("P2", "PM", 3),
+    ]
+
+    selected, truncated = rank_issues(issues, RankingOptions(top_k=3, per_agent_quota=2))
+
+    assert [issue.issue_id for issue in selected] == ["E1", "E2", "P1"]
+    # Skipped by the quota and left over by the top-K, still in rank order
+    assert [issue.issue_id for issue in truncated] == ["E3", "P2"]
+
+
+def test_rank_issues_without_limits_keeps_everything_in_rank_order() -> None:
+    issues = [_issue("A", "QA", 3), _issue("B", "PM", 1), _issue("C", "UX", 2), _issue("D", "PM", 1)]
+
+    selected, truncated = rank_issues(issues, RankingOptions(top_k=None, per_agent_quota=None))
+
+    assert [issue.issue_id for issue in selected] == ["B", "D", "C", "A"]
+    assert truncated == []
+
+
+def test_score_rewards_duplicate_support_weight_and_earlier_quotes() -> None:
+    single = _issue("S", "QA", 2)
+    supported = _issue("M", "QA", 2, contributing_agents=["QA", "Engineer", "PM", "UX"])
+    early = _issue("E", "QA", 2, span_start=0)
+    late = _issue("L", "QA", 2, span_start=90)
+
+    assert score_issue(supported) > score_issue(_issue("P", "QA", 1)) > score_issue(single)
+    assert score_issue(early, prd_length=100) > score_issue(late, prd_length=100) > score_issue(single)
+    assert score_issue(single, weight=2.0) > score_issue(_issue("P", "QA", 1))
+
+
+def test_agent_weights_accept_roles() -> None:
+    legal = ROLE_TO_DEFINITION["legal_advisor"].display_name
+    issues = [_issue("E1", "Engineer", 1), _issue("L1", legal, 1)]
+
+    selected, _ = rank_issues(issues, RankingOptions(agent_weights=parse_agent_weights("legal_advisor=1.5,bad=x")))
+
+    assert [issue.issue_id for issue in selected] == ["L1", "E1"]
+
+
+def test_ranking_options_round_trip_through_state() -> None:
+    options = RankingOptions(top_k=10, per_agent_quota=None, agent_weights={"pm": 1.2})
+
+    assert RankingOptions.from_state(options.to_state()) == options
+    assert RankingOptions.from_state(None) == RankingOptions()
+
+
+def test_aggregate_final_issues_returns_truncated_issues() -> None:
+    definition = ROLE_TO_DEFINITION["engineer"]
+    output = {
+        "issues": [
+            {"priority": 1 + index % 3, "summary": f"s{index}", "comment": f"論点{index}", "original_text": ""}
+            for index in range(7)
+        ]
+    }
+    state: dict[str, object] = {
+        AGENT_STATE_KEYS[definition.agent_key]: output,
+        REVIEW_RANKING_STATE_KEY: RankingOptions(top_k=None, per_agent_quota=3).to_state(),
+    }
+
+    result = AGGREGATE_FINAL_ISSUES_TOOL(SimpleNamespace(state=state))  # type: ignore[arg-type]
+
+    assert [issue.priority for issue in result.final_issues] == [1, 1, 1]
+    assert [issue.priority for issue in result.truncated_issues] == [2, 2, 3, 3]
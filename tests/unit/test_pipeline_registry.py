@@ -0,0 +1,103 @@
+import os
+from pathlib import Path
+
+import pytest
+from google.adk.models.google_llm import Gemini
+from google.genai import types as genai_types
+
+from hibikasu_agent.agents import specialist as specialist_module
+from hibikasu_agent.agents.parallel_orchestrator import registry as registry_module
+from hibikasu_agent.agents.parallel_orchestrator.registry import ReviewPipelineRegistry
+
+
+class _CountingBuilder:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, list[str], int]] = []
+
+    def __call__(self, model: str, roles: list[str], chunk_count: int) -> object:
+        self.calls.append((model, roles, chunk_count))
+        return object()
+
+
+def test_registry_reuses_pipeline_for_same_model_and_roles() -> None:
+    builder = _CountingBuilder()
+    registry = ReviewPipelineRegistry(builder=builder)  # type: ignore[arg-type]
+
+    first = registry.get("m", selected_agents=["pm", "engineer"])
+    second = registry.get("m", selected_agents=["engineer", "pm"])
+    other_model = registry.get("other", selected_agents=["engineer", "pm"])
+    chunked = registry.get("m", selected_agents=["engineer", "pm"], chunk_count=3)
+
+    assert first is second
+    assert other_model is not first
+    assert chunked is not first
+    assert builder.calls == [
+        ("m", ["engineer", "pm"], 1),
+        ("other", ["engineer", "pm"], 1),
+        ("m", ["engineer", "pm"], 3),
+    ]
+
+
+def test_registry_treats_invalid_selection_as_all_agents() -> None:
+    builder = _CountingBuilder()
+    registry = ReviewPipelineRegistry(builder=builder)  # type: ignore[arg-type]
+
+    assert registry.get("m", selected_agents=None) is registry.get("m", selected_agents=["unknown"])
+    assert len(builder.calls) == 1
+
+
+def test_registry_rebuilds_when_prompts_change(monkeypatch: pytest.MonkeyPatch) -> None:
+    mtime = {"value": 1.0}
+    monkeypatch.setattr(registry_module, "prompts_mtime", lambda: mtime["value"])
+    builder = _CountingBuilder()
+    registry = ReviewPipelineRegistry(builder=builder)  # type: ignore[arg-type]
+
+    first = registry.get("m")
+    mtime["value"] = 2.0
+    second = registry.get("m")
+
+    assert first is not second
+    assert len(builder.calls) == 2
+
+
+def test_registry_builds_real_pipeline_once() -> None:
+    registry = ReviewPipelineRegistry()
+
+    pipeline = registry.get("gemini-2.5-flash-lite", selected_agents=["qa_tester"])
+
+    assert pipeline is registry.get("gemini-2.5-flash-lite", selected_agents=["qa_tester"])
+    assert [agent.name for agent in pipeline.sub_agents[0].sub_agents] == ["qa_tester_specialist"]
+
+
+def test_registry_gives_each_specialist_a_retrying_model() -> None:
+    retry = genai_types.HttpRetryOptions(attempts=4, initial_delay=1, max_delay=30)
+    registry = ReviewPipelineRegistry(retry_options=retry)
+
+    pipeline = registry.get("gemini-2.5-flash-lite", selected_agents=["qa_tester", "pm"])
+    chunked = registry.get("gemini-2.5-flash-lite", selected_agents=["qa_tester"], chunk_count=2)
+
+    specialists = [
+        *pipeline.sub_agents[0].sub_agents,
+        *(agent for group in chunked.sub_agents[0].sub_agents for agent in group.sub_agents),
+    ]
+    assert len(specialists) == 4
+    for agent in specialists:
+        assert isinstance(agent.model, Gemini)
+        assert agent.model.model == "gemini-2.5-flash-lite"
+        assert agent.model.retry_options == retry
+
+
+def test_load_agent_prompts_parses_once_until_file_changes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    prompts = tmp_path / "agents.toml"
+    prompts.write_text('[engineer]\ninstruction_review = "v1"\n', encoding="utf-8")
+    monkeypatch.setattr(specialist_module, "AGENT_PROMPTS_PATH", prompts)
+    specialist_module._parse_agent_prompts.cache_clear()
+
+    first = specialist_module.load_agent_prompts()
+    assert specialist_module.load_agent_prompts() is first
+
+    prompts.write_text('[engineer]\ninstruction_review = "v2"\n', encoding="utf-8")
+    stat = prompts.stat()
+    os.utime(prompts, (stat.st_atime, stat.st_mtime + 10))
+
+    assert specialist_module.load_agent_prompts()["engineer"]["instruction_review"] == "v2"
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from hibikasu_agent.services.review_events import ReviewEventBroker
+
+
+async def _collect(subscription, limit: int = 10, heartbeat_seconds: float = 1.0):  # type: ignore[no-untyped-def]
+    items = []
+    async for item in subscription.events(heartbeat_seconds=heartbeat_seconds):
+        items.append(item)
+        if len(items) >= limit:
+            break
+    return items
+
+
+@pytest.mark.asyncio
+async def test_subscriber_receives_live_events_until_terminal() -> None:
+    broker = ReviewEventBroker()
+    subscription = broker.subscribe("rid")
+    task = asyncio.create_task(_collect(subscription))
+
+    broker.publish("rid", "progress", {"progress": 0.5})
+    broker.publish("rid", "completed", {"issues": []})
+    items = await asyncio.wait_for(task, timeout=1)
+    subscription.close()
+
+    assert [(item.id, item.event) for item in items] == [(1, "progress"), (2, "completed")]
+
+
+@pytest.mark.asyncio
+async def test_resume_replays_only_missed_events() -> None:
+    broker = ReviewEventBroker()
+    for idx in range(3):
+        broker.publish("rid", "progress", {"step": idx})
+    broker.publish("rid", "completed", {})
+
+    subscription = broker.subscribe("rid", last_event_id=2)
+    items = await asyncio.wait_for(_collect(subscription), timeout=1)
+    subscription.close()
+
+    assert subscription.resumed
+    assert [item.id for item in items] == [3, 4]
+
+
+@pytest.mark.asyncio
+async def test_resume_outside_buffer_falls_back_to_snapshot() -> None:
+    broker = ReviewEventBroker(history_size=2)
+    for idx in range(5):
+        broker.publish("rid", "progress", {"step": idx})
+
+    subscription = broker.subscribe("rid", last_event_id=1)
+    subscription.close()
+
+    assert not subscription.resumed
+
+
+@pytest.mark.asyncio
+async def test_idle_stream_yields_heartbeats_and_skips_seen_events() -> None:
+    broker = ReviewEventBroker()
+    subscription = broker.subscribe("rid")
+    broker.publish("rid", "progress", {})
+    subscription.mark_seen(broker.last_event_id("rid"))
+
+    items = await _collect(subscription, limit=1, heartbeat_seconds=0.01)
+    subscription.close()
+
+    assert items == [None]
+
+
+@pytest.mark.asyncio
+async def test_next_event_wakes_on_publish_and_times_out_when_idle() -> None:
+    broker = ReviewEventBroker()
+    subscription = broker.subscribe("rid")
+
+    assert await subscription.next_event(timeout=0.01) is None
+    asyncio.get_running_loop().call_later(0.01, broker.publish, "rid", "progress", {"progress": 0.5})
+    item = await subscription.next_event(timeout=1)
+    subscription.close()
+
+    assert item is not None and item.event == "progress"
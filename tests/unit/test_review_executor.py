@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from hibikasu_agent.services.review_executor import ReviewExecutor
+
+
+@pytest.mark.asyncio
+async def test_review_executor_caps_concurrency() -> None:
+    executor = ReviewExecutor(max_concurrency=2)
+    running = 0
+    peak = 0
+
+    async def job(review_id: str) -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    tasks = [executor.submit(f"rid-{i}", job) for i in range(6)]
+    await asyncio.gather(*tasks)
+
+    assert peak == 2
+    assert executor.in_flight == 0
+    assert executor.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_review_executor_isolates_job_failures() -> None:
+    executor = ReviewExecutor(max_concurrency=1)
+    done: list[str] = []
+
+    async def failing(review_id: str) -> None:
+        raise RuntimeError("boom")
+
+    async def ok(review_id: str) -> None:
+        done.append(review_id)
+
+    await asyncio.gather(executor.submit("bad", failing), executor.submit("good", ok))
+
+    assert done == ["good"]
+
+
+@pytest.mark.asyncio
+async def test_review_executor_shutdown_cancels_stragglers() -> None:
+    executor = ReviewExecutor(max_concurrency=1)
+    started = asyncio.Event()
+
+    async def slow(review_id: str) -> None:
+        started.set()
+        await asyncio.sleep(10)
+
+    task = executor.submit("slow", slow)
+    await started.wait()
+    await executor.shutdown(timeout=0.01)
+
+    assert task.cancelled()
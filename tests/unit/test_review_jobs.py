@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from hibikasu_agent.services.review_executor import ReviewExecutor
+from hibikasu_agent.services.review_jobs import ReviewJobQueue, ReviewJobWorker
+from hibikasu_agent.services.review_scheduler import QueueFullError
+from hibikasu_agent.services.shared_state import SqliteSharedState
+
+
+def _queue(tmp_path, **kwargs) -> ReviewJobQueue:  # type: ignore[no-untyped-def]
+    return ReviewJobQueue(SqliteSharedState(tmp_path / "shared.sqlite3"), **kwargs)
+
+
+def test_job_queue_claims_oldest_unleased_job(tmp_path) -> None:
+    queue = _queue(tmp_path)
+    queue.enqueue("r1")
+    queue.enqueue("r2")
+
+    assert queue.claim("w1").review_id == "r1"  # type: ignore[union-attr]
+    # Another worker (separate connection) skips the leased job
+    other = _queue(tmp_path)
+    assert other.claim("w2").review_id == "r2"  # type: ignore[union-attr]
+    assert other.claim("w2") is None
+
+    queue.complete("r1", "w1")
+    assert [job.review_id for job in queue.jobs()] == ["r2"]
+
+
+def test_job_queue_reclaims_job_after_worker_lease_expires(tmp_path) -> None:
+    queue = _queue(tmp_path, lease_seconds=0.05)
+    queue.enqueue("r1")
+    assert queue.claim("crashed") is not None
+    assert queue.claim("w2") is None
+
+    time.sleep(0.06)
+    assert queue.claim("w2").review_id == "r1"  # type: ignore[union-attr]
+    assert queue.owner_of("r1") == "w2"
+
+
+def test_job_queue_admission_counts_shared_backlog(tmp_path) -> None:
+    queue = _queue(tmp_path, max_queued=2, max_queued_per_tenant=1)
+    queue.enqueue("r1", tenant="a")
+    with pytest.raises(QueueFullError) as tenant_err:
+        queue.check_admission("a")
+    assert tenant_err.value.status_code == 429
+
+    queue.enqueue("r2", tenant="b")
+    with pytest.raises(QueueFullError) as full_err:
+        queue.check_admission("c")
+    assert full_err.value.status_code == 503
+
+
+def test_job_queue_admission_ignores_running_jobs(tmp_path) -> None:
+    queue = _queue(tmp_path, max_queued=1, max_queued_per_tenant=1)
+    queue.enqueue("r1", tenant="team:a")
+    assert queue.claim("w1") is not None
+
+    # The claimed job is running, not waiting, so the queue is empty again
+    queue.check_admission("team:a")
+    assert queue.queued_count() == 0
+    queue.enqueue("r2", tenant="team:a")
+    assert queue.queued_count("team:a") == 1
+    assert queue.queued_count("team") == 0
+    with pytest.raises(QueueFullError):
+        queue.check_admission("other")
+
+
+def test_queue_positions_follow_claim_order(tmp_path) -> None:
+    queue = _queue(tmp_path)
+    for review_id in ("r1", "r2", "r3"):
+        queue.enqueue(review_id, tenant="t")
+    assert queue.queue_positions() == {"r1": 1, "r2": 2, "r3": 3}
+
+    queue.claim("w1")
+    assert queue.queue_positions() == {"r2": 1, "r3": 2}
+    queue.complete("r2", "w1")
+    assert queue.queue_positions() == {"r3": 1}
+
+
+@pytest.mark.asyncio
+async def test_worker_reports_queue_positions_of_waiting_reviews(tmp_path) -> None:
+    queue = _queue(tmp_path)
+    executor = ReviewExecutor(max_concurrency=1)
+    release = asyncio.Event()
+    updates: list[tuple[str, int, int | None]] = []
+
+    async def job(review_id: str) -> None:
+        await release.wait()
+
+    worker = ReviewJobWorker(
+        queue, executor, job, worker_id="w1", poll_interval_seconds=0.01, initial_duration_seconds=30
+    )
+    worker.start()
+    for review_id in ("r1", "r2", "r3"):
+        worker.enqueue(review_id, on_queue_update=lambda rid, pos, eta: updates.append((rid, pos, eta)))
+    for _ in range(100):
+        if len(updates) >= 2:
+            break
+        await asyncio.sleep(0.01)
+
+    # r1 started at once and never reported a position
+    assert updates == [("r2", 1, 30), ("r3", 2, 60)]
+
+    release.set()
+    for _ in range(100):
+        if queue.jobs() == []:
+            break
+        await asyncio.sleep(0.01)
+    await worker.stop()
+    assert queue.jobs() == []
+    # Claimed reviews are no longer tracked for position updates
+    assert worker._waiting == {}
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_claimed_jobs_and_completes_them(tmp_path) -> None:
+    queue = _queue(tmp_path)
+    executor = ReviewExecutor(max_concurrency=1)
+    done: list[str] = []
+
+    async def job(review_id: str) -> None:
+        await asyncio.sleep(0.01)
+        done.append(review_id)
+
+    worker = ReviewJobWorker(queue, executor, job, worker_id="w1", poll_interval_seconds=0.01)
+    worker.start()
+    worker.enqueue("r1")
+    worker.enqueue("r2")
+    for _ in range(100):
+        if len(done) == 2:
+            break
+        await asyncio.sleep(0.01)
+    await worker.stop()
+
+    assert done == ["r1", "r2"]
+    assert queue.jobs() == []
+
+
+@pytest.mark.asyncio
+async def test_cancelled_job_is_left_for_another_worker(tmp_path) -> None:
+    queue = _queue(tmp_path)
+    executor = ReviewExecutor(max_concurrency=1)
+    started = asyncio.Event()
+
+    async def job(review_id: str) -> None:
+        started.set()
+        await asyncio.sleep(10)
+
+    worker = ReviewJobWorker(queue, executor, job, worker_id="w1")
+    worker.enqueue("r1")
+    assert worker.claim_available() == 1
+    await started.wait()
+    await executor.shutdown(timeout=0)
+
+    # The job survives the shutdown and is immediately claimable elsewhere
+    assert [record.review_id for record in queue.jobs()] == ["r1"]
+    assert queue.get("r1").state == "queued"  # type: ignore[union-attr]
+    assert queue.claim("w2") is not None
+
+
+@pytest.mark.asyncio
+async def test_job_is_cancelled_when_its_lease_is_lost(tmp_path) -> None:
+    queue = _queue(tmp_path, lease_seconds=0.15)
+    executor = ReviewExecutor(max_concurrency=1)
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def job(review_id: str) -> None:
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    worker = ReviewJobWorker(queue, executor, job, worker_id="w1")
+    worker.enqueue("r1")
+    assert worker.claim_available() == 1
+    await started.wait()
+
+    # Another worker takes over the lease (e.g. after w1 stalled past the lease expiry)
+    other = _queue(tmp_path, lease_seconds=60)
+    other._backend.delete("review_job_lease:r1")
+    assert other.claim("w2") is not None
+
+    await asyncio.wait_for(cancelled.wait(), timeout=1.0)
+    await executor.shutdown(timeout=1.0)
+
+    # w1 neither completes nor releases a job it no longer owns
+    record = queue.get("r1")
+    assert record is not None and (record.state, record.owner) == ("running", "w2")
+    assert queue.owner_of("r1") == "w2"
+    assert worker.running == frozenset()
+
+
+def test_job_record_tracks_state_attempts_and_heartbeat(tmp_path) -> None:
+    queue = _queue(tmp_path)
+    queue.enqueue("r1")
+    assert queue.get("r1").state == "queued"  # type: ignore[union-attr]
+
+    claimed = queue.claim("w1")
+    assert claimed is not None
+    assert (claimed.state, claimed.attempts, claimed.owner) == ("running", 1, "w1")
+    first_heartbeat = claimed.heartbeat_at
+
+    time.sleep(0.01)
+    assert queue.renew("r1", "w1")
+    assert queue.get("r1").heartbeat_at > first_heartbeat  # type: ignore[operator, union-attr]
+
+    queue.record_phase("r1", "aggregating")
+    assert queue.get("r1").state == "aggregating"  # type: ignore[union-attr]
+    queue.complete("r1", "w1")
+
+    record = queue.get("r1")
+    assert record is not None and record.state == "completed"
+    # Finished records are kept for inspection but are no longer pending work
+    assert queue.jobs() == []
+    assert queue.owner_of("r1") is None
+
+
+def test_claim_reads_only_unfinished_jobs(tmp_path) -> None:
+    queue = _queue(tmp_path, lease_seconds=0.05)
+    for review_id in ("done-1", "done-2", "crashed", "waiting"):
+        queue.enqueue(review_id)
+    for review_id in ("done-1", "done-2"):
+        queue.claim("w1")
+        queue.complete(review_id, "w1")
+    assert queue.claim("dead-worker").review_id == "crashed"  # type: ignore[union-attr]
+    time.sleep(0.06)
+
+    reads: list[str] = []
+    original_get = queue._backend.get
+
+    def recording_get(key: str) -> str | None:
+        reads.append(key)
+        return original_get(key)
+
+    queue._backend.get = recording_get  # type: ignore[method-assign]
+    # The crashed run's expired lease makes it the oldest claimable job again
+    assert queue.claim("w2").review_id == "crashed"  # type: ignore[union-attr]
+    assert queue.claim("w2").review_id == "waiting"  # type: ignore[union-attr]
+    assert queue.claim("w2") is None
+    assert not any("done" in key for key in reads)
+
+
+def test_recover_leaves_jobs_leased_by_live_workers(tmp_path) -> None:
+    queue = _queue(tmp_path)
+    queue.enqueue("claimed")
+    stale = queue.jobs()
+    # A live worker claims the job after recovery listed it as queued
+    assert _queue(tmp_path).claim("live-worker").review_id == "claimed"  # type: ignore[union-attr]
+    queue.jobs = lambda: stale  # type: ignore[method-assign]
+
+    assert queue.recover([]) == []
+    assert queue.get("claimed").state == "running"  # type: ignore[union-attr]
+    assert queue.owner_of("claimed") == "live-worker"
+
+
+def test_recover_requeues_orphaned_and_missing_jobs(tmp_path) -> None:
+    queue = _queue(tmp_path)
+    queue.enqueue("crashed")
+    queue.enqueue("alive")
+    assert _queue(tmp_path, lease_seconds=0.05).claim("dead-worker").review_id == "crashed"  # type: ignore[union-attr]
+    assert queue.claim("live-worker", skip={"crashed"}).review_id == "alive"  # type: ignore[union-attr]
+    queue.record_phase("alive", "aggregating")
+    time.sleep(0.06)
+
+    recovered = queue.recover(["never-enqueued", "alive"])
+
+    assert recovered == ["crashed", "never-enqueued"]
+    assert queue.get("crashed").state == "queued"  # type: ignore[union-attr]
+    assert queue.get("crashed").attempts == 1  # type: ignore[union-attr]
+    assert queue.get("alive").state == "aggregating"  # type: ignore[union-attr]
+    assert {record.review_id for record in queue.jobs()} == {"crashed", "alive", "never-enqueued"}
+
+
+@pytest.mark.asyncio
+async def test_worker_gives_up_after_max_attempts(tmp_path) -> None:
+    queue = _queue(tmp_path, lease_seconds=0.05, max_attempts=2)
+    executor = ReviewExecutor(max_concurrency=1)
+    ran: list[str] = []
+    given_up: list[tuple[str, str]] = []
+
+    async def job(review_id: str) -> None:
+        ran.append(review_id)
+
+    queue.enqueue("r1")
+    for owner in ("crashed-1", "crashed-2"):
+        assert queue.claim(owner) is not None
+        time.sleep(0.06)
+
+    worker = ReviewJobWorker(
+        queue, executor, job, worker_id="w1", on_give_up=lambda rid, reason: given_up.append((rid, reason))
+    )
+    assert worker.claim_available() == 0
+
+    assert ran == []
+    assert [rid for rid, _ in given_up] == ["r1"]
+    record = queue.get("r1")
+    assert record is not None and record.state == "failed"
+    assert record.error == given_up[0][1]
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from hibikasu_agent.services.review_executor import ReviewExecutor
+from hibikasu_agent.services.review_scheduler import QueueFullError, ReviewScheduler
+
+
+@pytest.mark.asyncio
+async def test_scheduler_dispatches_round_robin_across_tenants() -> None:
+    executor = ReviewExecutor(max_concurrency=1)
+    scheduler = ReviewScheduler(executor, max_queued=10, max_queued_per_tenant=10)
+    started: list[str] = []
+    gate = asyncio.Event()
+
+    async def job(review_id: str) -> None:
+        started.append(review_id)
+        await gate.wait()
+
+    scheduler.submit("a1", job, tenant="a")
+    scheduler.submit("a2", job, tenant="a")
+    scheduler.submit("a3", job, tenant="a")
+    scheduler.submit("b1", job, tenant="b")
+
+    # a1 runs immediately; b1 must not wait behind a tenant's whole burst
+    assert scheduler.position("a2") == 1
+    assert scheduler.position("b1") == 2
+    assert scheduler.position("a3") == 3
+
+    gate.set()
+    for _ in range(50):
+        if len(started) == 4:
+            break
+        await asyncio.sleep(0)
+    assert started == ["a1", "a2", "b1", "a3"]
+    assert scheduler.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_reports_queue_position_and_eta() -> None:
+    executor = ReviewExecutor(max_concurrency=1)
+    scheduler = ReviewScheduler(executor, initial_duration_seconds=30)
+    updates: dict[str, tuple[int, int | None]] = {}
+    gate = asyncio.Event()
+
+    async def job(review_id: str) -> None:
+        await gate.wait()
+
+    def on_update(review_id: str, position: int, eta: int | None) -> None:
+        updates[review_id] = (position, eta)
+
+    assert scheduler.submit("first", job, on_queue_update=on_update) == 0
+    assert scheduler.submit("second", job, on_queue_update=on_update) == 1
+
+    assert "first" not in updates
+    assert updates["second"] == (1, 30)
+    gate.set()
+    await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_notifies_only_reviews_whose_position_changed() -> None:
+    executor = ReviewExecutor(max_concurrency=1)
+    scheduler = ReviewScheduler(executor, max_queued=10, max_queued_per_tenant=10)
+    updates: list[tuple[str, int]] = []
+    gate = asyncio.Event()
+
+    async def job(review_id: str) -> None:
+        await gate.wait()
+
+    def on_update(review_id: str, position: int, eta: int | None) -> None:
+        updates.append((review_id, position))
+
+    scheduler.submit("a1", job, tenant="a")
+    scheduler.submit("a2", job, tenant="a", on_queue_update=on_update)
+    scheduler.submit("a3", job, tenant="a", on_queue_update=on_update)
+    scheduler.submit("b1", job, tenant="b", on_queue_update=on_update)
+
+    # b1 overtakes a3 in the round-robin order; a2 keeps its place and is not told again
+    assert updates == [("a2", 1), ("a3", 2), ("b1", 2), ("a3", 3)]
+    gate.set()
+    await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_rejects_when_queue_is_full() -> None:
+    executor = ReviewExecutor(max_concurrency=1)
+    scheduler = ReviewScheduler(executor, max_queued=2, max_queued_per_tenant=1)
+    gate = asyncio.Event()
+
+    async def job(review_id: str) -> None:
+        await gate.wait()
+
+    scheduler.submit("running", job, tenant="a")
+    scheduler.submit("a-queued", job, tenant="a")
+
+    with pytest.raises(QueueFullError) as tenant_err:
+        scheduler.check_admission("a")
+    assert tenant_err.value.status_code == 429
+    assert tenant_err.value.retry_after > 0
+
+    scheduler.submit("b-queued", job, tenant="b")
+    with pytest.raises(QueueFullError) as global_err:
+        scheduler.check_admission("c")
+    assert global_err.value.status_code == 503
+
+    gate.set()
+    await asyncio.sleep(0.01)
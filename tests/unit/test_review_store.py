@@ -2,8 +2,16 @@ from __future__ import annotations
 
 import time
 
+import pytest
+
+from hibikasu_agent.api.schemas.reviews import Issue
 from hibikasu_agent.services.models import ReviewRuntimeSession
-from hibikasu_agent.services.review_store import ReviewSessionStore
+from hibikasu_agent.services.review_store import (
+    RedisReviewSessionStore,
+    ReviewSessionStore,
+    SqliteReviewSessionStore,
+    create_review_session_store,
+)
 
 
 def _make_session() -> ReviewRuntimeSession:
@@ -42,3 +50,214 @@ def test_review_store_mutate_and_remove() -> None:
 
     store.remove("rid")
     assert store.get("rid") is None
+
+
+def _make_issue(issue_id: str) -> Issue:
+    return Issue(issue_id=issue_id, priority=1, agent_name="engineer", comment="c", original_text="t")
+
+
+def test_review_store_expires_sessions_after_ttl() -> None:
+    store = ReviewSessionStore(ttl_seconds=60)
+    session = _make_session()
+    session.created_at = time.time() - 120
+    store.create("old", session)
+    store.create("new", _make_session())
+
+    assert store.get("old") is None
+    assert store.get("new") is not None
+
+
+def test_review_store_evicts_least_recently_used_finished_sessions() -> None:
+    store = ReviewSessionStore(max_sessions=2)
+    for rid in ("a", "b"):
+        session = _make_session()
+        session.status = "completed"
+        store.create(rid, session)
+    store.get("a")  # "b" becomes least recently used
+    store.create("c", _make_session())
+
+    assert store.get("b") is None
+    assert store.get("a") is not None
+    assert store.get("c") is not None
+
+
+def test_review_store_memory_cap_keeps_in_flight_sessions() -> None:
+    store = ReviewSessionStore(max_total_chars=10)
+    running = _make_session()
+    running.prd_text = "x" * 8
+    store.create("running", running)
+    done = _make_session()
+    done.status = "completed"
+    done.prd_text = "y" * 8
+    store.create("done", done)
+
+    assert store.get("done") is None
+    assert store.get("running") is running
+    assert store.total_chars == 8
+
+
+def test_sqlite_store_round_trips_sessions(tmp_path) -> None:
+    db_path = tmp_path / "sessions.sqlite3"
+    store = SqliteReviewSessionStore(db_path)
+    session = _make_session()
+    session.prd_text = "PRD"
+    store.create("rid", session)
+
+    session.status = "completed"
+    session.issues = [_make_issue("i1"), _make_issue("i2")]
+    store.update("rid", session)
+
+    # A second connection (e.g. another worker) observes the same data
+    other = SqliteReviewSessionStore(db_path)
+    fetched = other.get("rid")
+    assert fetched is not None
+    assert fetched.status == "completed"
+    assert [issue.issue_id for issue in fetched.issues or []] == ["i1", "i2"]
+    assert list(other.as_dict()) == ["rid"]
+
+
+def test_sqlite_store_updates_single_issue_rows(tmp_path) -> None:
+    store = SqliteReviewSessionStore(tmp_path / "sessions.sqlite3")
+    session = _make_session()
+    session.issues = [_make_issue("i1"), _make_issue("i2")]
+    store.create("rid", session)
+
+    assert store.update_issue("rid", _make_issue("i2").model_copy(update={"status": "done"}))
+    assert not store.update_issue("rid", _make_issue("missing"))
+
+    fetched = store.get("rid")
+    assert fetched is not None
+    assert [issue.status for issue in fetched.issues or []] == [None, "done"]
+
+
+def test_sqlite_store_rewrites_issue_rows_only_when_issues_change(tmp_path) -> None:
+    store = SqliteReviewSessionStore(tmp_path / "sessions.sqlite3")
+    session = _make_session()
+    session.issues = [_make_issue("i1"), _make_issue("i2")]
+    store.create("rid", session)
+    statements: list[str] = []
+    store._db.set_trace_callback(statements.append)
+
+    session.progress = 0.5
+    store.update("rid", session)
+    assert not [sql for sql in statements if "review_issues" in sql]
+
+    session.issues = [_make_issue("i1")]
+    store.update("rid", session)
+    assert any(sql.startswith("DELETE FROM review_issues") for sql in statements)
+    fetched = store.get("rid")
+    assert fetched is not None
+    assert [issue.issue_id for issue in fetched.issues or []] == ["i1"]
+
+
+def test_review_store_updates_do_not_sweep_expired_sessions(monkeypatch) -> None:
+    store = ReviewSessionStore(ttl_seconds=60)
+    store.create("old", _make_session())
+    session = _make_session()
+    store.create("rid", session)
+    sweeps: list[str] = []
+    original = store._is_expired
+    monkeypatch.setattr(store, "_is_expired", lambda sess, now: sweeps.append("checked") or original(sess, now))
+
+    for progress in (0.1, 0.2, 0.3):
+        session.progress = progress
+        store.update("rid", session)
+
+    assert sweeps == []
+
+
+def test_update_issue_persists_the_session_version(tmp_path, fake_redis) -> None:
+    stores = [
+        ReviewSessionStore(),
+        SqliteReviewSessionStore(tmp_path / "sessions.sqlite3"),
+        RedisReviewSessionStore(fake_redis),
+    ]
+    for store in stores:
+        session = _make_session()
+        session.issues = [_make_issue("i1")]
+        session.version = 3
+        store.create("rid", session)
+
+        assert store.update_issue("rid", _make_issue("i1").model_copy(update={"status": "done"}), version=4)
+
+        fetched = store.get("rid")
+        assert fetched is not None
+        assert fetched.version == 4, type(store).__name__
+        assert [issue.status for issue in fetched.issues or []] == ["done"]
+
+
+def test_get_version_and_status_read_without_loading_the_session(tmp_path, fake_redis, monkeypatch) -> None:
+    stores = [
+        ReviewSessionStore(),
+        SqliteReviewSessionStore(tmp_path / "sessions.sqlite3"),
+        RedisReviewSessionStore(fake_redis),
+    ]
+    for store in stores:
+        session = _make_session()
+        session.issues = [_make_issue("i1")]
+        session.version = 3
+        store.create("rid", session)
+        store.update_issue("rid", _make_issue("i1").model_copy(update={"status": "done"}), version=5)
+        if not isinstance(store, ReviewSessionStore):
+            # Persistent stores must not deserialize the PRD and issues for a version or status check
+            monkeypatch.setattr(store, "_load", lambda *_args: pytest.fail("session was loaded"))
+
+        assert store.get_version("rid") == 5, type(store).__name__
+        assert store.get_version("missing") is None
+        assert store.get_status("rid") == "processing", type(store).__name__
+        assert store.get_status("missing") is None
+
+
+def test_sqlite_store_expires_and_removes_sessions(tmp_path) -> None:
+    store = SqliteReviewSessionStore(tmp_path / "sessions.sqlite3", ttl_seconds=60)
+    old = _make_session()
+    old.created_at = time.time() - 120
+    store.create("old", old)
+    store.create("rid", _make_session())
+
+    assert store.get("old") is None
+    store.mutate("rid", lambda s: setattr(s, "progress", 0.5))
+    assert store.get("rid").progress == 0.5
+    store.remove("rid")
+    assert store.get("rid") is None
+
+
+def test_create_review_session_store_validates_backend() -> None:
+    assert isinstance(create_review_session_store("memory"), ReviewSessionStore)
+    with pytest.raises(ValueError):
+        create_review_session_store("sqlite")
+    with pytest.raises(ValueError):
+        create_review_session_store("redis")
+
+
+def test_redis_store_round_trips_and_updates_single_issue(fake_redis) -> None:
+    store = RedisReviewSessionStore(fake_redis)
+    session = _make_session()
+    store.create("rid", session)
+    session.status = "completed"
+    session.issues = [_make_issue("i1"), _make_issue("i2")]
+    store.update("rid", session)
+
+    assert store.update_issue("rid", _make_issue("i2").model_copy(update={"status": "done"}))
+    assert not store.update_issue("rid", _make_issue("missing"))
+
+    # Another worker with its own store instance sees the same review
+    fetched = RedisReviewSessionStore(fake_redis).get("rid")
+    assert fetched is not None
+    assert fetched.status == "completed"
+    assert [(issue.issue_id, issue.status) for issue in fetched.issues or []] == [("i1", None), ("i2", "done")]
+    assert list(store.as_dict()) == ["rid"]
+
+
+def test_redis_store_expires_and_removes_sessions(fake_redis) -> None:
+    store = RedisReviewSessionStore(fake_redis, ttl_seconds=60)
+    old = _make_session()
+    old.created_at = time.time() - 120
+    store.create("old", old)
+    store.create("rid", _make_session())
+
+    assert store.get("old") is None
+    assert list(store.as_dict()) == ["rid"]
+    store.remove("rid")
+    assert store.get("rid") is None
+    assert create_review_session_store("redis", redis_client=fake_redis).get("rid") is None
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from hibikasu_agent.services.shared_state import (
+    RedisSharedState,
+    SharedStateBackend,
+    SqliteSharedState,
+    create_shared_state_backend,
+)
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def backend(request, tmp_path, fake_redis) -> SharedStateBackend:
+    if request.param == "sqlite":
+        return SqliteSharedState(tmp_path / "shared.sqlite3")
+    return RedisSharedState(fake_redis)
+
+
+def test_shared_state_get_set_scan_and_expiry(backend: SharedStateBackend) -> None:
+    backend.set("job:a", "1")
+    backend.set("job:b", "2", ttl_seconds=0.05)
+    backend.set("other", "3")
+
+    assert backend.get("job:a") == "1"
+    assert backend.scan("job:") == ["job:a", "job:b"]
+
+    time.sleep(0.06)
+    assert backend.get("job:b") is None
+    assert backend.scan("job:") == ["job:a"]
+    backend.delete("job:a")
+    assert backend.get("job:a") is None
+
+
+def test_shared_state_leases_are_exclusive_until_expiry(backend: SharedStateBackend) -> None:
+    assert backend.acquire_lease("lease", "w1", 0.05)
+    assert not backend.acquire_lease("lease", "w2", 0.05)
+    assert backend.renew_lease("lease", "w1", 0.05)
+    assert not backend.renew_lease("lease", "w2", 0.05)
+
+    # A crashed holder stops renewing; the lease becomes claimable again
+    time.sleep(0.06)
+    assert backend.acquire_lease("lease", "w2", 10)
+    assert backend.lease_owner("lease") == "w2"
+    assert not backend.renew_lease("lease", "w1", 10)
+
+    backend.release_lease("lease", "w1")  # not the owner: no effect
+    assert backend.lease_owner("lease") == "w2"
+    backend.release_lease("lease", "w2")
+    assert backend.acquire_lease("lease", "w1", 10)
+
+
+def test_sqlite_shared_state_is_visible_to_other_connections(tmp_path) -> None:
+    first = SqliteSharedState(tmp_path / "shared.sqlite3")
+    second = SqliteSharedState(tmp_path / "shared.sqlite3")
+
+    assert first.acquire_lease("lease", "w1", 10)
+    assert not second.acquire_lease("lease", "w2", 10)
+    first.set("key", "value")
+    assert second.get("key") == "value"
+
+
+def test_create_shared_state_backend_validates_backend(tmp_path, fake_redis) -> None:
+    assert create_shared_state_backend("memory") is None
+    assert isinstance(create_shared_state_backend("sqlite", db_path=str(tmp_path / "s.db")), SqliteSharedState)
+    assert isinstance(create_shared_state_backend("redis", redis_client=fake_redis), RedisSharedState)
+    with pytest.raises(ValueError):
+        create_shared_state_backend("sqlite")
+    with pytest.raises(ValueError):
+        create_shared_state_backend("etcd")
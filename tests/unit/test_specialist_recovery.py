@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import AsyncGenerator
+from types import SimpleNamespace
+
+import pytest
+from google.adk.models import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types as genai_types
+from pydantic import Field
+from hibikasu_agent.agents.specialist_recovery import SpecialistRecovery
+from hibikasu_agent.agents.specialist_timing import SpecialistDeadlineExceeded, SpecialistTimingPolicy, TimedLlm
+from hibikasu_agent.constants.agents import specialist_error_state_key
+
+_VALID = json.dumps({"issues": [{"priority": 1, "summary": "要約", "comment": "c", "original_text": "x"}]})
+
+
+def _response(text: str, *, prompt: int | None = None, completion: int = 0) -> LlmResponse:
+    usage = (
+        genai_types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=prompt, candidates_token_count=completion, total_token_count=prompt + completion
+        )
+        if prompt is not None
+        else None
+    )
+    return LlmResponse(
+        content=genai_types.Content(role="model", parts=[genai_types.Part(text=text)]), usage_metadata=usage
+    )
+
+
+class _ScriptedLlm(BaseLlm):
+    """Returns (or raises) the scripted outcomes in order and records every request."""
+
+    outcomes: list[object] = Field(default_factory=list)
+    requests: list[LlmRequest] = Field(default_factory=list)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.requests.append(llm_request)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        yield outcome if isinstance(outcome, LlmResponse) else _response(str(outcome))
+
+
+def _recovery(*outcomes: object) -> tuple[SpecialistRecovery, _ScriptedLlm]:
+    llm = _ScriptedLlm(model="scripted", outcomes=list(outcomes), requests=[])
+    return SpecialistRecovery(model=llm, output_key="engineer_issues"), llm
+
+
+@pytest.mark.asyncio
+async def test_valid_output_is_left_untouched() -> None:
+    recovery, llm = _recovery()
+
+    assert await recovery.after_model(SimpleNamespace(state={}), _response(_VALID)) is None  # type: ignore[arg-type]
+    assert llm.requests == []
+
+
+@pytest.mark.asyncio
+async def test_invalid_output_is_repaired_with_a_short_prompt() -> None:
+    recovery, llm = _recovery(_VALID)
+    context = SimpleNamespace(state={})
+
+    repaired = await recovery.after_model(context, _response('{"issues": [{"priority": 9}]}'))  # type: ignore[arg-type]
+
+    assert repaired is not None and repaired.content.parts[0].text == _VALID  # type: ignore[union-attr]
+    assert context.state == {}
+    # The repair request carries only the invalid JSON and errors, not the PRD or instruction
+    (request,) = llm.requests
+    prompt = request.contents[0].parts[0].text or ""  # type: ignore[index]
+    assert '{"priority": 9}' in prompt and "issues.0.priority" in prompt
+    assert request.config.response_mime_type == "application/json"
+
+
+@pytest.mark.asyncio
+async def test_specialist_gives_up_with_empty_issues_after_bounded_attempts() -> None:
+    recovery, llm = _recovery("not json", "still not json")
+    context = SimpleNamespace(state={})
+
+    result = await recovery.after_model(context, _response("oops"))  # type: ignore[arg-type]
+
+    assert result is not None and json.loads(result.content.parts[0].text) == {"issues": []}  # type: ignore[union-attr, arg-type]
+    assert len(llm.requests) == 2
+    assert context.state[specialist_error_state_key("engineer_issues")].startswith("出力形式が不正です")
+
+
+@pytest.mark.asyncio
+async def test_model_error_reruns_the_original_request() -> None:
+    recovery, llm = _recovery(RuntimeError("503 unavailable"), _VALID)
+    context = SimpleNamespace(state={})
+    request = LlmRequest(model="scripted")
+
+    result = await recovery.on_model_error(context, request, RuntimeError("500 internal"))  # type: ignore[arg-type]
+
+    assert result is not None and result.content.parts[0].text == _VALID  # type: ignore[union-attr]
+    assert llm.requests == [request, request]
+    assert context.state == {}
+
+
+@pytest.mark.asyncio
+async def test_model_error_records_reason_when_reruns_fail() -> None:
+    recovery, _ = _recovery(RuntimeError("first"), RuntimeError("second"))
+    context = SimpleNamespace(state={})
+
+    result = await recovery.on_model_error(context, LlmRequest(model="scripted"), RuntimeError("boom"))  # type: ignore[arg-type]
+
+    assert result is not None and json.loads(result.content.parts[0].text) == {"issues": []}  # type: ignore[union-attr, arg-type]
+    assert context.state[specialist_error_state_key("engineer_issues")] == "RuntimeError: second"
+
+
+@pytest.mark.asyncio
+async def test_missed_deadline_gives_up_without_rerunning() -> None:
+    recovery, llm = _recovery()
+    context = SimpleNamespace(state={})
+
+    result = await recovery.on_model_error(
+        context,  # type: ignore[arg-type]
+        LlmRequest(model="scripted"),
+        SpecialistDeadlineExceeded("engineer", 30),
+    )
+
+    assert result is not None and json.loads(result.content.parts[0].text) == {"issues": []}  # type: ignore[union-attr, arg-type]
+    assert llm.requests == []
+    assert "30秒" in context.state[specialist_error_state_key("engineer_issues")]
+
+
+class _HangingLlm(BaseLlm):
+    """Never answers (a re-run stuck on the provider side)."""
+
+    calls: int = 0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        await asyncio.sleep(60)
+        yield _response(_VALID)
+
+
+@pytest.mark.asyncio
+async def test_hanging_rerun_gives_up_at_the_specialist_deadline() -> None:
+    inner = _HangingLlm(model="hanging")
+    policy = SpecialistTimingPolicy(timeout_seconds=0.05)
+    recovery = SpecialistRecovery(
+        model=TimedLlm(model="hanging", inner=inner, role="engineer", policy=policy), output_key="engineer_issues"
+    )
+    context = SimpleNamespace(state={})
+
+    started = time.perf_counter()
+    result = await recovery.on_model_error(context, LlmRequest(model="hanging"), RuntimeError("503 unavailable"))  # type: ignore[arg-type]
+
+    assert time.perf_counter() - started < 1.0
+    assert result is not None and json.loads(result.content.parts[0].text) == {"issues": []}  # type: ignore[union-attr, arg-type]
+    # The missed deadline ends the recovery instead of spending the remaining attempts
+    assert inner.calls == 1
+    assert "0.05秒" in context.state[specialist_error_state_key("engineer_issues")]
+
+
+@pytest.mark.asyncio
+async def test_repaired_response_reports_tokens_of_every_call() -> None:
+    recovery, _ = _recovery("still invalid", _response(_VALID, prompt=30, completion=5))
+    # The second repair is valid; the first returned no usage metadata
+    context = SimpleNamespace(state={})
+
+    repaired = await recovery.after_model(context, _response("oops", prompt=1000, completion=200))  # type: ignore[arg-type]
+
+    assert repaired is not None and repaired.usage_metadata is not None
+    assert repaired.usage_metadata.prompt_token_count == 1030
+    assert repaired.usage_metadata.candidates_token_count == 205
+    assert repaired.usage_metadata.total_token_count == 1235
+
+
+@pytest.mark.asyncio
+async def test_rerun_and_give_up_responses_report_their_tokens() -> None:
+    recovery, _ = _recovery(_response(_VALID, prompt=1000, completion=100))
+    result = await recovery.on_model_error(SimpleNamespace(state={}), LlmRequest(model="scripted"), RuntimeError("500"))  # type: ignore[arg-type]
+    assert result is not None and result.usage_metadata is not None
+    assert result.usage_metadata.total_token_count == 1100
+
+    recovery, _ = _recovery(_response("not json", prompt=1000, completion=100), _response("nope", prompt=50))
+    context = SimpleNamespace(state={})
+    result = await recovery.on_model_error(context, LlmRequest(model="scripted"), RuntimeError("500"))  # type: ignore[arg-type]
+    assert result is not None and json.loads(result.content.parts[0].text) == {"issues": []}  # type: ignore[union-attr, arg-type]
+    assert result.usage_metadata is not None and result.usage_metadata.total_token_count == 1150
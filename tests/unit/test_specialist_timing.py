@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+
+import pytest
+from google.adk.models import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types as genai_types
+from pydantic import Field
+from hibikasu_agent.agents.parallel_orchestrator.registry import ReviewPipelineRegistry
+from hibikasu_agent.agents.specialist_timing import (
+    LatencyTracker,
+    SpecialistDeadlineExceeded,
+    SpecialistTimingPolicy,
+    TimedLlm,
+    parse_role_timeouts,
+)
+
+
+class _DelayedLlm(BaseLlm):
+    """The n-th call answers after ``delays[n]`` seconds with the text ``call-n``."""
+
+    delays: list[float] = Field(default_factory=list)
+    calls: int = 0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        index = self.calls
+        self.calls += 1
+        await asyncio.sleep(self.delays[index])
+        yield LlmResponse(
+            content=genai_types.Content(role="model", parts=[genai_types.Part(text=f"call-{index}")]),
+            usage_metadata=genai_types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=100, candidates_token_count=10, total_token_count=110
+            ),
+        )
+
+
+class _StreamingLlm(BaseLlm):
+    """Streams ``chunk-n`` after waiting ``chunk_delays[n]`` seconds for each chunk."""
+
+    chunk_delays: list[float] = Field(default_factory=list)
+    calls: int = 0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        for index, delay in enumerate(self.chunk_delays):
+            await asyncio.sleep(delay)
+            yield LlmResponse(
+                content=genai_types.Content(role="model", parts=[genai_types.Part(text=f"chunk-{index}")]),
+                partial=True,
+            )
+
+
+async def _texts(llm: BaseLlm, *, stream: bool = False) -> list[str]:
+    return [
+        response.content.parts[0].text or ""  # type: ignore[union-attr, index]
+        async for response in llm.generate_content_async(LlmRequest(model="m"), stream=stream)
+    ]
+
+
+def test_latency_tracker_quantile_needs_enough_samples() -> None:
+    tracker = LatencyTracker(min_samples=3)
+    tracker.record("pm", 1.0)
+    tracker.record("pm", 3.0)
+    assert tracker.quantile("pm", 0.9) is None
+
+    tracker.record("pm", 2.0)
+    assert tracker.quantile("pm", 0.9) == 3.0
+    assert tracker.quantile("pm", 0.5) == 2.0
+
+
+def test_parse_role_timeouts_skips_invalid_entries() -> None:
+    assert parse_role_timeouts("engineer=90, pm = 60,bad,qa=x") == {"engineer": 90.0, "pm": 60.0}
+    assert parse_role_timeouts(None) == {}
+
+
+@pytest.mark.asyncio
+async def test_slow_specialist_is_abandoned_at_its_deadline() -> None:
+    policy = SpecialistTimingPolicy(timeout_seconds=10, role_timeout_seconds={"pm": 0.05})
+    llm = TimedLlm(model="m", inner=_DelayedLlm(model="m", delays=[1.0]), role="pm", policy=policy)
+
+    with pytest.raises(SpecialistDeadlineExceeded) as err:
+        await _texts(llm)
+
+    assert err.value.timeout_seconds == 0.05
+    assert policy.tracker.counters() == {("pm", "deadlines_exceeded"): 1}
+
+
+@pytest.mark.asyncio
+async def test_hedge_fires_after_p90_and_first_response_wins() -> None:
+    tracker = LatencyTracker(min_samples=1)
+    tracker.record("engineer", 0.02)
+    policy = SpecialistTimingPolicy(hedge=True, hedge_min_delay_seconds=0.0, tracker=tracker)
+    inner = _DelayedLlm(model="m", delays=[1.0, 0.0])
+    llm = TimedLlm(model="m", inner=inner, role="engineer", policy=policy)
+
+    assert await _texts(llm) == ["call-1"]
+    assert inner.calls == 2
+    assert tracker.counters() == {("engineer", "hedges_fired"): 1, ("engineer", "hedges_won"): 1}
+
+
+@pytest.mark.asyncio
+async def test_winning_response_reports_tokens_of_the_losing_hedge() -> None:
+    tracker = LatencyTracker(min_samples=1)
+    tracker.record("engineer", 0.02)
+    policy = SpecialistTimingPolicy(hedge=True, hedge_min_delay_seconds=0.0, tracker=tracker)
+    llm = TimedLlm(model="m", inner=_DelayedLlm(model="m", delays=[1.0, 0.0]), role="engineer", policy=policy)
+
+    (response,) = [response async for response in llm.generate_content_async(LlmRequest(model="m"))]
+
+    # The cancelled primary already consumed the same prompt; its partial output is unknown
+    usage = response.usage_metadata
+    assert usage is not None
+    assert (usage.prompt_token_count, usage.candidates_token_count, usage.total_token_count) == (200, 10, 210)
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_sends_no_hedge() -> None:
+    tracker = LatencyTracker(min_samples=1)
+    tracker.record("engineer", 0.5)
+    policy = SpecialistTimingPolicy(hedge=True, hedge_min_delay_seconds=0.0, tracker=tracker)
+    inner = _DelayedLlm(model="m", delays=[0.0])
+
+    assert await _texts(TimedLlm(model="m", inner=inner, role="engineer", policy=policy)) == ["call-0"]
+    assert inner.calls == 1
+    assert tracker.counters() == {}
+
+
+@pytest.mark.asyncio
+async def test_streamed_specialist_is_abandoned_at_its_deadline() -> None:
+    policy = SpecialistTimingPolicy(timeout_seconds=0.1)
+    llm = TimedLlm(model="m", inner=_StreamingLlm(model="m", chunk_delays=[0.0, 0.0, 1.0]), role="pm", policy=policy)
+    received: list[str] = []
+
+    with pytest.raises(SpecialistDeadlineExceeded):
+        async for response in llm.generate_content_async(LlmRequest(model="m"), stream=True):
+            received.append(response.content.parts[0].text or "")  # type: ignore[union-attr, index]
+
+    # Chunks that arrived in time were passed through before the stream was cut
+    assert received == ["chunk-0", "chunk-1"]
+    assert policy.tracker.counters() == {("pm", "deadlines_exceeded"): 1}
+
+
+@pytest.mark.asyncio
+async def test_stream_within_deadline_is_passed_through_without_hedging() -> None:
+    tracker = LatencyTracker(min_samples=1)
+    tracker.record("pm", 0.0)
+    policy = SpecialistTimingPolicy(timeout_seconds=1.0, hedge=True, hedge_min_delay_seconds=0.0, tracker=tracker)
+    inner = _StreamingLlm(model="m", chunk_delays=[0.02, 0.02])
+
+    texts = await _texts(TimedLlm(model="m", inner=inner, role="pm", policy=policy), stream=True)
+
+    assert texts == ["chunk-0", "chunk-1"]
+    # Streams are never hedged, even when they are slower than the recorded p90
+    assert inner.calls == 1
+    assert tracker.counters() == {}
+
+
+def test_registry_applies_timing_policy_per_role() -> None:
+    policy = SpecialistTimingPolicy(timeout_seconds=30)
+    registry = ReviewPipelineRegistry(timing=policy)
+
+    pipeline = registry.get("gemini-2.5-flash-lite", selected_agents=["pm", "qa_tester"])
+
+    models = [agent.model for agent in pipeline.sub_agents[0].sub_agents]
+    assert all(isinstance(model, TimedLlm) and model.policy is policy for model in models)
+    assert sorted(model.role for model in models) == ["pm", "qa_tester"]  # type: ignore[union-attr]
+    # Recovery re-runs and repairs use the same timed model as the specialist itself
+    agents = pipeline.sub_agents[0].sub_agents
+    assert all(agent.on_model_error_callback.__self__._llm is agent.model for agent in agents)  # type: ignore[union-attr]
@@ -5,10 +5,17 @@ from types import SimpleNamespace
 import pytest
 from hibikasu_agent.agents.parallel_orchestrator.tools import (
     AGGREGATE_FINAL_ISSUES_TOOL,
-    _load_issues_from_state,
-    _to_final_issues,
+    load_issues_from_state,
+    to_final_issues,
+)
+from hibikasu_agent.constants.agents import (
+    AGENT_STATE_KEYS,
+    PRD_TEXT_STATE_KEY,
+    REVIEW_CHUNKS_STATE_KEY,
+    SPECIALIST_DEFINITIONS,
+    chunk_state_key,
+    specialist_error_state_key,
 )
-from hibikasu_agent.constants.agents import AGENT_STATE_KEYS, SPECIALIST_DEFINITIONS
 from hibikasu_agent.schemas.models import FinalIssuesResponse, IssueItem, IssuesResponse
 from pydantic import ValidationError
 
@@ -19,7 +26,7 @@ def test_load_issues_from_state_raises_on_malformed_dict() -> None:
     malformed = {"engineer_issues": {"bad_key": "value"}}
 
     with pytest.raises(ValidationError):
-        _load_issues_from_state(malformed, "engineer_issues")
+        load_issues_from_state(malformed, "engineer_issues")
 
 
 def test_to_final_issues_preserves_original_text() -> None:
@@ -28,7 +35,7 @@ def test_to_final_issues_preserves_original_text() -> None:
     long_text = "a" * 200
     issues = IssuesResponse(issues=[IssueItem(priority=1, summary="短い要約", comment="c", original_text=long_text)])
 
-    final_issues = _to_final_issues("engineer_specialist", issues)
+    final_issues = to_final_issues("engineer_specialist", issues)
 
     assert len(final_issues) == 1
     assert final_issues[0].original_text == long_text
@@ -76,3 +83,77 @@ def test_aggregate_final_issues_handles_missing_state() -> None:
     response = AGGREGATE_FINAL_ISSUES_TOOL(tool_context)
     assert isinstance(response, FinalIssuesResponse)
     assert response.final_issues == []
+
+
+def test_aggregate_final_issues_keeps_other_agents_when_one_output_is_invalid() -> None:
+    """An unusable specialist output is reported per agent instead of failing aggregation."""
+
+    engineer, ux, qa = SPECIALIST_DEFINITIONS[:3]
+    state: dict[str, object] = {
+        engineer.state_key: IssuesResponse(issues=[_make_issue_item(1, "ok")]),
+        ux.state_key: {"bad_key": "value"},
+        qa.state_key: {"issues": []},
+        specialist_error_state_key(qa.state_key): "出力形式が不正です: issues.0.comment",
+    }
+
+    response = AGGREGATE_FINAL_ISSUES_TOOL(SimpleNamespace(state=state))
+
+    assert [issue.comment for issue in response.final_issues] == ["ok"]
+    assert set(response.agent_errors) == {ux.agent_key, qa.agent_key}
+    assert response.agent_errors[qa.agent_key] == "出力形式が不正です: issues.0.comment"
+
+
+def test_aggregate_final_issues_merges_chunks_with_global_spans() -> None:
+    """Chunked outputs are deduplicated per agent and mapped to global offsets."""
+
+    prd_text = "# A\nalpha requirement\n# B\nbeta requirement\n"
+    second_start = prd_text.index("# B")
+    chunks = [
+        {"index": 0, "start": 0, "end": second_start},
+        {"index": 1, "start": second_start - 5, "end": len(prd_text)},
+    ]
+    definition = SPECIALIST_DEFINITIONS[0]
+    state: dict[str, object] = {
+        PRD_TEXT_STATE_KEY: prd_text,
+        REVIEW_CHUNKS_STATE_KEY: chunks,
+        chunk_state_key(definition.state_key, 0, 2): IssuesResponse(
+            issues=[IssueItem(priority=2, summary="a", comment="c", original_text="alpha requirement")]
+        ),
+        chunk_state_key(definition.state_key, 1, 2): IssuesResponse(
+            issues=[
+                IssueItem(priority=1, summary="b", comment="c", original_text="beta requirement"),
+                # Repeated from the overlap region; must be dropped
+                IssueItem(priority=2, summary="a", comment="c", original_text="alpha  requirement"),
+            ]
+        ),
+    }
+
+    response = AGGREGATE_FINAL_ISSUES_TOOL(SimpleNamespace(state=state))
+
+    assert [issue.original_text for issue in response.final_issues] == ["beta requirement", "alpha requirement"]
+    beta = response.final_issues[0]
+    assert prd_text[beta.span_start : beta.span_end] == "beta requirement"
+
+
+def test_to_final_issues_assigns_stable_ids() -> None:
+    """The same specialist output maps to the same IDs across calls."""
+
+    issues = IssuesResponse(issues=[_make_issue_item(1, "a"), _make_issue_item(2, "b")])
+
+    first = [issue.issue_id for issue in to_final_issues("engineer_specialist", issues)]
+    second = [issue.issue_id for issue in to_final_issues("engineer_specialist", issues)]
+    other_agent = [issue.issue_id for issue in to_final_issues("pm_specialist", issues)]
+
+    assert first == second
+    assert len(set(first)) == 2
+    assert set(first).isdisjoint(other_agent)
+
+
+def test_aggregate_final_issues_drops_repeated_issue_ids() -> None:
+    definition = SPECIALIST_DEFINITIONS[0]
+    repeated = _make_issue_item(1, "same")
+    state: dict[str, object] = {definition.state_key: IssuesResponse(issues=[repeated, repeated])}
+
+    response = AGGREGATE_FINAL_ISSUES_TOOL(SimpleNamespace(state=state))
+
+    assert len(response.final_issues) == 1
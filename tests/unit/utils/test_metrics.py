@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import pytest
+from hibikasu_agent.utils.metrics import Gauge, MetricsRegistry
+
+
+def test_render_uses_text_exposition_format() -> None:
+    registry = MetricsRegistry()
+    failures = registry.counter("test_failures_total", "Failures by reason.", ("reason",))
+    latency = registry.histogram("test_latency_seconds", "Latency.", buckets=(1.0, 5.0))
+    failures.inc(reason="dialog_error")
+    failures.inc(2, reason='say "hi"')
+    latency.observe(0.5)
+    latency.observe(3.0)
+    latency.observe(10.0)
+    depth = Gauge("test_queue_depth", "Queue depth.")
+    depth.set(4)
+
+    lines = registry.render([depth]).splitlines()
+
+    assert "# TYPE test_failures_total counter" in lines
+    assert 'test_failures_total{reason="dialog_error"} 1' in lines
+    assert 'test_failures_total{reason="say \\"hi\\""} 2' in lines
+    assert "# TYPE test_latency_seconds histogram" in lines
+    assert 'test_latency_seconds_bucket{le="1"} 1' in lines
+    assert 'test_latency_seconds_bucket{le="5"} 2' in lines
+    assert 'test_latency_seconds_bucket{le="+Inf"} 3' in lines
+    assert "test_latency_seconds_sum 13.5" in lines
+    assert "test_latency_seconds_count 3" in lines
+    assert "test_queue_depth 4" in lines
+
+
+def test_registry_returns_existing_metric_and_rejects_mismatched_labels() -> None:
+    registry = MetricsRegistry()
+    first = registry.counter("test_total", "Total.", ("reason",))
+
+    assert registry.counter("test_total", "Total.", ("reason",)) is first
+    with pytest.raises(ValueError):
+        registry.counter("test_total", "Total.", ("other",))
+    with pytest.raises(ValueError):
+        first.inc(other="x")
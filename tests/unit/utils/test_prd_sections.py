@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from itertools import pairwise
+
+from hibikasu_agent.utils.prd_sections import chunk_prd, section_at, split_sections
+
+PRD = "intro text\n# 概要\n本文A\n## 要件\n本文B\n"
+
+
+def test_split_sections_covers_document_in_order() -> None:
+    sections = split_sections(PRD)
+
+    assert [section.heading for section in sections] == ["", "概要", "要件"]
+    assert "".join(section.text for section in sections) == PRD
+    assert sections[1].text.startswith("# 概要")
+
+
+def test_section_digest_ignores_trailing_whitespace() -> None:
+    a = split_sections("# T\nbody\n")[0]
+    b = split_sections("# T  \nbody   \n\n")[0]
+    assert a.digest == b.digest
+
+
+def test_section_at_returns_containing_section() -> None:
+    sections = split_sections(PRD)
+    offset = PRD.index("本文B")
+    found = section_at(sections, offset)
+    assert found is not None and found.heading == "要件"
+    assert section_at(sections, len(PRD) + 10) is None
+
+
+def test_chunk_prd_returns_single_chunk_for_short_text() -> None:
+    chunks = chunk_prd(PRD, max_chars=1000)
+    assert len(chunks) == 1
+    assert (chunks[0].start, chunks[0].end) == (0, len(PRD))
+
+
+def test_chunk_prd_splits_on_sections_with_overlap() -> None:
+    prd = "".join(f"# S{i}\n" + "x" * 40 + "\n" for i in range(6))
+    chunks = chunk_prd(prd, max_chars=100, overlap_chars=50)
+
+    assert len(chunks) > 1
+    assert chunks[0].start == 0
+    assert chunks[-1].end == len(prd)
+    for prev, cur in pairwise(chunks):
+        # Overlapping windows, each starting on a line boundary
+        assert cur.start < prev.end
+        assert prd[cur.start - 1] == "\n"
+        assert cur.end - cur.start <= 100 + 50
+
+
+def test_chunk_prd_splits_oversized_section_on_line_breaks() -> None:
+    prd = "# Big\n" + "".join(f"line {i:03d}\n" for i in range(50))
+    chunks = chunk_prd(prd, max_chars=120)
+
+    assert len(chunks) > 1
+    covered = "".join(chunk.text_of(prd) for chunk in chunks)
+    assert covered == prd
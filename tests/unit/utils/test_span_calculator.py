@@ -1,7 +1,16 @@
 from __future__ import annotations
 
+import random
+from difflib import SequenceMatcher
+
 from hibikasu_agent.api.schemas.reviews import IssueSpan
-from hibikasu_agent.utils.span_calculator import calculate_span, find_simple_span, normalize_text
+from hibikasu_agent.utils.span_calculator import (
+    SpanIndex,
+    calculate_span,
+    find_simple_span,
+    get_span_index,
+    normalize_text,
+)
 
 
 def test_normalize_text_removes_whitespace() -> None:
@@ -57,3 +66,51 @@ def test_calculate_span_returns_none_when_similarity_low() -> None:
     prd = "プロダクトの目的は売上拡大です。"
     original = "全く関係のない文章です"
     assert calculate_span(prd, original) is None
+
+
+def test_span_index_resolves_batch_of_quotes() -> None:
+    prd = "# 概要\nユーザーはサインアップし、データを保存します。\n決済はカードのみ対応する。"
+    index = SpanIndex(prd)
+
+    spans = index.find_many(["決済はカードのみ", "ﾕｰｻﾞｰは サインアップし", "無関係な文章です", ""])
+
+    assert spans[0] is not None and prd[spans[0].start_index : spans[0].end_index] == "決済はカードのみ"
+    assert spans[1] is not None and prd[spans[1].start_index : spans[1].end_index] == "ユーザーはサインアップし"
+    assert spans[2] is None
+    assert spans[3] is None
+    assert index.offsets.typecode == "i"
+
+
+def test_span_index_longest_common_substring_matches_sequence_matcher() -> None:
+    rng = random.Random(7)
+    for _ in range(200):
+        prd = "".join(rng.choice("abcde") for _ in range(rng.randint(20, 120)))
+        query = "".join(rng.choice("abcde") for _ in range(rng.randint(6, 30)))
+        index = SpanIndex(prd)
+
+        start, size = index.longest_common_substring(query)
+        expected = SequenceMatcher(None, prd, query, autojunk=False).find_longest_match(0, len(prd), 0, len(query))
+
+        if expected.size >= 3:
+            assert (start, size) == (expected.a, expected.size)
+        else:
+            assert size == 0
+
+
+def test_calculate_span_reuses_index_for_same_prd() -> None:
+    prd = "共通のPRD本文です。" * 10
+    get_span_index.cache_clear()
+
+    calculate_span(prd, "PRD本文")
+    calculate_span(prd, "ＰＲＤ 本文です")
+
+    assert get_span_index.cache_info().misses == 1
+
+
+def test_span_index_locate_reports_resolution_method() -> None:
+    index = SpanIndex("ユーザーは 検索結果 を保存できる。保存した結果は共有できる。")
+
+    assert index.locate("検索結果")[1] == "exact"
+    assert index.locate("ユーザーは検索結果")[1] == "normalized"
+    assert index.locate("保存した結果は共有できます")[1] == "fuzzy"
+    assert index.locate("まったく関係のない文章です") == (None, "none")
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+import uuid
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from hibikasu_agent.api.schemas.reviews import Issue
+from hibikasu_agent.services.ai_service import AiService
+from hibikasu_agent.services.mappers.api_issue_mapper import map_api_issue
+from hibikasu_agent.utils.tracing import JsonLinesSpanExporter, review_trace_context, tracer
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+
+@pytest.fixture(scope="module")
+def provider() -> TracerProvider:
+    current = trace.get_tracer_provider()
+    if isinstance(current, TracerProvider):
+        return current
+    provider = TracerProvider()
+    trace.set_tracer_provider(provider)
+    return provider
+
+
+@pytest.fixture
+def spans(provider: TracerProvider) -> Iterator[InMemorySpanExporter]:
+    exporter = InMemorySpanExporter()
+    processor = SimpleSpanProcessor(exporter)
+    provider.add_span_processor(processor)
+    yield exporter
+    exporter.shutdown()
+
+
+class _MappingADK:
+    """Maps one quote that only matches fuzzily, like the real provider's mapping step."""
+
+    async def run_review_async(
+        self,
+        prd_text: str,
+        *,
+        on_event: Callable[[Any], None] | None = None,
+        selected_agents: list[str] | None = None,
+    ) -> list[Issue]:
+        with tracer.start_as_current_span("review.mapping"):
+            item = {"issue_id": "T-1", "priority": 1, "comment": "c", "original_text": "保存した結果は共有できます"}
+            return [map_api_issue(item, prd_text)]
+
+
+def test_review_trace_id_is_derived_from_review_id() -> None:
+    review_id = str(uuid.uuid4())
+
+    span_context = trace.get_current_span(review_trace_context(review_id)).get_span_context()
+
+    assert span_context.trace_id == uuid.UUID(review_id).int
+    assert span_context.is_valid
+
+
+@pytest.mark.asyncio
+async def test_review_spans_share_one_trace(spans: InMemorySpanExporter) -> None:
+    svc = AiService(adk_service=_MappingADK())  # type: ignore[arg-type]
+    review_id = svc.new_review_session("ユーザーは検索結果を保存できる。保存した結果は共有できる。")
+
+    await svc.kickoff_review_async(review_id)
+
+    finished = {span.name: span for span in spans.get_finished_spans()}
+    assert {"review.queue_wait", "review.run", "review.mapping", "review.span_calculation"} <= set(finished)
+    assert {span.context.trace_id for span in finished.values()} == {uuid.UUID(review_id).int}
+    assert finished["review.mapping"].parent.span_id == finished["review.run"].context.span_id  # type: ignore[union-attr]
+    assert finished["review.span_calculation"].attributes["hibikasu.span_method"] == "fuzzy"  # type: ignore[index]
+    assert finished["review.run"].attributes["hibikasu.review_status"] == "completed"  # type: ignore[index]
+
+
+def test_json_lines_exporter_appends_one_span_per_line(provider: TracerProvider, tmp_path: Path) -> None:
+    path = tmp_path / "traces" / "spans.jsonl"
+    processor = SimpleSpanProcessor(JsonLinesSpanExporter(path))
+    provider.add_span_processor(processor)
+    try:
+        with tracer.start_as_current_span("outer"), tracer.start_as_current_span("inner"):
+            pass
+    finally:
+        processor.shutdown()
+
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [record["name"] for record in records] == ["inner", "outer"]